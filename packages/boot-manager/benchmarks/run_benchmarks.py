@@ -0,0 +1,395 @@
+"""
+Benchmarks für die zeitkritischen Pfade des Boot Managers.
+
+Läuft auf einem normalen Linux-Rechner ohne Docker und ohne Netzwerk: Docker-Daemon
+und HTTP-Server werden lokal nachgebildet. Die Ergebnisse werden als JSON
+geschrieben, damit sich Releases miteinander vergleichen lassen.
+
+    python benchmarks/run_benchmarks.py --output benchmark-results.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BOOT_MANAGER_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "dpt-boot-manager.py")
+)
+COMPOSE_FIXTURE = os.path.abspath(
+    os.path.join(
+        os.path.dirname(__file__), "..", "..", "..", "docker", "docker-compose.prod.yml"
+    )
+)
+
+
+def load_boot_manager():
+    """
+    Lädt dpt-boot-manager.py als Modul (der Dateiname ist kein gültiger Modulname)
+    und schaltet das Boot-Tracing ab.
+    """
+    spec = importlib.util.spec_from_file_location("dpt_boot_manager", BOOT_MANAGER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Benchmark-Läufe nicht in den Boot-Trace schreiben
+    module.tracer.enabled = False
+    return module
+
+
+def summarize(values, unit):
+    """
+    Fasst Messwerte zu Kennzahlen zusammen.
+    """
+    return {
+        "unit": unit,
+        "runs": len(values),
+        "min": round(min(values), 4),
+        "median": round(statistics.median(values), 4),
+        "mean": round(statistics.fmean(values), 4),
+        "max": round(max(values), 4),
+    }
+
+
+# ============================================================================
+#   LOKALE NACHBILDUNGEN (HTTP-SERVER, DOCKER-DAEMON)
+# ============================================================================
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """
+    Liefert 'server.payload' aus und unterstützt Range-Anfragen.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        payload = self.server.payload
+        byte_range = self.headers.get("Range")
+        if byte_range:
+            start, _, end = byte_range.split("=", 1)[1].partition("-")
+            start = int(start)
+            end = int(end) if end else len(payload) - 1
+            body = memoryview(payload)[start : end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+        else:
+            body = memoryview(payload)
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeDockerHandler(BaseHTTPRequestHandler):
+    """
+    Beantwortet die Engine-API-Aufrufe, die Ping und Readiness-Tracking nutzen.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def address_string(self):
+        return "unix"
+
+    def _send(self, body, status=200):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        containers = self.server.containers
+        if self.path == "/_ping":
+            return self._send(b"OK")
+        if self.path.startswith("/containers/json"):
+            return self._send(list(containers.values()))
+        if self.path.startswith("/containers/"):
+            container_id = self.path.split("/")[2]
+            if container_id in containers:
+                return self._send({"State": containers[container_id]["_state"]})
+        self._send({"message": "not found"}, status=404)
+
+
+class FakeDockerDaemon(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, handler=FakeDockerHandler):
+        super().__init__(socket_path, handler)
+        self.containers = {}
+
+
+def start_server(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ============================================================================
+#   BENCHMARKS
+# ============================================================================
+
+
+def bench_cold_import(runs):
+    """
+    Kaltstart in einem frischen Interpreter: nur Import bzw. Import plus
+    Headless-Befehl 'config get'.
+    """
+    env = dict(os.environ, DOCKER_HOST="unix:///nonexistent.sock")
+    import_code = (
+        "import importlib.util as u;"
+        f"s=u.spec_from_file_location('m', {BOOT_MANAGER_PATH!r});"
+        "s.loader.exec_module(u.module_from_spec(s))"
+    )
+    results = {}
+    for name, command in (
+        ("cold_import_s", [sys.executable, "-c", import_code]),
+        ("headless_config_get_s", [sys.executable, BOOT_MANAGER_PATH, "config", "get"]),
+    ):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, env=env, capture_output=True, check=True)
+            timings.append(time.perf_counter() - start)
+        results[name] = summarize(timings, "s")
+    return results
+
+
+def bench_config_roundtrip(bm, workdir, runs):
+    """
+    load_config/save_config auf einer Kopie der Compose-Datei.
+    """
+    compose_copy = os.path.join(workdir, "docker-compose.yml")
+    shutil.copy(COMPOSE_FIXTURE, compose_copy)
+    bm.DOCKER_COMPOSE_FILE = compose_copy
+
+    cold_timings, load_timings, roundtrip_timings = [], [], []
+    for _ in range(runs):
+        # ohne Cache (erstes Lesen bzw. Datei von außen geändert)
+        bm.config_store.invalidate()
+        start = time.perf_counter()
+        bm.load_config()
+        cold_timings.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        config = bm.load_config()
+        load_timings.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        bm.apply_config_values(config, bm.get_config_values(config))
+        bm.save_config(config)
+        bm.load_config()
+        roundtrip_timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "load_config_cold_ms": summarize(cold_timings, "ms"),
+        "load_config_ms": summarize(load_timings, "ms"),
+        "save_load_roundtrip_ms": summarize(roundtrip_timings, "ms"),
+    }
+
+
+class _TextStub:
+    """
+    Ersatz für tk.Text ohne Display; zählt nur Zeilen.
+    """
+
+    def __init__(self):
+        self.lines = 0
+
+    def insert(self, index, chunk):
+        self.lines += chunk.count("\n")
+
+    def index(self, index):
+        return f"{self.lines + 1}.0"
+
+    def delete(self, start, end):
+        self.lines -= int(end.split(".")[0]) - 1
+
+    def see(self, index):
+        pass
+
+
+class _RootStub:
+    def after(self, delay, callback):
+        pass
+
+
+def bench_log_ingestion(bm, line_count):
+    """
+    Ein Kommando gibt 'line_count' Zeilen aus; gemessen wird, bis alle Zeilen
+    die Log-Pipeline durchlaufen haben.
+    """
+    sink = bm.LogSink()
+    widget = _TextStub()
+    sink.attach(_RootStub(), widget)
+    bm.log_sink = sink
+
+    command = [
+        sys.executable,
+        "-c",
+        "import sys\n"
+        f"for i in range({line_count}): "
+        "sys.stdout.write('Layer %d: Downloading [====>   ]\\n' % i)",
+    ]
+    start = time.perf_counter()
+    bm.run_command(command)
+    while sink.lines_written + sink.lines_dropped < line_count:
+        sink._flush()
+        time.sleep(sink.flush_interval_ms / 1000)
+    sink._flush()
+    elapsed = time.perf_counter() - start
+    return {
+        "log_ingestion": {
+            "lines": line_count,
+            "seconds": round(elapsed, 3),
+            "lines_per_second": round(line_count / elapsed),
+            "lines_dropped": sink.lines_dropped,
+            "lines_in_widget": widget.lines,
+        }
+    }
+
+
+def bench_downloader(bm, workdir, size_mb, runs):
+    """
+    DownloadEngine gegen einen lokalen HTTP-Server mit Range-Unterstützung.
+    """
+    server = start_server(ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler))
+    server.payload = os.urandom(size_mb * 1024 * 1024)
+    url = f"http://127.0.0.1:{server.server_address[1]}/asset.exe"
+
+    throughput = []
+    try:
+        for run in range(runs):
+            target = os.path.join(workdir, f"asset-{run}.exe")
+            start = time.perf_counter()
+            bm.DownloadEngine().download([{"url": url, "path": target}])
+            throughput.append(size_mb / (time.perf_counter() - start))
+            os.remove(target)
+    finally:
+        server.shutdown()
+    return {"download_mb_per_s": summarize(throughput, "MB/s")}
+
+
+def bench_readiness(bm, workdir, runs):
+    """
+    Latenz zwischen "Container wird healthy" und der Erkennung durch den
+    ReadinessTracker sowie die Ping-Latenz gegen einen nachgebildeten Daemon.
+    """
+    socket_path = os.path.join(workdir, "docker.sock")
+    daemon = start_server(FakeDockerDaemon(socket_path))
+    client = bm.DockerEngineClient(host=f"unix://{socket_path}")
+    config = {
+        "name": "bench",
+        "services": {
+            "db": {"image": "mysql:9", "healthcheck": {}},
+            "prisma": {"image": "prisma"},
+            "api": {
+                "image": "api",
+                "depends_on": {
+                    "db": {"condition": "service_healthy"},
+                    "prisma": {"condition": "service_completed_successfully"},
+                },
+            },
+        },
+    }
+
+    ping_timings = []
+    for _ in range(200):
+        start = time.perf_counter()
+        client.ping()
+        ping_timings.append((time.perf_counter() - start) * 1000)
+
+    latencies = []
+    try:
+        for _ in range(runs):
+            daemon.containers = {
+                name: {
+                    "Id": name,
+                    "Labels": {
+                        "com.docker.compose.project": "bench",
+                        "com.docker.compose.service": name,
+                    },
+                    "_state": {"Running": True, "Status": "running"},
+                }
+                for name in config["services"]
+            }
+            daemon.containers["db"]["_state"]["Health"] = {"Status": "starting"}
+            flipped = {}
+
+            def become_ready():
+                time.sleep(0.3)
+                daemon.containers["prisma"]["_state"] = {
+                    "Running": False,
+                    "Status": "exited",
+                    "ExitCode": 0,
+                }
+                daemon.containers["db"]["_state"]["Health"]["Status"] = "healthy"
+                flipped["at"] = time.perf_counter()
+
+            threading.Thread(target=become_ready, daemon=True).start()
+            tracker = bm.ReadinessTracker(config, client=client)
+            if not tracker.wait(timeout=10):
+                raise RuntimeError("Readiness wurde nicht erkannt")
+            latencies.append((time.perf_counter() - flipped["at"]) * 1000)
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+    return {
+        "docker_ping_ms": summarize(ping_timings, "ms"),
+        "readiness_detection_ms": summarize(latencies, "ms"),
+    }
+
+
+BENCHMARKS = ("startup", "config", "log", "download", "readiness")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--log-lines", type=int, default=100000)
+    parser.add_argument("--download-mb", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    bm = load_boot_manager()
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        if "startup" in args.only:
+            results.update(bench_cold_import(args.runs))
+        if "config" in args.only:
+            results.update(bench_config_roundtrip(bm, workdir, args.runs * 20))
+        if "log" in args.only:
+            results.update(bench_log_ingestion(bm, args.log_lines))
+        if "download" in args.only:
+            results.update(bench_downloader(bm, workdir, args.download_mb, args.runs))
+        if "readiness" in args.only:
+            results.update(bench_readiness(bm, workdir, args.runs))
+
+    report = {
+        "version": bm.CURRENT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
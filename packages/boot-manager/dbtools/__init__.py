@@ -0,0 +1,12 @@
+"""
+Datenbank-Werkzeuge des Boot Managers: Sicherung, Massenimport, Salden-Export,
+Testdatensätze und Lasttest.
+
+Die Module hängen weder von Tkinter noch von dpt-boot-manager.py ab. MySQL wird
+über eine übergebene Funktion 'mysql_command(*args, interactive=False)'
+aufgerufen, die die Befehlszeile für den mysql-Client (mit ausgewählter
+Datenbank) liefert; die Sicherung bekommt für mysqldump eine gleichartige
+Funktion 'mysqldump_command'. Fortschritt, Statusmeldungen und Tracing kommen
+als Objekte bzw. Callbacks vom Aufrufer. GUI und Kommandozeile rufen nur hier
+hinein.
+"""
@@ -0,0 +1,295 @@
+"""
+Datenbank-Sicherung: mysqldump im db-Container, gzip-komprimiert in ein
+Verzeichnis mit Manifest, und die Wiederherstellung daraus über den mysql-Client.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+PARALLEL = 4
+LARGE_TABLE_BYTES = 64 * 1024 * 1024  # größere Tabellen bekommen einen eigenen Dump
+CHUNK_SIZE = 1024 * 1024
+COMPRESSLEVEL = 3  # schnell; Dumps komprimieren auch so auf einen Bruchteil
+DUMP_OPTIONS = ["--single-transaction", "--quick", "--hex-blob"]
+MANIFEST_NAME = "manifest.json"
+
+
+class BackupError(Exception):
+    """
+    Fehler beim Sichern oder Wiederherstellen der Datenbank.
+    """
+
+
+def get_table_sizes(mysql_command):
+    """
+    Gibt {Tabelle: geschätzte Größe in Bytes} der ausgewählten Datenbank aus
+    information_schema zurück.
+    """
+    query = (
+        "SELECT table_name, data_length + index_length FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE'"
+    )
+    result = subprocess.run(
+        mysql_command("-N", "-B", "-e", query), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise BackupError(result.stderr.strip() or "Tabellen nicht abrufbar")
+    sizes = {}
+    for line in result.stdout.splitlines():
+        table, _, size = line.partition("\t")
+        sizes[table] = int(size) if size.isdigit() else 0
+    return sizes
+
+
+def plan_backup_parts(sizes, large_table_bytes=LARGE_TABLE_BYTES):
+    """
+    Teilt die Tabellen in Dump-Teile auf: jede große Tabelle einzeln, alle kleinen
+    gemeinsam. Die größten Teile kommen zuerst, damit sie früh parallel starten.
+    Gibt [(Teilname, [Tabellen], geschätzte Bytes)] zurück.
+    """
+    parts = []
+    small = []
+    for table, size in sorted(sizes.items(), key=lambda item: -item[1]):
+        if size >= large_table_bytes:
+            parts.append((f"data-{table}", [table], size))
+        else:
+            small.append(table)
+    if small:
+        parts.append(("data-small", small, sum(sizes[table] for table in small)))
+    return parts
+
+
+def _read_stderr(file):
+    file.seek(0)
+    return file.read().decode(errors="replace").strip()
+
+
+def _dump_to_file(command, path, progress):
+    """
+    Leitet die Ausgabe von 'command' blockweise durch gzip in 'path'. stderr
+    landet in einer temporären Datei, damit mysqldump nicht an einer vollen
+    Pipe hängen bleibt, während hier stdout gelesen wird.
+    Gibt die Anzahl unkomprimierter Bytes zurück.
+    """
+    written = 0
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            with process.stdout, gzip.open(
+                path, "wb", compresslevel=COMPRESSLEVEL
+            ) as out:
+                for chunk in iter(lambda: process.stdout.read(CHUNK_SIZE), b""):
+                    out.write(chunk)
+                    written += len(chunk)
+                    if progress is not None:
+                        progress.add(len(chunk))
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        if process.wait() != 0:
+            raise BackupError(
+                f"{os.path.basename(path)}: "
+                f"{_read_stderr(stderr) or f'Exit-Code {process.returncode}'}"
+            )
+    return written
+
+
+def backup_database(
+    mysql_command,
+    mysqldump_command,
+    database,
+    backup_dir,
+    sizes=None,
+    parallel=PARALLEL,
+    progress=None,
+    on_part_done=None,
+    version=None,
+):
+    """
+    Sichert 'database' in ein neues Verzeichnis '<database>-<Zeitstempel>' in
+    'backup_dir': Schema und Daten als gzip-komprimierte SQL-Teile und ein
+    manifest.json. Jeder Teil wird direkt an seinen endgültigen Platz
+    geschrieben; bis das Manifest steht, trägt das Verzeichnis die Endung '.part'.
+
+    Mit 'parallel' > 1 bekommt jede große Tabelle einen eigenen mysqldump
+    (--single-transaction), der Rest einen gemeinsamen. Jeder Teil liest in
+    seiner eigenen Transaktion; zueinander konsistent sind sie nur, wenn
+    währenddessen niemand schreibt (der Aufrufer hält dazu die API an). Mit
+    parallel=1 entsteht ein einziger Dump in einer Transaktion, der auch im
+    laufenden Betrieb konsistent ist.
+
+    'sizes' ({Tabelle: Bytes}, sonst aus information_schema) bestimmt die
+    Aufteilung, 'progress' (mit add(Bytes)) zählt die gedumpten Bytes und
+    'on_part_done' erhält das Ergebnis jedes Teils.
+    Gibt eine Zusammenfassung mit Pfad, Größe und Dauer zurück.
+    """
+    if sizes is None:
+        sizes = get_table_sizes(mysql_command)
+    path = os.path.join(backup_dir, f"{database}-{time.strftime('%Y%m%d-%H%M%S')}")
+    if os.path.exists(path):
+        raise BackupError(f"Sicherung existiert bereits: {path}")
+
+    if parallel > 1:
+        jobs = [
+            (
+                "schema",
+                [],
+                True,
+                ["--no-data", "--routines", "--triggers", database],
+            )
+        ]
+        for name, tables, _ in plan_backup_parts(sizes):
+            jobs.append(
+                (
+                    name,
+                    tables,
+                    False,
+                    ["--no-create-info", "--skip-triggers", database, *tables],
+                )
+            )
+    else:
+        jobs = [(database, sorted(sizes), True, ["--routines", "--triggers", database])]
+
+    start = time.monotonic()
+    part_path = f"{path}.part"
+
+    def dump(job):
+        name, tables, schema, args = job
+        file_name = f"{name}.sql.gz"
+        part_start = time.monotonic()
+        written = _dump_to_file(
+            mysqldump_command(*DUMP_OPTIONS, *args),
+            os.path.join(part_path, file_name),
+            progress,
+        )
+        result = {
+            "file": file_name,
+            "tables": tables,
+            "schema": schema,
+            "bytes": written,
+        }
+        if on_part_done is not None:
+            on_part_done(dict(result, seconds=time.monotonic() - part_start))
+        return result
+
+    os.makedirs(part_path)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+            members = list(pool.map(dump, jobs))
+
+        manifest = {
+            "version": version,
+            "database": database,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "parallel": parallel > 1,
+            "members": members,
+        }
+        with open(os.path.join(part_path, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(part_path, path)
+    except BaseException:
+        shutil.rmtree(part_path, ignore_errors=True)
+        raise
+
+    return {
+        "path": path,
+        "size": sum(
+            os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+        ),
+        "bytes": sum(member["bytes"] for member in members),
+        "parts": len(members),
+        "parallel": parallel > 1,
+        "seconds": round(time.monotonic() - start, 1),
+    }
+
+
+def read_backup_manifest(path):
+    """
+    Liest das Manifest einer Sicherung; 'path' ist ihr Verzeichnis oder die
+    Datei manifest.json darin.
+    """
+    if os.path.basename(path) != MANIFEST_NAME:
+        path = os.path.join(path, MANIFEST_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BackupError(f"Keine gültige Sicherung: {e}") from e
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("members"), list):
+        raise BackupError(f"Keine gültige Sicherung: {path} ohne Teile")
+    return manifest
+
+
+def _restore_member(mysql_command, path, progress):
+    """
+    Entpackt einen SQL-Teil blockweise direkt in 'mysql' im Container. stderr
+    landet in einer temporären Datei, damit mysql beim Schreiben von Meldungen
+    nicht blockiert, während hier noch stdin gefüllt wird.
+    """
+    name = os.path.basename(path)
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            mysql_command(interactive=True),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+            bufsize=0,
+        )
+        try:
+            with gzip.open(path) as source:
+                # Wiederherstellung nicht ins Binlog schreiben (deutlich schneller)
+                process.stdin.write(b"SET SESSION sql_log_bin = 0;\n")
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    process.stdin.write(chunk)
+                    if progress is not None:
+                        progress.add(len(chunk))
+        except BrokenPipeError:
+            pass  # mysql hat abgebrochen, die Fehlermeldung steht in stderr
+        except (OSError, EOFError, zlib.error) as e:
+            process.kill()
+            process.wait()
+            raise BackupError(f"{name}: {e}") from e
+        finally:
+            process.stdin.close()
+        if process.wait() != 0:
+            raise BackupError(
+                f"{name}: {_read_stderr(stderr) or f'Exit-Code {process.returncode}'}"
+            )
+
+
+def restore_database(
+    path, mysql_command, parallel=PARALLEL, progress=None, on_part_done=None
+):
+    """
+    Spielt eine mit backup_database erstellte Sicherung über den mysql-Client
+    aus 'mysql_command' ein: zuerst die Teile mit Schema (ersetzen vorhandene
+    Tabellen), danach die Datenteile parallel. 'progress' zählt die entpackten
+    Bytes, 'on_part_done' erhält Datei und Dauer jedes Teils.
+    Gibt das Manifest zurück.
+    """
+    manifest = read_backup_manifest(path)
+    directory = path if os.path.isdir(path) else os.path.dirname(path)
+    members = manifest["members"]
+
+    def restore(member):
+        start = time.monotonic()
+        _restore_member(
+            mysql_command, os.path.join(directory, member["file"]), progress
+        )
+        if on_part_done is not None:
+            on_part_done({"file": member["file"], "seconds": time.monotonic() - start})
+
+    for member in members:
+        if member.get("schema"):
+            restore(member)
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+        list(pool.map(restore, [m for m in members if not m.get("schema")]))
+    return manifest
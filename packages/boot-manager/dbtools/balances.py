@@ -0,0 +1,304 @@
+"""
+Salden-Export: die Kennzahlen aus packages/database/sql/select.sql für alle
+Lehrpersonen und Semester in einer Abfrage, gestreamt nach CSV oder Parquet.
+"""
+
+import csv
+import os
+import time
+
+from dbtools.mysql import mysql_query_rows
+
+PARQUET_BATCH_ROWS = 10000  # Zeilen je Parquet-Zeilengruppe
+
+
+class ExportError(Exception):
+    """
+    Fehler beim Export der Auswertung.
+    """
+
+
+# Spalten des Exports: (Name, Typ); die Namen folgen den Aliasen in
+# packages/database/sql/select.sql
+COLUMNS = [
+    ("LehrpersonID", "int"),
+    ("Nachname", "str"),
+    ("Vorname", "str"),
+    ("Gruppe", "str"),
+    ("SemesterID", "int"),
+    ("Semester", "str"),
+    ("Anz_BA", "int"),
+    ("Anz_MA", "int"),
+    ("Anz_Zwtprf", "int"),
+    ("Anz_Prxs", "int"),
+    ("SumSupervision", "float"),
+    ("SumLecture", "float"),
+    ("SumReduction", "float"),
+    ("Sum_Funktion_Forschung", "float"),
+    ("Sum_Gesetzlich", "float"),
+    ("Deputat", "float"),
+    ("SumSaldo", "float"),
+    ("SumSaldoZeitraum", "float"),
+    ("SumAngeordnet", "float"),
+]
+
+# Alle Kennzahlen aus select.sql für alle Lehrpersonen und Semester in einer
+# Abfrage: je Tabelle eine Gruppierung nach (Lehrperson, Semester), der Saldo
+# über den Zeitraum als Fensterfunktion statt einer Abfrage je Semester.
+# Wie in select.sql bleibt eine Summe leer (NULL), wenn es keine Einträge gibt,
+# und damit auch jeder Saldo, in den sie eingeht.
+QUERY = """
+WITH
+grid AS (
+    SELECT t.id AS teacherId, s.id AS semesterId
+    FROM `Teacher` t CROSS JOIN `SemesterPeriod` s
+    WHERE s.id BETWEEN {window_from} AND {last}
+),
+sup AS (
+    SELECT s.teacherId, s.semesterPeriodId AS semesterId,
+        SUM(CASE WHEN st.typeOfSupervision = 'Bachelorarbeit' THEN 1 ELSE 0 END)
+            AS countBachelor,
+        SUM(CASE WHEN st.typeOfSupervision = 'Masterarbeit' THEN 1 ELSE 0 END)
+            AS countMaster,
+        SUM(CASE WHEN st.typeOfSupervision = 'Zweitprüfer' THEN 1 ELSE 0 END)
+            AS countSecond,
+        SUM(CASE WHEN st.typeOfSupervision = 'Praxissemester' THEN 1 ELSE 0 END)
+            AS countInternship,
+        SUM(st.calculationFactor) AS sumSupervision
+    FROM `Supervision` s
+    JOIN `SupervisionType` st ON s.supervisionTypeId = st.typeOfSupervisionId
+    WHERE s.semesterPeriodId BETWEEN {window_from} AND {last}
+    GROUP BY s.teacherId, s.semesterPeriodId
+),
+lec AS (
+    SELECT teacherId, semesterPeriodId AS semesterId,
+        SUM(CASE WHEN ordered = FALSE THEN hours END) AS sumLecture,
+        SUM(hours) AS sumLectureAll
+    FROM `TeachingEvent`
+    WHERE semesterPeriodId BETWEEN {window_from} AND {last}
+    GROUP BY teacherId, semesterPeriodId
+),
+red AS (
+    SELECT d.teacherId, d.semesterPeriodId AS semesterId,
+        SUM(d.scope) AS sumReduction,
+        SUM(CASE WHEN dt.discountType IN ('Funktion/Aufgabe', 'Forschung/Entwicklung')
+            THEN d.scope END) AS sumFunctionResearch,
+        SUM(CASE WHEN dt.discountType = 'Gesetzlich' THEN d.scope END) AS sumLegal
+    FROM `Discount` d
+    JOIN `DiscountType` dt ON d.discountTypeId = dt.discountTypeId
+    WHERE d.semesterPeriodId BETWEEN {window_from} AND {last}
+    GROUP BY d.teacherId, d.semesterPeriodId
+),
+duty AS (
+    SELECT teacherId, semesterPeriodId AS semesterId, SUM(individualDuty) AS deputat
+    FROM `TeachingDutyPerSemester`
+    WHERE semesterPeriodId BETWEEN {window_from} AND {last}
+    GROUP BY teacherId, semesterPeriodId
+),
+arranged AS (
+    SELECT teacherId, SUM(hours) AS sumOrdered
+    FROM `TeachingEvent`
+    WHERE ordered = TRUE
+    GROUP BY teacherId
+),
+balance AS (
+    SELECT g.teacherId, g.semesterId,
+        COALESCE(sup.countBachelor, 0) AS countBachelor,
+        COALESCE(sup.countMaster, 0) AS countMaster,
+        COALESCE(sup.countSecond, 0) AS countSecond,
+        COALESCE(sup.countInternship, 0) AS countInternship,
+        sup.sumSupervision, lec.sumLecture, red.sumReduction,
+        red.sumFunctionResearch, red.sumLegal, duty.deputat,
+        sup.sumSupervision + lec.sumLectureAll + red.sumReduction - duty.deputat
+            AS saldo,
+        SUM(sup.sumSupervision) OVER w + SUM(lec.sumLectureAll) OVER w
+            + SUM(red.sumReduction) OVER w - SUM(duty.deputat) OVER w AS saldoRange
+    FROM grid g
+    LEFT JOIN sup ON sup.teacherId = g.teacherId AND sup.semesterId = g.semesterId
+    LEFT JOIN lec ON lec.teacherId = g.teacherId AND lec.semesterId = g.semesterId
+    LEFT JOIN red ON red.teacherId = g.teacherId AND red.semesterId = g.semesterId
+    LEFT JOIN duty ON duty.teacherId = g.teacherId AND duty.semesterId = g.semesterId
+    WINDOW w AS (
+        PARTITION BY g.teacherId ORDER BY g.semesterId
+        RANGE BETWEEN {preceding} PRECEDING AND CURRENT ROW
+    )
+)
+SELECT b.teacherId, u.lastName, u.firstName, tg.groupName, b.semesterId, sp.name,
+    b.countBachelor, b.countMaster, b.countSecond, b.countInternship,
+    b.sumSupervision, b.sumLecture, b.sumReduction, b.sumFunctionResearch,
+    b.sumLegal, b.deputat, b.saldo, b.saldoRange, a.sumOrdered
+FROM balance b
+JOIN `Teacher` t ON t.id = b.teacherId
+JOIN `User` u ON u.id = t.userId
+JOIN `TeachingGroup` tg ON tg.id = t.teachingGroupId
+JOIN `SemesterPeriod` sp ON sp.id = b.semesterId
+LEFT JOIN arranged a ON a.teacherId = b.teacherId
+WHERE b.semesterId BETWEEN {first} AND {last}
+ORDER BY u.lastName, u.firstName, b.teacherId, b.semesterId
+"""
+
+
+def get_balance_period(mysql_command):
+    """
+    Gibt (aktives Semester, Saldierungszeitraum) aus SemesterPeriod und
+    EvaluationSettings zurück; ohne Einstellung gilt wie in der Web-App 6.
+    """
+    rows = list(
+        mysql_query_rows(
+            mysql_command,
+            "SELECT (SELECT MAX(id) FROM `SemesterPeriod` WHERE active = TRUE), "
+            "(SELECT value FROM `EvaluationSettings` "
+            "WHERE `key` = 'saldation_period')",
+            error_class=ExportError,
+        )
+    )
+    active, period = rows[0] if rows else (None, None)
+    if active is None:
+        raise ExportError("Kein aktives Semester")
+    try:
+        period = int(period)
+    except (TypeError, ValueError):
+        period = 6
+    return int(active), period if period > 0 else 6
+
+
+def _typed_value(kind, value):
+    if value is None or kind == "str":
+        return value
+    return int(float(value)) if kind == "int" else float(value)
+
+
+class _CsvBalanceWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _ in COLUMNS])
+
+    def write(self, row):
+        self._writer.writerow(["" if value is None else value for value in row])
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetBalanceWriter:
+    """
+    Schreibt Zeilengruppen zu je PARQUET_BATCH_ROWS Zeilen, damit auch große
+    Exporte nur eine Gruppe im Speicher halten.
+    """
+
+    _TYPES = {"int": "int64", "float": "float64", "str": "string"}
+
+    def __init__(self, path):
+        try:
+            import pyarrow  # optional, erst hier laden
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ExportError(
+                "Parquet-Export benötigt pyarrow (pip install pyarrow)"
+            ) from e
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema(
+            [(name, getattr(pyarrow, self._TYPES[kind])()) for name, kind in COLUMNS]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+        self._batch = []
+
+    def write(self, row):
+        self._batch.append(
+            [_typed_value(kind, value) for (_, kind), value in zip(COLUMNS, row)]
+        )
+        if len(self._batch) >= PARQUET_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            pyarrow = self._pyarrow
+            columns = list(zip(*self._batch))
+            self._writer.write_table(
+                pyarrow.table(
+                    {
+                        name: pyarrow.array(values, type=self._schema.field(name).type)
+                        for (name, _), values in zip(COLUMNS, columns)
+                    },
+                    schema=self._schema,
+                )
+            )
+            self._batch = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def export_balances(
+    mysql_command,
+    path=None,
+    output_dir=".",
+    first=None,
+    last=None,
+    period=None,
+    file_format="csv",
+    progress=None,
+):
+    """
+    Exportiert die Kennzahlen aus select.sql (Betreuungen, Lehrveranstaltungen,
+    Ermäßigungen, Deputat, Saldo je Semester und über den Saldierungszeitraum)
+    für alle Lehrpersonen und die Semester 'first' bis 'last' als CSV oder
+    Parquet. Ohne Angaben gilt der Zeitraum bis zum aktiven Semester; ohne
+    'path' entsteht 'salden-<von>-<bis>-<Zeitstempel>' in 'output_dir'.
+    'progress' (mit add(Bytes)) zählt die gelesenen Bytes.
+    Gibt eine Zusammenfassung mit Zeilen pro Sekunde zurück.
+    """
+    if file_format not in ("csv", "parquet"):
+        raise ExportError(f"Unbekanntes Format: {file_format}")
+    if last is None or period is None:
+        active, default_period = get_balance_period(mysql_command)
+        last = active if last is None else last
+        period = default_period if period is None else period
+    first = max(last - period + 1, 1) if first is None else first
+    if first > last or period < 1:
+        raise ExportError(f"Ungültiger Zeitraum: {first}-{last} ({period})")
+
+    if path is None:
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(
+            output_dir, f"salden-{first}-{last}-{time.strftime('%Y%m%d-%H%M%S')}"
+        )
+        path += ".parquet" if file_format == "parquet" else ".csv"
+    query = QUERY.format(
+        first=int(first),
+        last=int(last),
+        window_from=int(first) - int(period) + 1,
+        preceding=int(period) - 1,
+    )
+
+    start = time.monotonic()
+    rows = 0
+    writer_class = (
+        _ParquetBalanceWriter if file_format == "parquet" else _CsvBalanceWriter
+    )
+    writer = writer_class(f"{path}.part")
+    try:
+        for row in mysql_query_rows(mysql_command, query, progress, ExportError):
+            writer.write(row)
+            rows += 1
+        writer.close()
+        os.replace(f"{path}.part", path)
+    except BaseException:
+        writer.close()
+        try:
+            os.remove(f"{path}.part")
+        except OSError:
+            pass
+        raise
+    seconds = time.monotonic() - start
+    return {
+        "path": path,
+        "first_semester": first,
+        "last_semester": last,
+        "period": period,
+        "rows": rows,
+        "seconds": round(seconds, 2),
+        "rows_per_second": round(rows / max(seconds, 0.001)),
+    }
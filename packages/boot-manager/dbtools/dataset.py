@@ -0,0 +1,462 @@
+"""
+Testdaten-Generator: skalierbare, referenziell konsistente Datensätze für alle
+Prisma-Modelle, als SQL direkt in die Datenbank, als SQL-Skript oder als CSV.
+"""
+
+import csv
+import datetime
+import os
+import random
+import time
+
+from dbtools.mysql import SqlBatchWriter, mysql_query_rows, mysql_script_stream
+
+TEACHERS = 500  # Lehrpersonen bei Skalierung 1
+SEMESTERS = 20
+SEED = 42
+# Alle erzeugten Benutzer melden sich mit PASSWORD an (als bcrypt-Hash)
+PASSWORD = "dpt-dataset"
+PASSWORD_HASH = "$2b$10$Ji/5ksvUuZUbbxa3tYykReHn88rfXxirS/gfGLTDQZGwCCLBdLfdW"
+
+
+class DatasetError(Exception):
+    """
+    Fehler beim Erzeugen oder Einspielen eines Testdatensatzes.
+    """
+
+
+# Spalten je Tabelle in Einfügereihenfolge (Eltern vor Kindern); deckt alle
+# Prisma-Modelle ab, dazu die implizite n:m-Tabelle Program <-> SemesterPeriod
+TABLES = {
+    "User": [
+        "id",
+        "username",
+        "firstName",
+        "lastName",
+        "password",
+        "isPasswordTemporary",
+        "role",
+        "createdAt",
+        "updatedAt",
+    ],
+    "Controller": ["id", "userId"],
+    "TeachingGroup": ["id", "groupName", "groupDescription", "groupBalance"],
+    "SemesterPeriod": ["id", "name", "active"],
+    "Program": ["id", "programName"],
+    "_ProgramToSemesterPeriod": ["A", "B"],
+    "SupervisionType": [
+        "typeOfSupervisionId",
+        "typeOfSupervision",
+        "calculationFactor",
+        "validFrom",
+    ],
+    "DiscountType": ["discountTypeId", "discountType"],
+    "EvaluationSettings": ["id", "key", "value", "dataType"],
+    "Teacher": [
+        "id",
+        "userId",
+        "retirementDate",
+        "totalTeachingDuty",
+        "teachingGroupId",
+    ],
+    "Comment": ["commentId", "commentContent", "commentDate", "userId"],
+    "TeachingDutyPerSemester": [
+        "id",
+        "individualDuty",
+        "sumBalance",
+        "sumOrderedBalance",
+        "semesterPeriodId",
+        "teacherId",
+    ],
+    "TeachingEvent": [
+        "id",
+        "name",
+        "semesterPeriodId",
+        "teacherId",
+        "ordered",
+        "hours",
+        "commentId",
+        "programId",
+    ],
+    "Supervision": [
+        "id",
+        "studentId",
+        "supervisionShare",
+        "semesterPeriodId",
+        "supervisionTypeId",
+        "teacherId",
+        "commentId",
+    ],
+    "Discount": [
+        "id",
+        "discountTypeId",
+        "semesterPeriodId",
+        "teacherId",
+        "ordered",
+        "approvalDate",
+        "supervisor",
+        "commentId",
+        "description",
+        "scope",
+    ],
+}
+
+# Stammdaten wie in packages/database/prisma/seed.ts
+# (Name, Faktor, Gültigkeit: "alt" bis vor, "neu" ab dem letzten Semester)
+SUPERVISION_TYPES = [
+    ("Bachelorarbeit", 0.2, "alt"),
+    ("Masterarbeit", 0.2, "alt"),
+    ("Zweitprüfer", 0.2, "alt"),
+    ("Praxissemester", 0.2, "immer"),
+    ("Bachelorarbeit (ab SS24)", 0.3, "neu"),
+    ("Masterarbeit (ab SS24)", 0.3, "neu"),
+    ("Zweitprüfer (ab SS24)", 0.1, "neu"),
+]
+DISCOUNT_TYPES = ["Funktion/Aufgabe", "Forschung/Entwicklung", "Gesetzlich"]
+SETTINGS = [
+    ("saldation_period", "6", "int"),
+    ("factor_upper_limit", "2", "int"),
+    ("factor_lower_limit", "2", "int"),
+    ("max_hours_supervisions", "3.0", "float"),
+]
+PROGRAMS = ["BBW", "BWI", "BCSM", "BIF", "BMT", "MBM", "MIM", "MWI", "IMM"]
+FIRST_NAMES = [
+    "Anna", "Ben", "Clara", "David", "Elena", "Felix", "Greta", "Hannah",
+    "Jonas", "Julia", "Karl", "Lena", "Lukas", "Maria", "Matthias", "Nina",
+    "Oliver", "Paula", "Sophie", "Stefan", "Thomas", "Ute", "Valentin", "Yvonne",
+]  # fmt: skip
+LAST_NAMES = [
+    "Bauer", "Becker", "Fischer", "Freund", "Hartmann", "Hoffmann", "Keller",
+    "Koch", "Krüger", "Lange", "Meyer", "Müller", "Neumann", "Richter",
+    "Schäfer", "Schmidt", "Schneider", "Schulz", "Wagner", "Weber", "Wolf",
+]  # fmt: skip
+COURSES = [
+    "Mathematische Grundlagen", "Wirtschaftsstatistik", "Quantitative Methoden",
+    "Applied Econometrics", "Empirische Analysen", "Digital Economics",
+    "Programmierung", "Datenbanken", "Rechnungswesen", "Marketing",
+    "Projektmanagement", "Operations Research", "IT-Sicherheit", "Controlling",
+]  # fmt: skip
+
+
+class _CsvTableWriter:
+    """
+    Schreibt je Tabelle eine CSV-Datei '<Tabelle>.csv' in 'directory'.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.rows = 0
+        self._files = {}
+
+    def add(self, table, columns, values):
+        entry = self._files.get(table)
+        if entry is None:
+            file = open(
+                os.path.join(self.directory, f"{table}.csv"),
+                "w",
+                newline="",
+                encoding="utf-8",
+            )
+            entry = self._files[table] = (file, csv.writer(file))
+            entry[1].writerow(columns)
+        entry[1].writerow([self._format(value) for value in values])
+        self.rows += 1
+
+    @staticmethod
+    def _format(value):
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "1" if value else "0"
+        if isinstance(value, datetime.datetime):
+            return value.isoformat(sep=" ", timespec="milliseconds")
+        if isinstance(value, datetime.date):
+            return value.isoformat()
+        return value
+
+    def flush(self):
+        for file, _ in self._files.values():
+            file.close()
+        self._files = {}
+
+
+def dataset_size(scale, semesters=SEMESTERS):
+    """
+    Gibt die Eckdaten eines Datensatzes zurück; Skalierung 1 entspricht
+    TEACHERS Lehrpersonen über 'semesters' Semester.
+    """
+    teachers = max(1, round(TEACHERS * scale))
+    return {
+        "teachers": teachers,
+        "semesters": semesters,
+        "controllers": max(1, teachers // 100),
+        "teaching_groups": max(3, teachers // 25),
+    }
+
+
+def _semester_names(count):
+    """
+    Semesternamen rückwärts bis zum letzten (aktiven) Semester SS24.
+    """
+    names = []
+    year, summer = 24, True
+    for _ in range(count):
+        names.append(f"SS{year:02d}" if summer else f"WS{year:02d}/{year + 1:02d}")
+        if summer:
+            year -= 1
+        summer = not summer
+    return names[::-1]
+
+
+def generate_dataset(writer, scale=1.0, seed=SEED, semesters=SEMESTERS):
+    """
+    Erzeugt einen referenziell konsistenten Datensatz für alle Prisma-Modelle und
+    übergibt die Zeilen nacheinander an 'writer' (add(Tabelle, Spalten, Werte)).
+    Alle IDs werden vergeben, nicht der Datenbank überlassen; bei gleicher
+    Skalierung, gleichem Seed und gleicher Semesterzahl entstehen dieselben Daten.
+    Salden der Deputatsmeldungen werden aus den erzeugten Einträgen berechnet.
+    """
+    rng = random.Random(seed)
+    size = dataset_size(scale, semesters)
+    created = datetime.datetime(2024, 1, 1)
+
+    def add(table, *values):
+        writer.add(table, TABLES[table], values)
+
+    # Benutzer: zuerst Controller, dann Lehrpersonen
+    controllers = list(range(1, size["controllers"] + 1))
+    for user_id in controllers:
+        add(
+            "User",
+            user_id,
+            f"controller{user_id:03d}",
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            PASSWORD_HASH,
+            False,
+            "CONTROLLER",
+            created,
+            created,
+        )
+        add("Controller", user_id, user_id)
+    teacher_users = {}
+    for teacher_id in range(1, size["teachers"] + 1):
+        user_id = size["controllers"] + teacher_id
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        username = f"{last[:3]}{first[:2]}{teacher_id:03d}".lower()
+        add(
+            "User",
+            user_id,
+            username,
+            first,
+            last,
+            PASSWORD_HASH,
+            False,
+            "TEACHER",
+            created,
+            created,
+        )
+        teacher_users[teacher_id] = user_id
+
+    for group_id in range(1, size["teaching_groups"] + 1):
+        add(
+            "TeachingGroup",
+            group_id,
+            f"Gruppe_{group_id}",
+            f"Beschreibung von Gruppe {group_id}",
+            0.0,
+        )
+    names = _semester_names(semesters)
+    for semester_id, name in enumerate(names, start=1):
+        add("SemesterPeriod", semester_id, name, semester_id == semesters)
+    for program_id, name in enumerate(PROGRAMS, start=1):
+        add("Program", program_id, name)
+        for semester_id in range(1, semesters + 1):
+            add("_ProgramToSemesterPeriod", program_id, semester_id)
+
+    supervision_types = []
+    for type_id, (name, factor, validity) in enumerate(SUPERVISION_TYPES, start=1):
+        valid_from = semesters if validity == "neu" else 1
+        add("SupervisionType", type_id, name, factor, valid_from)
+        supervision_types.append((type_id, factor, validity))
+    for type_id, name in enumerate(DISCOUNT_TYPES, start=1):
+        add("DiscountType", type_id, name)
+    for setting_id, (key, value, data_type) in enumerate(SETTINGS, start=1):
+        add("EvaluationSettings", setting_id, key, value, data_type)
+
+    counters = {"comment": 0, "duty": 0, "event": 0, "supervision": 0, "discount": 0}
+
+    def comment(date):
+        # Etwa jeder zwölfte Eintrag bekommt einen Kommentar des Controllings
+        if rng.random() >= 1 / 12:
+            return None
+        counters["comment"] += 1
+        add(
+            "Comment",
+            counters["comment"],
+            rng.choice(["Rücksprache erfolgt", "Nachweis liegt vor", "siehe E-Mail"]),
+            date,
+            rng.choice(controllers),
+        )
+        return counters["comment"]
+
+    for teacher_id, user_id in teacher_users.items():
+        duty = rng.choice([18.0, 18.0, 18.0, 16.0, 13.0, 9.0])
+        add(
+            "Teacher",
+            teacher_id,
+            user_id,
+            datetime.date(rng.randint(2026, 2045), rng.choice([3, 9]), 1),
+            duty,
+            rng.randint(1, size["teaching_groups"]),
+        )
+        for semester_id in range(1, semesters + 1):
+            date = created - datetime.timedelta(days=182 * (semesters - semester_id))
+            balance = ordered_balance = 0.0
+
+            for _ in range(rng.randint(3, 8)):
+                counters["event"] += 1
+                hours = rng.choice([0.5, 1.0, 2.0, 2.0, 2.0, 4.0, 4.0])
+                ordered = rng.random() < 0.1
+                program_id = (
+                    rng.randint(1, len(PROGRAMS)) if rng.random() < 0.8 else None
+                )
+                add(
+                    "TeachingEvent",
+                    counters["event"],
+                    f"{rng.choice(COURSES)} {rng.choice(PROGRAMS)}"
+                    f"{rng.randint(100, 599)}",
+                    semester_id,
+                    teacher_id,
+                    ordered,
+                    hours,
+                    comment(date),
+                    program_id,
+                )
+                balance += hours
+                ordered_balance += hours if ordered else 0.0
+
+            # Ab dem letzten Semester gelten die neuen Betreuungsarten
+            current = "neu" if semester_id == semesters else "alt"
+            types = [
+                entry for entry in supervision_types if entry[2] in (current, "immer")
+            ]
+            for _ in range(rng.randint(0, 6)):
+                counters["supervision"] += 1
+                type_id, factor, _ = rng.choice(types)
+                share = rng.choice([1.0, 1.0, 1.0, 0.5, None])
+                add(
+                    "Supervision",
+                    counters["supervision"],
+                    rng.randint(1_000_000, 9_999_999),
+                    share,
+                    semester_id,
+                    type_id,
+                    teacher_id,
+                    comment(date),
+                )
+                balance += factor * (share if share is not None else 1.0)
+
+            if rng.random() < 0.3:
+                for _ in range(rng.randint(1, 2)):
+                    counters["discount"] += 1
+                    scope = rng.choice([1.0, 2.0, 2.0, 4.0])
+                    ordered = rng.random() < 0.2
+                    add(
+                        "Discount",
+                        counters["discount"],
+                        rng.randint(1, len(DISCOUNT_TYPES)),
+                        semester_id,
+                        teacher_id,
+                        ordered,
+                        date,
+                        rng.choice(["Dekanat", "Präsidium"]),
+                        comment(date),
+                        rng.choice(["Studiengangsleitung", "Forschungsprojekt", "§ 6"]),
+                        scope,
+                    )
+                    balance += scope
+                    ordered_balance += scope if ordered else 0.0
+
+            counters["duty"] += 1
+            add(
+                "TeachingDutyPerSemester",
+                counters["duty"],
+                duty,
+                round(balance - duty, 2),
+                round(ordered_balance, 2),
+                semester_id,
+                teacher_id,
+            )
+    return size
+
+
+def _database_has_data(mysql_command):
+    rows = list(
+        mysql_query_rows(
+            mysql_command,
+            "SELECT (SELECT COUNT(*) FROM `User`) + (SELECT COUNT(*) FROM "
+            "`SemesterPeriod`) + (SELECT COUNT(*) FROM `Teacher`)",
+            error_class=DatasetError,
+        )
+    )
+    return bool(rows and rows[0][0] not in (None, "0"))
+
+
+def write_dataset(
+    mysql_command=None,
+    scale=1.0,
+    seed=SEED,
+    semesters=SEMESTERS,
+    output=None,
+    file_format="sql",
+    replace=False,
+):
+    """
+    Erzeugt einen Testdatensatz und spielt ihn über den mysql-Client aus
+    'mysql_command' ein oder schreibt ihn mit 'output' als SQL-Skript
+    (.sql/.sql.gz) bzw. als CSV-Dateien je Tabelle in ein Verzeichnis. Beim
+    Einspielen muss die Datenbank leer sein, mit 'replace' werden alle
+    vorhandenen Daten vorher gelöscht.
+    Gibt eine Zusammenfassung mit Zeilen pro Sekunde zurück.
+    """
+    if file_format not in ("sql", "csv"):
+        raise DatasetError(f"Unbekanntes Format: {file_format}")
+    if scale <= 0 or semesters < 1:
+        raise DatasetError("Skalierung und Semesterzahl müssen positiv sein")
+    if file_format == "csv" and output is None:
+        raise DatasetError("CSV braucht ein Ausgabeverzeichnis")
+    if output is None and not replace and _database_has_data(mysql_command):
+        raise DatasetError(
+            "Datenbank enthält bereits Daten (--replace löscht sie vorher)"
+        )
+
+    start = time.monotonic()
+    if file_format == "csv":
+        writer = _CsvTableWriter(output)
+        size = generate_dataset(writer, scale, seed, semesters)
+        writer.flush()
+    else:
+        with mysql_script_stream(mysql_command, output, DatasetError) as stream:
+            stream.write("SET NAMES utf8mb4;\nSET autocommit = 0;\n")
+            # Der Datensatz ist in sich konsistent; die Prüfungen je Zeile
+            # kosten beim Einspielen nur Zeit
+            stream.write("SET foreign_key_checks = 0;\nSET unique_checks = 0;\n")
+            stream.write("START TRANSACTION;\n")
+            if replace:
+                for table in reversed(TABLES):
+                    stream.write(f"DELETE FROM `{table}`;\n")
+            writer = SqlBatchWriter(stream)
+            size = generate_dataset(writer, scale, seed, semesters)
+            writer.flush()
+            stream.write("COMMIT;\nSET foreign_key_checks = 1;\n")
+
+    seconds = time.monotonic() - start
+    return dict(
+        size,
+        output=output,
+        rows=writer.rows,
+        seconds=round(seconds, 2),
+        rows_per_second=round(writer.rows / max(seconds, 0.001)),
+    )
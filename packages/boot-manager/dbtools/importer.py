@@ -0,0 +1,490 @@
+"""
+Massenimport von CSV-/XLSX-Dateien in die Prisma-Tabellen: Zuordnung der
+Spalten, Prüfung je Zeile, abgelehnte Zeilen in '<Datei>.rejects.csv' und ein
+einziges SQL-Skript für alle angenommenen Zeilen.
+"""
+
+import csv
+import datetime
+import math
+import os
+import re
+import subprocess
+import time
+
+from dbtools.mysql import SqlBatchWriter, mysql_script_stream
+
+MAX_STRING = 191  # Prisma legt String als VARCHAR(191) an
+
+
+class BulkImportError(Exception):
+    """
+    Datei nicht importierbar (Tabelle unbekannt, Spalten fehlen, Datenbankfehler).
+    """
+
+
+# Importierbare Prisma-Modelle: Spalte -> (Typ, Pflichtfeld, referenzierter
+# Schlüssel (Tabelle, Spalte) oder None). Die Reihenfolge ist zugleich die
+# Import-Reihenfolge, damit Lehrpersonen vor ihren Einträgen angelegt werden.
+IMPORT_MODELS = {
+    "Teacher": {
+        "id": ("int", False, None),
+        "userId": ("int", True, ("User", "id")),
+        "retirementDate": ("date", True, None),
+        "totalTeachingDuty": ("float", True, None),
+        "teachingGroupId": ("int", True, ("TeachingGroup", "id")),
+    },
+    "TeachingDutyPerSemester": {
+        "id": ("int", False, None),
+        "individualDuty": ("float", True, None),
+        "sumBalance": ("float", True, None),
+        "sumOrderedBalance": ("float", True, None),
+        "semesterPeriodId": ("int", True, ("SemesterPeriod", "id")),
+        "teacherId": ("int", True, ("Teacher", "id")),
+    },
+    "TeachingEvent": {
+        "id": ("int", False, None),
+        "name": ("str", True, None),
+        "semesterPeriodId": ("int", True, ("SemesterPeriod", "id")),
+        "teacherId": ("int", True, ("Teacher", "id")),
+        "ordered": ("bool", True, None),
+        "hours": ("float", True, None),
+        "commentId": ("int", False, ("Comment", "commentId")),
+        "programId": ("int", False, ("Program", "id")),
+    },
+    "Supervision": {
+        "id": ("int", False, None),
+        "studentId": ("int", True, None),
+        "supervisionShare": ("float", False, None),
+        "semesterPeriodId": ("int", True, ("SemesterPeriod", "id")),
+        "supervisionTypeId": (
+            "int",
+            True,
+            ("SupervisionType", "typeOfSupervisionId"),
+        ),
+        "teacherId": ("int", True, ("Teacher", "id")),
+        "commentId": ("int", False, ("Comment", "commentId")),
+    },
+    "Discount": {
+        "id": ("int", False, None),
+        "discountTypeId": ("int", True, ("DiscountType", "discountTypeId")),
+        "semesterPeriodId": ("int", True, ("SemesterPeriod", "id")),
+        "teacherId": ("int", True, ("Teacher", "id")),
+        "ordered": ("bool", True, None),
+        "approvalDate": ("datetime", True, None),
+        "supervisor": ("str", True, None),
+        "commentId": ("int", False, ("Comment", "commentId")),
+        "description": ("str", True, None),
+        "scope": ("float", True, None),
+    },
+}
+
+# Eindeutige Schlüssel außer 'id' (Teacher.userId ist @unique, je Semester und
+# Lehrperson gibt es nur eine Deputatsmeldung)
+IMPORT_UNIQUE_KEYS = {
+    "Teacher": [("userId",)],
+    "TeachingDutyPerSemester": [("semesterPeriodId", "teacherId")],
+}
+
+
+def _parse_int(value):
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)  # XLSX liefert Zahlen als float
+    if isinstance(value, int):
+        return value
+    return int(str(value).strip())
+
+
+def _parse_float(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+    else:
+        number = float(str(value).strip().replace(",", "."))
+    if not math.isfinite(number):
+        raise ValueError(value)
+    return number
+
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "wahr", "ja", "x"):
+        return True
+    if text in ("0", "false", "falsch", "nein"):
+        return False
+    raise ValueError(value)
+
+
+def _parse_datetime(value):
+    if isinstance(value, datetime.datetime):
+        parsed = value
+    elif isinstance(value, datetime.date):
+        parsed = datetime.datetime.combine(value, datetime.time())
+    else:
+        text = str(value).strip()
+        for date_format in ("%d.%m.%Y", "%d.%m.%Y %H:%M"):
+            try:
+                return datetime.datetime.strptime(text, date_format)
+            except ValueError:
+                pass
+        parsed = datetime.datetime.fromisoformat(text)
+    if parsed.tzinfo is not None:
+        # Prisma speichert DateTime in UTC
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _parse_date(value):
+    return _parse_datetime(value).date()
+
+
+def _parse_str(value):
+    text = str(value).strip()
+    if len(text) > MAX_STRING:
+        raise ValueError(f"länger als {MAX_STRING} Zeichen")
+    return text
+
+
+# Typ -> (Umwandlung, Bezeichnung für Fehlermeldungen)
+IMPORT_PARSERS = {
+    "int": (_parse_int, "ganze Zahl"),
+    "float": (_parse_float, "Zahl"),
+    "bool": (_parse_bool, "Wahrheitswert (ja/nein)"),
+    "datetime": (_parse_datetime, "Zeitpunkt (TT.MM.JJJJ oder ISO 8601)"),
+    "date": (_parse_date, "Datum (TT.MM.JJJJ oder JJJJ-MM-TT)"),
+    "str": (_parse_str, "Text"),
+}
+
+
+def _csv_lines(path, progress):
+    """
+    Liest die Datei zeilenweise als Bytes (meldet dabei den Fortschritt) und
+    dekodiert UTF-8 mit oder ohne BOM.
+    """
+    with open(path, "rb") as file:
+        first = True
+        for line in file:
+            if progress is not None:
+                progress.add(len(line))
+            if first:
+                line = line.removeprefix(b"\xef\xbb\xbf")
+                first = False
+            yield line.decode("utf-8")
+
+
+def _detect_delimiter(path):
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as file:
+        header = file.readline()
+    return max(";,\t", key=header.count)
+
+
+def iter_import_rows(path, progress=None):
+    """
+    Liefert die Zeilen einer CSV- oder XLSX-Datei als Listen, die erste ist die
+    Kopfzeile. XLSX wird mit openpyxl im Nur-Lese-Modus gestreamt, ohne die
+    Arbeitsmappe vollständig zu laden.
+    """
+    if path.lower().endswith(".xlsx"):
+        import openpyxl  # nur für XLSX laden
+
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            for row in workbook.active.iter_rows(values_only=True):
+                yield ["" if cell is None else cell for cell in row]
+        finally:
+            workbook.close()
+        if progress is not None:
+            progress.add(os.path.getsize(path))
+        return
+    yield from csv.reader(_csv_lines(path, progress), delimiter=_detect_delimiter(path))
+
+
+def detect_import_table(path, header):
+    """
+    Bestimmt das Prisma-Modell einer Datei: zuerst über den Dateinamen
+    (z. B. 'TeachingEvent.csv'), sonst über die Spalten der Kopfzeile.
+    """
+    stem = re.sub(r"[^a-z]", "", os.path.basename(path).rsplit(".", 1)[0].lower())
+    for table in IMPORT_MODELS:
+        if stem.startswith(table.lower()):
+            return table
+    columns = {str(name).strip().lower() for name in header if str(name).strip()}
+    matches = [
+        table
+        for table, model in IMPORT_MODELS.items()
+        if columns <= {column.lower() for column in model}
+        and all(
+            column.lower() in columns
+            for column, (_, required, _) in model.items()
+            if required
+        )
+    ]
+    if len(matches) != 1:
+        raise BulkImportError(
+            f"{os.path.basename(path)}: Tabelle nicht erkennbar "
+            f"(Dateiname wie {', '.join(IMPORT_MODELS)} oder Tabelle angeben)"
+        )
+    return matches[0]
+
+
+def map_import_columns(table, header):
+    """
+    Ordnet die Kopfzeile (Groß-/Kleinschreibung egal) den Spalten des Modells zu.
+    Gibt [(Position in der Zeile, Spalte)] zurück.
+    """
+    model = IMPORT_MODELS[table]
+    by_lower = {column.lower(): column for column in model}
+    mapping = []
+    for index, name in enumerate(header):
+        name = str(name).strip()
+        if not name:
+            continue
+        if name.lower() not in by_lower:
+            raise BulkImportError(f"{table}: unbekannte Spalte '{name}'")
+        mapping.append((index, by_lower[name.lower()]))
+    present = {column for _, column in mapping}
+    missing = [
+        column
+        for column, (_, required, _) in model.items()
+        if required and column not in present
+    ]
+    if missing:
+        raise BulkImportError(f"{table}: Spalten fehlen: {', '.join(missing)}")
+    return mapping
+
+
+def import_key_checks(table):
+    """
+    Gibt die Schlüssel zurück, die für Zeilen von 'table' geprüft werden:
+    [(Tabelle, (Spalten,))] für referenzierte und eindeutige Schlüssel.
+    """
+    keys = [(table, ("id",))]
+    keys += [(table, columns) for columns in IMPORT_UNIQUE_KEYS.get(table, [])]
+    keys += [
+        (reference[0], (reference[1],))
+        for _, _, reference in IMPORT_MODELS[table].values()
+        if reference is not None
+    ]
+    return keys
+
+
+def fetch_existing_keys(mysql_command, keys):
+    """
+    Liest die vorhandenen Werte der Schlüssel [(Tabelle, (Spalten,))] in einer
+    einzigen Abfrage. Gibt {(Tabelle, Spalten): {"1", "2,7", ...}} zurück.
+    """
+    keys = list(dict.fromkeys(keys))
+    existing = {key: set() for key in keys}
+    if not keys:
+        return existing
+    query = " UNION ALL ".join(
+        f"SELECT {index}, CONCAT_WS(',', "
+        f"{', '.join(f'`{column}`' for column in columns)}) FROM `{table}`"
+        for index, (table, columns) in enumerate(keys)
+    )
+    result = subprocess.run(
+        mysql_command("-N", "-B", "-e", query),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise BulkImportError(result.stderr.strip() or "Schlüssel nicht abrufbar")
+    for line in result.stdout.splitlines():
+        index, _, value = line.partition("\t")
+        existing[keys[int(index)]].add(value)
+    return existing
+
+
+def validate_import_row(table, mapping, row, existing):
+    """
+    Wandelt eine Zeile in Werte für das Modell um und prüft Pflichtfelder,
+    Typen, Referenzen und eindeutige Schlüssel. 'existing' ist None (keine
+    Schlüsselprüfung) oder die Ausgabe von fetch_existing_keys; angenommene
+    Zeilen werden dort eingetragen. Gibt {Spalte: Wert} zurück oder wirft
+    ValueError mit allen Fehlern der Zeile.
+    """
+    model = IMPORT_MODELS[table]
+    values = {}
+    errors = []
+    for index, column in mapping:
+        kind, required, reference = model[column]
+        raw = row[index] if index < len(row) else ""
+        if raw is None or (isinstance(raw, str) and not raw.strip()):
+            if required:
+                errors.append(f"{column}: fehlt")
+            values[column] = None
+            continue
+        parse, expected = IMPORT_PARSERS[kind]
+        try:
+            values[column] = parse(raw)
+        except ValueError as e:
+            errors.append(f"{column}: {e if kind == 'str' else f'{expected} erwartet'}")
+            continue
+        if existing is not None and reference is not None:
+            if str(values[column]) not in existing[(reference[0], (reference[1],))]:
+                errors.append(f"{column}: {reference[0]} {values[column]} fehlt")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    if existing is not None:
+        new_keys = []
+        for columns in [("id",)] + IMPORT_UNIQUE_KEYS.get(table, []):
+            if any(values.get(column) is None for column in columns):
+                continue
+            key = ",".join(str(values[column]) for column in columns)
+            if key in existing[(table, columns)]:
+                errors.append(f"{'/'.join(columns)} {key} existiert bereits")
+            new_keys.append(((table, columns), key))
+        if errors:
+            raise ValueError("; ".join(errors))
+        for key, value in new_keys:
+            existing[key].add(value)
+    return values
+
+
+class _RejectWriter:
+    """
+    Schreibt abgelehnte Zeilen mit Zeilennummer und Fehler nach
+    '<Datei>.rejects.csv'; die Datei entsteht erst bei der ersten Ablehnung.
+    """
+
+    def __init__(self, path, header):
+        self.path = f"{path.rsplit('.', 1)[0]}.rejects.csv"
+        self.header = header
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def add(self, line_number, error, row):
+        if self._file is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8-sig")
+            self._writer = csv.writer(self._file, delimiter=";")
+            self._writer.writerow(["zeile", "fehler"] + list(self.header))
+        self._writer.writerow([line_number, error] + list(row))
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _import_file(path, table, writer, existing, progress):
+    """
+    Validiert eine Datei zeilenweise und übergibt die angenommenen Zeilen dem
+    SqlBatchWriter 'writer'.
+    """
+    start = time.monotonic()
+    rows = iter_import_rows(path, progress)
+    header = next(rows, None)
+    if header is None:
+        raise BulkImportError(f"{os.path.basename(path)}: Datei ist leer")
+    table = table or detect_import_table(path, header)
+    mapping = map_import_columns(table, header)
+    present = {column for _, column in mapping}
+    columns = [column for column in IMPORT_MODELS[table] if column in present]
+    rejects = _RejectWriter(path, header)
+    imported = 0
+    try:
+        # Zeilennummern wie in Excel: Kopfzeile = 1
+        for line_number, row in enumerate(rows, start=2):
+            if not any(str(cell).strip() for cell in row):
+                continue
+            try:
+                values = validate_import_row(table, mapping, row, existing)
+            except ValueError as e:
+                rejects.add(line_number, str(e), row)
+                continue
+            writer.add(table, columns, [values[column] for column in columns])
+            imported += 1
+        writer.flush()
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise BulkImportError(f"{os.path.basename(path)}: {e}") from e
+    finally:
+        rejects.close()
+    return {
+        "file": path,
+        "table": table,
+        "rows": imported,
+        "rejected": rejects.count,
+        "rejects_file": rejects.path if rejects.count else None,
+        "seconds": round(time.monotonic() - start, 3),
+    }
+
+
+def _sort_import_files(paths, table=None):
+    """
+    Sortiert die Dateien in Import-Reihenfolge der Modelle (soweit am Dateinamen
+    erkennbar); unbekannte bleiben in ihrer Reihenfolge am Ende.
+    """
+    order = list(IMPORT_MODELS)
+
+    def position(path):
+        stem = re.sub(r"[^a-z]", "", os.path.basename(path).lower())
+        for index, name in enumerate(order):
+            if table == name or (table is None and stem.startswith(name.lower())):
+                return index
+        return len(order)
+
+    return sorted(paths, key=position)
+
+
+def bulk_import(
+    paths,
+    mysql_command,
+    table=None,
+    sql_output=None,
+    check_keys=True,
+    progress=None,
+    on_status=None,
+    on_file_done=None,
+):
+    """
+    Importiert CSV-/XLSX-Dateien über den mysql-Client aus 'mysql_command'. Alle
+    Dateien laufen in einer einzigen Transaktion: Entweder werden alle
+    angenommenen Zeilen übernommen oder keine. Zeilen mit Fehlern werden nicht
+    importiert, sondern je Datei in '<Datei>.rejects.csv' abgelegt. Mit
+    'sql_output' wird das SQL in eine Datei geschrieben statt eingespielt.
+    'progress' (mit add(Bytes)) zählt die gelesenen Bytes, 'on_status' erhält
+    eine Meldung vor jeder Datei und 'on_file_done' deren Ergebnis.
+    Gibt eine Zusammenfassung mit Zeilen pro Sekunde zurück.
+    """
+    paths = _sort_import_files(paths, table)
+    existing = None
+    if check_keys:
+        tables = []
+        for path in paths:
+            rows = iter_import_rows(path)
+            try:
+                tables.append(table or detect_import_table(path, next(rows, [])))
+            finally:
+                rows.close()
+        existing = fetch_existing_keys(
+            mysql_command, [key for name in tables for key in import_key_checks(name)]
+        )
+
+    start = time.monotonic()
+    files = []
+    with mysql_script_stream(mysql_command, sql_output, BulkImportError) as stream:
+        stream.write("SET NAMES utf8mb4;\nSET autocommit = 0;\nSTART TRANSACTION;\n")
+        writer = SqlBatchWriter(stream)
+        for path in paths:
+            if on_status is not None:
+                on_status(f"Importiere {os.path.basename(path)}...")
+            result = _import_file(path, table, writer, existing, progress)
+            files.append(result)
+            if on_file_done is not None:
+                on_file_done(result)
+        stream.write("COMMIT;\n")
+
+    seconds = time.monotonic() - start
+    rows = sum(result["rows"] for result in files)
+    return {
+        "files": files,
+        "rows": rows,
+        "rejected": sum(result["rejected"] for result in files),
+        "seconds": round(seconds, 2),
+        "rows_per_second": round(rows / max(seconds, 0.001)),
+    }
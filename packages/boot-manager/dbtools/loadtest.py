@@ -0,0 +1,474 @@
+"""
+Lasttest gegen die API: asyncio-Lastgenerator mit virtuellen Benutzern,
+gewichteten Szenarien, geschlossenem oder offenem Lastmodell und Latenz-
+Perzentilen je Endpunkt.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+from urllib.parse import urlsplit
+
+from dbtools.mysql import MysqlError, mysql_query_rows
+
+REQUEST_TIMEOUT = 30
+
+
+class LoadTestError(Exception):
+    """
+    Fehler beim Vorbereiten oder Ausführen eines Lasttests.
+    """
+
+
+class AsyncHttpConnection:
+    """
+    Schlanker HTTP/1.1-Client auf asyncio-Streams mit einer Keep-Alive-Verbindung.
+    Die Lastgeneratoren brauchen Tausende Anfragen pro Sekunde aus einem Thread;
+    requests würde dafür einen Thread pro gleichzeitiger Anfrage belegen.
+    """
+
+    def __init__(self, base_url, timeout=REQUEST_TIMEOUT):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise LoadTestError(f"Ungültige URL: {base_url}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = parts.scheme == "https"
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method, path, headers=None, body=None):
+        """
+        Sendet eine Anfrage und gibt (Status, Body als Bytes) zurück. Hat der
+        Server die ruhende Verbindung inzwischen geschlossen, wird einmal neu
+        verbunden.
+        """
+        reused = self._writer is not None
+        try:
+            return await asyncio.wait_for(
+                self._exchange(method, path, headers, body), self.timeout
+            )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+        return await asyncio.wait_for(
+            self._exchange(method, path, headers, body), self.timeout
+        )
+
+    async def _exchange(self, method, path, headers, body):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port, ssl=self.ssl or None
+            )
+        lines = [
+            f"{method} {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json",
+        ]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        if body is not None:
+            lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body is not None:
+            self._writer.write(body)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError("Verbindung vom Server geschlossen")
+        try:
+            status = int(status_line.split(None, 2)[1])
+        except (IndexError, ValueError):
+            raise ConnectionError(f"Ungültige Statuszeile: {status_line!r}") from None
+        response_headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in response_headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readline()
+            data = b"".join(chunks)
+        elif "content-length" in response_headers:
+            data = await self._reader.readexactly(
+                int(response_headers["content-length"])
+            )
+        else:
+            data = await self._reader.read()
+            self.close()
+        if response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, data
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+class LoadTestStats:
+    """
+    Sammelt Latenzen, Statuscodes und Fehler je Endpunkt ("GET /semester").
+    Alle Aufrufe kommen aus der Event-Loop, daher ohne Sperren.
+    """
+
+    def __init__(self, progress=None):
+        self.endpoints = {}
+        self.progress = progress
+        self.requests = 0
+        self.errors = 0
+        self.iterations = {}
+        self.dropped = 0
+
+    def record(self, endpoint, ms, status=None, num_bytes=0, error=None):
+        entry = self.endpoints.setdefault(
+            endpoint, {"latencies": [], "errors": 0, "statuses": {}, "messages": {}}
+        )
+        entry["latencies"].append(ms)
+        self.requests += 1
+        if status is not None:
+            entry["statuses"][str(status)] = entry["statuses"].get(str(status), 0) + 1
+        if error is not None or status is None or status >= 400:
+            entry["errors"] += 1
+            self.errors += 1
+            message = error or f"HTTP {status}"
+            entry["messages"][message] = entry["messages"].get(message, 0) + 1
+        if self.progress is not None:
+            self.progress.add(num_bytes)
+
+    def report(self, seconds):
+        """
+        Fasst die Messwerte je Endpunkt zusammen: Anzahl, Durchsatz, Fehlerquote
+        und Perzentile (nächster Rang) der Latenz in Millisekunden.
+        """
+        endpoints = {}
+        for endpoint, entry in sorted(self.endpoints.items()):
+            latencies = sorted(entry["latencies"])
+            count = len(latencies)
+            endpoints[endpoint] = {
+                "requests": count,
+                "errors": entry["errors"],
+                "error_rate": round(entry["errors"] / count, 4),
+                "requests_per_second": round(count / max(seconds, 0.001), 1),
+                "mean_ms": round(sum(latencies) / count, 1),
+                "p50_ms": round(latency_percentile(latencies, 50), 1),
+                "p95_ms": round(latency_percentile(latencies, 95), 1),
+                "p99_ms": round(latency_percentile(latencies, 99), 1),
+                "max_ms": round(latencies[-1], 1),
+                "statuses": entry["statuses"],
+                "error_messages": entry["messages"],
+            }
+        return endpoints
+
+
+def latency_percentile(sorted_values, percent):
+    """
+    Perzentil nach dem Verfahren des nächsten Rangs (Werte müssen sortiert sein).
+    """
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class VirtualUser:
+    """
+    Ein angemeldeter Benutzer mit eigener Verbindung, der Szenarien abarbeitet.
+    """
+
+    def __init__(self, base_url, token, stats, rng):
+        self.connection = AsyncHttpConnection(base_url)
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.stats = stats
+        self.rng = rng
+        # Geplanter Startzeitpunkt im Raten-Modus: Wartezeit auf einen freien
+        # Benutzer zählt zur Latenz, sonst schönt ein überlasteter Server die Werte
+        self.scheduled_at = None
+
+    async def request(self, method, path, payload=None):
+        """
+        Führt eine Anfrage aus, misst sie und gibt den JSON-Body zurück (None bei
+        Fehlern).
+        """
+        started = self.scheduled_at or time.perf_counter()
+        self.scheduled_at = None
+        endpoint = f"{method} {path.split('?')[0]}"
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        try:
+            status, data = await self.connection.request(
+                method, path, self.headers, body
+            )
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            self.connection.close()
+            self.stats.record(
+                endpoint,
+                (time.perf_counter() - started) * 1000,
+                error=str(e) or type(e).__name__,
+            )
+            return None
+        self.stats.record(
+            endpoint, (time.perf_counter() - started) * 1000, status, len(data)
+        )
+        if status >= 400:
+            return None
+        try:
+            return json.loads(data) if data else None
+        except ValueError:
+            return None
+
+
+async def scenario_semester_list(user):
+    """
+    Semesterauswahl: Liste aller Semester laden.
+    """
+    await user.request("GET", "/semester")
+
+
+async def scenario_teacher_dashboard(user):
+    """
+    Übersicht der Lehrpersonen: Profil, Lehrpersonen und Deputate wie die
+    Auswertungsseite der Web-Oberfläche.
+    """
+    await user.request("GET", "/auth/profile")
+    await user.request("GET", "/teacher")
+    await user.request("GET", "/teachingDuty")
+
+
+async def scenario_deputat_report(user):
+    """
+    Deputatsmeldung: Deputate laden und eines davon mit unverändertem Wert
+    speichern (PUT wie die Deputat-Seite), damit wiederholte Läufe keine Daten
+    verändern.
+    """
+    duties = await user.request("GET", "/teachingDuty")
+    if not isinstance(duties, list) or not duties:
+        return
+    duty = user.rng.choice(duties)
+    await user.request(
+        "PUT",
+        "/teachingDuty",
+        {"id": duty.get("id"), "individualDuty": duty.get("individualDuty")},
+    )
+
+
+# Szenario -> (Funktion, Gewicht); die Gewichte bilden den typischen Mix zum
+# Semesterende nach: viel Lesen, wenige Meldungen
+SCENARIOS = {
+    "semester_list": (scenario_semester_list, 5),
+    "teacher_dashboard": (scenario_teacher_dashboard, 4),
+    "deputat_report": (scenario_deputat_report, 1),
+}
+
+
+def get_load_test_users(mysql_command, count):
+    """
+    Liest die Benutzernamen der ersten 'count' Controller aus der Datenbank
+    (z. B. controller001 aus dem Testdatensatz). Die lesenden und schreibenden
+    Endpunkte der API sind nur für Controller freigegeben.
+    """
+    query = (
+        "SELECT username FROM `User` WHERE role = 'CONTROLLER' "
+        f"ORDER BY id LIMIT {int(count)}"
+    )
+    try:
+        users = [row[0] for row in mysql_query_rows(mysql_command, query)]
+    except MysqlError as e:
+        raise LoadTestError(f"Benutzer konnten nicht gelesen werden: {e}") from e
+    if not users:
+        raise LoadTestError("Keine Controller in der Datenbank (db generate?)")
+    return users
+
+
+def get_access_token(data):
+    """
+    Liest das JWT aus der Antwort von /auth/login (None, wenn keines enthalten ist).
+    """
+    if isinstance(data, dict):
+        for key in ("access_token", "accessToken", "token"):
+            if isinstance(data.get(key), str):
+                return data[key]
+    return None
+
+
+async def _login_users(base_url, users, password, stats):
+    """
+    Meldet alle Benutzer gleichzeitig über /auth/login an und gibt die Tokens
+    zurück (fehlgeschlagene Anmeldungen fehlen).
+    """
+
+    async def login(username):
+        connection = AsyncHttpConnection(base_url)
+        body = json.dumps({"username": username, "password": password}).encode()
+        started = time.perf_counter()
+        try:
+            status, data = await connection.request("POST", "/auth/login", body=body)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            stats.record(
+                "POST /auth/login",
+                (time.perf_counter() - started) * 1000,
+                error=str(e) or type(e).__name__,
+            )
+            return None
+        finally:
+            connection.close()
+        stats.record("POST /auth/login", (time.perf_counter() - started) * 1000, status)
+        try:
+            return get_access_token(json.loads(data)) if status < 400 else None
+        except ValueError:
+            return None
+
+    tokens = await asyncio.gather(*(login(username) for username in users))
+    return [token for token in tokens if token]
+
+
+async def _drive_load(
+    base_url, tokens, scenarios, concurrency, rate, duration, seed, stats
+):
+    """
+    Lässt 'concurrency' virtuelle Benutzer 'duration' Sekunden lang Szenarien
+    ausführen: ohne 'rate' so schnell wie möglich hintereinander (geschlossenes
+    Modell), mit 'rate' startet ein Taktgeber 'rate' Szenarien pro Sekunde
+    (offenes Modell, begrenzt durch die Zahl der Benutzer).
+    """
+    names = list(scenarios)
+    weights = [SCENARIOS[name][1] for name in names]
+    users = [
+        VirtualUser(base_url, tokens[i % len(tokens)], stats, random.Random(seed + i))
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def run_scenario(user, name):
+        await SCENARIOS[name][0](user)
+        stats.iterations[name] = stats.iterations.get(name, 0) + 1
+
+    try:
+        if rate is None:
+
+            async def closed_loop(user):
+                while time.perf_counter() < deadline:
+                    await run_scenario(user, user.rng.choices(names, weights)[0])
+
+            await asyncio.gather(*(closed_loop(user) for user in users))
+            return
+
+        idle = asyncio.Queue()
+        for user in users:
+            idle.put_nowait(user)
+
+        async def open_iteration(scheduled_at, name):
+            user = await idle.get()
+            try:
+                if time.perf_counter() >= deadline:
+                    stats.dropped += 1
+                    return
+                user.scheduled_at = scheduled_at
+                await run_scenario(user, name)
+            finally:
+                idle.put_nowait(user)
+
+        rng = random.Random(seed)
+        tasks = []
+        number = 0
+        while True:
+            scheduled_at = started + number / rate
+            if scheduled_at >= deadline:
+                break
+            await asyncio.sleep(max(scheduled_at - time.perf_counter(), 0))
+            tasks.append(
+                asyncio.ensure_future(
+                    open_iteration(scheduled_at, rng.choices(names, weights)[0])
+                )
+            )
+            number += 1
+        await asyncio.gather(*tasks)
+    finally:
+        for user in users:
+            user.connection.close()
+
+
+def run_load_test(
+    base_url,
+    users,
+    password,
+    concurrency,
+    duration,
+    rate=None,
+    scenarios=None,
+    seed=0,
+    max_error_rate=0.0,
+    progress=None,
+    on_status=None,
+):
+    """
+    Lasttest gegen 'base_url': meldet 'users' mit 'password' über /auth/login an
+    und treibt mit asyncio die Szenarien aus SCENARIOS mit fester Parallelität
+    oder fester Rate (Szenarien pro Sekunde). 'progress' (mit add(Bytes)) zählt
+    die empfangenen Bytes, 'on_status' erhält eine Meldung nach der Anmeldung.
+    Gibt einen Bericht mit Durchsatz, Fehlerquote und p50/p95/p99 je Endpunkt
+    zurück; "ok" ist falsch, wenn die Fehlerquote 'max_error_rate' übersteigt.
+    """
+    scenarios = list(scenarios or SCENARIOS)
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise LoadTestError(
+            f"Unbekannte Szenarien: {', '.join(unknown)} "
+            f"(verfügbar: {', '.join(SCENARIOS)})"
+        )
+    if concurrency < 1 or duration <= 0 or (rate is not None and rate <= 0):
+        raise LoadTestError("Parallelität, Dauer und Rate müssen positiv sein")
+
+    login_stats = LoadTestStats()
+    stats = LoadTestStats(progress)
+    login_started = time.perf_counter()
+    tokens = asyncio.run(_login_users(base_url, users, password, login_stats))
+    login_seconds = time.perf_counter() - login_started
+    if not tokens:
+        raise LoadTestError(
+            f"Keiner der {len(users)} Benutzer konnte sich anmelden ({base_url})"
+        )
+    if on_status is not None:
+        on_status(f"Lasttest läuft ({len(tokens)} Benutzer, {duration:g} s)...")
+    started = time.perf_counter()
+    asyncio.run(
+        _drive_load(
+            base_url, tokens, scenarios, concurrency, rate, duration, seed, stats
+        )
+    )
+    seconds = time.perf_counter() - started
+
+    error_rate = stats.errors / max(stats.requests, 1)
+    return {
+        "ok": stats.requests > 0 and error_rate <= max_error_rate,
+        "base_url": base_url,
+        "mode": "closed" if rate is None else "open",
+        "concurrency": concurrency,
+        "rate": rate,
+        "duration_s": duration,
+        "seconds": round(seconds, 2),
+        "users": len(users),
+        "logged_in": len(tokens),
+        "login": login_stats.report(login_seconds).get("POST /auth/login"),
+        "requests": stats.requests,
+        "errors": stats.errors,
+        "error_rate": round(error_rate, 4),
+        "requests_per_second": round(stats.requests / max(seconds, 0.001), 1),
+        "iterations": stats.iterations,
+        "dropped_iterations": stats.dropped,
+        "endpoints": stats.report(seconds),
+    }
@@ -0,0 +1,186 @@
+"""
+Gemeinsame MySQL-Helfer: Literale, gebündelte INSERTs, SQL-Skripte an den
+mysql-Client streamen und Abfrageergebnisse zeilenweise lesen.
+"""
+
+import datetime
+import gzip
+import io
+import os
+import re
+import subprocess
+import tempfile
+from contextlib import contextmanager
+
+BATCH_ROWS = 1000  # Zeilen je INSERT-Anweisung
+
+
+class MysqlError(Exception):
+    """
+    mysql im db-Container hat einen Fehler gemeldet.
+    """
+
+
+_SQL_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "'": "\\'", "\0": "\\0", "\n": "\\n", "\r": "\\r", "\x1a": "\\Z"}
+)
+
+
+def sql_literal(value):
+    """
+    Formatiert einen Python-Wert als MySQL-Literal.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime.datetime):
+        return f"'{value.isoformat(sep=' ', timespec='milliseconds')}'"
+    if isinstance(value, datetime.date):
+        return f"'{value.isoformat()}'"
+    return "'" + str(value).translate(_SQL_ESCAPES) + "'"
+
+
+class SqlBatchWriter:
+    """
+    Sammelt Zeilen je Tabelle und Spaltenliste und schreibt sie als mehrzeilige
+    INSERTs mit je 'batch_rows' Zeilen in 'stream'.
+    """
+
+    def __init__(self, stream, batch_rows=BATCH_ROWS):
+        self.stream = stream
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self._batches = {}
+
+    def add(self, table, columns, values):
+        key = (table, tuple(columns))
+        batch = self._batches.setdefault(key, [])
+        batch.append("(" + ", ".join(sql_literal(value) for value in values) + ")")
+        if len(batch) >= self.batch_rows:
+            self._write(key)
+
+    def _write(self, key):
+        table, columns = key
+        batch = self._batches.pop(key)
+        names = ", ".join(f"`{column}`" for column in columns)
+        values = ",\n".join(batch)
+        self.stream.write(f"INSERT INTO `{table}` ({names}) VALUES\n{values};\n")
+        self.rows += len(batch)
+
+    def flush(self):
+        for key in list(self._batches):
+            self._write(key)
+
+
+def _read_stderr(file):
+    file.seek(0)
+    return file.read().decode(errors="replace").strip()
+
+
+@contextmanager
+def mysql_script_stream(mysql_command, sql_output=None, error_class=MysqlError):
+    """
+    Liefert einen Textstrom für SQL-Anweisungen: direkt in den mysql-Client aus
+    'mysql_command' oder mit 'sql_output' in eine Datei (bei '.gz' komprimiert).
+    Nach dem Block wird der Strom geschlossen und der Exit-Code von mysql
+    geprüft; bei einem Fehler im Block wird mysql abgebrochen bzw. die Datei
+    gelöscht.
+    """
+    if sql_output is not None:
+        opener = gzip.open if sql_output.endswith(".gz") else open
+        stream = opener(sql_output, "wt", encoding="utf-8", newline="\n")
+        try:
+            yield stream
+            stream.close()
+        except BaseException:
+            stream.close()
+            try:
+                os.remove(sql_output)
+            except OSError:
+                pass
+            raise
+        return
+
+    # stderr in eine Datei: Als Pipe, die erst nach stdin gelesen wird, könnte
+    # mysql beim Schreiben vieler Meldungen hängen, während hier stdin voll ist
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            mysql_command("--default-character-set=utf8mb4", interactive=True),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+        )
+        stream = io.TextIOWrapper(process.stdin, encoding="utf-8", newline="\n")
+        broken = False
+        try:
+            yield stream
+            stream.close()
+        except BrokenPipeError:
+            broken = True  # mysql hat abgebrochen, Fehlermeldung steht in stderr
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        if process.wait() != 0 or broken:
+            raise error_class(
+                "Datenbank hat die Anweisungen abgelehnt, nichts übernommen: "
+                + _read_stderr(stderr)
+            )
+
+
+_MYSQL_BATCH_ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def _unescape_batch_field(field):
+    """
+    Macht die Maskierung von 'mysql --batch' rückgängig; NULL wird zu None.
+    """
+    if field == "NULL":
+        return None
+    if "\\" not in field:
+        return field
+    return re.sub(
+        r"\\(.)", lambda m: _MYSQL_BATCH_ESCAPES.get(m.group(1), m.group(1)), field
+    )
+
+
+def mysql_query_rows(mysql_command, query, progress=None, error_class=MysqlError):
+    """
+    Führt 'query' mit 'mysql --quick --batch' aus und liefert die Ergebniszeilen
+    einzeln als Listen (None für NULL). Mit --quick holt der Client jede Zeile
+    vom Server, sobald sie gebraucht wird (mysql_use_result), statt das ganze
+    Ergebnis zu puffern; zusammen mit dem zeilenweisen Lesen hier liegt nie mehr
+    als eine Zeile im Speicher. 'progress' (mit add(Bytes)) zählt die gelesenen
+    Bytes.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            mysql_command(
+                "--quick",
+                "--batch",
+                "--skip-column-names",
+                "--default-character-set=utf8mb4",
+                "-e",
+                query,
+            ),
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+        try:
+            for line in process.stdout:
+                if progress is not None:
+                    progress.add(len(line))
+                yield [
+                    _unescape_batch_field(field)
+                    for field in line.decode("utf-8").rstrip("\n").split("\t")
+                ]
+            if process.wait() != 0:
+                raise error_class(_read_stderr(stderr))
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
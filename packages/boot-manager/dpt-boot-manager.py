@@ -1,16 +1,36 @@
+import time
+
+# Zeitpunkt des Programmstarts für das Startup-Profiling (vor allen weiteren Imports)
+_STARTUP_T0 = time.perf_counter()
+
+import argparse
 import atexit
+import copy
+import gzip
+import hashlib
+import heapq
+import http.client
+import io
+import json
+import lzma
+import math
 import os
+import queue
+import random
+import re
+import shutil
+import socket
+import struct
 import subprocess
 import sys
+import tarfile
+import tempfile
 import threading
-import time
-import tkinter as tk
 import webbrowser
-import yaml
-import requests
-import sv_ttk
-import darkdetect
-from tkinter import messagebox, ttk
+from collections import deque
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from urllib.parse import parse_qsl, urlencode
 
 # ============================================================================
 #   KONSTANTEN / GLOBALE EINSTELLUNGEN
@@ -18,6 +38,7 @@ from tkinter import messagebox, ttk
 
 # GitHub API
 GITHUB_API_BASE_URL = "https://api.github.com"
+RELEASE_API_URL = f"{GITHUB_API_BASE_URL}/repositories/861008208/releases/latest"
 
 # Versionsangabe der Anwendung (wird per CI/CD aktualisiert)
 CURRENT_VERSION = "v1.0.10"
@@ -53,6 +74,360 @@ APP_FOLDER = get_app_folder()
 # versionierte Compose-Datei (z. B. "docker-compose-1.0.0.yml").
 DOCKER_COMPOSE_FILE = os.path.join(APP_FOLDER, COMPOSE_NAME)
 
+# Konsolenausgabe: maximale Zeilenzahl im Log-Feld (älteste Zeilen werden verworfen),
+# Intervall für das gebündelte Schreiben und maximale Anzahl wartender Zeilen.
+LOG_MAX_LINES = 2000
+LOG_FLUSH_INTERVAL_MS = 50
+LOG_MAX_PENDING_LINES = 100000
+CONSOLE_TITLE = "Konsolenausgabe"
+
+# Update-Downloads: Segmentierung, Blockgröße, Wiederholungen und Timeouts
+DOWNLOAD_SEGMENTS = 4
+DOWNLOAD_MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_STATE_INTERVAL = 1024 * 1024  # Fortschritt alle 1 MB sichern
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_TIMEOUT = (10, 30)  # (Verbindungsaufbau, Lesen) in Sekunden
+
+# Release-Cache: Gültigkeit, Backoff nach Fehlern und regelmäßige Prüfung (Sekunden)
+RELEASE_CACHE_FILE = os.path.join(APP_FOLDER, "release-cache.json")
+RELEASE_CACHE_TTL = 15 * 60
+RELEASE_RECHECK_INTERVAL = 60 * 60
+RELEASE_BACKOFF_BASE = 60
+RELEASE_BACKOFF_MAX = 6 * 60 * 60
+RELEASE_REQUEST_TIMEOUT = (5, 10)
+
+# Docker: Pfad zu Docker Desktop (Windows), Timeouts der Engine API und des Starts
+DOCKER_DESKTOP_PATH = "C:\\Program Files\\Docker\\Docker\\Docker Desktop.exe"
+DOCKER_API_TIMEOUT = 5
+DOCKER_START_TIMEOUT = 300
+
+# Bereitschaft der Dienste: HTTP-Pfade für Probes, Timeouts und Timeline-Datei.
+# Die API hat keinen GET-Endpunkt ohne Anmeldung; die 401 von /auth/profile
+# zeigt, dass Nest läuft und Anfragen bis zum Guard verarbeitet.
+SERVICE_HTTP_PROBES = {
+    "api": "/auth/profile",
+    "api-proxy": "/auth/profile",
+    "web": "/",
+}
+SERVICE_PROBE_TIMEOUT = 2
+READINESS_TIMEOUT = 600
+READINESS_POLL_INTERVAL = 0.5
+# Mit Docker-Events wird nur noch als Rückfallebene gepollt; der Event-Stream
+# wird abschnittsweise abonniert, damit der Thread nach dem Warten bald endet
+READINESS_EVENT_POLL_INTERVAL = 5.0
+READINESS_EVENT_WINDOW = 5
+READINESS_TIMELINE_FILE = os.path.join(APP_FOLDER, "boot-timeline.jsonl")
+
+# Vorwärmen: lesende API-Aufrufe nach dem Start (zwei Runden: kalt, warm)
+WARMUP_DEFAULT_PATHS = "/semester, /teacher, /teachingEvent, /supervision, /discount"
+WARMUP_CONCURRENCY = 4
+WARMUP_ROUNDS = 2
+WARMUP_HTTP_TIMEOUT = 120
+WARMUP_REQUEST_TIMEOUT = (2, 30)
+WARMUP_RESULTS_FILE = os.path.join(APP_FOLDER, "warmup-latencies.jsonl")
+
+# Images: Pull-Strategien, Digest-Cache und Docker-Hub-Registry
+PULL_POLICIES = ("always", "missing", "if-digest-changed")
+IMAGE_DIGEST_CACHE_FILE = os.path.join(APP_FOLDER, "image-digests.json")
+DOCKER_HUB_AUTH_URL = "https://auth.docker.io/token"
+DOCKER_HUB_REGISTRY_URL = "https://registry-1.docker.io"
+REGISTRY_TIMEOUT = (5, 10)
+MANIFEST_MEDIA_TYPES = (
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+)
+
+# Bereich der Compose-Datei für Einstellungen des Boot Managers (von Compose ignoriert)
+BOOT_SETTINGS_KEY = "x-boot-manager"
+
+# Ausgabedatei für --profile-startup
+STARTUP_PROFILE_FILE = os.path.join(APP_FOLDER, "startup-profile.json")
+
+# Datei mit den SHA-256-Prüfsummen der Release-Assets (wird per CI/CD erzeugt)
+CHECKSUMS_ASSET_NAME = "SHA256SUMS"
+
+# Delta-Updates: binäre Patches zwischen zwei EXE-Versionen (werden per CI/CD erzeugt)
+DELTA_MAGIC = b"DPTDELTA1\n"
+DELTA_ASSET_SUFFIX = ".delta"
+DELTA_BLOCK_SIZE = 32
+
+# Boot-Tracing: abgeschlossene Spans als JSON-Zeilen in einer rotierenden Datei
+TRACE_FILE = os.path.join(APP_FOLDER, "boot-trace.jsonl")
+TRACE_MAX_BYTES = 1024 * 1024
+TRACE_BACKUP_COUNT = 3
+
+# Ressourcen-Monitor: letzte Minute in 1-s-Auflösung, letzte Stunde in 30-s-Schritten
+STATS_FINE_POINTS = 60
+STATS_COARSE_INTERVAL = 30
+STATS_COARSE_POINTS = 120
+STATS_DISCOVERY_INTERVAL = 5  # Sekunden zwischen zwei Abfragen der Container-Liste
+STATS_STREAM_TIMEOUT = 30
+STATS_REDRAW_MS = 1000
+
+# Container-Logs: begrenzter Puffer pro Dienst, rotierende komprimierte Dateien
+CONTAINER_LOG_DIR = os.path.join(APP_FOLDER, "logs")
+CONTAINER_LOG_BUFFER_LINES = 5000
+CONTAINER_LOG_TAIL = 200
+CONTAINER_LOG_MAX_BYTES = 5 * 1024 * 1024
+CONTAINER_LOG_BACKUPS = 5
+CONTAINER_LOG_VIEW_ROWS = 30
+CONTAINER_LOG_REFRESH_MS = 250
+LOG_LEVELS = ("ERROR", "WARN", "INFO", "DEBUG")
+
+# MySQL-Profile: verwaltete Konfiguration neben der Compose-Datei, in den db-Dienst gemountet
+MYSQL_PROFILES = ("auto", "small", "balanced", "server", "custom")
+MYSQL_CONFIG_NAME = "mysql-dpt.cnf"
+MYSQL_CONFIG_VOLUME = f"./{MYSQL_CONFIG_NAME}:/etc/mysql/conf.d/dpt.cnf:ro"
+MYSQL_DEFAULT_MAX_CONNECTIONS = 151
+MYSQL_RESERVED_CONNECTIONS = 10  # für prisma, Backups und Administration
+
+# API-Replikate: N api-Container hinter einem generierten nginx-Proxy auf Port 4000
+API_REPLICA_CHOICES = ("1", "2", "3", "4", "6", "8")
+API_PROXY_SERVICE = "api-proxy"
+API_PROXY_IMAGE = "nginx:1.27-alpine"
+API_PROXY_CONFIG_NAME = "nginx-api.conf"
+API_PROXY_CONFIG_VOLUME = f"./{API_PROXY_CONFIG_NAME}:/etc/nginx/conf.d/default.conf:ro"
+API_DB_POOL_MAX = 20  # Obergrenze des Prisma-Pools pro Replikat
+
+# Datenbank-Sicherung (dbtools.backup): Zielverzeichnis und gesicherte Datenbank
+BACKUP_DIR = os.path.join(APP_FOLDER, "backups")
+BACKUP_DATABASE = "core"
+
+# Salden-Export: Zielverzeichnis ohne --output
+EXPORT_DIR = os.path.join(APP_FOLDER, "exports")
+
+# Lasttest: virtuelle Benutzer, Laufzeit und Ergebnisdatei
+LOADTEST_CONCURRENCY = 10
+LOADTEST_DURATION = 30
+LOADTEST_USERS = 5  # Controller aus dem Testdatensatz, die sich anmelden
+LOADTEST_MAX_ERROR_RATE = 0.01  # darüber gilt der Lasttest als fehlgeschlagen
+LOADTEST_RESULTS_FILE = os.path.join(APP_FOLDER, "loadtest-results.jsonl")
+
+# Image-Bundles für Rechner ohne Registry-Zugang (docker save, zstd-komprimiert)
+IMAGE_BUNDLE_NAME = "dpt-images.tar.zst"
+IMAGE_BUNDLE_MANIFEST = "dpt-bundle.json"
+IMAGE_BUNDLE_LEVEL = 6
+
+# Kindprozesse: Wartezeit zwischen terminate und kill, Länge der Prozess-Historie
+PROCESS_TERMINATE_GRACE = 5
+PROCESS_HISTORY_SIZE = 50
+PROCESS_LINE_LIMIT = 1024 * 1024
+PROCESS_READ_SIZE = 64 * 1024
+
+# Herunterfahren: Grace-Zeit pro Dienst bis SIGKILL (überschreibbar per stop_grace_period)
+SHUTDOWN_DEFAULT_GRACE = 10
+
+
+# ============================================================================
+#   STARTUP-PROFILING UND VERZÖGERTE IMPORTS
+# ============================================================================
+
+
+class StartupProfiler:
+    """
+    Sammelt Zeiten für den Programmstart: Dauer einzelner Phasen, Zeitpunkte
+    (Millisekunden seit Programmstart) und die Importzeit verzögert geladener
+    Module. Mit --profile-startup wird das Ergebnis als JSON geschrieben.
+    """
+
+    def __init__(self, start=_STARTUP_T0):
+        self.enabled = False
+        self.output_path = STARTUP_PROFILE_FILE
+        self._start = start
+        self.phases = {}
+        self.milestones = {}
+        self.imports = {}
+
+    def add_phase(self, name, start, end):
+        self.phases[name] = round((end - start) * 1000, 1)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Misst die Dauer des umschlossenen Blocks als Phase 'name'.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, start, time.perf_counter())
+
+    def mark(self, name):
+        """
+        Hält fest, wie viele Millisekunden seit Programmstart vergangen sind.
+        """
+        self.milestones[name] = round((time.perf_counter() - self._start) * 1000, 1)
+
+    def record_import(self, module_name, seconds):
+        self.imports[module_name] = round(seconds * 1000, 1)
+
+    def report(self):
+        return {
+            "version": CURRENT_VERSION,
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "python": sys.version.split()[0],
+            "phases_ms": self.phases,
+            "milestones_ms": self.milestones,
+            "imports_ms": self.imports,
+        }
+
+    def write(self):
+        """
+        Schreibt den Bericht nach 'output_path', sofern das Profiling aktiv ist.
+        """
+        if not self.enabled:
+            return
+        try:
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+            log(f"Startprofil gespeichert: {self.output_path}")
+        except OSError as e:
+            log(f"Startprofil konnte nicht gespeichert werden: {e}")
+
+
+startup_profiler = StartupProfiler()
+
+
+class LazyModule:
+    """
+    Platzhalter für ein Modul, das erst beim ersten Attributzugriff importiert wird.
+    Der Import selbst steht als normale import-Anweisung in 'loader', damit
+    PyInstaller das Modul weiterhin findet und in die EXE packt.
+    """
+
+    def __init__(self, name, loader):
+        self._name = name
+        self._loader = loader
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            start = time.perf_counter()
+            module = self._loader()
+            startup_profiler.record_import(self._name, time.perf_counter() - start)
+            self._module = module
+        return getattr(module, attr)
+
+
+def _load_requests():
+    import requests
+    import requests.adapters
+
+    return requests
+
+
+def _load_asyncio():
+    import asyncio
+
+    return asyncio
+
+
+def _load_zstandard():
+    import zstandard
+
+    return zstandard
+
+
+def _load_backup():
+    from dbtools import backup
+
+    return backup
+
+
+def _load_importer():
+    from dbtools import importer
+
+    return importer
+
+
+def _load_balances():
+    from dbtools import balances
+
+    return balances
+
+
+def _load_dataset():
+    from dbtools import dataset
+
+    return dataset
+
+
+def _load_loadtest():
+    from dbtools import loadtest
+
+    return loadtest
+
+
+def _load_yaml():
+    import yaml
+
+    return yaml
+
+
+def _load_sv_ttk():
+    import sv_ttk
+
+    return sv_ttk
+
+
+def _load_darkdetect():
+    import darkdetect
+
+    return darkdetect
+
+
+def _load_tkinter():
+    import tkinter
+
+    return tkinter
+
+
+def _load_ttk():
+    from tkinter import ttk
+
+    return ttk
+
+
+def _load_messagebox():
+    from tkinter import messagebox
+
+    return messagebox
+
+
+def _load_filedialog():
+    from tkinter import filedialog
+
+    return filedialog
+
+
+# dbtools liegt neben dem Skript; beim Laden über importlib (Benchmarks, Tests)
+# steht dessen Verzeichnis nicht von selbst in sys.path
+_SCRIPT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+if _SCRIPT_FOLDER not in sys.path:
+    sys.path.insert(0, _SCRIPT_FOLDER)
+
+# Netzwerk-, YAML- und Theme-Module erst bei Bedarf laden; Tkinter ebenso,
+# damit der Headless-Modus ganz ohne GUI-Module auskommt
+requests = LazyModule("requests", _load_requests)
+asyncio = LazyModule("asyncio", _load_asyncio)
+zstandard = LazyModule("zstandard", _load_zstandard)
+backup = LazyModule("dbtools.backup", _load_backup)
+importer = LazyModule("dbtools.importer", _load_importer)
+balances = LazyModule("dbtools.balances", _load_balances)
+dataset = LazyModule("dbtools.dataset", _load_dataset)
+loadtest = LazyModule("dbtools.loadtest", _load_loadtest)  # lädt asyncio
+yaml = LazyModule("yaml", _load_yaml)
+sv_ttk = LazyModule("sv_ttk", _load_sv_ttk)
+darkdetect = LazyModule("darkdetect", _load_darkdetect)
+tk = LazyModule("tkinter", _load_tkinter)
+ttk = LazyModule("tkinter.ttk", _load_ttk)
+messagebox = LazyModule("tkinter.messagebox", _load_messagebox)
+filedialog = LazyModule("tkinter.filedialog", _load_filedialog)
+
 
 # ============================================================================
 #   GLOBALE VARIABLEN (GUI, STATUS, ETC.)
@@ -72,8 +447,12 @@ first_controller_lastname_entry = None
 
 # Toggle‐Button statt Start/Stop:
 toggle_button = None
+open_browser_button = None
 app_is_running = False  # Merkt sich, ob die Anwendung aktuell läuft
 
+# Fenster des Ressourcen-Monitors (None, solange es nicht geöffnet ist)
+resource_window = None
+
 
 # ------------------------------------------------------
 # Konfiguration: Nur Felder, die der Benutzer direkt ändern darf
@@ -109,6 +488,18 @@ CONFIG_SCHEMA = [
                 "compose_path": ("services", "db", "environment", "MYSQL_PASSWORD"),
                 "default": "systempassword",
             },
+            {
+                "label_text": "MySQL-Profil",
+                "compose_path": (BOOT_SETTINGS_KEY, "mysql_profile"),
+                "default": "auto",
+                "choices": MYSQL_PROFILES,
+            },
+            {
+                "label_text": "API-Replikate",
+                "compose_path": (BOOT_SETTINGS_KEY, "api_replicas"),
+                "default": "1",
+                "choices": API_REPLICA_CHOICES,
+            },
         ],
     },
     {
@@ -156,27 +547,567 @@ CONFIG_SCHEMA = [
             },
         ],
     },
+    {
+        "group_name": "Boot Manager",
+        "fields": [
+            {
+                "label_text": "Image-Aktualisierung",
+                "compose_path": (BOOT_SETTINGS_KEY, "pull_policy"),
+                "default": "if-digest-changed",
+                "choices": PULL_POLICIES,
+            },
+            {
+                "label_text": "Images im Hintergrund vorladen",
+                "compose_path": (BOOT_SETTINGS_KEY, "prepull"),
+                "default": "ja",
+                "choices": ("ja", "nein"),
+            },
+            {
+                "label_text": "API vorwärmen (GET-Pfade)",
+                "compose_path": (BOOT_SETTINGS_KEY, "warmup_paths"),
+                "default": WARMUP_DEFAULT_PATHS,
+            },
+            {
+                "label_text": "Stack beim Beenden weiterlaufen lassen",
+                "compose_path": (BOOT_SETTINGS_KEY, "keep_running"),
+                "default": "nein",
+                "choices": ("ja", "nein"),
+            },
+        ],
+    },
 ]
 
+# ============================================================================
+#   LOG-PIPELINE (KONSOLENAUSGABE)
+# ============================================================================
+
+
+class LogSink:
+    """
+    Nimmt Log-Zeilen aus beliebigen Threads entgegen und schreibt sie gebündelt
+    in das Log-Feld der GUI.
+    - Worker-Threads legen Zeilen nur in eine thread-sichere Queue.
+    - Der Tk-Mainloop leert die Queue per root.after-Timer und fügt pro Durchlauf
+      alle wartenden Zeilen mit einem einzigen insert ein.
+    - Das Log-Feld behält höchstens 'max_lines' Zeilen, ältere werden entfernt.
+    - Läuft die Queue voll, werden neue Zeilen verworfen und gezählt.
+    """
+
+    def __init__(
+        self,
+        max_lines=LOG_MAX_LINES,
+        flush_interval_ms=LOG_FLUSH_INTERVAL_MS,
+        max_pending=LOG_MAX_PENDING_LINES,
+    ):
+        self.max_lines = max_lines
+        self.flush_interval_ms = flush_interval_ms
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._root = None
+        self._widget = None
+        self._on_stats = None
+        self._stream = None
+
+        # Durchsatz-Zähler
+        self.lines_written = 0
+        self.lines_dropped = 0
+        self.lines_evicted = 0
+        self.lines_per_second = 0.0
+        self._rate_window_start = time.monotonic()
+        self._rate_window_lines = 0
+
+    def write(self, text):
+        """
+        Legt eine Zeile (oder einen Block mit Zeilenumbrüchen) in die Queue.
+        Darf aus jedem Thread aufgerufen werden und blockiert nie.
+        """
+        if not text.endswith("\n"):
+            text += "\n"
+        if self._stream is not None:
+            with self._lock:
+                self._stream.write(text)
+                self._stream.flush()
+                self.lines_written += text.count("\n")
+            return
+        try:
+            self._queue.put_nowait(text)
+        except queue.Full:
+            with self._lock:
+                self.lines_dropped += text.count("\n")
+
+    def attach(self, root_widget, text_widget, on_stats=None):
+        """
+        Verbindet die Pipeline mit dem Tk-Root und dem Text-Widget und startet
+        den periodischen Flush im Mainloop. 'on_stats' wird nach jeder
+        Aktualisierung der Durchsatzwerte mit stats() aufgerufen.
+        """
+        self._root = root_widget
+        self._widget = text_widget
+        self._on_stats = on_stats
+        self._root.after(self.flush_interval_ms, self._flush)
+
+    def attach_stream(self, stream):
+        """
+        Schreibt alle Meldungen direkt in 'stream' (z. B. stderr im Headless-Modus)
+        statt sie für das Log-Feld zu puffern.
+        """
+        self._stream = stream
+
+    def drain(self, limit=None):
+        """
+        Entnimmt alle (bzw. höchstens 'limit') wartenden Einträge aus der Queue
+        und gibt sie als Liste zurück.
+        """
+        batch = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def stats(self):
+        """
+        Gibt die aktuellen Durchsatzwerte als Dictionary zurück.
+        """
+        with self._lock:
+            return {
+                "lines_per_second": round(self.lines_per_second, 1),
+                "lines_written": self.lines_written,
+                "lines_dropped": self.lines_dropped,
+                "lines_evicted": self.lines_evicted,
+                "pending": self._queue.qsize(),
+            }
+
+    def _record(self, line_count):
+        """
+        Aktualisiert die Zähler und berechnet etwa einmal pro Sekunde die Rate neu.
+        Gibt True zurück, wenn die Rate neu berechnet wurde.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.lines_written += line_count
+            self._rate_window_lines += line_count
+            elapsed = now - self._rate_window_start
+            if elapsed < 1.0:
+                return False
+            self.lines_per_second = self._rate_window_lines / elapsed
+            self._rate_window_start = now
+            self._rate_window_lines = 0
+            return True
+
+    def _flush(self):
+        """
+        Läuft im Tk-Mainloop: schreibt alle wartenden Zeilen mit einem insert,
+        kürzt das Log-Feld auf 'max_lines' und plant den nächsten Durchlauf.
+        """
+        batch = self.drain()
+        line_count = 0
+        if batch:
+            # Zeilen, die ohnehin sofort wieder entfernt würden, gar nicht erst einfügen
+            if len(batch) > self.max_lines:
+                skipped = batch[: -self.max_lines]
+                batch = batch[-self.max_lines :]
+                with self._lock:
+                    self.lines_evicted += sum(entry.count("\n") for entry in skipped)
+                line_count += sum(entry.count("\n") for entry in skipped)
+
+            chunk = "".join(batch)
+            line_count += chunk.count("\n")
+            self._widget.insert(tk.END, chunk)
+
+            # Älteste Zeilen entfernen, wenn das Limit überschritten ist
+            # (das Text-Widget endet immer mit einer leeren Zeile).
+            widget_lines = int(self._widget.index("end-1c").split(".")[0]) - 1
+            excess = widget_lines - self.max_lines
+            if excess > 0:
+                self._widget.delete("1.0", f"{excess + 1}.0")
+                with self._lock:
+                    self.lines_evicted += excess
+
+            self._widget.see(tk.END)
+
+        rate_updated = self._record(line_count)
+        if rate_updated and self._on_stats:
+            self._on_stats(self.stats())
+
+        self._root.after(self.flush_interval_ms, self._flush)
+
+
+# Zentrale Log-Pipeline, wird in create_gui() mit dem Log-Feld verbunden
+log_sink = LogSink()
+
+
+def log(message):
+    """
+    Schreibt eine Meldung in die Konsolenausgabe (thread-sicher).
+    """
+    log_sink.write(message)
+
+
+# ============================================================================
+#   BOOT-TRACING (SPANS ALS JSONL)
+# ============================================================================
+
+
+class Span:
+    """
+    Ein zeitlich begrenzter Abschnitt (z. B. "compose_up") mit Ergebnis und
+    Attributen. Wird mit end() abgeschlossen und dabei in die Trace-Datei geschrieben.
+    """
+
+    def __init__(self, tracer, name, parent=None, start=None, **attributes):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = parent.trace_id if parent else os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.start = start if start is not None else time.monotonic()
+        self.attributes = attributes
+        self.outcome = "ok"
+        self.error = None
+        self.ended = False
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self, error, outcome="error"):
+        self.outcome = outcome
+        self.error = str(error)
+
+    def end(self, end=None):
+        if self.ended:
+            return
+        self.ended = True
+        self.tracer.emit(self, end if end is not None else time.monotonic())
+
+
+class Tracer:
+    """
+    Erzeugt Spans für die Phasen des Boot-Vorgangs und schreibt sie beim
+    Abschluss als JSON-Zeile in eine rotierende Datei. Der aktuelle Span wird
+    pro Thread gemerkt, damit verschachtelte Spans ihren Eltern-Span finden;
+    über Threads hinweg wird er mit activate() weitergereicht.
+    """
+
+    def __init__(
+        self, path=TRACE_FILE, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUP_COUNT
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.enabled = True
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._logger = None
+
+    def current(self):
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def start_span(self, name, parent=None, **attributes):
+        """
+        Beginnt einen Span; ohne 'parent' wird der aktuelle Span des Threads verwendet.
+        """
+        return Span(self, name, parent or self.current(), **attributes)
+
+    @contextmanager
+    def activate(self, span):
+        """
+        Macht 'span' im aktuellen Thread zum Eltern-Span weiterer Spans.
+        """
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+
+    @contextmanager
+    def span(self, name, parent=None, **attributes):
+        """
+        Umschließt einen Block mit einem Span. Eine Ausnahme setzt das Ergebnis
+        auf "error" und wird weitergereicht.
+        """
+        span = self.start_span(name, parent, **attributes)
+        try:
+            with self.activate(span):
+                yield span
+        except BaseException as e:
+            span.fail(e)
+            raise
+        finally:
+            span.end()
+
+    def record(
+        self, name, start, end, parent=None, outcome="ok", error=None, **attributes
+    ):
+        """
+        Schreibt nachträglich einen Span mit bekannten Start-/Endzeiten (time.monotonic()).
+        """
+        span = Span(self, name, parent or self.current(), start=start, **attributes)
+        span.outcome = outcome
+        span.error = error
+        span.end(end)
+        return span
+
+    def _get_logger(self):
+        if self._logger is None:
+            import logging.handlers
+
+            handler = logging.handlers.RotatingFileHandler(
+                self.path,
+                maxBytes=self.max_bytes,
+                backupCount=self.backups,
+                encoding="utf-8",
+                delay=True,
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger(f"dpt-boot-manager.trace.{self.path}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def emit(self, span, end):
+        if not self.enabled:
+            return
+        record = {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            # Wanduhrzeit des Starts, Dauer aus der monotonen Uhr
+            "ts": round(time.time() - (time.monotonic() - span.start), 3),
+            "duration_ms": round((end - span.start) * 1000, 1),
+            "outcome": span.outcome,
+            "thread": threading.current_thread().name,
+        }
+        if span.error:
+            record["error"] = span.error
+        if span.attributes:
+            record["attributes"] = span.attributes
+        try:
+            with self._lock:
+                self._get_logger().info(json.dumps(record, default=str))
+        except OSError as e:
+            self.enabled = False
+            log(f"Boot-Trace konnte nicht geschrieben werden: {e}")
+
+
+tracer = Tracer()
+
+
+def read_last_trace(root_name="boot", path=TRACE_FILE):
+    """
+    Liest alle Spans des letzten Traces, dessen Wurzel-Span 'root_name' heißt.
+    Wurzel-Spans werden zuletzt geschrieben, daher wird von hinten gesucht.
+    Gibt eine leere Liste zurück, wenn es noch keinen solchen Trace gibt.
+    """
+    lines = []
+    for file_path in (f"{path}.1", path):
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                lines.extend(f.readlines())
+        except OSError:
+            continue
+
+    spans = []
+    for line in lines:
+        try:
+            spans.append(json.loads(line))
+        except ValueError:
+            continue
+
+    for span in reversed(spans):
+        if span["parent_id"] is None and span["name"] == root_name:
+            return [s for s in spans if s["trace_id"] == span["trace_id"]]
+    return []
+
+
+def critical_path(spans):
+    """
+    Bestimmt den kritischen Pfad eines Traces: Ausgehend vom Ende des Wurzel-Spans
+    wird jeweils das Kind gewählt, das zuletzt endet, danach das Kind, das vor
+    dessen Beginn endet usw. Gibt eine Liste von (Tiefe, Span) zurück, wobei jeder
+    Span zusätzlich "offset_ms" (Beginn relativ zur Wurzel) erhält.
+    """
+    children = {}
+    root_span = None
+    for span in spans:
+        if span["parent_id"] is None:
+            root_span = span
+        else:
+            children.setdefault(span["parent_id"], []).append(span)
+    if root_span is None:
+        return []
+
+    def end_of(span):
+        return span["ts"] + span["duration_ms"] / 1000
+
+    path = []
+
+    def walk(span, depth):
+        span["offset_ms"] = round((span["ts"] - root_span["ts"]) * 1000, 1)
+        path.append((depth, span))
+        chain = []
+        limit = end_of(span)
+        for child in sorted(
+            children.get(span["span_id"], []), key=end_of, reverse=True
+        ):
+            # 1 ms Toleranz für Rundung der Zeitstempel
+            if end_of(child) <= limit + 0.001:
+                chain.append(child)
+                limit = child["ts"]
+        for child in reversed(chain):
+            walk(child, depth + 1)
+
+    walk(root_span, 0)
+    return path
+
+
+def describe_span(span):
+    """
+    Kurzbezeichnung eines Spans für die Anzeige (bei Kommandos mit Befehl).
+    """
+    command = span.get("attributes", {}).get("command")
+    if command:
+        return f"{span['name']}: {command[:60]}"
+    return span["name"]
+
+
+def show_boot_trace():
+    """
+    Zeigt den kritischen Pfad des letzten Starts in einem eigenen Fenster.
+    """
+    path = critical_path(read_last_trace())
+    if not path:
+        messagebox.showinfo("Letzter Start", "Es wurde noch kein Start aufgezeichnet.")
+        return
+
+    boot = path[0][1]
+    trace_window = tk.Toplevel(root)
+    trace_window.title("Letzter Start – kritischer Pfad")
+    trace_window.geometry("560x360")
+
+    started = time.strftime("%d.%m.%Y %H:%M:%S", time.localtime(boot["ts"]))
+    ttk.Label(
+        trace_window,
+        text=f"Start am {started}: {boot['duration_ms'] / 1000:.1f} s ({boot['outcome']})",
+    ).pack(padx=10, pady=(10, 5), anchor="w")
+
+    tree = ttk.Treeview(
+        trace_window, columns=("offset", "duration", "outcome"), show="tree headings"
+    )
+    tree.heading("#0", text="Phase")
+    tree.heading("offset", text="Beginn (s)")
+    tree.heading("duration", text="Dauer (s)")
+    tree.heading("outcome", text="Ergebnis")
+    tree.column("#0", width=280)
+    for column in ("offset", "duration", "outcome"):
+        tree.column(column, width=80, anchor="e")
+
+    for depth, span in path:
+        tree.insert(
+            "",
+            tk.END,
+            text="    " * depth + describe_span(span),
+            values=(
+                f"{span['offset_ms'] / 1000:.1f}",
+                f"{span['duration_ms'] / 1000:.1f}",
+                span["outcome"],
+            ),
+        )
+    tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+
 # ============================================================================
 #   KONFIGURATION LADEN / SPEICHERN, geschaltete Pfade auslesen/setzen
 # ============================================================================
 
 
+class ConfigStore:
+    """
+    Hält die geparste Compose-Datei im Speicher.
+    - Gelesen und geparst wird nur, wenn sich Pfad, Änderungszeit oder Größe der
+      Datei geändert haben; sonst liefert load() eine Kopie aus dem Speicher.
+    - Geparst und geschrieben wird mit dem C-Loader/-Dumper von PyYAML, sofern
+      die libyaml-Erweiterung verfügbar ist.
+    - save() schreibt in eine temporäre Datei im selben Verzeichnis und ersetzt
+      die Compose-Datei erst danach, ein Absturz hinterlässt nie eine halbe Datei.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._config = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat_key(path):
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def load(self):
+        path = DOCKER_COMPOSE_FILE
+        with self._lock:
+            key = self._stat_key(path)
+            if key != self._key:
+                with open(path, "r", newline="\n") as file:
+                    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                    self._config = yaml.load(file, Loader=loader)
+                self._key = key
+            return copy.deepcopy(self._config)
+
+    def save(self, config):
+        path = DOCKER_COMPOSE_FILE
+        with self._lock:
+            # Unveränderte Konfiguration nicht neu schreiben (Datei bleibt unberührt)
+            try:
+                unchanged = self._key == self._stat_key(path)
+            except OSError:
+                unchanged = False
+            if unchanged and config == self._config:
+                return
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        data = yaml.dump(config, Dumper=dumper, default_flow_style=False)
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=".compose-", suffix=".tmp", dir=os.path.dirname(path) or "."
+            )
+            try:
+                with os.fdopen(fd, "w", newline="\n") as file:
+                    file.write(data)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                _remove_quietly(tmp_path)
+                raise
+            self._config = copy.deepcopy(config)
+            self._key = self._stat_key(path)
+
+    def invalidate(self):
+        with self._lock:
+            self._key = None
+
+
+config_store = ConfigStore()
+
+
 def load_config():
     """
-    Lädt die Konfiguration aus der versionierten docker-compose-Datei.
+    Lädt die Konfiguration aus der versionierten docker-compose-Datei
+    (aus dem Speicher, solange sich die Datei nicht geändert hat).
     """
-    with open(DOCKER_COMPOSE_FILE, "r", newline="\n") as file:
-        return yaml.safe_load(file)
+    return config_store.load()
 
 
 def save_config(config):
     """
-    Speichert die geänderte Konfiguration in der versionierten docker-compose-Datei.
+    Speichert die geänderte Konfiguration atomar in der versionierten docker-compose-Datei.
     """
-    with open(DOCKER_COMPOSE_FILE, "w", newline="\n") as file:
-        yaml.safe_dump(config, file, default_flow_style=False)
+    config_store.save(config)
 
 
 def get_nested(dct, path):
@@ -193,22 +1124,82 @@ def get_nested(dct, path):
 def set_nested(dct, path, value):
     """
     Setzt rekursiv den Wert in 'dct' für den angegebenen Pfad.
+    Fehlende Dictionaries auf dem Weg (z. B. 'x-boot-manager') werden angelegt.
     """
     *parents, last = path
     current = dct
     for key in parents:
-        current = current[key]
+        if isinstance(current, dict):
+            current = current.setdefault(key, {})
+        else:
+            current = current[key]
     current[last] = value
 
 
-# ------------------------------------------------------
-# Funktion zum Anpassen abhängiger Werte
-# ------------------------------------------------------
-def fix_dependent_values(config):
+def iter_config_fields():
     """
-    Sorgt dafür, dass Abhängigkeiten (Port -> FRONTEND_URL, Root PW -> DATABASE_URL usw.)
-    nach dem Speichern der GUI-Werte automatisch konsistent sind.
+    Liefert alle Felddefinitionen aus CONFIG_SCHEMA.
+    """
+    for group_def in CONFIG_SCHEMA:
+        yield from group_def["fields"]
+
+
+def get_config_values(config):
+    """
+    Gibt für alle Felder aus CONFIG_SCHEMA den Wert zurück, wie er in der GUI
+    angezeigt wird ({compose_path: Text}).
+    """
+    values = {}
+    for field_def in iter_config_fields():
+        path = field_def["compose_path"]
+        try:
+            raw_value = get_nested(config, path)
+        except KeyError:
+            # Ältere Compose-Dateien kennen z. B. 'x-boot-manager' noch nicht
+            raw_value = field_def["default"]
+
+        # Wenn es eine Extract-Funktion gibt, anwenden
+        if field_def.get("extract") is not None:
+            raw_value = field_def["extract"](raw_value)
+
+        values[path] = str(raw_value)
+    return values
+
+
+def apply_config_values(config, values):
     """
+    Schreibt Eingabewerte ({compose_path: Text}) gemäß CONFIG_SCHEMA in 'config'
+    und korrigiert anschließend die von geänderten Feldern abhängigen Werte.
+    Gibt die Menge der tatsächlich geänderten Pfade zurück (leer = nichts zu speichern).
+    """
+    changed = set()
+    for field_def in iter_config_fields():
+        path = field_def["compose_path"]
+        if path not in values:
+            continue
+
+        try:
+            old_value = get_nested(config, path)
+        except (KeyError, IndexError, TypeError):
+            old_value = None
+        new_value = values[path]
+        if field_def.get("inject") is not None:
+            new_value = field_def["inject"](old_value, new_value)
+        # 3000 und "3000" gelten als gleich, damit sich der YAML-Typ nicht ändert
+        if old_value is not None and str(old_value) == str(new_value):
+            continue
+        set_nested(config, path, new_value)
+        changed.add(path)
+
+    if changed:
+        fix_dependent_values(config, changed)
+    return changed
+
+
+# ------------------------------------------------------
+# Abhängige Werte: jede Regel nennt die Felder, von denen sie abhängt
+# ------------------------------------------------------
+def _fix_frontend_url(config):
     # FRONTEND_URL an den Port anpassen
     # Wir lesen die "services.web.ports[0]" -> extrahieren den Port.
     try:
@@ -223,6 +1214,8 @@ def fix_dependent_values(config):
     except KeyError:
         pass
 
+
+def _fix_prisma_database_url(config):
     # DATABASE_URL basierend auf Root Password
     # Wir speichern root PW in "services.db.environment.MYSQL_ROOT_PASSWORD"
     # und wollen die Prisma-DB-Connection "services.prisma.environment.DATABASE_URL" anpassen.
@@ -235,41 +1228,541 @@ def fix_dependent_values(config):
     except KeyError:
         pass
 
+
+def _fix_api_database_url(config):
     # API-Datenbank-URL anpassen
     try:
         api_db_pw = get_nested(
             config, ("services", "db", "environment", "MYSQL_PASSWORD")
         )
+        api_env = config["services"]["api"]["environment"]
+        # Parameter wie connection_limit bleiben erhalten
+        query = api_env.get("DATABASE_URL", "").partition("?")[2]
         new_api_db_url = f"mysql://system:{api_db_pw}@db:3306/core"
-        config["services"]["api"]["environment"]["DATABASE_URL"] = new_api_db_url
+        api_env["DATABASE_URL"] = (
+            f"{new_api_db_url}?{query}" if query else new_api_db_url
+        )
     except KeyError:
         pass
 
 
-# ============================================================================
-#   UPDATE-FUNKTIONEN
-# ============================================================================
+def _fix_mysql_config_volume(config):
+    # Verwaltete MySQL-Konfiguration (Profil) in den db-Dienst einbinden
+    if "db" in config.get("services", {}):
+        try:
+            volumes = get_nested(config, ("services", "db", "volumes"))
+        except KeyError:
+            volumes = []
+        if MYSQL_CONFIG_VOLUME not in volumes:
+            set_nested(
+                config, ("services", "db", "volumes"), volumes + [MYSQL_CONFIG_VOLUME]
+            )
+
+
+# (Felder aus CONFIG_SCHEMA, Regel); Regeln ohne Felder laufen nur beim
+# vollständigen Abgleich (z. B. Migration älterer Compose-Dateien beim Start)
+DEPENDENT_VALUE_RULES = [
+    ((("services", "web", "ports", 0),), _fix_frontend_url),
+    (
+        (("services", "db", "environment", "MYSQL_ROOT_PASSWORD"),),
+        _fix_prisma_database_url,
+    ),
+    ((("services", "db", "environment", "MYSQL_PASSWORD"),), _fix_api_database_url),
+    ((), _fix_mysql_config_volume),
+    # API-Replikate und Proxy-Dienst passend zur Einstellung anlegen/entfernen
+    (((BOOT_SETTINGS_KEY, "api_replicas"),), lambda config: apply_api_replicas(config)),
+]
 
 
-def get_latest_release():
+def fix_dependent_values(config, changed=None):
     """
-    Ruft die neueste Release-Version und deren Assets über die GitHub-API ab.
-    Gibt (tag_name, assets) zurück oder (None, None) bei Fehler.
+    Sorgt dafür, dass Abhängigkeiten (Port -> FRONTEND_URL, Root PW -> DATABASE_URL usw.)
+    nach dem Speichern der GUI-Werte automatisch konsistent sind.
+    Mit 'changed' (Menge geänderter Pfade) laufen nur die betroffenen Regeln.
     """
-    url = f"{GITHUB_API_BASE_URL}/repositories/861008208/releases/latest"
+    for inputs, rule in DEPENDENT_VALUE_RULES:
+        if changed is None or changed.intersection(inputs):
+            rule(config)
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return data["tag_name"], data["assets"]
-    except requests.exceptions.RequestException as e:
-        log_output.insert(tk.END, f"Fehler bei der Update-Prüfung: {e}\n")
-        log_output.see(tk.END)
-        return None, None
 
+# ============================================================================
+#   DOWNLOAD-ENGINE (UPDATE-DATEIEN)
+# ============================================================================
+
+_http_session = None
+_http_session_lock = threading.Lock()
 
-def get_asset_download_url(asset_id):
+
+def get_http_session():
+    """
+    Gibt die gemeinsam genutzte requests.Session zurück. Alle HTTP-Zugriffe
+    teilen sich so einen Verbindungs-Pool (Keep-Alive, weniger TLS-Handshakes).
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=DOWNLOAD_SEGMENTS * 2
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def format_bytes(num_bytes):
+    """
+    Formatiert eine Byte-Anzahl menschenlesbar (z. B. "12.3 MB").
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024 or unit == "GB":
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{num_bytes} B"
+        num_bytes /= 1024
+
+
+def sha256_of_file(path):
+    """
+    Berechnet die SHA-256-Prüfsumme einer Datei (blockweise, ohne sie komplett zu laden).
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DownloadError(Exception):
+    """
+    Endgültiger Fehler beim Herunterladen oder Prüfen einer Datei.
+    """
+
+
+class DownloadEngine:
+    """
+    Lädt mehrere Dateien gleichzeitig über eine gemeinsame requests.Session.
+    - Große Dateien werden in HTTP-Range-Segmente aufgeteilt, die parallel laden.
+    - Daten landen zunächst in '<ziel>.part', der Fortschritt jedes Segments in
+      '<ziel>.part.json'. Ein abgebrochener Download wird dort fortgesetzt.
+    - Vor dem Umbenennen auf den Zielnamen wird die SHA-256-Prüfsumme geprüft.
+    - Der Gesamtfortschritt wird als ("progress", {...}) in 'progress_queue' gelegt.
+    """
+
+    def __init__(
+        self,
+        session=None,
+        segments=DOWNLOAD_SEGMENTS,
+        min_segment_size=DOWNLOAD_MIN_SEGMENT_SIZE,
+        chunk_size=DOWNLOAD_CHUNK_SIZE,
+        retries=DOWNLOAD_RETRIES,
+        timeout=DOWNLOAD_TIMEOUT,
+        progress_queue=None,
+    ):
+        self.session = session or get_http_session()
+        self.segments = segments
+        self.min_segment_size = min_segment_size
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.timeout = timeout
+        self.progress_queue = progress_queue
+
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._total = 0
+        self._downloaded = 0
+        self._fresh = 0  # in diesem Lauf tatsächlich übertragene Bytes
+        self._started = None
+        self._last_report = 0.0
+
+    def download(self, jobs):
+        """
+        Lädt alle Jobs (Dicts mit "url", "path" und optional "sha256") parallel
+        herunter, prüft sie und verschiebt sie an ihren Zielpfad.
+        Wirft DownloadError, wenn ein Job endgültig fehlschlägt.
+        """
+        self._started = time.monotonic()
+        workers = max(1, len(jobs) * self.segments)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            plans = list(pool.map(self._prepare, jobs))
+            futures = [
+                pool.submit(self._fetch_segment, plan, segment)
+                for plan in plans
+                for segment in plan["state"]["segments"]
+            ]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception():
+                    # Übrige Segmente anhalten, ihr Stand bleibt für den nächsten Versuch erhalten
+                    self._cancel.set()
+                    raise future.exception()
+
+        for plan in plans:
+            self._finalize(plan)
+        self._report(force=True)
+
+    def _probe(self, url):
+        """
+        Ermittelt Dateigröße und Range-Unterstützung mit einer 1-Byte-Anfrage.
+        Gibt (size, supports_ranges) zurück; size ist None, falls unbekannt.
+        """
+        try:
+            with self.session.get(
+                url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                if response.status_code == 206:
+                    total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                    if total.isdigit():
+                        return int(total), True
+                length = response.headers.get("Content-Length")
+                return (int(length) if length else None), False
+        except requests.exceptions.RequestException as e:
+            raise DownloadError(f"{url} nicht erreichbar: {e}") from e
+
+    def _split(self, size, supports_ranges):
+        """
+        Teilt eine Datei der Größe 'size' in Segmente {"start", "end", "done"} auf.
+        """
+        if not size or not supports_ranges:
+            return [{"start": 0, "end": None, "done": 0}]
+        count = max(1, min(self.segments, size // self.min_segment_size))
+        step = -(-size // count)
+        return [
+            {"start": start, "end": min(start + step, size) - 1, "done": 0}
+            for start in range(0, size, step)
+        ]
+
+    def _prepare(self, job):
+        """
+        Legt die .part-Datei an oder übernimmt den Stand eines früheren Versuchs.
+        """
+        part_path = job["path"] + ".part"
+        state_path = part_path + ".json"
+        size, supports_ranges = self._probe(job["url"])
+
+        state = None
+        if supports_ranges and os.path.exists(part_path):
+            try:
+                with open(state_path, "r") as f:
+                    state = json.load(f)
+                if (
+                    state.get("size") != size
+                    or state.get("sha256") != job.get("sha256")
+                    or os.path.getsize(part_path) != size
+                ):
+                    state = None
+            except (OSError, ValueError):
+                state = None
+
+        if state is None:
+            state = {
+                "size": size,
+                "sha256": job.get("sha256"),
+                "segments": self._split(size, supports_ranges),
+            }
+            with open(part_path, "wb") as f:
+                if size:
+                    f.truncate(size)
+        else:
+            resumed = sum(segment["done"] for segment in state["segments"])
+            log(
+                f"Setze Download von {os.path.basename(job['path'])} fort ({format_bytes(resumed)} vorhanden)."
+            )
+
+        plan = {
+            "job": job,
+            "part_path": part_path,
+            "state_path": state_path,
+            "state": state,
+            "supports_ranges": supports_ranges,
+            "state_lock": threading.Lock(),
+        }
+        self._save_state(plan)
+
+        with self._lock:
+            self._total += size or 0
+            self._downloaded += sum(segment["done"] for segment in state["segments"])
+        return plan
+
+    def _save_state(self, plan):
+        """
+        Schreibt den Segment-Fortschritt atomar neben die .part-Datei.
+        """
+        with plan["state_lock"]:
+            tmp_path = plan["state_path"] + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(plan["state"], f)
+            os.replace(tmp_path, plan["state_path"])
+
+    def _fetch_segment(self, plan, segment):
+        """
+        Lädt ein Segment und setzt nach Verbindungsabbrüchen an der letzten
+        geschriebenen Position fort. Versuche ohne Fortschritt zählen als Fehlschlag.
+        """
+        url = plan["job"]["url"]
+        failures = 0
+        while not self._cancel.is_set():
+            if not plan["supports_ranges"] and segment["done"]:
+                # Ohne Range-Unterstützung muss von vorn begonnen werden
+                self._advance(-segment["done"])
+                segment["done"] = 0
+
+            position = segment["start"] + segment["done"]
+            if segment["end"] is not None and position > segment["end"]:
+                return
+
+            headers = {}
+            if plan["supports_ranges"]:
+                headers["Range"] = f"bytes={position}-{segment['end']}"
+
+            progress_before = segment["done"]
+            try:
+                with self.session.get(
+                    url, headers=headers, stream=True, timeout=self.timeout
+                ) as response:
+                    response.raise_for_status()
+                    if plan["supports_ranges"] and response.status_code != 206:
+                        raise DownloadError("Server hat die Range-Anfrage ignoriert.")
+
+                    # Ungepuffert schreiben, damit der gesicherte Stand nie
+                    # Daten enthält, die noch nicht in der Datei angekommen sind
+                    with open(plan["part_path"], "r+b", buffering=0) as f:
+                        f.seek(position)
+                        unsaved = 0
+                        for chunk in response.iter_content(self.chunk_size):
+                            if self._cancel.is_set():
+                                break
+                            f.write(chunk)
+                            segment["done"] += len(chunk)
+                            unsaved += len(chunk)
+                            self._advance(len(chunk))
+                            if unsaved >= DOWNLOAD_STATE_INTERVAL:
+                                self._save_state(plan)
+                                unsaved = 0
+
+                self._save_state(plan)
+                if self._cancel.is_set():
+                    return
+                if segment["end"] is None:
+                    return
+                if segment["start"] + segment["done"] <= segment["end"]:
+                    raise DownloadError("Verbindung vorzeitig beendet.")
+                return
+            except (requests.exceptions.RequestException, DownloadError) as e:
+                self._save_state(plan)
+                if segment["done"] > progress_before:
+                    failures = 0
+                failures += 1
+                if failures > self.retries:
+                    raise DownloadError(
+                        f"{os.path.basename(plan['job']['path'])}: {e}"
+                    ) from e
+                time.sleep(min(0.5 * 2**failures, 10))
+
+    def _finalize(self, plan):
+        """
+        Prüft Größe und Prüfsumme der .part-Datei und benennt sie auf den Zielnamen um.
+        """
+        job = plan["job"]
+        part_path = plan["part_path"]
+        size = plan["state"]["size"]
+        if size is not None and os.path.getsize(part_path) != size:
+            raise DownloadError(f"{os.path.basename(job['path'])}: Größe stimmt nicht.")
+
+        expected = job.get("sha256")
+        if expected and sha256_of_file(part_path) != expected.lower():
+            # Beschädigte Teildatei verwerfen, damit der nächste Versuch neu beginnt
+            os.remove(part_path)
+            os.remove(plan["state_path"])
+            raise DownloadError(
+                f"{os.path.basename(job['path'])}: SHA-256-Prüfsumme stimmt nicht."
+            )
+
+        os.replace(part_path, job["path"])
+        os.remove(plan["state_path"])
+
+    def _advance(self, num_bytes):
+        with self._lock:
+            self._downloaded += num_bytes
+            self._fresh += max(num_bytes, 0)
+        self._report()
+
+    def _report(self, force=False):
+        """
+        Meldet den Gesamtfortschritt höchstens alle 100 ms an die progress_queue.
+        """
+        if self.progress_queue is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_report < 0.1:
+                return
+            self._last_report = now
+            elapsed = max(now - self._started, 1e-6)
+            progress = {
+                "downloaded": self._downloaded,
+                "total": self._total,
+                "bytes_per_second": self._fresh / elapsed,
+            }
+        self.progress_queue.put(("progress", progress))
+
+
+# ============================================================================
+#   UPDATE-FUNKTIONEN
+# ============================================================================
+
+
+class ReleaseCheckError(Exception):
+    """
+    Die Release-Prüfung ist fehlgeschlagen oder pausiert gerade (Backoff).
+    """
+
+
+class ReleaseCache:
+    """
+    Zwischenspeicher für die Release-Metadaten der GitHub-API als JSON-Datei
+    neben der Anwendung (ETag, tag_name, Assets).
+    - Innerhalb von 'ttl' Sekunden wird ohne Netzwerkzugriff aus dem Cache geantwortet.
+    - Danach wird mit If-None-Match revalidiert (304-Antworten zählen nicht
+      gegen das Rate-Limit der GitHub-API).
+    - Nach Fehlern wird exponentiell mit Jitter gewartet, bevor erneut angefragt wird.
+    """
+
+    def __init__(
+        self,
+        path=RELEASE_CACHE_FILE,
+        url=RELEASE_API_URL,
+        ttl=RELEASE_CACHE_TTL,
+        session=None,
+    ):
+        self.path = path
+        self.url = url
+        self.ttl = ttl
+        self._session = session
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log(f"Release-Cache konnte nicht gespeichert werden: {e}")
+
+    def cached(self):
+        """
+        Gibt (tag_name, assets) aus dem Cache zurück oder (None, None).
+        """
+        with self._lock:
+            return self._data.get("tag_name"), self._data.get("assets")
+
+    def _fresh(self, now):
+        data = self._data
+        if data.get("tag_name") and now - data.get("checked_at", 0) < self.ttl:
+            return data["tag_name"], data["assets"]
+        return None
+
+    def refresh(self, force=False):
+        """
+        Gibt (tag_name, assets) zurück und fragt die GitHub-API nur an, wenn der
+        Cache älter als 'ttl' ist oder 'force' gesetzt ist. Wirft
+        ReleaseCheckError bei Fehlern oder solange der Backoff noch läuft.
+        Der Cache ist nur zum Lesen und Aktualisieren gesperrt, nicht während
+        der HTTP-Anfrage; gleichzeitige Auffrischungen teilen sich eine Anfrage.
+        """
+        with self._lock:
+            fresh = None if force else self._fresh(time.time())
+        if fresh:
+            return fresh
+
+        with self._refresh_lock:
+            with self._lock:
+                now = time.time()
+                data = self._data
+                # Ein anderer Thread hat inzwischen aufgefrischt
+                fresh = self._fresh(now)
+                if fresh and not force:
+                    return fresh
+                retry_after = data.get("retry_after", 0)
+                if now < retry_after:
+                    raise ReleaseCheckError(
+                        f"Nächster Versuch in {int(retry_after - now)} s."
+                    )
+                headers = {"Accept": "application/vnd.github+json"}
+                if data.get("etag") and data.get("tag_name"):
+                    headers["If-None-Match"] = data["etag"]
+
+            session = self._session or get_http_session()
+            try:
+                response = session.get(
+                    self.url, headers=headers, timeout=RELEASE_REQUEST_TIMEOUT
+                )
+                if response.status_code != 304:
+                    response.raise_for_status()
+                    release = response.json()
+                    update = {
+                        "etag": response.headers.get("ETag"),
+                        "tag_name": release["tag_name"],
+                        "assets": release["assets"],
+                    }
+                else:
+                    update = {}
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                with self._lock:
+                    failures = self._data.get("failures", 0) + 1
+                    delay = min(
+                        RELEASE_BACKOFF_BASE * 2 ** (failures - 1), RELEASE_BACKOFF_MAX
+                    )
+                    delay = random.uniform(delay / 2, delay)
+
+                    # Bei erschöpftem Rate-Limit bis zum Reset warten
+                    response = getattr(e, "response", None)
+                    if response is not None:
+                        reset = response.headers.get("X-RateLimit-Reset", "")
+                        if response.headers.get("X-RateLimit-Remaining") == "0" and (
+                            reset.isdigit()
+                        ):
+                            delay = max(delay, int(reset) - now)
+
+                    self._data["failures"] = failures
+                    self._data["retry_after"] = now + delay
+                    self._save()
+                raise ReleaseCheckError(str(e)) from e
+
+            with self._lock:
+                self._data.update(update, checked_at=now, failures=0, retry_after=0)
+                self._save()
+                return self._data["tag_name"], self._data["assets"]
+
+
+release_cache = ReleaseCache()
+
+
+def get_latest_release(force=False):
+    """
+    Ruft die neueste Release-Version und deren Assets ab (über den Release-Cache).
+    Schlägt die Anfrage fehl, wird auf den zuletzt bekannten Stand zurückgegriffen.
+    Gibt (tag_name, assets) zurück oder (None, None), wenn nichts bekannt ist.
+    """
+    try:
+        return release_cache.refresh(force)
+    except ReleaseCheckError as e:
+        log(f"Fehler bei der Update-Prüfung: {e}")
+        return release_cache.cached()
+
+
+def get_asset_download_url(asset_id):
     """
     Ermittelt die direkte Download-URL für ein Release-Asset anhand seiner Asset-ID.
     Gibt die Download-URL oder None zurück.
@@ -279,31 +1772,43 @@ def get_asset_download_url(asset_id):
     }
     url = f"{GITHUB_API_BASE_URL}/repositories/861008208/releases/assets/{asset_id}"
     try:
-        response = requests.get(url, headers=headers, stream=True)
-        response.raise_for_status()
-        return response.url
+        # Nur den Weiterleitungen folgen, den Inhalt selbst nicht laden
+        with get_http_session().get(
+            url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT
+        ) as response:
+            response.raise_for_status()
+            return response.url
     except requests.exceptions.RequestException:
         return None
 
 
-def check_for_updates_background():
+def check_for_updates_background(force=False, quiet=False):
+    """
+    Prüft im Hintergrund nach einer neuen Version und übergibt das Ergebnis
+    an den Tk-Thread, der den Update-Button anpasst.
+    """
+    with tracer.span("update_check", force=force) as span:
+        latest_version, latest_assets = get_latest_release(force)
+        if not latest_version:
+            span.fail("Release nicht abrufbar")
+            if not quiet:
+                log("Update-Prüfung fehlgeschlagen. Anwendung läuft normal.")
+            return
+        span.set(latest_version=latest_version)
+
+    root.after(0, show_release_state, latest_version, latest_assets, quiet)
+
+
+def show_release_state(latest_version, latest_assets, quiet=False):
     """
-    Prüft im Hintergrund nach einer neuen Version und aktualisiert den Update-Button.
+    Aktualisiert den Update-Button (nur im Tk-Thread aufrufen).
     - Ist eine neuere Version verfügbar, wird der Button farblich markiert (rot) und führt bei Klick confirm_update aus.
     - Ist die Version bereits aktuell, wird der Button grün und bei Klick erfolgt erneut ein check_for_updates.
     """
-    latest_version, latest_assets = get_latest_release()
-    if not latest_version:
-        log_output.insert(
-            tk.END, "Update-Prüfung fehlgeschlagen. Anwendung läuft normal.\n"
-        )
-        log_output.see(tk.END)
-        return
-
     if latest_version != CURRENT_VERSION:
         # Neuere Version verfügbar
-        log_output.insert(tk.END, f"Neue Version verfügbar: {latest_version}\n")
-        log_output.see(tk.END)
+        if not quiet:
+            log(f"Neue Version verfügbar: {latest_version}")
         update_button.configure(
             text=f"Update verfügbar ({latest_version})",
             style="UpdateOrange.TButton",
@@ -311,8 +1816,8 @@ def check_for_updates_background():
         )
     else:
         # Aktuelle Version = neuester Stand
-        log_output.insert(tk.END, "Ihre Version ist aktuell.\n")
-        log_output.see(tk.END)
+        if not quiet:
+            log("Ihre Version ist aktuell.")
         update_button.configure(
             text=f"Version {CURRENT_VERSION} – aktuell",
             style="IsLatest.TButton",
@@ -323,10 +1828,26 @@ def check_for_updates_background():
 def check_for_updates():
     """
     Löst eine manuelle Prüfung auf Updates aus und gibt eine Nachricht in das Log-Feld aus.
+    Die TTL des Release-Caches wird dabei übergangen, nur der Backoff gilt weiter.
     """
-    log_output.insert(tk.END, "Suche nach Updates...\n")
-    log_output.see(tk.END)
-    threading.Thread(target=check_for_updates_background, daemon=True).start()
+    log("Suche nach Updates...")
+    threading.Thread(
+        target=check_for_updates_background, kwargs={"force": True}, daemon=True
+    ).start()
+
+
+def schedule_release_recheck():
+    """
+    Plant die nächste regelmäßige Update-Prüfung im Hintergrund.
+    """
+
+    def recheck():
+        threading.Thread(
+            target=check_for_updates_background, kwargs={"quiet": True}, daemon=True
+        ).start()
+        schedule_release_recheck()
+
+    root.after(RELEASE_RECHECK_INTERVAL * 1000, recheck)
 
 
 def confirm_update(latest_version, latest_assets):
@@ -344,7 +1865,8 @@ def confirm_update(latest_version, latest_assets):
 def show_update_progress(latest_version, latest_assets):
     """
     Zeigt ein kleines Fenster mit Fortschrittsbalken an und startet den
-    Download-Thread für die neuen Dateien.
+    Download-Thread für die neuen Dateien. Der Thread meldet Fortschritt und
+    Ergebnis über eine Queue, die hier im Tk-Mainloop ausgewertet wird.
     """
     update_window = tk.Toplevel(root)
     update_window.title("Update läuft")
@@ -359,213 +1881,4097 @@ def show_update_progress(latest_version, latest_assets):
         update_window, orient="horizontal", length=300, mode="determinate"
     )
     progress_bar.pack(pady=10)
-    progress_bar.start()
 
-    update_window.update()
+    throughput_label = ttk.Label(update_window, text="")
+    throughput_label.pack(pady=5)
+
+    progress_queue = queue.Queue()
+
+    def poll_progress():
+        """
+        Übernimmt die Meldungen des Download-Threads in das Update-Fenster.
+        """
+        progress = None
+        while True:
+            try:
+                kind, payload = progress_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                progress = payload
+            elif kind == "status":
+                status_label.config(text=payload)
+            elif kind == "error":
+                status_label.config(text=payload)
+                log(payload)
+                return
+            elif kind == "done":
+                progress_bar["value"] = progress_bar["maximum"]
+                status_label.config(
+                    text="Update erfolgreich! Anwendung wird neu gestartet..."
+                )
+                update_window.after(
+                    2000,
+                    lambda: restart_application(status_label, payload, update_window),
+                )
+                return
+
+        if progress and progress["total"]:
+            progress_bar["value"] = (
+                progress["downloaded"] * progress_bar["maximum"] / progress["total"]
+            )
+            throughput_label.config(
+                text=f"{format_bytes(progress['downloaded'])} von "
+                f"{format_bytes(progress['total'])} "
+                f"({format_bytes(progress['bytes_per_second'])}/s)"
+            )
+        update_window.after(100, poll_progress)
 
     threading.Thread(
         target=download_and_replace_files,
-        args=(
-            latest_version,
-            latest_assets,
-            status_label,
-            progress_bar,
-            update_window,
-        ),
+        args=(latest_version, latest_assets, progress_queue),
         daemon=True,
     ).start()
+    poll_progress()
 
 
-def download_and_replace_files(
-    latest_version, latest_assets, status_label, progress_bar, update_window
-):
+def get_published_checksums(latest_assets):
+    """
+    Ermittelt die mit dem Release veröffentlichten SHA-256-Prüfsummen.
+    Bevorzugt wird das 'digest'-Feld der GitHub-API, ansonsten die Datei
+    CHECKSUMS_ASSET_NAME im Format von 'sha256sum'. Gibt {Dateiname: Hash} zurück.
+    """
+    checksums = {}
+    for asset in latest_assets:
+        digest = asset.get("digest") or ""
+        if digest.startswith("sha256:"):
+            checksums[asset["name"]] = digest.split(":", 1)[1].lower()
+
+    for asset in latest_assets:
+        if asset["name"] != CHECKSUMS_ASSET_NAME:
+            continue
+        try:
+            response = get_http_session().get(
+                asset["browser_download_url"], timeout=DOWNLOAD_TIMEOUT
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            log(f"Prüfsummen konnten nicht geladen werden: {e}")
+            break
+        for line in response.text.splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                checksums.setdefault(parts[1].lstrip("*"), parts[0].lower())
+
+    return checksums
+
+
+class DeltaError(Exception):
+    """
+    Fehler beim Erzeugen oder Anwenden eines Delta-Updates.
+    """
+
+
+def delta_asset_name(from_version, to_version):
+    return f"BootManagerDPT_{from_version}_to_{to_version}{DELTA_ASSET_SUFFIX}"
+
+
+def create_delta(old_path, new_path, delta_path, block_size=DELTA_BLOCK_SIZE):
     """
-    Lädt die Assets (EXE und docker-compose.yml) herunter und ersetzt
-    die alten Dateien. Zeigt den Fortschritt im übergebenen Fortschrittsbalken an.
+    Erzeugt ein binäres Delta von 'old_path' nach 'new_path' (im CI/CD-Build).
+    Das Delta besteht aus Kopier-Anweisungen für Bereiche, die in der alten Datei
+    vorkommen, und den übrigen Bytes; der Anweisungsstrom ist LZMA-komprimiert.
+    Gibt die Größe des Deltas in Bytes zurück.
     """
-    exe_asset_id = None
-    compose_asset_id = None
+    with open(old_path, "rb") as f:
+        old = f.read()
+    with open(new_path, "rb") as f:
+        new = f.read()
+
+    # Blöcke der alten Datei an festen Grenzen indizieren
+    index = {}
+    for offset in range(0, len(old) - block_size + 1, block_size):
+        index.setdefault(old[offset : offset + block_size], offset)
+
+    header = {
+        "source_sha256": hashlib.sha256(old).hexdigest(),
+        "target_sha256": hashlib.sha256(new).hexdigest(),
+        "target_size": len(new),
+    }
+    compressor = lzma.LZMACompressor()
+    with open(delta_path, "wb") as out:
+        out.write(DELTA_MAGIC)
+        out.write(json.dumps(header).encode() + b"\n")
+
+        def add(data):
+            if data:
+                out.write(compressor.compress(b"A" + struct.pack(">I", len(data))))
+                out.write(compressor.compress(data))
+
+        literal_start = position = 0
+        while position <= len(new) - block_size:
+            source = index.get(new[position : position + block_size])
+            if source is None:
+                position += 1
+                continue
+
+            # Treffer rückwärts in noch nicht ausgegebene Bytes verlängern ...
+            start, source_start = position, source
+            while (
+                start > literal_start
+                and source_start > 0
+                and new[start - 1] == old[source_start - 1]
+            ):
+                start -= 1
+                source_start -= 1
+            # ... und vorwärts, erst in 4-KB-Schritten, dann byteweise
+            end, source_end = position + block_size, source + block_size
+            while True:
+                chunk = new[end : end + 4096]
+                if not chunk or chunk != old[source_end : source_end + len(chunk)]:
+                    break
+                end += len(chunk)
+                source_end += len(chunk)
+            while (
+                end < len(new) and source_end < len(old) and new[end] == old[source_end]
+            ):
+                end += 1
+                source_end += 1
+
+            add(new[literal_start:start])
+            out.write(
+                compressor.compress(
+                    b"C" + struct.pack(">QI", source_start, end - start)
+                )
+            )
+            literal_start = position = end
+
+        add(new[literal_start:])
+        out.write(compressor.flush())
+        return out.tell()
+
+
+def apply_delta(old_path, delta_path, out_path, expected_sha256=None):
+    """
+    Baut aus 'old_path' und dem Delta die neue Datei 'out_path' und prüft
+    Größe und SHA-256 (aus dem Delta und, falls angegeben, 'expected_sha256').
+    Bei einem Fehler bleibt keine halbfertige Datei zurück (DeltaError).
+    """
+    part_path = f"{out_path}.part"
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(delta_path, "rb") as f:
+            if f.read(len(DELTA_MAGIC)) != DELTA_MAGIC:
+                raise DeltaError("Ungültiges Delta-Format")
+            header = json.loads(f.readline())
+            if sha256_of_file(old_path) != header["source_sha256"]:
+                raise DeltaError("Delta passt nicht zur installierten Version")
+
+            with lzma.open(f) as ops, open(old_path, "rb") as old, open(
+                part_path, "wb"
+            ) as out:
+                while True:
+                    kind = ops.read(1)
+                    if not kind:
+                        break
+                    if kind == b"C":
+                        offset, length = struct.unpack(">QI", ops.read(12))
+                        old.seek(offset)
+                        source = old
+                    elif kind == b"A":
+                        (length,) = struct.unpack(">I", ops.read(4))
+                        source = ops
+                    else:
+                        raise DeltaError(f"Unbekannte Delta-Anweisung {kind!r}")
+                    while length:
+                        data = source.read(min(length, DOWNLOAD_CHUNK_SIZE))
+                        if not data:
+                            raise DeltaError("Delta ist unvollständig")
+                        out.write(data)
+                        digest.update(data)
+                        written += len(data)
+                        length -= len(data)
+
+        actual = digest.hexdigest()
+        if written != header["target_size"]:
+            raise DeltaError(f"Größe {written} statt {header['target_size']} Bytes")
+        for expected in (header["target_sha256"], expected_sha256):
+            if expected and actual != expected.lower():
+                raise DeltaError(f"Prüfsumme stimmt nicht (erwartet {expected})")
+    except (lzma.LZMAError, EOFError, struct.error, ValueError, KeyError) as e:
+        _remove_quietly(part_path)
+        raise DeltaError(f"Delta beschädigt: {e}") from e
+    except BaseException:
+        _remove_quietly(part_path)
+        raise
+    os.replace(part_path, out_path)
+    return written
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
 
-    # Asset-IDs aus dem Release ermitteln
+def download_and_replace_files(latest_version, latest_assets, progress_queue):
+    """
+    Lädt die Assets (EXE und docker-compose.yml) gleichzeitig herunter, prüft
+    ihre Prüfsummen und legt sie neben die alten Dateien.
+    Läuft in einem Worker-Thread: Fortschritt, Fehler und Ergebnis werden nur
+    über 'progress_queue' gemeldet, die GUI wird hier nicht angefasst.
+    """
+    exe_asset = None
+    compose_asset = None
+    delta_asset = None
+
+    # Assets aus dem Release ermitteln
     for asset in latest_assets:
-        if asset["name"].endswith(".exe"):
-            exe_asset_id = asset["id"]
+        if asset["name"] == delta_asset_name(CURRENT_VERSION, latest_version):
+            delta_asset = asset
+        elif asset["name"].endswith(".exe"):
+            exe_asset = asset
         elif asset["name"].endswith(".yml"):
-            compose_asset_id = asset["id"]
+            compose_asset = asset
 
-    if not exe_asset_id or not compose_asset_id:
-        status_label.config(text="Fehler: Update-Dateien nicht gefunden.")
-        progress_bar.stop()
+    if not exe_asset or not compose_asset:
+        progress_queue.put(("error", "Fehler: Update-Dateien nicht gefunden."))
         return
 
-    def download_file(url, save_path):
-        """
-        Hilfsfunktion, um eine Datei (EXE, YML) herunterzuladen und gleichzeitig
-        den Fortschrittsbalken zu aktualisieren.
-        """
+    # Neue EXE in dasselbe Verzeichnis wie die alte EXE, Compose-Datei daneben
+    new_exe_path = os.path.join(
+        os.path.dirname(EXE_PATH), f"BootManagerDPT_{latest_version}.exe"
+    )
+    new_compose_path = os.path.join(
+        os.path.dirname(DOCKER_COMPOSE_FILE), f"docker-compose-{latest_version}.yml"
+    )
+
+    checksums = get_published_checksums(latest_assets)
+
+    def download(assets):
+        jobs = []
+        for asset, save_path in assets:
+            download_url = get_asset_download_url(asset["id"])
+            if not download_url:
+                raise DownloadError(f"{asset['name']} konnte nicht abgerufen werden.")
+            if asset["name"] not in checksums:
+                log(f"Keine Prüfsumme für {asset['name']} veröffentlicht.")
+            jobs.append(
+                {
+                    "url": download_url,
+                    "path": save_path,
+                    "sha256": checksums.get(asset["name"]),
+                }
+            )
+        DownloadEngine(progress_queue=progress_queue).download(jobs)
+
+    # Delta nur für die laufende EXE anwendbar (nicht beim Start als .py-Skript);
+    # schlägt es fehl, wird wie bisher die vollständige EXE geladen
+    if delta_asset and getattr(sys, "frozen", False):
+        delta_path = f"{new_exe_path}{DELTA_ASSET_SUFFIX}"
+        progress_queue.put(
+            ("status", f"Lade Delta-Update {latest_version} herunter...")
+        )
         try:
-            response = requests.get(
-                url,
-                stream=True,
-                timeout=10,
+            download(((delta_asset, delta_path), (compose_asset, new_compose_path)))
+            progress_queue.put(("status", "Wende Delta-Update an..."))
+            apply_delta(
+                EXE_PATH, delta_path, new_exe_path, checksums.get(exe_asset["name"])
             )
-            response.raise_for_status()
-
-            total_size = int(response.headers.get("content-length", 0))
-            block_size = 8192
-            progress_bar["maximum"] = total_size if total_size else 100
+            log(
+                f"Delta-Update angewendet: {format_bytes(delta_asset['size'])} "
+                f"statt {format_bytes(exe_asset['size'])} geladen."
+            )
+            progress_queue.put(("done", new_exe_path))
+            return
+        except (DeltaError, DownloadError, OSError) as e:
+            log(f"Delta-Update fehlgeschlagen ({e}), lade die vollständige EXE.")
+        finally:
+            _remove_quietly(delta_path)
 
-            downloaded = 0
-            with open(save_path, "wb") as f:
-                for chunk in response.iter_content(block_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        progress_bar["value"] = min(downloaded, progress_bar["maximum"])
+    progress_queue.put(("status", f"Lade Update {latest_version} herunter..."))
+    try:
+        download(((exe_asset, new_exe_path), (compose_asset, new_compose_path)))
+    except (DownloadError, OSError) as e:
+        progress_queue.put(("error", f"Fehler beim Download: {e}"))
+        return
 
-            # Fortschrittsbalken am Ende füllen
-            progress_bar["value"] = progress_bar["maximum"]
-            update_window.update_idletasks()
+    progress_queue.put(("done", new_exe_path))
 
-        except Exception as e:
-            status_label.config(text=f"Fehler beim Download: {e}")
-            status_label.config(text=f"Fehler beim Download: {e}")
-            progress_bar.stop()
-            sys.exit(1)
-
-    # Neue EXE herunterladen (in dasselbe Verzeichnis wie die alte EXE)
-    exe_download_url = get_asset_download_url(exe_asset_id)
-    if exe_download_url:
-        update_window.update()
-        progress_bar["value"] = 0
-        new_exe_path = os.path.join(
-            os.path.dirname(EXE_PATH), f"BootManagerDPT_{latest_version}.exe"
-        )
-        download_file(exe_download_url, new_exe_path)
-
-    # Neue Docker-Compose Datei herunterladen
-    compose_download_url = get_asset_download_url(compose_asset_id)
-    if compose_download_url:
-        status_label.config(text="Lade neue Docker-Compose-Datei herunter...")
-        update_window.update()
-        progress_bar["value"] = 0
-        new_compose_path = os.path.join(
-            os.path.dirname(DOCKER_COMPOSE_FILE), f"docker-compose-{latest_version}.yml"
-        )
-        download_file(compose_download_url, new_compose_path)
-
-    status_label.config(text="Update erfolgreich! Anwendung wird neu gestartet...")
-    progress_bar["value"] = progress_bar["maximum"]
-    progress_bar.stop()
-    update_window.update()
-    time.sleep(2)
-    restart_application(status_label, new_exe_path, update_window)
 
+def restart_application(status_label, new_exe_path, update_window):
     """
     Beendet die aktuelle Anwendung vollständig und startet die neue EXE.
+    Der Stack wird vorher im Hintergrund heruntergefahren, da os._exit
+    die atexit-Handler überspringt.
     """
 
+    def finish():
+        try:
+            # Starte die neue EXE
+            subprocess.Popen([new_exe_path])
 
-def restart_application(status_label, new_exe_path, update_window):
-    try:
-        status_label.config(text="Beende alte Version...")
-        update_window.update()
+            # Schließe das Update-Fenster
+            update_window.destroy()
 
-        # Starte die neue EXE
-        subprocess.Popen([new_exe_path])
+            # Beende die laufende Anwendung (alle Threads)
+            os._exit(0)
 
-        # Schließe das Update-Fenster
-        update_window.destroy()
+        except Exception as e:
+            print(f"Fehler beim Neustart: {e}")
 
-        # Beende die laufende Anwendung (alle Threads)
-        os._exit(0)
+    def shutdown_thread():
+        shutdown_coordinator.shutdown("update")
+        root.after(0, finish)
 
-    except Exception as e:
-        print(f"Fehler beim Neustart: {e}")
+    status_label.config(text="Beende alte Version...")
+    threading.Thread(target=shutdown_thread, daemon=True).start()
 
 
 # ============================================================================
-#   DOCKER-FUNKTIONEN
+#   PROZESS-SUPERVISOR (KINDPROZESSE, COMPOSE-AUFRUF)
 # ============================================================================
 
 
-def is_docker_running():
+class SupervisedProcess:
     """
-    Prüft, ob Docker auf dem System läuft. Gibt True/False zurück.
+    Eintrag der Prozess-Registry: Kommando, Zustand und Ergebnis eines Kindprozesses.
+    wait() darf aus jedem Thread aufgerufen werden.
     """
-    try:
-        result = subprocess.run(
-            ["docker", "info"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
-        return False
 
+    def __init__(self, process_id, args, name, exclusive, timeout, on_line, on_exit):
+        self.id = process_id
+        self.args = list(args)
+        command = " ".join([os.path.basename(self.args[0]), *self.args[1:]])
+        self.name = name or (command[:57] + "..." if len(command) > 60 else command)
+        self.exclusive = exclusive
+        self.timeout = timeout
+        self.on_line = on_line
+        self.on_exit = on_exit
+        self.pid = None
+        self.started = None
+        self.returncode = None
+        self.duration = None
+        self.error = None
+        self.cancelled = False
+        self.timed_out = False
+        self._process = None
+        self._done = threading.Event()
+
+    @property
+    def running(self):
+        return not self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Wartet auf das Ende des Prozesses und gibt den Exit-Code zurück
+        (None, wenn er nicht gestartet werden konnte oder vorher abgebrochen wurde).
+        """
+        self._done.wait(timeout)
+        return self.returncode
+
+    def result(self):
+        return {
+            "name": self.name,
+            "exit_code": self.returncode,
+            "duration_s": self.duration,
+            "cancelled": self.cancelled,
+            "timed_out": self.timed_out,
+            "error": self.error,
+        }
 
-def start_docker_if_needed():
+
+class ProcessSupervisor:
     """
-    Startet Docker Desktop unter Windows, falls es noch nicht läuft.
-    Wartet im Hintergrund, bis Docker läuft und ruft danach 'start_docker_compose' auf.
+    Startet und überwacht alle Kindprozesse des Boot Managers.
+    - Eine Registry hält die laufenden Prozesse, eine kurze Historie die beendeten.
+    - stdout/stderr aller Prozesse liest ein einziger I/O-Thread mit einer
+      asyncio-Ereignisschleife (unter Windows Proactor, da selectors dort keine
+      Pipes unterstützt); Zeilen gehen an 'on_line', sonst an die Log-Pipeline.
+    - Abbruch und Timeout beenden den Prozess mit terminate, nach
+      PROCESS_TERMINATE_GRACE Sekunden mit kill.
+    - Prozesse mit gleichem 'exclusive'-Schlüssel (z. B. "compose") laufen
+      nacheinander, damit sich Start und Stopp nicht überholen.
+    - Exit-Code und Dauer landen im Log, im Trace und bei 'on_exit'.
     """
 
-    def docker_thread():
-        if not is_docker_running():
-            root.after(
-                0,
-                lambda: log_output.insert(tk.END, "Docker Desktop wird gestartet...\n"),
+    def __init__(self, terminate_grace=PROCESS_TERMINATE_GRACE):
+        self.terminate_grace = terminate_grace
+        self.processes = {}
+        self.history = deque(maxlen=PROCESS_HISTORY_SIZE)
+        self._next_id = 1
+        self._loop = None
+        self._exclusive_locks = {}
+        self._lock = threading.Lock()
+
+    def _get_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="process-supervisor", daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    def start(
+        self,
+        args,
+        name=None,
+        exclusive=None,
+        timeout=None,
+        on_line=None,
+        on_exit=None,
+        merge_stderr=False,
+    ):
+        """
+        Startet 'args' (Liste, ohne Shell) und kehrt sofort zurück.
+        'on_line' erhält jede Ausgabezeile (im I/O-Thread, darf nicht blockieren),
+        'on_exit' das SupervisedProcess-Objekt nach dem Ende.
+        """
+        with self._lock:
+            process_id = self._next_id
+            self._next_id += 1
+            process = SupervisedProcess(
+                process_id, args, name, exclusive, timeout, on_line, on_exit
             )
-            root.after(0, log_output.see, tk.END)
+            self.processes[process_id] = process
+        asyncio.run_coroutine_threadsafe(
+            self._run(process, merge_stderr), self._get_loop()
+        )
+        return process
+
+    def run(self, args, **kwargs):
+        """
+        Wie start(), wartet aber auf das Ende und gibt den Exit-Code zurück.
+        """
+        return self.start(args, **kwargs).wait()
+
+    def cancel(self, process):
+        """
+        Bricht einen laufenden oder noch wartenden Prozess ab.
+        """
+        if process is None or not process.running:
+            return
+        process.cancelled = True
+        loop = self._get_loop()
+        asyncio.run_coroutine_threadsafe(self._terminate(process), loop)
 
-            # Docker Desktop starten
-            subprocess.run(
-                ["start", "", "C:\\Program Files\\Docker\\Docker\\Docker Desktop.exe"],
-                shell=True,
+    def cancel_all(self, exclusive=None):
+        """
+        Bricht alle Prozesse ab, bei Angabe von 'exclusive' nur die dieser Gruppe.
+        """
+        with self._lock:
+            processes = [
+                process
+                for process in self.processes.values()
+                if exclusive is None or process.exclusive == exclusive
+            ]
+        # Erst alle markieren: sonst startet ein wartender Prozess, sobald der
+        # vor ihm beendet ist, noch bevor er selbst als abgebrochen gilt
+        for process in processes:
+            if process.running:
+                process.cancelled = True
+        for process in processes:
+            self.cancel(process)
+
+    def running(self):
+        with self._lock:
+            return list(self.processes.values())
+
+    async def _run(self, process, merge_stderr):
+        lock = None
+        if process.exclusive:
+            lock = self._exclusive_locks.setdefault(process.exclusive, asyncio.Lock())
+            await lock.acquire()
+        process.started = time.monotonic()
+        try:
+            if not process.cancelled:
+                await self._execute(process, merge_stderr)
+        finally:
+            if lock is not None:
+                lock.release()
+            self._finish(process)
+
+    async def _execute(self, process, merge_stderr):
+        pipe = asyncio.subprocess.PIPE
+        try:
+            child = await asyncio.create_subprocess_exec(
+                *process.args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=pipe,
+                stderr=asyncio.subprocess.STDOUT if merge_stderr else pipe,
             )
-            time.sleep(5)  # Wartezeit für Docker Desktop-Start
+        except OSError as e:
+            process.error = str(e)
+            return
+        process._process = child
+        process.pid = child.pid
+        if process.cancelled:
+            # Abbruch kam, während der Prozess gestartet wurde
+            await self._terminate(process)
+
+        streams = [child.stdout] if merge_stderr else [child.stdout, child.stderr]
+        on_line = process.on_line or (lambda line: log_sink.write(line))
+        completion = asyncio.gather(
+            *(self._pump(stream, on_line) for stream in streams), child.wait()
+        )
+        try:
+            await asyncio.wait_for(asyncio.shield(completion), process.timeout)
+        except asyncio.TimeoutError:
+            process.timed_out = True
+            await self._terminate(process)
+            await completion
+        process.returncode = child.returncode
+
+    @staticmethod
+    async def _pump(stream, on_line):
+        """
+        Liest blockweise und gibt vollständige Zeilen weiter; eine Zeile länger als
+        PROCESS_LINE_LIMIT wird in Stücken weitergegeben.
+        """
+        pending = b""
+        while True:
+            chunk = await stream.read(PROCESS_READ_SIZE)
+            if not chunk:
+                break
+            *lines, pending = (pending + chunk).split(b"\n")
+            if len(pending) > PROCESS_LINE_LIMIT:
+                lines.append(pending)
+                pending = b""
+            for line in lines:
+                on_line(line.decode("utf-8", errors="replace").rstrip("\r"))
+        if pending:
+            on_line(pending.decode("utf-8", errors="replace").rstrip("\r"))
+
+    async def _terminate(self, process):
+        child = process._process
+        if child is None or child.returncode is not None:
+            return
+        try:
+            child.terminate()
+            await asyncio.wait_for(child.wait(), self.terminate_grace)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            child.kill()
+
+    def _finish(self, process):
+        process.duration = round(time.monotonic() - process.started, 2)
+        with self._lock:
+            self.processes.pop(process.id, None)
+            self.history.append(process)
+
+        if process.error:
+            outcome, message = "error", f"nicht startbar ({process.error})"
+        elif process.timed_out:
+            outcome, message = "timeout", f"Timeout nach {process.duration} s"
+        elif process.cancelled:
+            outcome, message = "cancelled", f"abgebrochen nach {process.duration} s"
+        else:
+            outcome = "ok" if process.returncode == 0 else "error"
+            message = f"Exit-Code {process.returncode} nach {process.duration} s"
+        log(f"{process.name}: {message}")
+        tracer.record(
+            "process",
+            process.started,
+            process.started + process.duration,
+            outcome=outcome,
+            error=process.error,
+            command=process.name,
+            exit_code=process.returncode,
+        )
+        process._done.set()
+        if process.on_exit:
+            try:
+                process.on_exit(process)
+            except Exception as e:
+                log(f"Fehler im Prozess-Callback von {process.name}: {e}")
+
+
+process_supervisor = ProcessSupervisor()
+
+_compose_command = None
+_compose_major_version = None
+_compose_command_lock = threading.Lock()
+
+
+def get_compose_command():
+    """
+    Ermittelt einmalig, ob das Compose-Plugin ('docker compose', v2) oder das
+    eigenständige 'docker-compose' verfügbar ist, und merkt sich das Ergebnis.
+    """
+    global _compose_command, _compose_major_version
+    with _compose_command_lock:
+        if _compose_command is None:
+            for candidate in (["docker", "compose"], ["docker-compose"]):
+                try:
+                    result = subprocess.run(
+                        candidate + ["version"], capture_output=True, timeout=15
+                    )
+                except (OSError, subprocess.TimeoutExpired):
+                    continue
+                if result.returncode == 0:
+                    _compose_command = candidate
+                    match = re.search(rb"version v?(\d+)\.", result.stdout)
+                    _compose_major_version = int(match.group(1)) if match else None
+                    break
+            else:
+                # Nichts gefunden (Docker noch nicht installiert): nicht cachen
+                return ["docker", "compose"]
+            log(f"Compose-Aufruf: {' '.join(_compose_command)}")
+        return list(_compose_command)
+
+
+def compose_supports_replicas():
+    """
+    Das alte 'docker-compose' v1 ignoriert deploy.replicas (außer im Swarm-Modus)
+    und startet nur einen api-Container.
+    """
+    get_compose_command()
+    return _compose_major_version is None or _compose_major_version >= 2
+
+
+def compose_args(*args):
+    """
+    Baut ein Compose-Kommando für die versionierte Compose-Datei.
+    """
+    return get_compose_command() + ["-f", DOCKER_COMPOSE_FILE, *args]
+
+
+# ============================================================================
+#   DOCKER-FUNKTIONEN
+# ============================================================================
+
+
+class DockerEngineError(Exception):
+    """
+    Die Docker Engine API ist nicht erreichbar oder hat mit einem Fehler geantwortet.
+    """
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP-Verbindung über einen Unix-Socket (Linux, macOS).
+    """
+
+    def __init__(self, socket_path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
 
-            # Überprüfen, bis Docker läuft
-            while not is_docker_running():
-                time.sleep(5)
-                root.after(
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self._socket_path)
+        self.sock = sock
+
+
+class _NamedPipeReader(io.RawIOBase):
+    """
+    Lesender Zugriff auf eine Named Pipe für http.client. Schließen beendet nur
+    die Antwort, nicht die Pipe, damit die Verbindung erhalten bleibt.
+    """
+
+    def __init__(self, pipe):
+        self._pipe = pipe
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._pipe.readinto(buffer)
+
+
+class _NamedPipeSocket:
+    """
+    Minimaler Socket-Ersatz für eine Windows Named Pipe (nur was http.client nutzt).
+    Lesen und Schreiben laufen überlappend über _winapi, damit 'timeout' wie bei
+    einem Socket gilt: Eine hängende Pipe führt nach 'timeout' Sekunden zu
+    TimeoutError, statt ping() samt Verbindungs-Lock dauerhaft zu blockieren.
+    """
+
+    def __init__(self, pipe_path, timeout=None):
+        import _winapi
+
+        self._winapi = _winapi
+        self.timeout = timeout
+        self._handle = None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                self._handle = _winapi.CreateFile(
+                    pipe_path,
+                    _winapi.GENERIC_READ | _winapi.GENERIC_WRITE,
                     0,
-                    lambda: log_output.insert(tk.END, "Warte auf Docker Desktop...\n"),
+                    _winapi.NULL,
+                    _winapi.OPEN_EXISTING,
+                    _winapi.FILE_FLAG_OVERLAPPED,
+                    _winapi.NULL,
                 )
-                root.after(0, log_output.see, tk.END)
+                return
+            except OSError as e:
+                # Alle Instanzen der Pipe belegt: auf eine freie warten
+                if getattr(e, "winerror", None) != _winapi.ERROR_PIPE_BUSY:
+                    raise
+            _winapi.WaitNamedPipe(pipe_path, self._milliseconds(deadline))
+
+    def _milliseconds(self, deadline):
+        if deadline is None:
+            return self._winapi.INFINITE
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Zeitüberschreitung an der Named Pipe")
+        return max(1, int(remaining * 1000))
+
+    def _complete(self, overlapped, error):
+        """
+        Wartet höchstens 'timeout' Sekunden auf eine überlappende Lese- oder
+        Schreiboperation; danach wird sie abgebrochen.
+        """
+        _winapi = self._winapi
+        if error == _winapi.ERROR_IO_PENDING:
+            deadline = None if self.timeout is None else time.monotonic() + self.timeout
+            result = _winapi.WaitForMultipleObjects(
+                [overlapped.event], False, self._milliseconds(deadline)
+            )
+            if result != _winapi.WAIT_OBJECT_0:
+                overlapped.cancel()
+                # Erst nach Abschluss des Abbruchs darf der Puffer freigegeben werden
+                overlapped.GetOverlappedResult(True)
+                raise TimeoutError("Zeitüberschreitung an der Named Pipe")
+        return overlapped.GetOverlappedResult(True)[0]
+
+    def readinto(self, buffer):
+        try:
+            overlapped, error = self._winapi.ReadFile(
+                self._handle, len(buffer), overlapped=True
+            )
+        except BrokenPipeError:
+            return 0
+        self._complete(overlapped, error)
+        data = overlapped.getbuffer()
+        buffer[: len(data)] = data
+        return len(data)
+
+    def sendall(self, data):
+        view = memoryview(data)
+        while view:
+            overlapped, error = self._winapi.WriteFile(
+                self._handle, view, overlapped=True
+            )
+            view = view[self._complete(overlapped, error) :]
 
-            root.after(0, lambda: log_output.insert(tk.END, "Docker Desktop läuft.\n"))
-            root.after(0, log_output.see, tk.END)
+    def makefile(self, mode):
+        return io.BufferedReader(_NamedPipeReader(self))
 
-        # Sobald Docker läuft, docker-compose aufrufen
-        start_docker_compose()
+    def close(self):
+        if self._handle is not None:
+            self._winapi.CloseHandle(self._handle)
+            self._handle = None
 
-    threading.Thread(target=docker_thread, daemon=True).start()
 
+class _NamedPipeHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP-Verbindung über die Named Pipe von Docker Desktop (Windows).
+    """
+
+    def __init__(self, pipe_path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self._pipe_path = pipe_path
+
+    def connect(self):
+        self.sock = _NamedPipeSocket(self._pipe_path, timeout=self.timeout)
 
-def start_docker_compose():
+
+def default_docker_host():
+    """
+    Ermittelt die Adresse des Docker-Daemons: DOCKER_HOST, sonst die Named Pipe
+    unter Windows bzw. den Unix-Socket unter Linux/macOS.
     """
-    Führt 'docker-compose up -d' aus und setzt den Anwendungsstatus auf "läuft".
+    docker_host = os.environ.get("DOCKER_HOST")
+    if docker_host:
+        return docker_host
+    if sys.platform == "win32":
+        return "npipe:////./pipe/docker_engine"
+    for socket_path in (
+        "/var/run/docker.sock",
+        os.path.expanduser("~/.docker/run/docker.sock"),
+    ):
+        if os.path.exists(socket_path):
+            return f"unix://{socket_path}"
+    return "unix:///var/run/docker.sock"
+
+
+class DockerEngineClient:
+    """
+    Schlanker Client für die Docker Engine API. Anfragen laufen über eine
+    persistente Verbindung zum lokalen Daemon (Unix-Socket oder Named Pipe)
+    statt über einen neuen 'docker'-Prozess pro Abfrage.
     """
 
-    def update_status():
-        # Nach dem Start => app_is_running = True, Toggle-Button anpassen
-        global app_is_running
-        app_is_running = True
-        toggle_button.configure(
+    def __init__(self, host=None, timeout=DOCKER_API_TIMEOUT):
+        self.host = host or default_docker_host()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self, timeout):
+        scheme, _, address = self.host.partition("://")
+        if scheme == "unix":
+            return _UnixHTTPConnection(address, timeout=timeout)
+        if scheme == "npipe":
+            return _NamedPipeHTTPConnection(address.replace("/", "\\"), timeout=timeout)
+        if scheme in ("tcp", "http"):
+            return http.client.HTTPConnection(address, timeout=timeout)
+        raise DockerEngineError(f"Nicht unterstützter DOCKER_HOST: {self.host}")
+
+    def request(self, method, path, query=None):
+        """
+        Führt eine Anfrage über die persistente Verbindung aus und gibt
+        (status, body) zurück. Eine abgebrochene Verbindung wird einmal neu aufgebaut.
+        """
+        url = f"{path}?{urlencode(query)}" if query else path
+        with self._lock:
+            while True:
+                reused = self._connection is not None
+                if not reused:
+                    self._connection = self._connect(self.timeout)
+                try:
+                    self._connection.request(method, url, headers={"Host": "docker"})
+                    response = self._connection.getresponse()
+                    return response.status, response.read()
+                except (OSError, http.client.HTTPException) as e:
+                    self._connection.close()
+                    self._connection = None
+                    if not reused:
+                        raise DockerEngineError(str(e)) from e
+
+    def get_json(self, path, query=None):
+        status, body = self.request("GET", path, query)
+        if status >= 400:
+            raise DockerEngineError(f"{path}: HTTP {status} {body[:200]!r}")
+        return json.loads(body)
+
+    def ping(self):
+        """
+        Gibt True zurück, wenn der Daemon erreichbar ist und Anfragen beantwortet.
+        """
+        try:
+            status, body = self.request("GET", "/_ping")
+        except DockerEngineError:
+            return False
+        return status == 200 and body.strip() == b"OK"
+
+    def version(self):
+        return self.get_json("/version")
+
+    def info(self):
+        return self.get_json("/info")
+
+    def inspect_container(self, container_id):
+        return self.get_json(f"/containers/{container_id}/json")
+
+    def containers(self, all=False, filters=None):
+        """
+        Listet Container auf, optional gefiltert (z. B. {"label": ["..."]}).
+        """
+        query = {"all": "1" if all else "0"}
+        if filters:
+            query["filters"] = json.dumps(filters)
+        return self.get_json("/containers/json", query)
+
+    def stats(self, container_id, stream=True):
+        """
+        Liefert die Ressourcennutzung eines Containers: als Generator (eine
+        Messung pro Sekunde) oder mit stream=False als einzelne Messung.
+        """
+        path = f"/containers/{container_id}/stats"
+        if stream:
+            return self.stream(
+                "GET", path, {"stream": "1"}, timeout=STATS_STREAM_TIMEOUT
+            )
+        return self.get_json(path, {"stream": "0"})
+
+    def stop_container(self, container_id, grace=SHUTDOWN_DEFAULT_GRACE):
+        """
+        Stoppt einen Container (SIGTERM, nach 'grace' Sekunden SIGKILL). Läuft über
+        eine eigene Verbindung, damit parallele Stopps sich nicht gegenseitig blockieren.
+        Gibt True zurück, wenn der Container gestoppt wurde, False, wenn er schon stand.
+        """
+        grace = math.ceil(grace)
+        connection = self._connect(grace + self.timeout)
+        try:
+            connection.request(
+                "POST",
+                f"/containers/{container_id}/stop?t={grace}",
+                headers={"Host": "docker"},
+            )
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            raise DockerEngineError(str(e)) from e
+        finally:
+            connection.close()
+        if response.status >= 400:
+            raise DockerEngineError(
+                f"Stop {container_id[:12]}: HTTP {response.status} {body[:200]!r}"
+            )
+        return response.status != 304
+
+    def start_container(self, container_id):
+        """
+        Startet einen Container. Gibt True zurück, wenn er gestartet wurde, False,
+        wenn er schon lief.
+        """
+        status, body = self.request("POST", f"/containers/{container_id}/start")
+        if status >= 400:
+            raise DockerEngineError(
+                f"Start {container_id[:12]}: HTTP {status} {body[:200]!r}"
+            )
+        return status != 304
+
+    def images(self):
+        return self.get_json("/images/json")
+
+    def inspect_image(self, image):
+        """
+        Gibt die Image-Informationen zurück oder None, wenn das Image lokal fehlt.
+        """
+        status, body = self.request("GET", f"/images/{image}/json")
+        if status == 404:
+            return None
+        if status >= 400:
+            raise DockerEngineError(f"Image {image}: HTTP {status} {body[:200]!r}")
+        return json.loads(body)
+
+    def stream(self, method, path, query=None, timeout=None):
+        """
+        Führt eine Anfrage über eine eigene Verbindung aus und liefert die
+        zeilenweise JSON-Antwort (Events, Pull-Fortschritt) als Generator.
+        """
+        url = f"{path}?{urlencode(query)}" if query else path
+        connection = self._connect(timeout)
+        try:
+            connection.request(method, url, headers={"Host": "docker"})
+            response = connection.getresponse()
+            if response.status >= 400:
+                raise DockerEngineError(
+                    f"{path}: HTTP {response.status} {response.read()[:200]!r}"
+                )
+            for line in iter(response.readline, b""):
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        except (OSError, http.client.HTTPException) as e:
+            raise DockerEngineError(str(e)) from e
+        finally:
+            connection.close()
+
+    def events(self, filters=None, since=None, until=None):
+        """
+        Liefert die Ereignisse des Daemons als Generator von Dicts. Der Stream
+        läuft über eine eigene Verbindung, beginnt bei 'since' und endet nach
+        'until' (jeweils Unix-Zeit).
+        """
+        query = {}
+        if filters:
+            query["filters"] = json.dumps(filters)
+        if since is not None:
+            query["since"] = str(int(since))
+        if until is not None:
+            query["until"] = str(int(until))
+        timeout = None if until is None else max(until - time.time(), 0) + 5
+        return self.stream("GET", "/events", query, timeout=timeout)
+
+    def wait_until_ready(
+        self,
+        timeout=DOCKER_START_TIMEOUT,
+        on_wait=None,
+        notify_interval=5.0,
+        initial_delay=0.1,
+        max_delay=2.0,
+    ):
+        """
+        Wartet mit exponentiellem Backoff, bis der Daemon auf /_ping antwortet.
+        'on_wait' wird höchstens alle 'notify_interval' Sekunden aufgerufen.
+        Gibt True zurück, sobald der Daemon bereit ist, oder False nach 'timeout'.
+        """
+        start = time.monotonic()
+        last_notify = start
+        delay = initial_delay
+        while True:
+            if self.ping():
+                return True
+            now = time.monotonic()
+            if now - start >= timeout:
+                return False
+            if on_wait and now - last_notify >= notify_interval:
+                on_wait()
+                last_notify = now
+            time.sleep(min(delay, timeout - (now - start)))
+            delay = min(delay * 2, max_delay)
+
+
+docker_client = DockerEngineClient()
+
+
+def is_docker_running():
+    """
+    Prüft über die Docker Engine API, ob Docker auf dem System läuft. Gibt True/False zurück.
+    """
+    return docker_client.ping()
+
+
+def ensure_docker_running():
+    """
+    Startet Docker Desktop unter Windows, falls es noch nicht läuft, und wartet,
+    bis die Docker Engine API antwortet. Gibt True zurück, wenn Docker bereit ist.
+    """
+    with tracer.span("docker_desktop", launched=False) as span:
+        if is_docker_running():
+            return True
+        if not os.path.exists(DOCKER_DESKTOP_PATH):
+            span.fail("Docker Desktop nicht gefunden")
+            log(
+                "Docker Desktop nicht gefunden. Bitte starten Sie Docker Desktop manuell."
+            )
+            return False
+
+        log("Docker Desktop wird gestartet...")
+        span.set(launched=True)
+
+        # Docker Desktop starten
+        subprocess.run(["start", "", DOCKER_DESKTOP_PATH], shell=True)
+
+        # Warten, bis die Docker Engine API antwortet
+        if not docker_client.wait_until_ready(
+            on_wait=lambda: log("Warte auf Docker Desktop...")
+        ):
+            span.fail("Zeitüberschreitung", outcome="timeout")
+            log("Docker Desktop ist nicht rechtzeitig gestartet.")
+            return False
+
+        log("Docker Desktop läuft.")
+        return True
+
+
+def start_stack(on_progress=None, timeout=READINESS_TIMEOUT):
+    """
+    Lädt die Images gemäß Pull-Strategie, führt 'compose up -d' aus und
+    wartet, bis alle Dienste bereit sind. Gibt (bereit, tracker) zurück;
+    'tracker' ist None, wenn schon 'compose up' fehlgeschlagen ist.
+    """
+    started = time.monotonic()
+    config = load_config()
+
+    if get_api_replicas(config) > 1 and not compose_supports_replicas():
+        log(
+            "Mehrere API-Replikate brauchen Docker Compose v2; 'docker-compose' v1 "
+            "würde nur ein Replikat starten. Bitte Docker Compose aktualisieren "
+            "oder 'API-Replikate' auf 1 setzen."
+        )
+        return False, None
+
+    with tracer.span("mysql_profile") as span:
+        profile, max_connections = write_mysql_config(config)
+        replicas = get_api_replicas(config)
+        span.set(profile=profile, api_replicas=replicas)
+        original = copy.deepcopy(config)
+        # Ältere Compose-Dateien binden die verwaltete Konfiguration noch nicht ein,
+        # von Hand geänderte Replikat-Zahlen haben noch keinen Proxy-Dienst
+        if MYSQL_CONFIG_VOLUME not in config["services"]["db"].get("volumes", []) or (
+            replicas > 1
+        ) != (API_PROXY_SERVICE in config["services"]):
+            fix_dependent_values(config)
+        set_api_connection_limit(
+            config, api_connection_limit(max_connections, replicas)
+        )
+        # Nur schreiben, wenn sich ein Wert tatsächlich geändert hat
+        if config != original:
+            save_config(config)
+        if replicas > 1:
+            write_api_proxy_config()
+
+    with tracer.span("images") as span:
+        if not ensure_compose_images(config):
+            span.fail("Nicht alle Images verfügbar")
+            log("Nicht alle Images sind verfügbar, docker-compose versucht es erneut.")
+        image_puller.reset()
+
+    # Images sind bereits gemäß Pull-Strategie geladen, nur Fehlendes nachholen
+    with tracer.span("compose_up") as span:
+        if replicas > 1:
+            start_single_api_replica(config, timeout)
+        returncode = run_command(
+            compose_args("up", "-d", "--pull", "missing"),
+            name="compose up",
+            exclusive="compose",
+        )
+        span.set(exit_code=returncode)
+        if returncode != 0:
+            span.fail(f"Exit-Code {returncode}")
+            log("compose up ist fehlgeschlagen.")
+            return False, None
+
+    tracker = ReadinessTracker(config, started=started, on_change=on_progress)
+    with tracer.span("readiness", services=len(tracker.services)) as span:
+        ready = tracker.wait(timeout)
+        if not ready:
+            span.fail("Nicht alle Dienste bereit")
+    if ready:
+        log(f"Alle Dienste bereit nach {tracker.finished} s.")
+    else:
+        log("Nicht alle Dienste sind bereit geworden. Details siehe oben.")
+    tracker.write_timeline()
+    return ready, tracker
+
+
+def start_single_api_replica(config, timeout=READINESS_TIMEOUT):
+    """
+    Startet den Stack zunächst mit nur einem api-Replikat und wartet, bis es
+    über den Proxy antwortet. Jedes Replikat legt beim Start den ersten
+    Controller an, falls noch keiner existiert (findFirst, dann create); auf
+    einer frischen Datenbank scheitern gleichzeitig gestartete Replikate sonst
+    am Unique-Index von User.username.
+    """
+    with tracer.span("api_first_replica") as span:
+        returncode = run_command(
+            compose_args("up", "-d", "--pull", "missing", "--scale", "api=1"),
+            name="compose up (1 api-Replikat)",
+            exclusive="compose",
+        )
+        if returncode != 0:
+            span.fail(f"Exit-Code {returncode}")
+            return False
+        url = f"http://localhost:{get_api_port(config)}{SERVICE_HTTP_PROBES['api']}"
+        if not wait_for_http([url], timeout=timeout):
+            span.fail("API antwortet nicht")
+            log("Das erste API-Replikat antwortet nicht, starte trotzdem alle.")
+            return False
+    return True
+
+
+def start_docker_if_needed():
+    """
+    Startet Docker Desktop unter Windows, falls es noch nicht läuft.
+    Wartet im Hintergrund, bis Docker läuft und ruft danach 'start_docker_compose' auf.
+    """
+
+    boot_span = tracer.start_span("boot", mode="gui")
+
+    def docker_thread():
+        with tracer.activate(boot_span):
+            docker_ready = ensure_docker_running()
+        if not docker_ready:
+            boot_span.fail("Docker ist nicht verfügbar")
+            boot_span.end()
+            root.after(0, reset_toggle_button)
+            return
+
+        # Sobald Docker läuft, docker-compose aufrufen
+        start_docker_compose(boot_span)
+
+    threading.Thread(target=docker_thread, daemon=True).start()
+
+
+def start_docker_compose(boot_span=None):
+    """
+    Startet den Stack im Hintergrund und setzt erst dann den Anwendungsstatus
+    auf "läuft", wenn alle Dienste bereit sind. 'boot_span' wird nach dem
+    Start abgeschlossen.
+    """
+
+    def update_status():
+        # Nach dem Start => app_is_running = True, Toggle-Button anpassen
+        global app_is_running
+        app_is_running = True
+        toggle_button.configure(
             text="Anwendung stoppen", state=tk.NORMAL, style="UpdateOrange.TButton"
         )
 
-    cmd = f"docker-compose -f {DOCKER_COMPOSE_FILE} up -d --pull always"
-    threading.Thread(target=run_command, args=(cmd, update_status), daemon=True).start()
+    def show_progress(ready, total):
+        root.after(
+            0,
+            lambda: toggle_button.configure(
+                text=f"Warte auf Dienste ({ready}/{total})..."
+            ),
+        )
+
+    def compose_thread():
+        boot = boot_span or tracer.start_span("boot", mode="gui")
+        with tracer.activate(boot):
+            ready, tracker = start_stack(on_progress=show_progress)
+        if not ready:
+            boot.fail("Stack nicht bereit")
+        boot.end()
+        if tracker is None:
+            root.after(0, reset_toggle_button)
+            return
+        # Auch bei Fehlern laufen Container, daher bleibt "Anwendung stoppen" möglich
+        container_logs.start()
+        root.after(0, update_status)
+        # Browser-Button erst freigeben, wenn die API vorgewärmt ist
+        if ready:
+            warm_up_api(load_config())
+        root.after(0, lambda: open_browser_button.config(state=tk.NORMAL))
+
+    threading.Thread(target=compose_thread, daemon=True).start()
+
+
+def stop_docker_compose():
+    """
+    Führt 'compose stop' für das definierte Compose-File aus.
+    """
+    with tracer.span("compose_stop") as span:
+        returncode = run_command(
+            compose_args("stop"), name="compose stop", exclusive="compose"
+        )
+        span.set(exit_code=returncode)
+
+
+# ============================================================================
+#   BEREITSCHAFT DER DIENSTE (READINESS)
+# ============================================================================
+
+
+def get_compose_project_name(config):
+    """
+    Ermittelt den Projektnamen, unter dem docker-compose die Container anlegt
+    (Feld 'name' der Compose-Datei, sonst der Verzeichnisname).
+    """
+    name = config.get("name")
+    if not name:
+        folder = os.path.basename(os.path.dirname(os.path.abspath(DOCKER_COMPOSE_FILE)))
+        name = "".join(c for c in folder.lower() if c.isalnum() or c in "-_")
+    return name
+
+
+def get_published_port(service_config):
+    """
+    Gibt den Host-Port des ersten Port-Mappings eines Dienstes zurück (z. B. "3000:3000").
+    """
+    ports = service_config.get("ports") or []
+    if not ports:
+        return None
+    mapping = str(ports[0])
+    return mapping.split(":")[-2] if ":" in mapping else mapping
+
+
+def _depends_on_items(service):
+    """
+    Liefert (Dienst, Optionen) für 'depends_on' in Listen- und Dict-Schreibweise.
+    """
+    depends_on = service.get("depends_on") or {}
+    if isinstance(depends_on, list):
+        return [(name, {}) for name in depends_on]
+    return [(name, options or {}) for name, options in depends_on.items()]
+
+
+def probe_http(url, timeout=SERVICE_PROBE_TIMEOUT):
+    """
+    Gibt den HTTP-Status zurück, sobald der Dienst antwortet (< 500), sonst None.
+    """
+    try:
+        response = get_http_session().get(url, timeout=timeout)
+    except requests.exceptions.RequestException:
+        return None
+    return response.status_code if response.status_code < 500 else None
+
+
+class ReadinessTracker:
+    """
+    Verfolgt jeden Dienst des Compose-Projekts über die Stufen
+    created -> running -> healthy/completed -> serving und hält fest,
+    wann welche Stufe erreicht wurde.
+    - Dienste mit Healthcheck sind erst mit Status "healthy" bereit.
+    - Einmal-Jobs (andere Dienste warten auf service_completed_successfully)
+      sind bereit, sobald sie mit Exit-Code 0 beendet sind.
+    - Dienste aus SERVICE_HTTP_PROBES müssen zusätzlich per HTTP antworten
+      ("serving": erste Antwort mit Status < 500, nicht unbedingt 200; der
+      Status steht als "serving_status" in der Timeline).
+    - Dienste mit mehreren Containern (deploy.replicas) erreichen eine Stufe
+      erst, wenn alle angelegten Replikate sie erreicht haben.
+    """
+
+    def __init__(self, config, client=None, started=None, on_change=None):
+        self.client = client or docker_client
+        self.project = get_compose_project_name(config)
+        self.started = started if started is not None else time.monotonic()
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.on_change = on_change
+        self.finished = None
+        self.events_live = False
+
+        services = config.get("services", {})
+        jobs = {
+            dependency
+            for service in services.values()
+            for dependency, options in _depends_on_items(service)
+            if options.get("condition") == "service_completed_successfully"
+        }
+
+        self.services = {}
+        for name, service in services.items():
+            if name in jobs:
+                target = "completed"
+            elif "healthcheck" in service:
+                target = "healthy"
+            else:
+                target = "running"
+
+            probe_url = None
+            port = get_published_port(service)
+            if name in SERVICE_HTTP_PROBES and port:
+                probe_url = f"http://localhost:{port}{SERVICE_HTTP_PROBES[name]}"
+
+            self.services[name] = {
+                "target": target,
+                "probe_url": probe_url,
+                "replicas": int((service.get("deploy") or {}).get("replicas", 1)),
+                "replica_stages": {},
+                "stage": "pending",
+                "ready": False,
+                "error": None,
+                "timeline": {},
+            }
+
+    def _trace_services(self, tracking_since):
+        """
+        Schreibt pro Dienst einen Span vom Beginn des Wartens bis zur Bereitschaft
+        (bzw. bis zum Fehler oder Timeout).
+        """
+        now = time.monotonic()
+        for name, service in self.services.items():
+            if service["ready"]:
+                stage = "serving" if service["probe_url"] else service["target"]
+                end, outcome = self.started + service["timeline"][stage], "ok"
+            elif service["error"]:
+                end, outcome = now, "error"
+            else:
+                end, outcome = now, "timeout"
+            tracer.record(
+                f"readiness:{name}",
+                min(tracking_since, end),
+                end,
+                outcome=outcome,
+                error=service["error"],
+                target=service["target"],
+                timeline=service["timeline"],
+            )
+
+    def _reach(self, name, stage):
+        service = self.services[name]
+        if stage in service["timeline"]:
+            return False
+        service["timeline"][stage] = round(time.monotonic() - self.started, 2)
+        service["stage"] = stage
+        replicas = (
+            f", {service['replicas']} Replikate" if service["replicas"] > 1 else ""
+        )
+        log(f"Dienst {name}: {stage} ({service['timeline'][stage]} s{replicas})")
+        return True
+
+    def poll(self):
+        """
+        Fragt einmal den Zustand aller Container ab. Gibt True zurück, wenn
+        sich dabei etwas geändert hat.
+        """
+        containers = self.client.containers(
+            all=True,
+            filters={"label": [f"com.docker.compose.project={self.project}"]},
+        )
+        by_service = {}
+        for container in containers:
+            service_name = container["Labels"].get("com.docker.compose.service")
+            by_service.setdefault(service_name, []).append(container)
+
+        changed = False
+        for name, service in self.services.items():
+            if service["ready"] or service["error"]:
+                continue
+            # Maßgeblich sind die tatsächlich angelegten Container, nicht
+            # deploy.replicas (z. B. ignoriert von docker-compose v1)
+            if by_service.get(name):
+                service["replicas"] = len(by_service[name])
+            replica_stages = service["replica_stages"]
+            for container in by_service.get(name, []):
+                stages = replica_stages.setdefault(container["Id"], {"created"})
+                state = self.client.inspect_container(container["Id"])["State"]
+                health = (state.get("Health") or {}).get("Status")
+                if state.get("Running"):
+                    stages.add("running")
+                    if health == "healthy":
+                        stages.add("healthy")
+                    elif health == "unhealthy":
+                        service["error"] = "Healthcheck fehlgeschlagen"
+                elif state.get("Status") in ("exited", "dead"):
+                    exit_code = state.get("ExitCode")
+                    if service["target"] == "completed" and exit_code == 0:
+                        stages.add("completed")
+                    else:
+                        service["error"] = f"beendet mit Exit-Code {exit_code}"
+                if service["error"] and service["replicas"] > 1:
+                    names = container.get("Names") or [container["Id"][:12]]
+                    service["error"] += f" ({names[0].lstrip('/')})"
+                    break
+
+            # Eine Stufe gilt erst, wenn alle Replikate sie erreicht haben
+            for stage in ("created", "running", service["target"]):
+                reached = sum(
+                    1 for stages in replica_stages.values() if stage in stages
+                )
+                if reached >= service["replicas"]:
+                    changed |= self._reach(name, stage)
+
+            if service["error"]:
+                log(f"Dienst {name}: {service['error']}")
+                changed = True
+                continue
+
+            if service["target"] not in service["timeline"]:
+                continue
+            if service["probe_url"]:
+                status = probe_http(service["probe_url"])
+                if status is None:
+                    continue
+                changed |= self._reach(name, "serving")
+                service["timeline"]["serving_status"] = status
+            service["ready"] = True
+            changed = True
+
+        return changed
+
+    def all_ready(self):
+        return all(service["ready"] for service in self.services.values())
+
+    def failed(self):
+        return any(service["error"] for service in self.services.values())
+
+    def summary(self):
+        ready = sum(1 for service in self.services.values() if service["ready"])
+        return ready, len(self.services)
+
+    def _watch_events(self, wake, stop, since):
+        """
+        Setzt 'wake' bei jedem Container-Ereignis des Projekts (Anlegen, Start,
+        Ende, Healthcheck), bis 'stop' gesetzt ist. Der Stream wird in Abschnitten
+        von READINESS_EVENT_WINDOW Sekunden abonniert, lückenlos über 'since'.
+        Liefert der Daemon keine Events, bleibt es beim Pollen im Takt von wait().
+        """
+        filters = {
+            "type": ["container"],
+            "label": [f"com.docker.compose.project={self.project}"],
+            "event": ["create", "start", "die", "health_status"],
+        }
+        self.events_live = True
+        try:
+            while not stop.is_set():
+                until = int(time.time()) + READINESS_EVENT_WINDOW
+                for _ in self.client.events(filters, since=since, until=until):
+                    wake.set()
+                since = until
+        except DockerEngineError as e:
+            log(f"Docker-Events nicht verfügbar, Status wird gepollt: {e}")
+        finally:
+            self.events_live = False
+            wake.set()
+
+    def _poll_interval(self, interval):
+        """
+        Wartezeit bis zum nächsten Poll: mit Events nur als Rückfallebene, sonst
+        und solange ein Dienst nur noch auf seine HTTP-Probe wartet 'interval'.
+        """
+        if not self.events_live:
+            return interval
+        for service in self.services.values():
+            if (
+                service["probe_url"]
+                and not service["ready"]
+                and service["target"] in service["timeline"]
+            ):
+                return interval
+        return max(interval, READINESS_EVENT_POLL_INTERVAL)
+
+    def wait(self, timeout=READINESS_TIMEOUT, interval=READINESS_POLL_INTERVAL):
+        """
+        Wartet, bis alle Dienste bereit sind, einer fehlschlägt oder 'timeout'
+        Sekunden vergangen sind. Docker-Events wecken die Abfrage sofort; ohne
+        Events wird alle 'interval' Sekunden gepollt. Gibt True zurück, wenn der
+        Stack bereit ist.
+        """
+        tracking_since = time.monotonic()
+        deadline = tracking_since + timeout
+        wake = threading.Event()
+        stop = threading.Event()
+        threading.Thread(
+            target=self._watch_events,
+            args=(wake, stop, int(time.time())),
+            daemon=True,
+        ).start()
+        try:
+            while True:
+                wake.clear()
+                try:
+                    changed = self.poll()
+                except DockerEngineError as e:
+                    log(f"Docker-Status nicht abrufbar: {e}")
+                    changed = False
+                if changed and self.on_change:
+                    self.on_change(*self.summary())
+                if self.all_ready() or self.failed():
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wake.wait(min(self._poll_interval(interval), remaining))
+        finally:
+            stop.set()
+
+        self.finished = round(time.monotonic() - self.started, 2)
+        self._trace_services(tracking_since)
+        return self.all_ready()
+
+    def timeline(self):
+        """
+        Gibt den Zeitverlauf des Starts als Dictionary zurück.
+        """
+        return {
+            "version": CURRENT_VERSION,
+            "started_at": self.started_at,
+            "ready": self.all_ready(),
+            "total_s": self.finished,
+            "services": {
+                name: dict(service["timeline"], error=service["error"])
+                for name, service in self.services.items()
+            },
+        }
+
+    def write_timeline(self, path=READINESS_TIMELINE_FILE):
+        """
+        Hängt den Zeitverlauf als JSON-Zeile an die Timeline-Datei an.
+        """
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.timeline()) + "\n")
+        except OSError as e:
+            log(f"Start-Timeline konnte nicht gespeichert werden: {e}")
+
+
+# ============================================================================
+#   VORWÄRMEN (HTTP-PROBES, WARM-UP DER API)
+# ============================================================================
+
+
+def get_warmup_paths(config):
+    """
+    Liest die kommagetrennten GET-Pfade für das Vorwärmen aus den Einstellungen.
+    """
+    value = get_boot_setting(config, "warmup_paths") or ""
+    return [path.strip() for path in str(value).split(",") if path.strip()]
+
+
+def wait_for_http(urls, timeout=WARMUP_HTTP_TIMEOUT, interval=READINESS_POLL_INTERVAL):
+    """
+    Pollt alle URLs parallel über die gemeinsame HTTP-Session, bis jede antwortet
+    oder 'timeout' Sekunden vergangen sind. Gibt {URL: Sekunden bis zur ersten
+    Antwort} zurück; URLs ohne Antwort fehlen im Ergebnis.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    answered = {}
+    pending = list(urls)
+    with ThreadPoolExecutor(max_workers=max(len(pending), 1)) as pool:
+        while pending:
+            statuses = list(pool.map(probe_http, pending))
+            now = time.monotonic()
+            for url, status in zip(pending, statuses):
+                if status is not None:
+                    answered[url] = round(now - started, 2)
+            pending = [url for url in pending if url not in answered]
+            if not pending or now >= deadline:
+                break
+            time.sleep(interval)
+    return answered
+
+
+def api_login(base_url, username, password, session=None):
+    """
+    Meldet sich über /auth/login an und gibt das JWT zurück (None bei Fehlern).
+    """
+    session = session or get_http_session()
+    try:
+        response = session.post(
+            f"{base_url}/auth/login",
+            json={"username": username, "password": password},
+            timeout=WARMUP_REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+    return loadtest.get_access_token(data)
+
+
+def timed_get(url, headers=None, session=None, timeout=WARMUP_REQUEST_TIMEOUT):
+    """
+    Führt einen GET aus und misst die Zeit bis zum ersten Byte (Antwort-Header)
+    sowie bis zum vollständigen Body. Fehler werden im Ergebnis vermerkt, auch
+    Antworten mit Status >= 400 (z. B. 404 bei falschem Pfad wärmt nichts vor).
+    """
+    session = session or get_http_session()
+    start = time.monotonic()
+    result = {"status": None}
+    try:
+        with session.get(
+            url, headers=headers, timeout=timeout, stream=True
+        ) as response:
+            result["status"] = response.status_code
+            result["first_byte_ms"] = round(response.elapsed.total_seconds() * 1000, 1)
+            result["bytes"] = len(response.content)
+        if response.status_code >= 400:
+            result["error"] = f"HTTP {response.status_code}"
+    except requests.exceptions.RequestException as e:
+        result["error"] = str(e)
+    result["total_ms"] = round((time.monotonic() - start) * 1000, 1)
+    tracer.record(
+        "warmup_request",
+        start,
+        time.monotonic(),
+        outcome="error" if "error" in result else "ok",
+        error=result.get("error"),
+        url=url,
+        status=result["status"],
+    )
+    return result
+
+
+def warm_up_api(
+    config, paths=None, rounds=WARMUP_ROUNDS, http_timeout=WARMUP_HTTP_TIMEOUT
+):
+    """
+    Wartet, bis Web-Oberfläche und API per HTTP antworten, meldet sich als
+    Admin-Controller an und ruft die lesenden Endpunkte in mehreren Runden mit
+    begrenzter Parallelität auf. So sind Node-Prozess, Verbindungs-Pools und
+    MySQL-Buffer-Pool warm, bevor der erste Benutzer kommt.
+    Gibt einen Bericht mit den Latenzen (erstes Byte) pro Pfad und Runde zurück.
+    """
+    services = config.get("services", {})
+    api_env = services["api"].get("environment", {})
+    api_url = f"http://localhost:{get_api_port(config)}"
+    urls = {"api": f"{api_url}{SERVICE_HTTP_PROBES['api']}"}
+    web_port = get_published_port(services.get("web", {}))
+    if web_port:
+        urls["web"] = f"http://localhost:{web_port}{SERVICE_HTTP_PROBES['web']}"
+    paths = get_warmup_paths(config) if paths is None else paths
+    report = {"ok": True, "http_ready_s": {}, "authenticated": False, "requests": []}
+
+    with tracer.span("warmup", paths=len(paths), rounds=rounds) as span:
+        answered = wait_for_http(urls.values(), timeout=http_timeout)
+        report["http_ready_s"] = {name: answered.get(url) for name, url in urls.items()}
+        missing = [name for name, url in urls.items() if url not in answered]
+        if missing:
+            report["ok"] = False
+            report["error"] = f"keine Antwort von {', '.join(missing)}"
+            span.fail(report["error"])
+            log(f"Vorwärmen abgebrochen: {report['error']}")
+            return report
+
+        token = api_login(
+            api_url,
+            api_env.get("FIRST_CONTROLLER_USERNAME"),
+            api_env.get("FIRST_CONTROLLER_PASSWORD"),
+        )
+        report["authenticated"] = token is not None
+        headers = {"Authorization": f"Bearer {token}"} if token else None
+
+        # Runden nacheinander, damit die zweite Runde die warmen Latenzen zeigt
+        with ThreadPoolExecutor(max_workers=WARMUP_CONCURRENCY) as pool:
+            for round_number in range(1, rounds + 1):
+                results = pool.map(
+                    lambda path: timed_get(f"{api_url}{path}", headers), paths
+                )
+                for path, result in zip(paths, results):
+                    report["requests"].append(
+                        dict(result, path=path, round=round_number)
+                    )
+        span.set(authenticated=report["authenticated"])
+
+    for path in paths:
+        timings = [
+            (
+                f"Fehler ({entry['error']})"
+                if "error" in entry
+                else f"{entry['first_byte_ms']:.0f} ms"
+            )
+            for entry in report["requests"]
+            if entry["path"] == path
+        ]
+        log(f"Vorwärmen {path}: {' -> '.join(timings)}")
+    if report["requests"] and all("error" in entry for entry in report["requests"]):
+        report["ok"] = False
+        report["error"] = "alle Vorwärm-Anfragen fehlgeschlagen"
+        log(
+            "Warnung: Keine Vorwärm-Anfrage war erfolgreich. Stimmen die Pfade "
+            "unter 'API vorwärmen (GET-Pfade)' und die Controller-Zugangsdaten?"
+        )
+    write_warmup_results(report)
+    return report
+
+
+def write_warmup_results(report, path=WARMUP_RESULTS_FILE):
+    """
+    Hängt den Bericht des Vorwärmens als JSON-Zeile an die Ergebnisdatei an.
+    """
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(
+                json.dumps(dict(report, time=time.strftime("%Y-%m-%dT%H:%M:%S"))) + "\n"
+            )
+    except OSError as e:
+        log(f"Vorwärm-Ergebnisse konnten nicht gespeichert werden: {e}")
+
+
+# ============================================================================
+#   HERUNTERFAHREN (STOP-REIHENFOLGE, KOORDINATOR)
+# ============================================================================
+
+
+def parse_compose_duration(value, default):
+    """
+    Wandelt eine Compose-Dauer ("10s", "1m30s", 5) in Sekunden um.
+    """
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    factors = {"h": 3600, "m": 60, "s": 1, "ms": 0.001, "us": 0.000001}
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|us|h|m|s)", str(value))
+    if not parts:
+        return default
+    return sum(float(amount) * factors[unit] for amount, unit in parts)
+
+
+def get_stop_order(config):
+    """
+    Teilt die Dienste in Stufen ein, die nacheinander gestoppt werden: zuerst die
+    Dienste, von denen niemand abhängt, zuletzt die Basisdienste (z. B. die
+    Datenbank). Innerhalb einer Stufe kann parallel gestoppt werden.
+    """
+    services = config.get("services", {})
+    dependents = {name: set() for name in services}
+    for name, service in services.items():
+        for dependency, _ in _depends_on_items(service):
+            if dependency in dependents:
+                dependents[dependency].add(name)
+
+    waves = []
+    remaining = set(services)
+    while remaining:
+        wave = sorted(name for name in remaining if not dependents[name] & remaining)
+        # Zyklische Abhängigkeiten: Rest gemeinsam stoppen
+        waves.append(wave or sorted(remaining))
+        remaining -= set(waves[-1])
+    return waves
+
+
+def stop_stack(config=None, client=None, on_progress=None):
+    """
+    Stoppt alle laufenden Container des Compose-Projekts in umgekehrter
+    Abhängigkeitsreihenfolge; Container derselben Stufe parallel, jeweils mit der
+    Grace-Zeit ihres Dienstes. Ist die Docker Engine API nicht nutzbar, wird auf
+    'compose stop' zurückgegriffen.
+    Gibt einen Bericht mit Dauer pro Dienst und Gesamtlatenz zurück.
+    """
+    config = config if config is not None else load_config()
+    client = client or docker_client
+    started = time.monotonic()
+    report = {"ok": True, "services": {}}
+
+    try:
+        containers = client.containers(
+            filters={
+                "label": [
+                    f"com.docker.compose.project={get_compose_project_name(config)}"
+                ]
+            }
+        )
+    except DockerEngineError as e:
+        log(f"Docker Engine API nicht nutzbar ({e}), verwende compose stop.")
+        stop_docker_compose()
+        report["latency_s"] = round(time.monotonic() - started, 2)
+        return report
+
+    running = {}
+    for container in containers:
+        service = container["Labels"].get("com.docker.compose.service")
+        running.setdefault(service, []).append(container["Id"])
+
+    services = config.get("services", {})
+    waves = [
+        [name for name in wave if name in running] for wave in get_stop_order(config)
+    ]
+    # Container ohne Eintrag in der Compose-Datei zuerst stoppen
+    unknown = sorted(name for name in running if name not in services)
+    waves = [wave for wave in [unknown] + waves if wave]
+    total = sum(len(ids) for ids in running.values())
+    stopped = 0
+    parent = tracer.current()
+
+    def stop_one(service, container_id, grace):
+        start = time.monotonic()
+        with tracer.span(f"stop:{service}", parent=parent, grace=grace) as span:
+            try:
+                client.stop_container(container_id, grace)
+                error = None
+            except DockerEngineError as e:
+                span.fail(e)
+                error = str(e)
+        return service, time.monotonic() - start, error
+
+    for wave in waves:
+        jobs = [
+            (
+                service,
+                container_id,
+                parse_compose_duration(
+                    services.get(service, {}).get("stop_grace_period"),
+                    SHUTDOWN_DEFAULT_GRACE,
+                ),
+            )
+            for service in wave
+            for container_id in running[service]
+        ]
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            for future in [pool.submit(stop_one, *job) for job in jobs]:
+                service, duration, error = future.result()
+                entry = report["services"].setdefault(service, {"duration_s": 0})
+                entry["duration_s"] = max(entry["duration_s"], round(duration, 2))
+                if error:
+                    entry["error"] = error
+                    report["ok"] = False
+                    log(f"Dienst {service} konnte nicht gestoppt werden: {error}")
+                stopped += 1
+                if on_progress:
+                    on_progress(stopped, total)
+
+    report["latency_s"] = round(time.monotonic() - started, 2)
+    log(f"{stopped} Container gestoppt nach {report['latency_s']} s.")
+    return report
+
+
+class ShutdownCoordinator:
+    """
+    Fährt den Stack beim Beenden des Boot Managers genau einmal herunter, egal ob
+    das Fenster geschlossen, ein Update installiert oder der Prozess über atexit
+    beendet wird. Spätere Aufrufe warten auf den ersten und liefern dessen Bericht.
+    Mit der Einstellung "keep_running" bleibt der Stack im Hintergrund aktiv.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.report = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def shutdown(self, trigger, on_progress=None):
+        with self._lock:
+            first_call = not self.started
+            self.started = True
+        if not first_call:
+            self._done.wait()
+            return self.report
+
+        try:
+            with tracer.span("shutdown", trigger=trigger) as span:
+                container_logs.stop()
+                # Ein laufendes 'compose up' würde gestoppte Container neu anlegen
+                process_supervisor.cancel_all(exclusive="compose")
+                config = load_config()
+                if get_boot_setting(config, "keep_running") == "ja":
+                    log("Stack läuft im Hintergrund weiter.")
+                    self.report = {"ok": True, "kept_running": True}
+                else:
+                    self.report = dict(
+                        stop_stack(config, on_progress=on_progress),
+                        kept_running=False,
+                    )
+                    span.set(latency_s=self.report["latency_s"])
+                span.set(kept_running=self.report["kept_running"])
+        except OSError as e:
+            log(f"Herunterfahren fehlgeschlagen: {e}")
+            self.report = {"ok": False, "error": str(e)}
+        finally:
+            self._done.set()
+        return self.report
+
+
+shutdown_coordinator = ShutdownCoordinator()
+
+
+# ============================================================================
+#   RESSOURCEN-MONITOR (DOCKER STATS)
+# ============================================================================
+
+# Angezeigte Kennzahlen: (Schlüssel, Beschriftung, Formatierung)
+RESOURCE_METRICS = (
+    ("cpu", "CPU", lambda value: f"{value:.0f} %"),
+    ("memory", "RAM", lambda value: format_bytes(int(value))),
+    ("network", "Netz", lambda value: f"{format_bytes(int(value))}/s"),
+    ("block_io", "Block-I/O", lambda value: f"{format_bytes(int(value))}/s"),
+)
+
+
+def parse_container_stats(stats, previous=None):
+    """
+    Rechnet eine Antwort von /containers/{id}/stats in Kennzahlen um.
+    Netz- und Block-I/O liefert Docker als Zählerstände; die Raten ergeben sich
+    aus den Zählerständen der vorigen Messung ('previous').
+    Gibt (Kennzahlen, Zählerstände) zurück.
+    """
+    cpu = stats.get("cpu_stats") or {}
+    precpu = stats.get("precpu_stats") or {}
+    cpu_usage = cpu.get("cpu_usage") or {}
+    cpu_delta = cpu_usage.get("total_usage", 0) - (precpu.get("cpu_usage") or {}).get(
+        "total_usage", 0
+    )
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online_cpus = (
+        cpu.get("online_cpus") or len(cpu_usage.get("percpu_usage") or []) or 1
+    )
+    cpu_percent = 0.0
+    if cpu_delta > 0 and system_delta > 0:
+        cpu_percent = cpu_delta / system_delta * online_cpus * 100
+
+    # Wie 'docker stats': Page Cache (inactive_file bzw. cache) nicht mitzählen
+    memory = stats.get("memory_stats") or {}
+    memory_details = memory.get("stats") or {}
+    page_cache = memory_details.get("inactive_file", memory_details.get("cache", 0))
+    memory_used = max(memory.get("usage", 0) - page_cache, 0)
+
+    counters = {"time": time.monotonic(), "rx": 0, "tx": 0, "read": 0, "write": 0}
+    for network in (stats.get("networks") or {}).values():
+        counters["rx"] += network.get("rx_bytes", 0)
+        counters["tx"] += network.get("tx_bytes", 0)
+    blkio = (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []
+    for entry in blkio:
+        operation = entry.get("op", "").lower()
+        if operation in ("read", "write"):
+            counters[operation] += entry.get("value", 0)
+
+    rates = {"rx": 0.0, "tx": 0.0, "read": 0.0, "write": 0.0}
+    if previous:
+        elapsed = counters["time"] - previous["time"]
+        if elapsed > 0:
+            for key in rates:
+                rates[key] = max(counters[key] - previous[key], 0) / elapsed
+
+    sample = {
+        "cpu": cpu_percent,
+        "memory": memory_used,
+        "network": rates["rx"] + rates["tx"],
+        "block_io": rates["read"] + rates["write"],
+    }
+    return sample, counters
+
+
+class ResourceHistory:
+    """
+    Ringpuffer fester Größe für die Kennzahlen eines Dienstes in zwei Auflösungen:
+    jede Messung der letzten Minute und Mittelwerte über 'coarse_interval'
+    Sekunden für die letzte Stunde.
+    """
+
+    def __init__(
+        self,
+        fine_points=STATS_FINE_POINTS,
+        coarse_interval=STATS_COARSE_INTERVAL,
+        coarse_points=STATS_COARSE_POINTS,
+    ):
+        self.fine = deque(maxlen=fine_points)
+        self.coarse = deque(maxlen=coarse_points)
+        self.coarse_interval = coarse_interval
+        self.latest = None
+        self._bucket = []
+        self._bucket_index = None
+
+    def add(self, timestamp, sample):
+        self.latest = sample
+        self.fine.append(sample)
+
+        # Messungen desselben Zeitfensters sammeln, beim Wechsel gemittelt ablegen
+        bucket_index = int(timestamp // self.coarse_interval)
+        if self._bucket and bucket_index != self._bucket_index:
+            self.coarse.append(
+                {
+                    key: sum(entry[key] for entry in self._bucket) / len(self._bucket)
+                    for key in sample
+                }
+            )
+            self._bucket = []
+        self._bucket_index = bucket_index
+        self._bucket.append(sample)
+
+    def series(self, key, coarse=False):
+        return [sample[key] for sample in (self.coarse if coarse else self.fine)]
+
+
+class ResourceMonitor:
+    """
+    Sammelt die Ressourcennutzung aller laufenden Container des Compose-Projekts.
+    - Normalbetrieb: ein Stats-Stream pro Container (eine Messung pro Sekunde).
+    - Gedrosselt (z. B. bei minimiertem Fenster): keine Streams, stattdessen
+      eine Einzelmessung pro Container alle STATS_COARSE_INTERVAL Sekunden.
+    """
+
+    def __init__(self, project, client=None, idle_interval=STATS_COARSE_INTERVAL):
+        self.project = project
+        self.client = client or docker_client
+        self.idle_interval = idle_interval
+        self.histories = {}
+        self.throttled = False
+        self._counters = {}
+        self._streams = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def set_throttled(self, throttled):
+        if throttled != self.throttled:
+            self.throttled = throttled
+            self._wake.set()
+
+    def snapshot(self, coarse=False):
+        """
+        Gibt pro Dienst die Messreihen aller Kennzahlen und die letzte Messung zurück.
+        """
+        with self._lock:
+            return {
+                service: (
+                    {
+                        key: history.series(key, coarse)
+                        for key, _, _ in RESOURCE_METRICS
+                    },
+                    history.latest,
+                )
+                for service, history in sorted(self.histories.items())
+            }
+
+    def _add(self, container_id, service, stats):
+        with self._lock:
+            sample, counters = parse_container_stats(
+                stats, self._counters.get(container_id)
+            )
+            self._counters[container_id] = counters
+            history = self.histories.setdefault(service, ResourceHistory())
+            history.add(time.time(), sample)
+
+    def _running_containers(self):
+        containers = self.client.containers(
+            filters={"label": [f"com.docker.compose.project={self.project}"]}
+        )
+        return {
+            container["Id"]: container["Labels"].get("com.docker.compose.service")
+            for container in containers
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                containers = self._running_containers()
+            except DockerEngineError:
+                containers = {}
+
+            if self.throttled:
+                for container_id, service in containers.items():
+                    if self._stop.is_set() or not self.throttled:
+                        break
+                    try:
+                        stats = self.client.stats(container_id, stream=False)
+                    except DockerEngineError:
+                        continue
+                    self._add(container_id, service, stats)
+                interval = self.idle_interval
+            else:
+                for container_id, service in containers.items():
+                    thread = self._streams.get(container_id)
+                    if thread is None or not thread.is_alive():
+                        thread = threading.Thread(
+                            target=self._follow,
+                            args=(container_id, service),
+                            daemon=True,
+                        )
+                        self._streams[container_id] = thread
+                        thread.start()
+                interval = STATS_DISCOVERY_INTERVAL
+
+            self._wake.wait(interval)
+            self._wake.clear()
+
+    def _follow(self, container_id, service):
+        """
+        Liest den Stats-Stream eines Containers, bis der Monitor gestoppt oder
+        gedrosselt wird oder der Container endet.
+        """
+        stream = self.client.stats(container_id)
+        try:
+            for stats in stream:
+                if self._stop.is_set() or self.throttled:
+                    break
+                self._add(container_id, service, stats)
+        except DockerEngineError:
+            pass
+        finally:
+            stream.close()
+
+
+def draw_sparkline(canvas, values, x, y, width, height, color, minimum_top=0.0):
+    """
+    Zeichnet eine Messreihe als Linie in das Rechteck (x, y, width, height).
+    Der obere Rand entspricht dem Maximum der Reihe, mindestens 'minimum_top'.
+    """
+    if len(values) < 2:
+        return
+    top = max(max(values), minimum_top) or 1
+    step = width / (len(values) - 1)
+    points = []
+    for index, value in enumerate(values):
+        points.extend((x + index * step, y + height - value / top * height))
+    canvas.create_line(*points, fill=color, width=1.5)
+
+
+def show_resource_monitor():
+    """
+    Öffnet das Fenster mit der Ressourcennutzung pro Dienst. Solange das Fenster
+    oder das Hauptfenster minimiert ist, wird der Monitor gedrosselt und nicht
+    neu gezeichnet; beim Schließen wird er beendet.
+    """
+    global resource_window
+    if resource_window is not None:
+        resource_window.deiconify()
+        resource_window.lift()
+        return
+
+    monitor = ResourceMonitor(get_compose_project_name(load_config()))
+    monitor.start()
+
+    window = resource_window = tk.Toplevel(root)
+    window.title("Ressourcen der Container")
+    window.resizable(False, False)
+
+    resolution_var = tk.StringVar(value="Letzte Minute")
+    ttk.Combobox(
+        window,
+        textvariable=resolution_var,
+        values=("Letzte Minute", "Letzte Stunde"),
+        state="readonly",
+        width=16,
+    ).pack(padx=10, pady=(10, 5), anchor="e")
+
+    style = ttk.Style(window)
+    background = style.lookup("TFrame", "background") or "white"
+    foreground = style.lookup("TLabel", "foreground") or "black"
+    colors = {
+        "cpu": "#e8743b",
+        "memory": "#4a90d9",
+        "network": "#19a979",
+        "block_io": "#945ecf",
+    }
+
+    canvas = tk.Canvas(
+        window,
+        width=560,
+        height=60,
+        background=background,
+        highlightthickness=0,
+    )
+    canvas.pack(padx=10, pady=(0, 10))
+
+    def redraw():
+        if not window.winfo_exists():
+            return
+        throttled = "iconic" in (root.state(), window.state())
+        monitor.set_throttled(throttled)
+        if not throttled:
+            coarse = resolution_var.get() == "Letzte Stunde"
+            snapshot = monitor.snapshot(coarse)
+            canvas.delete("all")
+            if not snapshot:
+                canvas.create_text(
+                    280, 30, text="Keine laufenden Container.", fill=foreground
+                )
+            row_height = 56
+            canvas.configure(height=max(len(snapshot) * row_height, 60))
+            for row, (service, (series, latest)) in enumerate(snapshot.items()):
+                top = row * row_height
+                canvas.create_text(
+                    5, top + 28, text=service, anchor="w", fill=foreground
+                )
+                for column, (key, label, format_value) in enumerate(RESOURCE_METRICS):
+                    x = 100 + column * 115
+                    canvas.create_text(
+                        x,
+                        top + 10,
+                        text=f"{label}: {format_value(latest[key])}",
+                        anchor="w",
+                        fill=foreground,
+                        font=("Arial", 8),
+                    )
+                    draw_sparkline(
+                        canvas,
+                        series[key],
+                        x,
+                        top + 20,
+                        105,
+                        28,
+                        colors[key],
+                        minimum_top=100.0 if key == "cpu" else 0.0,
+                    )
+        window.after(STATS_REDRAW_MS, redraw)
+
+    def close():
+        global resource_window
+        monitor.stop()
+        window.destroy()
+        resource_window = None
+
+    window.protocol("WM_DELETE_WINDOW", close)
+    redraw()
+
+
+# ============================================================================
+#   CONTAINER-LOGS (MULTIPLEX-LESER, PUFFER, DATEIEN)
+# ============================================================================
+
+# Stufe anhand typischer Marker (NestJS "ERROR [..]", MySQL "[Warning]" usw.)
+LOG_LEVEL_PATTERNS = (
+    ("ERROR", re.compile(r"\b(fatal|error|err|crit|critical|emerg)\b", re.I)),
+    ("WARN", re.compile(r"\b(warn|warning)\b", re.I)),
+    ("DEBUG", re.compile(r"\b(debug|verbose|trace)\b", re.I)),
+)
+
+
+def detect_log_level(message):
+    """
+    Bestimmt die Stufe einer Logzeile anhand ihres Anfangs; Standard ist INFO.
+    """
+    head = message[:100]
+    for level, pattern in LOG_LEVEL_PATTERNS:
+        if pattern.search(head):
+            return level
+    return "INFO"
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class ContainerLogs:
+    """
+    Folgt den Logs aller Dienste über einen einzigen 'compose logs -f'
+    (ein Prozess, ein Lese-Thread) und verteilt die Zeilen anhand des Präfixes
+    auf die Dienste:
+    - pro Dienst ein begrenzter Puffer im Speicher (älteste Zeilen fallen heraus),
+    - pro Dienst eine rotierende Datei in CONTAINER_LOG_DIR, ältere Dateien gzip-komprimiert.
+    """
+
+    def __init__(
+        self,
+        buffer_lines=CONTAINER_LOG_BUFFER_LINES,
+        log_dir=CONTAINER_LOG_DIR,
+        max_bytes=CONTAINER_LOG_MAX_BYTES,
+        backups=CONTAINER_LOG_BACKUPS,
+    ):
+        self.buffer_lines = buffer_lines
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.buffers = {}
+        self.version = (
+            0  # Zähler für neue Zeilen, damit die Ansicht nur bei Bedarf neu filtert
+        )
+        self._sequence = 0
+        self._containers = {}
+        self._handlers = {}
+        self._last_timestamp = None
+        self._process = None
+        self._lock = threading.Lock()
+
+    def is_running(self):
+        return self._process is not None and self._process.running
+
+    def start(self, config=None):
+        """
+        Startet den Leser, falls er nicht schon läuft. Beim ersten Start werden die
+        letzten CONTAINER_LOG_TAIL Zeilen geholt, danach ab der zuletzt gesehenen Zeile.
+        """
+        with self._lock:
+            if self.is_running():
+                return
+            self._containers = self._container_names(config or load_config())
+            command = compose_args("logs", "-f", "--no-color", "--timestamps")
+            if self._last_timestamp:
+                command += ["--since", self._last_timestamp]
+            else:
+                command += ["--tail", str(CONTAINER_LOG_TAIL)]
+            self._process = process_supervisor.start(
+                command, name="Container-Logs", on_line=self.add_line, merge_stderr=True
+            )
+
+    def stop(self):
+        process_supervisor.cancel(self._process)
+
+    @staticmethod
+    def _container_names(config):
+        """
+        Ordnet Containernamen (Präfix der Logzeilen) den Diensten zu.
+        """
+        project = get_compose_project_name(config)
+        names = {}
+        for service, service_config in config.get("services", {}).items():
+            names[service_config.get("container_name", service)] = service
+            replicas = int((service_config.get("deploy") or {}).get("replicas", 1))
+            for separator in ("-", "_"):
+                for index in range(1, replicas + 1):
+                    names[f"{project}{separator}{service}{separator}{index}"] = service
+        return names
+
+    def add_line(self, line):
+        """
+        Zerlegt eine Zeile "<container> | <zeitstempel> <text>" und legt sie ab.
+        Zeilen ohne Präfix (Meldungen von docker-compose selbst) gehören zu "compose".
+        """
+        prefix, separator, rest = line.partition("|")
+        if separator:
+            container = prefix.strip()
+            service = self._containers.get(
+                container, re.sub(r"[-_]\d+$", "", container)
+            )
+            rest = rest[1:] if rest.startswith(" ") else rest
+        else:
+            service, rest = "compose", line
+
+        timestamp, _, message = rest.partition(" ")
+        if timestamp[:1].isdigit() and "T" in timestamp:
+            self._last_timestamp = timestamp
+        else:
+            timestamp, message = "", rest
+        level = detect_log_level(message)
+
+        with self._lock:
+            self._sequence += 1
+            buffer = self.buffers.get(service)
+            if buffer is None:
+                buffer = self.buffers[service] = deque(maxlen=self.buffer_lines)
+            buffer.append((self._sequence, service, level, timestamp, message))
+            self.version += 1
+        self._write_file(service, rest)
+
+    def _write_file(self, service, text):
+        import logging.handlers
+
+        handler = self._handlers.get(service)
+        if handler is None:
+            try:
+                os.makedirs(self.log_dir, exist_ok=True)
+            except OSError:
+                return
+            handler = logging.handlers.RotatingFileHandler(
+                os.path.join(self.log_dir, f"{service}.log"),
+                maxBytes=self.max_bytes,
+                backupCount=self.backups,
+                encoding="utf-8",
+                delay=True,
+            )
+            handler.namer = lambda name: f"{name}.gz"
+            handler.rotator = _gzip_rotator
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._handlers[service] = handler
+        handler.emit(logging.makeLogRecord({"msg": text}))
+
+    def services(self):
+        with self._lock:
+            return sorted(self.buffers)
+
+    def entries(self, service=None, max_level=None):
+        """
+        Gibt die gepufferten Zeilen in Eingangsreihenfolge zurück, optional nur
+        für einen Dienst und nur bis zur Stufe 'max_level' (z. B. "WARN" = ERROR + WARN).
+        """
+        levels = LOG_LEVELS[: LOG_LEVELS.index(max_level) + 1] if max_level else None
+        with self._lock:
+            buffers = [self.buffers[service]] if service else self.buffers.values()
+            merged = heapq.merge(*[list(buffer) for buffer in buffers])
+            return [entry for entry in merged if levels is None or entry[2] in levels]
+
+
+container_logs = ContainerLogs()
+
+
+def show_container_logs():
+    """
+    Öffnet die Log-Ansicht aller Container. Die Ansicht ist virtualisiert: es
+    werden nur die CONTAINER_LOG_VIEW_ROWS sichtbaren Zeilen in das Textfeld
+    geschrieben, die Scrollbar wird selbst verwaltet. Am Ende der Liste folgt
+    die Ansicht neuen Zeilen automatisch.
+    """
+    container_logs.start()
+
+    window = tk.Toplevel(root)
+    window.title("Container-Logs")
+
+    filter_frame = ttk.Frame(window)
+    filter_frame.pack(fill="x", padx=10, pady=(10, 5))
+    all_services, all_levels = "Alle Dienste", "Alle Stufen"
+    service_var = tk.StringVar(value=all_services)
+    level_var = tk.StringVar(value=all_levels)
+    service_box = ttk.Combobox(
+        filter_frame, textvariable=service_var, state="readonly", width=18
+    )
+    service_box.pack(side=tk.LEFT, padx=(0, 5))
+    ttk.Combobox(
+        filter_frame,
+        textvariable=level_var,
+        values=(all_levels,) + LOG_LEVELS,
+        state="readonly",
+        width=12,
+    ).pack(side=tk.LEFT)
+    count_label = ttk.Label(filter_frame, text="")
+    count_label.pack(side=tk.RIGHT)
+
+    view_frame = ttk.Frame(window)
+    view_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+    text = tk.Text(
+        view_frame,
+        height=CONTAINER_LOG_VIEW_ROWS,
+        width=110,
+        wrap="none",
+        border=0,
+        highlightthickness=0,
+    )
+    text.tag_configure("ERROR", foreground="#e5534b")
+    text.tag_configure("WARN", foreground="#d29922")
+    text.tag_configure("DEBUG", foreground="gray")
+    scrollbar = ttk.Scrollbar(view_frame, orient="vertical")
+    scrollbar.pack(side=tk.RIGHT, fill="y")
+    text.pack(side=tk.LEFT, fill="both", expand=True)
+    text.bind("<Key>", lambda e: "break")
+
+    state = {"entries": [], "first": 0, "follow": True, "version": None, "filter": None}
+    rows = CONTAINER_LOG_VIEW_ROWS
+
+    def render():
+        entries = state["entries"]
+        last_first = max(len(entries) - rows, 0)
+        if state["follow"]:
+            state["first"] = last_first
+        state["first"] = min(max(state["first"], 0), last_first)
+        first = state["first"]
+
+        text.delete("1.0", tk.END)
+        for _, service, level, timestamp, message in entries[first : first + rows]:
+            text.insert(tk.END, f"{timestamp[11:19]} {service:>8} | {message}\n", level)
+        if entries:
+            scrollbar.set(first / len(entries), (first + rows) / len(entries))
+        else:
+            scrollbar.set(0, 1)
+        count_label.configure(text=f"{len(entries)} Zeilen")
+
+    def scroll_to(first):
+        state["first"] = first
+        state["follow"] = first >= len(state["entries"]) - rows
+        render()
+
+    def on_scrollbar(action, amount, unit=None):
+        if action == "moveto":
+            scroll_to(int(float(amount) * len(state["entries"])))
+        else:
+            step = rows if unit == "pages" else 1
+            scroll_to(state["first"] + int(amount) * step)
+
+    scrollbar.configure(command=on_scrollbar)
+    text.bind("<MouseWheel>", lambda e: scroll_to(state["first"] - e.delta // 40))
+    text.bind("<Button-4>", lambda e: scroll_to(state["first"] - 3))
+    text.bind("<Button-5>", lambda e: scroll_to(state["first"] + 3))
+
+    def refresh():
+        if not window.winfo_exists():
+            return
+        service_box.configure(values=(all_services,) + tuple(container_logs.services()))
+        service = service_var.get()
+        level = level_var.get()
+        current_filter = (
+            None if service == all_services else service,
+            None if level == all_levels else level,
+        )
+        # Nur neu filtern, wenn neue Zeilen da sind oder der Filter geändert wurde
+        if (
+            container_logs.version != state["version"]
+            or current_filter != state["filter"]
+        ):
+            if current_filter != state["filter"]:
+                state["follow"] = True
+            state["version"] = container_logs.version
+            state["filter"] = current_filter
+            state["entries"] = container_logs.entries(*current_filter)
+            render()
+        window.after(CONTAINER_LOG_REFRESH_MS, refresh)
+
+    refresh()
+
+
+# ============================================================================
+#   MYSQL-PROFILE (HOST-ABHÄNGIGE DATENBANK-EINSTELLUNGEN)
+# ============================================================================
+
+MB = 1024 * 1024
+GB = 1024 * MB
+
+
+def get_host_resources():
+    """
+    Ermittelt Arbeitsspeicher (Bytes) und CPU-Anzahl, die den Containern zur
+    Verfügung stehen: bevorzugt von der Docker Engine (unter Docker Desktop sind
+    das die Werte der VM), sonst vom Host selbst.
+    """
+    try:
+        info = docker_client.info()
+        return info["MemTotal"], info["NCPU"]
+    except (DockerEngineError, KeyError):
+        pass
+
+    cpus = os.cpu_count() or 1
+    if sys.platform == "win32":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys, cpus
+        return 4 * GB, cpus
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"), cpus
+    except (ValueError, OSError, AttributeError):
+        return 4 * GB, cpus
+
+
+def choose_mysql_profile(memory):
+    """
+    Profil für "auto": Laptops bis 6 GB -> small, bis 24 GB -> balanced, darüber server.
+    """
+    if memory < 6 * GB:
+        return "small"
+    if memory < 24 * GB:
+        return "balanced"
+    return "server"
+
+
+def _clamp(value, lower, upper):
+    return max(lower, min(value, upper))
+
+
+def derive_mysql_settings(profile, memory, cpus):
+    """
+    Leitet die MySQL-Einstellungen für ein Profil aus Arbeitsspeicher (Bytes)
+    und CPU-Anzahl ab. Reine Funktion ohne Seiteneffekte; Größen werden in
+    MB-Schreibweise ("512M") zurückgegeben.
+    - small: kleiner Buffer Pool, Log-Flush einmal pro Sekunde (Laptop, wenig RAM)
+    - balanced: ein Viertel des Speichers, Flush pro Transaktion
+    - server: die Hälfte des Speichers, mehr Verbindungen und I/O-Threads
+    """
+    if profile == "auto":
+        profile = choose_mysql_profile(memory)
+
+    if profile == "small":
+        buffer_pool = _clamp(memory // 10, 128 * MB, 512 * MB)
+        redo_log, connections, temp_tables, flush = 256 * MB, 50, 16 * MB, 2
+    elif profile == "balanced":
+        buffer_pool = _clamp(memory // 4, 256 * MB, 4 * GB)
+        redo_log, connections, temp_tables, flush = 512 * MB, 100, 32 * MB, 1
+    elif profile == "server":
+        buffer_pool = _clamp(memory // 2, 1 * GB, 32 * GB)
+        redo_log, connections, temp_tables, flush = 2 * GB, 300, 64 * MB, 1
+    else:
+        raise ValueError(f"Unbekanntes MySQL-Profil: {profile}")
+
+    # Höchstens drei Viertel des Speichers, auf ganze 128 MB (Chunk-Größe) abgerundet
+    buffer_pool = min(buffer_pool, memory * 3 // 4)
+    buffer_pool = max(buffer_pool // (128 * MB), 1) * 128 * MB
+    io_threads = _clamp(cpus // 2, 2, 16)
+    return {
+        "innodb_buffer_pool_size": f"{buffer_pool // MB}M",
+        "innodb_buffer_pool_instances": _clamp(buffer_pool // GB, 1, 8),
+        "innodb_redo_log_capacity": f"{redo_log // MB}M",
+        "innodb_flush_log_at_trx_commit": flush,
+        "sync_binlog": 0 if flush == 2 else 1,
+        "innodb_read_io_threads": io_threads,
+        "innodb_write_io_threads": io_threads,
+        "max_connections": connections,
+        "tmp_table_size": f"{temp_tables // MB}M",
+        "max_heap_table_size": f"{temp_tables // MB}M",
+    }
+
+
+def render_mysql_config(profile, memory, cpus, settings):
+    lines = [
+        "# Vom Deputatsverwaltung Boot Manager erzeugt "
+        f"(Profil {profile}, {memory / GB:.1f} GB RAM, {cpus} CPUs).",
+        "# Wird bei jedem Start überschrieben; für eigene Werte Profil 'custom' wählen.",
+        "[mysqld]",
+    ]
+    lines += [f"{key} = {value}" for key, value in settings.items()]
+    return "\n".join(lines) + "\n"
+
+
+def write_mysql_config(config, resources=None):
+    """
+    Schreibt die verwaltete MySQL-Konfiguration gemäß Profil neben die Compose-Datei.
+    Beim Profil "custom" bleibt eine vorhandene Datei unverändert (fehlt sie, wird
+    sie einmalig mit "balanced" angelegt).
+    Gibt (Profil, max_connections) zurück; das Profil ist None, wenn die Datei
+    nicht geschrieben werden konnte.
+    """
+    path = os.path.join(os.path.dirname(DOCKER_COMPOSE_FILE), MYSQL_CONFIG_NAME)
+    profile = get_boot_setting(config, "mysql_profile")
+    if profile == "custom":
+        if os.path.exists(path):
+            log("MySQL-Profil custom: eigene Konfiguration wird verwendet.")
+            return profile, read_max_connections(path)
+        profile = "balanced"
+
+    memory, cpus = resources or get_host_resources()
+    if profile == "auto":
+        profile = choose_mysql_profile(memory)
+    settings = derive_mysql_settings(profile, memory, cpus)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_mysql_config(profile, memory, cpus, settings))
+    except OSError as e:
+        log(f"MySQL-Konfiguration konnte nicht geschrieben werden: {e}")
+        return None, MYSQL_DEFAULT_MAX_CONNECTIONS
+    log(
+        f"MySQL-Profil {profile} ({memory / GB:.1f} GB, {cpus} CPUs): "
+        f"Buffer Pool {settings['innodb_buffer_pool_size']}, "
+        f"{settings['max_connections']} Verbindungen."
+    )
+    return profile, settings["max_connections"]
+
+
+def read_max_connections(path):
+    """
+    Liest max_connections aus einer eigenen MySQL-Konfiguration (sonst MySQL-Default).
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.partition("=")
+                if key.strip().replace("-", "_") == "max_connections":
+                    return int(value.strip())
+    except (OSError, ValueError):
+        pass
+    return MYSQL_DEFAULT_MAX_CONNECTIONS
+
+
+# ============================================================================
+#   API-REPLIKATE (LOAD BALANCER, VERBINDUNGS-POOLS)
+# ============================================================================
+
+API_PROXY_CONFIG = """\
+# Vom Deputatsverwaltung Boot Manager erzeugt. Docker-DNS liefert für "api"
+# alle Replikate; nginx verteilt die Anfragen reihum. Der Name wird über den
+# Docker-Resolver zur Laufzeit aufgelöst (Variable in proxy_pass), damit neu
+# erzeugte Replikate mit neuer IP ohne Neustart des Proxys erreichbar sind.
+resolver 127.0.0.11 valid=10s ipv6=off;
+
+server {
+    listen 4000;
+    client_max_body_size 20m;
+    set $api_upstream api;
+
+    location / {
+        proxy_pass http://$api_upstream:4000;
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_set_header Host $host;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_next_upstream error timeout http_502;
+    }
+}
+"""
+
+
+def get_api_replicas(config):
+    try:
+        return max(int(get_boot_setting(config, "api_replicas")), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _set_dependency(service, dependency, present):
+    """
+    Fügt 'dependency' zu depends_on hinzu bzw. entfernt sie (Listen- und Dict-Form).
+    """
+    depends_on = service.get("depends_on")
+    if isinstance(depends_on, dict):
+        if present:
+            depends_on.setdefault(dependency, {"condition": "service_started"})
+        else:
+            depends_on.pop(dependency, None)
+    elif present:
+        depends_on = depends_on or []
+        if dependency not in depends_on:
+            service["depends_on"] = depends_on + [dependency]
+    elif depends_on and dependency in depends_on:
+        depends_on.remove(dependency)
+
+
+def apply_api_replicas(config):
+    """
+    Schreibt das Compose-Modell für die eingestellte Anzahl API-Replikate um.
+    Ab zwei Replikaten verliert 'api' sein Port-Mapping und bekommt
+    deploy.replicas; ein nginx-Dienst 'api-proxy' übernimmt den veröffentlichten
+    Port (4000) und verteilt die Anfragen. Bei einem Replikat wird das
+    ursprüngliche Modell wiederhergestellt.
+    """
+    services = config.get("services", {})
+    if "api" not in services:
+        return
+    api = services["api"]
+    proxy = services.get(API_PROXY_SERVICE)
+    replicas = get_api_replicas(config)
+
+    if replicas > 1:
+        ports = api.pop("ports", None) or (proxy or {}).get("ports") or ["4000:4000"]
+        api.setdefault("deploy", {})["replicas"] = replicas
+        services[API_PROXY_SERVICE] = {
+            "image": API_PROXY_IMAGE,
+            "depends_on": ["api"],
+            "networks": list(api.get("networks", [])),
+            "ports": ports,
+            "volumes": [API_PROXY_CONFIG_VOLUME],
+        }
+    else:
+        if proxy is not None:
+            api["ports"] = proxy.get("ports") or ["4000:4000"]
+            del services[API_PROXY_SERVICE]
+        deploy = api.get("deploy")
+        if deploy is not None:
+            deploy.pop("replicas", None)
+            if not deploy:
+                del api["deploy"]
+
+    # Die Web-Oberfläche startet erst, wenn der Proxy läuft
+    if "web" in services:
+        _set_dependency(services["web"], API_PROXY_SERVICE, replicas > 1)
+
+
+def api_connection_limit(max_connections, replicas):
+    """
+    Größe des Prisma-Pools pro API-Replikat, sodass alle Replikate zusammen
+    max_connections (abzüglich einer Reserve) nicht überschreiten.
+    """
+    return _clamp(
+        (max_connections - MYSQL_RESERVED_CONNECTIONS) // replicas, 2, API_DB_POOL_MAX
+    )
+
+
+def set_api_connection_limit(config, limit):
+    """
+    Setzt connection_limit in der DATABASE_URL der API. Gibt True zurück, wenn
+    sich die URL geändert hat.
+    """
+    environment = config["services"]["api"].setdefault("environment", {})
+    url = environment.get("DATABASE_URL")
+    if not url:
+        return False
+    base, _, query = url.partition("?")
+    params = dict(parse_qsl(query))
+    params["connection_limit"] = str(limit)
+    new_url = f"{base}?{urlencode(params)}"
+    if new_url == url:
+        return False
+    environment["DATABASE_URL"] = new_url
+    log(f"API-Verbindungspool: {limit} Verbindungen pro Replikat.")
+    return True
+
+
+def write_api_proxy_config():
+    """
+    Schreibt die nginx-Konfiguration des API-Proxys neben die Compose-Datei.
+    """
+    path = os.path.join(os.path.dirname(DOCKER_COMPOSE_FILE), API_PROXY_CONFIG_NAME)
+    try:
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(API_PROXY_CONFIG)
+    except OSError as e:
+        log(f"Proxy-Konfiguration konnte nicht geschrieben werden: {e}")
+
+
+def get_api_port(config):
+    """
+    Host-Port, unter dem die API erreichbar ist (Proxy oder einzelner Container).
+    """
+    services = config.get("services", {})
+    service = services.get(API_PROXY_SERVICE) or services.get("api", {})
+    return get_published_port(service) or "4000"
+
+
+# ============================================================================
+#   DATENBANK-SICHERUNG (BACKUP / RESTORE)
+# ============================================================================
+
+
+class TransferProgress:
+    """
+    Zählt übertragene Bytes aus mehreren Threads und meldet höchstens alle
+    200 ms ("progress", {"done", "total", "bytes_per_second"}) an die Queue.
+    """
+
+    def __init__(self, progress_queue, total=None):
+        self.progress_queue = progress_queue
+        self.total = total
+        self.done = 0
+        self._started = time.monotonic()
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, num_bytes):
+        with self._lock:
+            self.done += num_bytes
+            now = time.monotonic()
+            if now - self._last_report < 0.2:
+                return
+            self._last_report = now
+            payload = {
+                "done": self.done,
+                "total": self.total,
+                "bytes_per_second": self.done / max(now - self._started, 0.001),
+            }
+        if self.progress_queue is not None:
+            self.progress_queue.put(("progress", payload))
+
+
+def get_db_container(config):
+    service = config["services"]["db"]
+    return service.get("container_name", f"{get_compose_project_name(config)}-db-1")
+
+
+def mysql_exec_command(config, tool, *args, interactive=False):
+    """
+    Baut den 'docker exec'-Aufruf für ein MySQL-Werkzeug im db-Container. Das
+    Root-Passwort wird per MYSQL_PWD übergeben, damit es nicht in der Kommandozeile
+    des Werkzeugs steht.
+    """
+    password = get_nested(
+        config, ("services", "db", "environment", "MYSQL_ROOT_PASSWORD")
+    )
+    command = ["docker", "exec"]
+    if interactive:
+        command.append("-i")
+    command += ["-e", f"MYSQL_PWD={password}", get_db_container(config), tool, "-uroot"]
+    return command + list(args)
+
+
+def mysql_client_command(config, database=BACKUP_DATABASE):
+    """
+    Gibt die Funktion für dbtools zurück, die zu Argumenten die Befehlszeile
+    für den mysql-Client im db-Container mit ausgewählter Datenbank baut.
+    """
+
+    def command(*args, interactive=False):
+        return mysql_exec_command(
+            config, "mysql", f"--database={database}", *args, interactive=interactive
+        )
+
+    return command
+
+
+def mysqldump_command(config):
+    """
+    Gibt die Funktion für dbtools zurück, die zu Argumenten die Befehlszeile
+    für mysqldump im db-Container baut.
+    """
+
+    def command(*args, interactive=False):
+        return mysql_exec_command(config, "mysqldump", *args, interactive=interactive)
+
+    return command
+
+
+@contextmanager
+def paused_api(config, client=None):
+    """
+    Hält die laufenden API-Container für die Dauer des Blocks an, damit niemand in
+    die Datenbank schreibt, und startet sie danach wieder. Liefert True, wenn keine
+    API mehr läuft, oder False, wenn die Docker Engine API nicht nutzbar ist (die
+    API läuft dann weiter).
+    """
+    client = client or docker_client
+    grace = parse_compose_duration(
+        config.get("services", {}).get("api", {}).get("stop_grace_period"),
+        SHUTDOWN_DEFAULT_GRACE,
+    )
+    stopped = []
+    try:
+        try:
+            containers = client.containers(
+                filters={
+                    "label": [
+                        "com.docker.compose.project="
+                        f"{get_compose_project_name(config)}",
+                        "com.docker.compose.service=api",
+                    ]
+                }
+            )
+
+            def stop(container_id):
+                if client.stop_container(container_id, grace):
+                    stopped.append(container_id)
+
+            with ThreadPoolExecutor(max_workers=max(1, len(containers))) as pool:
+                list(pool.map(stop, [container["Id"] for container in containers]))
+            paused = True
+        except DockerEngineError as e:
+            log(f"API konnte nicht angehalten werden: {e}")
+            paused = False
+        if stopped:
+            log(f"API angehalten ({len(stopped)} Container).")
+        yield paused
+    finally:
+        for container_id in stopped:
+            try:
+                client.start_container(container_id)
+            except DockerEngineError as e:
+                log(f"API-Container {container_id[:12]} nicht gestartet: {e}")
+        if stopped:
+            log("API wird wieder gestartet.")
+
+
+def backup_database(
+    progress_queue=None, config=None, backup_dir=BACKUP_DIR, pause_api=True
+):
+    """
+    Sichert die Datenbank 'core' nach 'backup_dir' (siehe
+    dbtools.backup.backup_database) und meldet Fortschritt, Log und Trace. Mit
+    'pause_api' wird die API angehalten, damit große Tabellen parallel und
+    trotzdem konsistent gedumpt werden; geht das nicht oder ist es nicht
+    gewünscht, entsteht ein einziger Dump in einer Transaktion.
+    Gibt die Zusammenfassung zurück.
+    """
+    config = config if config is not None else load_config()
+    mysql_command = mysql_client_command(config)
+    sizes = backup.get_table_sizes(mysql_command)
+    progress = TransferProgress(progress_queue, sum(sizes.values()) or None)
+    os.makedirs(backup_dir, exist_ok=True)
+
+    def on_part_done(result):
+        end = time.monotonic()
+        tracer.record(
+            "backup_part",
+            end - result["seconds"],
+            end,
+            part=result["file"],
+            tables=len(result["tables"]),
+            bytes=result["bytes"],
+        )
+
+    with tracer.span("backup", pause_api=pause_api) as span:
+        with paused_api(config) if pause_api else nullcontext(False) as paused:
+            if progress_queue is not None and paused:
+                progress_queue.put(("status", "API angehalten, Sicherung läuft..."))
+            summary = backup.backup_database(
+                mysql_command,
+                mysqldump_command(config),
+                BACKUP_DATABASE,
+                backup_dir,
+                sizes=sizes,
+                parallel=backup.PARALLEL if paused else 1,
+                progress=progress,
+                on_part_done=on_part_done,
+                version=CURRENT_VERSION,
+            )
+        span.set(parallel=summary["parallel"], bytes=summary["bytes"])
+    log(
+        f"Sicherung erstellt: {summary['path']} ({format_bytes(summary['size'])}, "
+        f"{'parallel' if summary['parallel'] else 'ein Dump'}, {summary['seconds']} s)"
+    )
+    return summary
+
+
+def restore_database(path, progress_queue=None, config=None):
+    """
+    Spielt eine Sicherung in 'core' zurück (siehe dbtools.backup.restore_database)
+    und meldet Fortschritt und Trace. Gibt das Manifest zurück.
+    """
+    config = config if config is not None else load_config()
+    manifest = backup.read_backup_manifest(path)
+    progress = TransferProgress(
+        progress_queue, sum(member["bytes"] for member in manifest["members"])
+    )
+
+    def on_part_done(result):
+        end = time.monotonic()
+        tracer.record("restore_part", end - result["seconds"], end, part=result["file"])
+
+    with tracer.span("restore"):
+        return backup.restore_database(
+            path,
+            mysql_client_command(config),
+            progress=progress,
+            on_part_done=on_part_done,
+        )
+
+
+def show_transfer_progress(title, worker, *args):
+    """
+    Zeigt ein Fortschrittsfenster für eine lange Datenübertragung und führt
+    'worker(*args, progress_queue)' in einem Hintergrund-Thread aus. Der Worker
+    meldet über die Queue ("progress"|"status"|"error"|"done", Inhalt).
+    """
+    window = tk.Toplevel(root)
+    window.title(title)
+    window.geometry("400x160")
+
+    status_label = ttk.Label(window, text=f"{title}...")
+    status_label.pack(pady=10)
+    progress_bar = ttk.Progressbar(
+        window, orient="horizontal", length=300, mode="determinate"
+    )
+    progress_bar.pack(pady=10)
+    throughput_label = ttk.Label(window, text="")
+    throughput_label.pack(pady=5)
+
+    progress_queue = queue.Queue()
+
+    def poll_progress():
+        progress = None
+        while True:
+            try:
+                kind, payload = progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                progress = payload
+            elif kind == "status":
+                status_label.config(text=payload)
+            elif kind in ("error", "done"):
+                if kind == "done":
+                    progress_bar["value"] = progress_bar["maximum"]
+                status_label.config(text=payload)
+                log(payload)
+                return
+
+        if progress:
+            # Die Gesamtgröße ist bei Sicherungen nur geschätzt
+            if progress["total"]:
+                progress_bar["value"] = min(
+                    progress["done"] * progress_bar["maximum"] / progress["total"],
+                    progress_bar["maximum"],
+                )
+            throughput_label.config(
+                text=f"{format_bytes(progress['done'])} "
+                f"({format_bytes(int(progress['bytes_per_second']))}/s)"
+            )
+        window.after(100, poll_progress)
+
+    def run():
+        try:
+            message = worker(*args, progress_queue)
+        except (
+            backup.BackupError,
+            importer.BulkImportError,
+            balances.ExportError,
+            dataset.DatasetError,
+            loadtest.LoadTestError,
+            ImageBundleError,
+            DockerEngineError,
+            OSError,
+            KeyError,
+        ) as e:
+            progress_queue.put(("error", f"Fehler: {e}"))
+            return
+        progress_queue.put(("done", message))
+
+    threading.Thread(target=run, daemon=True).start()
+    poll_progress()
+
+
+def start_backup():
+    """
+    Button-Callback: sichert die Datenbank im Hintergrund; die API ist dafür
+    angehalten.
+    """
+
+    def run_backup(progress_queue):
+        summary = backup_database(progress_queue)
+        return (
+            f"Sicherung erstellt: {os.path.basename(summary['path'])} "
+            f"({format_bytes(summary['size'])}, {summary['seconds']:.0f} s)"
+        )
+
+    show_transfer_progress("Datenbank sichern", run_backup)
+
+
+def start_restore():
+    """
+    Button-Callback: lässt eine Sicherung auswählen und spielt sie nach Rückfrage ein.
+    """
+    path = filedialog.askdirectory(
+        title="Sicherung (Verzeichnis) auswählen",
+        initialdir=BACKUP_DIR if os.path.isdir(BACKUP_DIR) else APP_FOLDER,
+        mustexist=True,
+    )
+    if not path:
+        return
+    if not messagebox.askyesno(
+        "Datenbank wiederherstellen",
+        f"Alle Daten in '{BACKUP_DATABASE}' werden durch {os.path.basename(path)} "
+        "ersetzt. Fortfahren?",
+    ):
+        return
+
+    def restore(path, progress_queue):
+        start = time.monotonic()
+        manifest = restore_database(path, progress_queue)
+        return (
+            f"Sicherung vom {manifest['created']} wiederhergestellt "
+            f"({time.monotonic() - start:.0f} s)."
+        )
+
+    show_transfer_progress("Datenbank wiederherstellen", restore, path)
+
+
+# ============================================================================
+#   MASSENIMPORT (CSV/XLSX -> DATENBANK)
+# ============================================================================
+
+
+def bulk_import(
+    paths,
+    table=None,
+    progress_queue=None,
+    config=None,
+    sql_output=None,
+    check_keys=True,
+):
+    """
+    Importiert CSV-/XLSX-Dateien in die Datenbank 'core' (siehe
+    dbtools.importer.bulk_import) und meldet Fortschritt, Log und Trace.
+    """
+    config = config if config is not None else load_config()
+    progress = TransferProgress(
+        progress_queue, sum(os.path.getsize(path) for path in paths) or None
+    )
+
+    def on_status(message):
+        if progress_queue is not None:
+            progress_queue.put(("status", message))
+
+    def on_file_done(result):
+        end = time.monotonic()
+        tracer.record(
+            "bulk_import_file",
+            end - result["seconds"],
+            end,
+            file=os.path.basename(result["file"]),
+            table=result["table"],
+            rows=result["rows"],
+            rejected=result["rejected"],
+        )
+        log(
+            f"{os.path.basename(result['file'])} -> {result['table']}: "
+            f"{result['rows']} Zeilen, {result['rejected']} abgelehnt"
+        )
+
+    with tracer.span("bulk_import", files=len(paths)) as span:
+        summary = importer.bulk_import(
+            paths,
+            mysql_client_command(config),
+            table=table,
+            sql_output=sql_output,
+            check_keys=check_keys,
+            progress=progress,
+            on_status=on_status,
+            on_file_done=on_file_done,
+        )
+        span.set(rows=summary["rows"], rejected=summary["rejected"])
+    return summary
+
+
+def start_bulk_import():
+    """
+    Button-Callback: lässt CSV-/XLSX-Dateien auswählen und importiert sie.
+    """
+    paths = filedialog.askopenfilenames(
+        title="Daten importieren",
+        initialdir=APP_FOLDER,
+        filetypes=[("Tabellen", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel", "*.xlsx")],
+    )
+    if not paths:
+        return
+
+    def run_import(paths, progress_queue):
+        summary = bulk_import(list(paths), progress_queue=progress_queue)
+        message = (
+            f"{summary['rows']} Zeilen importiert "
+            f"({summary['rows_per_second']} Zeilen/s)"
+        )
+        if summary["rejected"]:
+            message += f", {summary['rejected']} abgelehnt (siehe *.rejects.csv)"
+        return message + "."
+
+    show_transfer_progress("Daten importieren", run_import, paths)
+
+
+# ============================================================================
+#   SALDEN-EXPORT (MENGENBASIERTE AUSWERTUNG)
+# ============================================================================
+
+
+def export_balances(
+    path=None,
+    first=None,
+    last=None,
+    period=None,
+    file_format="csv",
+    progress_queue=None,
+    config=None,
+):
+    """
+    Exportiert die Salden aller Lehrpersonen (siehe
+    dbtools.balances.export_balances), ohne 'path' nach EXPORT_DIR.
+    """
+    config = config if config is not None else load_config()
+    progress = TransferProgress(progress_queue)
+    with tracer.span("balance_export") as span:
+        summary = balances.export_balances(
+            mysql_client_command(config),
+            path,
+            output_dir=EXPORT_DIR,
+            first=first,
+            last=last,
+            period=period,
+            file_format=file_format,
+            progress=progress,
+        )
+        span.set(
+            first=summary["first_semester"],
+            last=summary["last_semester"],
+            rows=summary["rows"],
+        )
+    return dict(summary, bytes=progress.done)
+
+
+def start_balance_export():
+    """
+    Button-Callback: exportiert die Salden aller Lehrpersonen als CSV.
+    """
+
+    def run_export(progress_queue):
+        summary = export_balances(progress_queue=progress_queue)
+        return (
+            f"{summary['rows']} Zeilen exportiert nach "
+            f"{os.path.basename(summary['path'])} "
+            f"({summary['rows_per_second']} Zeilen/s)."
+        )
+
+    show_transfer_progress("Salden exportieren", run_export)
+
+
+# ============================================================================
+#   TESTDATEN-GENERATOR (SKALIERBARE DATENSÄTZE)
+# ============================================================================
+
+
+def write_dataset(scale=1.0, output=None, config=None, **options):
+    """
+    Erzeugt einen Testdatensatz (siehe dbtools.dataset.write_dataset; 'seed',
+    'semesters', 'file_format' und 'replace' werden durchgereicht) und spielt
+    ihn ohne 'output' in die Datenbank 'core' ein.
+    """
+    mysql_command = None
+    if output is None:
+        config = config if config is not None else load_config()
+        mysql_command = mysql_client_command(config)
+    with tracer.span("dataset_generate", scale=scale) as span:
+        summary = dataset.write_dataset(mysql_command, scale, output=output, **options)
+        span.set(rows=summary["rows"], teachers=summary["teachers"])
+    return summary
+
+
+# ============================================================================
+#   LASTTEST (HTTP-LASTGENERATOR FÜR DIE API)
+# ============================================================================
+
+
+def run_load_test(
+    base_url=None,
+    users=None,
+    password=None,
+    concurrency=LOADTEST_CONCURRENCY,
+    rate=None,
+    duration=LOADTEST_DURATION,
+    scenarios=None,
+    seed=None,
+    max_error_rate=LOADTEST_MAX_ERROR_RATE,
+    progress_queue=None,
+    config=None,
+):
+    """
+    Lasttest gegen die API (siehe dbtools.loadtest.run_load_test). Standard sind
+    der lokale API-Port, die ersten LOADTEST_USERS Controller aus der Datenbank
+    sowie Passwort und Seed des Testdatensatzes. Der Bericht wird ins Log
+    geschrieben und an LOADTEST_RESULTS_FILE angehängt.
+    """
+    if base_url is None or users is None:
+        config = config if config is not None else load_config()
+    if base_url is None:
+        base_url = f"http://localhost:{get_api_port(config)}"
+    if users is None:
+        users = loadtest.get_load_test_users(
+            mysql_client_command(config), LOADTEST_USERS
+        )
+
+    def on_status(message):
+        if progress_queue is not None:
+            progress_queue.put(("status", message))
+
+    with tracer.span(
+        "loadtest", concurrency=concurrency, rate=rate, duration=duration
+    ) as span:
+        report = loadtest.run_load_test(
+            base_url,
+            users,
+            dataset.PASSWORD if password is None else password,
+            concurrency,
+            duration,
+            rate=rate,
+            scenarios=scenarios,
+            seed=dataset.SEED if seed is None else seed,
+            max_error_rate=max_error_rate,
+            progress=TransferProgress(progress_queue),
+            on_status=on_status,
+        )
+        span.set(requests=report["requests"], errors=report["errors"])
+    log_load_test_summary(report)
+    write_load_test_results(report)
+    return report
+
+
+def log_load_test_summary(report):
+    """
+    Schreibt die Zusammenfassung eines Lasttests zeilenweise ins Log.
+    """
+    log(
+        f"Lasttest: {report['requests']} Anfragen in {report['seconds']} s "
+        f"({report['requests_per_second']}/s), Fehlerquote "
+        f"{report['error_rate'] * 100:.1f} %"
+    )
+    for endpoint, entry in report["endpoints"].items():
+        log(
+            f"  {endpoint}: {entry['requests_per_second']}/s, "
+            f"p50 {entry['p50_ms']:.0f} ms, p95 {entry['p95_ms']:.0f} ms, "
+            f"p99 {entry['p99_ms']:.0f} ms, Fehler {entry['error_rate'] * 100:.1f} %"
+        )
+
+
+def write_load_test_results(report, path=LOADTEST_RESULTS_FILE):
+    """
+    Hängt den Bericht eines Lasttests als JSON-Zeile an die Ergebnisdatei an.
+    """
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(
+                json.dumps(dict(report, time=time.strftime("%Y-%m-%dT%H:%M:%S"))) + "\n"
+            )
+    except OSError as e:
+        log(f"Lasttest-Ergebnisse konnten nicht gespeichert werden: {e}")
+
+
+def start_load_test():
+    """
+    Button-Callback: Lasttest mit den Standardwerten gegen die laufende API.
+    """
+
+    def run_test(progress_queue):
+        report = run_load_test(progress_queue=progress_queue)
+        return (
+            f"Lasttest: {report['requests_per_second']} Anfragen/s, Fehlerquote "
+            f"{report['error_rate'] * 100:.1f} % (Details im Log)."
+        )
+
+    show_transfer_progress("Lasttest", run_test)
+
+
+# ============================================================================
+#   IMAGES (PULL-STRATEGIE, VORLADEN)
+# ============================================================================
+
+
+def get_boot_setting(config, key):
+    """
+    Liest eine Boot-Manager-Einstellung aus dem Bereich 'x-boot-manager' der
+    Compose-Datei (wird von docker-compose ignoriert). Fehlt sie, gilt der
+    Default aus CONFIG_SCHEMA.
+    """
+    path = (BOOT_SETTINGS_KEY, key)
+    try:
+        return get_nested(config, path)
+    except (KeyError, TypeError):
+        for field_def in iter_config_fields():
+            if field_def["compose_path"] == path:
+                return field_def["default"]
+        raise
+
+
+def get_compose_images(config):
+    """
+    Gibt alle in der Compose-Datei verwendeten Images (ohne Duplikate) zurück.
+    """
+    images = []
+    for service in config.get("services", {}).values():
+        image = service.get("image")
+        if image and image not in images:
+            images.append(image)
+    return images
+
+
+def split_image_reference(image):
+    """
+    Zerlegt z. B. "fabianjg/dpt:api-latest" in ("fabianjg/dpt", "api-latest").
+    """
+    name, _, digest = image.partition("@")
+    repository, colon, tag = name.rpartition(":")
+    if not colon or "/" in tag:
+        repository, tag = name, "latest"
+    return repository, tag
+
+
+def get_remote_digest(image, session=None):
+    """
+    Fragt den aktuellen Manifest-Digest eines Docker-Hub-Images per HEAD-Anfrage
+    ab (zählt nicht gegen das Pull-Limit). Gibt None zurück, wenn das Image aus
+    einer anderen Registry stammt.
+    """
+    repository, tag = split_image_reference(image)
+    first_part = repository.split("/")[0]
+    if "/" in repository and ("." in first_part or ":" in first_part):
+        return None
+    if "/" not in repository:
+        repository = f"library/{repository}"
+
+    session = session or get_http_session()
+    token_response = session.get(
+        DOCKER_HUB_AUTH_URL,
+        params={
+            "service": "registry.docker.io",
+            "scope": f"repository:{repository}:pull",
+        },
+        timeout=REGISTRY_TIMEOUT,
+    )
+    token_response.raise_for_status()
+    response = session.head(
+        f"{DOCKER_HUB_REGISTRY_URL}/v2/{repository}/manifests/{tag}",
+        headers={
+            "Authorization": f"Bearer {token_response.json()['token']}",
+            "Accept": ", ".join(MANIFEST_MEDIA_TYPES),
+        },
+        timeout=REGISTRY_TIMEOUT,
+    )
+    response.raise_for_status()
+    return response.headers.get("Docker-Content-Digest")
+
+
+class ImagePuller:
+    """
+    Stellt sicher, dass alle Images der Compose-Datei lokal vorhanden sind.
+    Die Pull-Strategie entscheidet, wann tatsächlich geladen wird:
+    - "always": jedes Mal laden (bisheriges Verhalten)
+    - "missing": nur fehlende Images laden
+    - "if-digest-changed": laden, wenn sich der Digest in der Registry gegenüber
+      dem zuletzt geladenen (IMAGE_DIGEST_CACHE_FILE) geändert hat
+    Ist die Registry nicht erreichbar, werden vorhandene lokale Images verwendet.
+    Pulls laufen parallel über die Docker Engine API; der Fortschritt je Image
+    wird an 'on_progress(image, text)' gemeldet.
+    Liegt neben der EXE ein Image-Bundle, dessen Digest zur Registry passt (oder
+    ist die Registry nicht erreichbar), wird es geladen statt aus der Registry zu
+    ziehen; ein veraltetes Bundle dient nur noch als Rückfall, wenn der Pull
+    scheitert.
+    """
+
+    def __init__(self, client=None, cache_path=IMAGE_DIGEST_CACHE_FILE):
+        self.client = client or docker_client
+        self.cache_path = cache_path
+        self.on_progress = None
+        self._lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._resolved = set()
+        self._bundle_lock = threading.Lock()
+        self._bundle_loaded = None
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                self._digests = json.load(f)
+        except (OSError, ValueError):
+            self._digests = {}
+
+    def _save_digest(self, image, digest):
+        with self._cache_lock:
+            self._digests[image] = digest
+            try:
+                tmp_path = self.cache_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._digests, f, indent=2)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                log(f"Image-Digests konnten nicht gespeichert werden: {e}")
+
+    def _report(self, image, text):
+        if self.on_progress:
+            self.on_progress(image, text)
+
+    def ensure_images(self, images, policy):
+        """
+        Sorgt dafür, dass alle 'images' gemäß 'policy' aktuell und lokal vorhanden
+        sind. Bereits in dieser Sitzung erledigte Images werden übersprungen.
+        Läuft schon ein Durchgang (z. B. das Vorladen), wird auf ihn gewartet.
+        Gibt True zurück, wenn alle Images verfügbar sind.
+        """
+        with self._lock:
+            pending = [image for image in images if image not in self._resolved]
+            if not pending:
+                return True
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                results = list(
+                    pool.map(lambda image: self._ensure(image, policy), pending)
+                )
+            for image, available in zip(pending, results):
+                if available:
+                    self._resolved.add(image)
+            return all(results)
+
+    def reset(self):
+        """
+        Vergisst die erledigten Images, damit der nächste Start erneut prüft.
+        """
+        with self._lock:
+            self._resolved.clear()
+
+    def _local_digests(self, image):
+        """
+        Gibt die RepoDigests des lokalen Images zurück oder None, wenn es fehlt.
+        """
+        info = self.client.inspect_image(image)
+        return None if info is None else info.get("RepoDigests") or []
+
+    def _ensure(self, image, policy):
+        remote, reachable, checked = None, True, False
+        try:
+            local = self._local_digests(image)
+        except DockerEngineError as e:
+            self._report(image, "Fehler")
+            log(f"Image {image} konnte nicht geprüft werden: {e}")
+            return False
+
+        if local is not None and policy == "missing":
+            self._report(image, "vorhanden")
+            return True
+
+        if local is not None and policy == "if-digest-changed":
+            remote, reachable = self._remote_digest(image)
+            checked = True
+            if remote is None:
+                self._report(image, "lokal")
+                return True
+            repository = split_image_reference(image)[0]
+            if remote == self._digests.get(image) or f"{repository}@{remote}" in local:
+                self._report(image, "aktuell")
+                self._save_digest(image, remote)
+                return True
+
+        # Ein Bundle neben der EXE nur verwenden, wenn es zum Digest in der
+        # Registry passt oder die Registry nicht erreichbar ist; ein veraltetes
+        # Bundle darf Pulls auf Rechnern mit Netz nicht dauerhaft verhindern
+        in_bundle = bundle_contains_image(image)
+        if in_bundle and not checked:
+            remote, reachable = self._remote_digest(image)
+        if in_bundle and (remote is not None or not reachable):
+            if self._load_from_bundle(image, remote):
+                return True
+        if self._pull(image):
+            return True
+        # Pull fehlgeschlagen: ein ungeprüftes Bundle ist besser als kein Image
+        if in_bundle and local is None and self._load_from_bundle(image, None):
+            return True
+        if local is not None:
+            log(f"Pull von {image} fehlgeschlagen, lokales Image wird verwendet.")
+            self._report(image, "lokal")
+            return True
+        return False
+
+    def _remote_digest(self, image):
+        """
+        Gibt (Digest in der Registry, Registry erreichbar) zurück. Der Digest ist
+        None, wenn er nicht abgefragt werden kann (z. B. andere Registry).
+        """
+        try:
+            return get_remote_digest(image), True
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            return None, False
+
+    def _load_from_bundle(self, image, remote):
+        """
+        Lädt das Image aus dem Bundle neben der EXE, sofern es dort enthalten ist
+        und (falls 'remote' angegeben) denselben Digest wie in der Registry hat. Das Bundle
+        wird pro Sitzung nur einmal importiert, auch wenn mehrere Images es brauchen.
+        """
+        bundle = find_image_bundle()
+        if bundle is None:
+            return False
+        path, manifest = bundle
+        entry = manifest["images"].get(image)
+        if entry is None or (remote and remote not in entry["digests"]):
+            return False
+
+        with self._bundle_lock:
+            if self._bundle_loaded != path:
+                self._report(image, "Bundle")
+                try:
+                    import_image_bundle(path, client=self.client)
+                except (ImageBundleError, DockerEngineError, OSError) as e:
+                    log(f"Image-Bundle konnte nicht geladen werden: {e}")
+                    return False
+                self._bundle_loaded = path
+
+        if self._local_digests(image) is None:
+            return False
+        digest = remote or (entry["digests"] or [None])[0]
+        if digest:
+            # docker load übernimmt keine RepoDigests, daher im Cache merken
+            self._save_digest(image, digest)
+        self._report(image, "aus Bundle")
+        return True
+
+    def _pull(self, image):
+        """
+        Lädt ein Image über POST /images/create und meldet den Fortschritt
+        aller Layer zusammengefasst.
+        """
+        repository, tag = split_image_reference(image)
+        layers = {}
+        last_percent = None
+        self._report(image, "0 %")
+        try:
+            for event in self.client.stream(
+                "POST", "/images/create", {"fromImage": repository, "tag": tag}
+            ):
+                if "error" in event:
+                    raise DockerEngineError(event["error"])
+                layer = event.get("id")
+                detail = event.get("progressDetail") or {}
+                status = event.get("status", "")
+                if layer and detail.get("total"):
+                    if status.startswith("Downloading"):
+                        layers[layer] = (detail.get("current", 0), detail["total"])
+                elif layer in layers and status in (
+                    "Download complete",
+                    "Pull complete",
+                ):
+                    layers[layer] = (layers[layer][1], layers[layer][1])
+
+                total = sum(layer_total for _, layer_total in layers.values())
+                if total:
+                    done = sum(current for current, _ in layers.values())
+                    percent = int(done * 100 / total)
+                    if percent != last_percent:
+                        last_percent = percent
+                        self._report(image, f"{percent} %")
+        except DockerEngineError as e:
+            self._report(image, "Fehler")
+            log(f"Pull von {image} fehlgeschlagen: {e}")
+            return False
+
+        local = self._local_digests(image) or []
+        for repo_digest in local:
+            if repo_digest.startswith(f"{repository}@"):
+                self._save_digest(image, repo_digest.partition("@")[2])
+        self._report(image, "fertig")
+        return True
+
+
+image_puller = ImagePuller()
+
+
+def ensure_compose_images(config):
+    """
+    Lädt die Images der Compose-Datei gemäß der eingestellten Pull-Strategie.
+    """
+    policy = get_boot_setting(config, "pull_policy")
+    return image_puller.ensure_images(get_compose_images(config), policy)
+
+
+def prepull_images():
+    """
+    Lädt die Images im Hintergrund vor, während der Benutzer noch Einstellungen
+    bearbeitet. Startet Docker dafür nicht extra, sondern nur, wenn es schon läuft.
+    """
+    config = load_config()
+    if get_boot_setting(config, "prepull") != "ja" or not is_docker_running():
+        return
+    ensure_compose_images(config)
+
+
+# ============================================================================
+#   IMAGE-BUNDLES (OFFLINE-BETRIEB OHNE REGISTRY)
+# ============================================================================
+
+
+class ImageBundleError(Exception):
+    """
+    Fehler beim Exportieren oder Importieren eines Image-Bundles.
+    """
+
+
+class _CountingReader:
+    """
+    Dateiobjekt-Hülle, die gelesene Bytes an einen TransferProgress meldet.
+    """
+
+    def __init__(self, fileobj, progress):
+        self.fileobj = fileobj
+        self.progress = progress
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        if self.progress is not None:
+            self.progress.add(len(data))
+        return data
+
+
+def _layer_chain_ids(diff_ids):
+    """
+    Berechnet die Chain-IDs eines Layer-Stapels, unter denen Docker Layer
+    speichert (ein Layer ist nur zusammen mit allen darunterliegenden identisch).
+    """
+    chain_ids = []
+    for diff_id in diff_ids:
+        if chain_ids:
+            data = f"{chain_ids[-1]} {diff_id}".encode()
+            diff_id = f"sha256:{hashlib.sha256(data).hexdigest()}"
+        chain_ids.append(diff_id)
+    return chain_ids
+
+
+def get_local_layer_chains(client=None):
+    """
+    Gibt die Chain-IDs aller Layer zurück, die der Docker-Daemon bereits hat.
+    """
+    client = client or docker_client
+    chains = set()
+    for image in client.images():
+        info = client.inspect_image(image["Id"]) or {}
+        chains.update(_layer_chain_ids((info.get("RootFS") or {}).get("Layers") or []))
+    return chains
+
+
+def export_image_bundle(path=None, config=None, progress_queue=None, client=None):
+    """
+    Exportiert alle Images der Compose-Datei in ein Bundle: die Ausgabe von
+    'docker save' als Tar-Strom, mit zstd auf allen CPU-Kernen komprimiert.
+    Erstes Element ist ein Manifest mit Image-IDs, Registry-Digests und der
+    Chain-ID jeder Layer-Datei, damit der Import ohne Entpacken entscheiden kann.
+    Gibt einen Bericht mit Größen und Dauer zurück.
+    """
+    config = config if config is not None else load_config()
+    client = client or docker_client
+    path = path or os.path.join(APP_FOLDER, IMAGE_BUNDLE_NAME)
+    started = time.monotonic()
+
+    images = {}
+    for image in get_compose_images(config):
+        info = client.inspect_image(image)
+        if info is None:
+            raise ImageBundleError(f"Image {image} ist lokal nicht vorhanden")
+        images[image] = {
+            "id": info["Id"],
+            "digests": [
+                digest.partition("@")[2] for digest in info.get("RepoDigests") or []
+            ],
+            "size": info.get("Size", 0),
+        }
+
+    work_dir = tempfile.mkdtemp(prefix="bundle-", dir=os.path.dirname(path) or ".")
+    try:
+        save_path = os.path.join(work_dir, "images.tar")
+        returncode = run_command(
+            ["docker", "save", "-o", save_path, *images], name="docker save"
+        )
+        if returncode != 0:
+            raise ImageBundleError(
+                f"docker save fehlgeschlagen (Exit-Code {returncode})"
+            )
+
+        with tarfile.open(save_path) as save_tar:
+            layers = {}
+            for entry in json.load(save_tar.extractfile("manifest.json")):
+                image_config = json.load(save_tar.extractfile(entry["Config"]))
+                chain_ids = _layer_chain_ids(image_config["rootfs"]["diff_ids"])
+                layers.update(zip(entry["Layers"], chain_ids))
+            members = save_tar.getmembers()
+            # Konfigurationen und Manifeste vor den großen Layern
+            members.sort(key=lambda member: member.name in layers)
+
+            manifest = {
+                "version": CURRENT_VERSION,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "images": images,
+                "layers": layers,
+            }
+            manifest_data = json.dumps(manifest, indent=2).encode()
+            uncompressed = sum(member.size for member in members)
+            progress = TransferProgress(progress_queue, uncompressed)
+
+            compressor = zstandard.ZstdCompressor(level=IMAGE_BUNDLE_LEVEL, threads=-1)
+            with open(f"{path}.part", "wb") as raw, compressor.stream_writer(
+                raw
+            ) as compressed, tarfile.open(fileobj=compressed, mode="w|") as out:
+                info = tarfile.TarInfo(IMAGE_BUNDLE_MANIFEST)
+                info.size = len(manifest_data)
+                info.mtime = time.time()
+                out.addfile(info, io.BytesIO(manifest_data))
+                for member in members:
+                    fileobj = save_tar.extractfile(member) if member.isfile() else None
+                    out.addfile(member, fileobj and _CountingReader(fileobj, progress))
+        os.replace(f"{path}.part", path)
+    except BaseException:
+        _remove_quietly(f"{path}.part")
+        raise
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "path": path,
+        "images": list(images),
+        "uncompressed": uncompressed,
+        "size": os.path.getsize(path),
+        "seconds": round(time.monotonic() - started, 1),
+    }
+    log(
+        f"Image-Bundle erstellt: {len(images)} Images, "
+        f"{format_bytes(report['uncompressed'])} -> {format_bytes(report['size'])} "
+        f"in {report['seconds']} s."
+    )
+    return report
+
+
+def read_image_bundle_manifest(path):
+    """
+    Liest nur das Manifest am Anfang eines Bundles (der Rest bleibt komprimiert).
+    """
+    try:
+        with open(path, "rb") as raw, zstandard.ZstdDecompressor().stream_reader(
+            raw
+        ) as stream, tarfile.open(fileobj=stream, mode="r|") as tar:
+            member = tar.next()
+            if member is None or member.name != IMAGE_BUNDLE_MANIFEST:
+                raise ImageBundleError(f"{path}: kein Image-Bundle")
+            return json.load(tar.extractfile(member))
+    except (tarfile.TarError, zstandard.ZstdError, ValueError) as e:
+        raise ImageBundleError(f"{path}: {e}") from e
+
+
+_bundle_cache = {}
+
+
+def find_image_bundle(folder=APP_FOLDER):
+    """
+    Gibt (Pfad, Manifest) des Bundles neben der EXE zurück oder None. Das Manifest
+    wird pro Dateistand (Größe, Änderungszeit) nur einmal gelesen.
+    """
+    path = os.path.join(folder, IMAGE_BUNDLE_NAME)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_size, stat.st_mtime)
+    if key not in _bundle_cache:
+        try:
+            _bundle_cache[key] = read_image_bundle_manifest(path)
+        except (ImageBundleError, OSError) as e:
+            log(f"Image-Bundle wird ignoriert: {e}")
+            _bundle_cache[key] = None
+    manifest = _bundle_cache[key]
+    return None if manifest is None else (path, manifest)
+
+
+def bundle_contains_image(image, folder=APP_FOLDER):
+    bundle = find_image_bundle(folder)
+    return bundle is not None and image in bundle[1]["images"]
+
+
+def _load_bundle_stream(path, skip, progress):
+    """
+    Entpackt das Bundle als Strom direkt in 'docker load'; Layer-Dateien aus
+    'skip' werden ausgelassen. Gibt (geladene Bytes, übersprungene Bytes) zurück.
+    """
+    process = subprocess.Popen(
+        ["docker", "load"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    loaded = skipped = 0
+    try:
+        with open(path, "rb") as raw, zstandard.ZstdDecompressor().stream_reader(
+            raw
+        ) as stream, tarfile.open(fileobj=stream, mode="r|") as tar_in, tarfile.open(
+            fileobj=process.stdin, mode="w|"
+        ) as tar_out:
+            for member in tar_in:
+                if member.name == IMAGE_BUNDLE_MANIFEST:
+                    continue
+                if member.name in skip:
+                    skipped += member.size
+                    continue
+                fileobj = tar_in.extractfile(member) if member.isfile() else None
+                tar_out.addfile(member, fileobj and _CountingReader(fileobj, progress))
+                loaded += member.size
+        process.stdin.close()
+    except BrokenPipeError:
+        pass  # docker load hat abgebrochen, Meldung folgt auf stdout
+    except (OSError, tarfile.TarError, zstandard.ZstdError) as e:
+        process.kill()
+        process.wait()
+        raise ImageBundleError(f"{path}: {e}") from e
+    output = process.stdout.read().decode(errors="replace").strip()
+    if process.wait() != 0:
+        raise ImageBundleError(f"docker load: {output}")
+    for line in output.splitlines():
+        log(line)
+    return loaded, skipped
+
+
+def import_image_bundle(path, progress_queue=None, client=None):
+    """
+    Lädt ein Image-Bundle in den Docker-Daemon. Layer, die der Daemon bereits
+    hat (gleiche Chain-ID), werden nicht erneut übertragen. Lehnt der Daemon den
+    verkürzten Strom ab, wird das Bundle vollständig geladen.
+    Gibt einen Bericht mit Größen und Dauer zurück.
+    """
+    client = client or docker_client
+    started = time.monotonic()
+    manifest = read_image_bundle_manifest(path)
+    try:
+        local_chains = get_local_layer_chains(client)
+    except DockerEngineError as e:
+        log(f"Vorhandene Layer nicht ermittelbar ({e}), lade alle.")
+        local_chains = set()
+    skip = {
+        member
+        for member, chain_id in manifest["layers"].items()
+        if chain_id in local_chains
+    }
+
+    progress = TransferProgress(progress_queue)
+    with tracer.span("image_bundle_import", skipped_layers=len(skip)) as span:
+        try:
+            loaded, skipped = _load_bundle_stream(path, skip, progress)
+        except ImageBundleError as e:
+            if not skip:
+                span.fail(e)
+                raise
+            log(f"Import ohne vorhandene Layer fehlgeschlagen ({e}), lade vollständig.")
+            loaded, skipped = _load_bundle_stream(path, set(), progress)
+        span.set(loaded=loaded, skipped=skipped)
+
+    report = {
+        "path": path,
+        "images": list(manifest["images"]),
+        "size": os.path.getsize(path),
+        "loaded": loaded,
+        "skipped": skipped,
+        "seconds": round(time.monotonic() - started, 1),
+    }
+    log(
+        f"Image-Bundle geladen: {len(report['images'])} Images "
+        f"({format_bytes(report['size'])}), {format_bytes(loaded)} übertragen, "
+        f"{format_bytes(skipped)} bereits vorhanden, {report['seconds']} s."
+    )
+    return report
+
+
+def start_bundle_export():
+    """
+    Button-Callback: exportiert die Images des Stacks in ein Bundle.
+    """
+    path = filedialog.asksaveasfilename(
+        title="Image-Bundle speichern",
+        initialdir=APP_FOLDER,
+        initialfile=IMAGE_BUNDLE_NAME,
+        filetypes=[("Image-Bundle", "*.tar.zst")],
+    )
+    if not path:
+        return
+
+    def export(path, progress_queue):
+        report = export_image_bundle(path, progress_queue=progress_queue)
+        return (
+            f"Image-Bundle erstellt: {format_bytes(report['size'])} "
+            f"({report['seconds']:.0f} s)"
+        )
+
+    show_transfer_progress("Images exportieren", export, path)
 
 
-def stop_docker_compose():
+def start_bundle_import():
     """
-    Führt 'docker-compose stop' für das definierte Compose-File aus.
+    Button-Callback: lädt ein ausgewähltes Image-Bundle in Docker.
     """
-    subprocess.run(["docker-compose", "-f", DOCKER_COMPOSE_FILE, "stop"])
+    path = filedialog.askopenfilename(
+        title="Image-Bundle auswählen",
+        initialdir=APP_FOLDER,
+        filetypes=[("Image-Bundle", "*.tar.zst")],
+    )
+    if not path:
+        return
+
+    def load(path, progress_queue):
+        report = import_image_bundle(path, progress_queue=progress_queue)
+        image_puller.reset()
+        return (
+            f"{len(report['images'])} Images geladen, "
+            f"{format_bytes(report['skipped'])} übersprungen ({report['seconds']:.0f} s)"
+        )
+
+    show_transfer_progress("Images importieren", load, path)
 
 
 # ============================================================================
@@ -575,43 +5981,31 @@ def stop_docker_compose():
 
 def reload_gui_values():
     """Lädt die Konfiguration und füllt die Einträge."""
-    config = load_config()
+    values = get_config_values(load_config())
 
     for field_info in field_widgets:
-        path = field_info["compose_path"]
-        raw_value = get_nested(config, path)
-
-        # Wenn es eine Extract-Funktion gibt, anwenden
-        if field_info["extract"] is not None:
-            raw_value = field_info["extract"](raw_value)
-
-        field_info["var"].set(str(raw_value))
+        field_info["var"].set(values[field_info["compose_path"]])
 
 
 def update_config():
     """Liest die GUI-Werte und speichert sie ins Compose. Anschließend abhängige Felder aktualisieren."""
     config = load_config()
 
-    # 1) Felder ins config schreiben
-    for field_info in field_widgets:
-        path = field_info["compose_path"]
-        gui_value = field_info["var"].get()
-
-        if field_info["inject"]:
-            old_value = get_nested(config, path)
-            new_value = field_info["inject"](old_value, gui_value)
-        else:
-            new_value = gui_value
-
-        set_nested(config, path, new_value)
-
-    # 2) Abhängigkeiten korrigieren
-    fix_dependent_values(config)
+    # 1) Felder ins config schreiben und Abhängigkeiten korrigieren
+    changed = apply_config_values(
+        config,
+        {
+            field_info["compose_path"]: field_info["var"].get()
+            for field_info in field_widgets
+        },
+    )
+    if not changed:
+        log("Keine Änderungen.")
+        return
 
-    # 3) Speichern
+    # 2) Speichern
     save_config(config)
-    log_output.insert(tk.END, "Konfiguration gespeichert.\n")
-    log_output.see(tk.END)
+    log(f"Konfiguration gespeichert ({len(changed)} geänderte Felder).")
 
     # Bei Bedarf GUI neu laden, um auch die sichtbaren Felder zu aktualisieren (falls abhängig)
     # reload_gui_values()
@@ -621,24 +6015,18 @@ def reset_to_defaults():
     """Schreibt in alle Felder den in CONFIG_SCHEMA definierten Default-Wert."""
     config = load_config()
 
-    for field_info in field_widgets:
-        path = field_info["compose_path"]
-        default = field_info["default"]
-
-        # Falls es eine Inject-Funktion gibt, sollte man u.U. den alten Wert
-        # (z.B. "3000:3000") zusammenbauen. Hier vereinfachtes Beispiel:
-        if field_info["inject"] is not None:
-            old_value = get_nested(config, path)
-            default = field_info["inject"](old_value, default)
-
-        set_nested(config, path, default)
-
-    # Abhängigkeiten aktualisieren
-    fix_dependent_values(config)
+    # Defaults setzen (inkl. Inject, z. B. "3000:3000") und Abhängigkeiten aktualisieren
+    changed = apply_config_values(
+        config,
+        {
+            field_def["compose_path"]: field_def["default"]
+            for field_def in iter_config_fields()
+        },
+    )
 
-    save_config(config)
-    log_output.insert(tk.END, "Standardwerte wiederhergestellt.\n")
-    log_output.see(tk.END)
+    if changed:
+        save_config(config)
+    log("Standardwerte wiederhergestellt.")
 
     # Anschließend GUI neu laden, um auch die sichtbaren Felder zu aktualisieren
     reload_gui_values()
@@ -649,32 +6037,20 @@ def reset_to_defaults():
 # ============================================================================
 
 
-def run_command(command, on_complete=None):
+def run_command(args, name=None, exclusive=None, timeout=None):
     """
-    Führt ein Shell-Kommando in einem eigenen Thread aus und leitet stdout/stderr
-    live in das Log-Feld des GUIs.
+    Führt ein Kommando über den Prozess-Supervisor aus; stdout/stderr laufen live
+    über die Log-Pipeline in das Log-Feld des GUIs. Blockiert bis zum Ende und gibt
+    den Exit-Code zurück (None bei Abbruch oder wenn der Start scheiterte).
     """
-    process = subprocess.Popen(
-        command,
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=1,
-    )
-
-    def read_stream(stream):
-        for line in iter(stream.readline, ""):
-            log_output.insert(tk.END, line)
-            log_output.see(tk.END)
-            log_output.update_idletasks()
-
-    threading.Thread(target=read_stream, args=(process.stdout,), daemon=True).start()
-    threading.Thread(target=read_stream, args=(process.stderr,), daemon=True).start()
-
-    process.wait()
-    if on_complete:
-        root.after(100, on_complete)
+    with tracer.span("command", command=" ".join(args)) as span:
+        returncode = process_supervisor.run(
+            args, name=name, exclusive=exclusive, timeout=timeout
+        )
+        span.set(exit_code=returncode)
+        if returncode != 0:
+            span.fail(f"Exit-Code {returncode}")
+    return returncode
 
 
 def disable_action_buttons():
@@ -721,15 +6097,10 @@ def start_application():
     """
     # Check if Docker Desktop can be automatically found.
     if not is_docker_running():
-        if not os.path.exists("C:\\Program Files\\Docker\\Docker\\Docker Desktop.exe"):
-            root.after(
-                0,
-                lambda: log_output.insert(
-                    tk.END,
-                    "Docker Desktop nicht gefunden. Bitte starten Sie Docker Desktop manuell.\n",
-                ),
+        if not os.path.exists(DOCKER_DESKTOP_PATH):
+            log(
+                "Docker Desktop nicht gefunden. Bitte starten Sie Docker Desktop manuell."
             )
-            root.after(0, lambda: log_output.see(tk.END))
             return
 
     toggle_button.configure(text="Anwendung startet...", style="UpdateOrange.TButton")
@@ -742,22 +6113,37 @@ def start_application():
 def stop_application():
     """
     Wird aufgerufen, wenn der Benutzer 'Anwendung stoppen' klickt.
-    Führt 'docker-compose stop' aus und aktualisiert den Anwendungsstatus.
+    Führt 'compose stop' aus und aktualisiert den Anwendungsstatus.
     """
     toggle_button.configure(
         text="Anwendung wird gestoppt...", style="UpdateOrange.TButton"
     )
     disable_action_buttons()
 
-    def update_status():
-        enable_action_buttons()
-        # Nach dem Stop => app_is_running = False
-        global app_is_running
-        app_is_running = False
-        toggle_button.configure(text="Anwendung starten", style="UpdateBlue.TButton")
+    def show_progress(stopped, total):
+        root.after(
+            0,
+            lambda: toggle_button.configure(
+                text=f"Anwendung wird gestoppt ({stopped}/{total})..."
+            ),
+        )
 
-    cmd = f"docker-compose -f {DOCKER_COMPOSE_FILE} stop"
-    threading.Thread(target=run_command, args=(cmd, update_status), daemon=True).start()
+    def stop_thread():
+        stop_stack(on_progress=show_progress)
+        root.after(0, reset_toggle_button)
+
+    threading.Thread(target=stop_thread, daemon=True).start()
+
+
+def reset_toggle_button():
+    """
+    Setzt den Anwendungsstatus auf "gestoppt" und gibt die Aktions-Buttons wieder frei.
+    """
+    global app_is_running
+    app_is_running = False
+    enable_action_buttons()
+    open_browser_button.config(state=tk.DISABLED)
+    toggle_button.configure(text="Anwendung starten", style="UpdateBlue.TButton")
 
 
 def open_frontend():
@@ -774,10 +6160,29 @@ def open_frontend():
 def on_closing():
     """
     Callback, der beim Schließen des Hauptfensters aufgerufen wird.
-    Stoppt vorsichtshalber Docker-Container und zerstört das Fenster.
+    Fährt den Stack im Hintergrund herunter und zerstört danach das Fenster;
+    bis dahin bleibt die Oberfläche bedienbar, weitere Klicks werden ignoriert.
     """
-    stop_docker_compose()
-    root.destroy()
+    if shutdown_coordinator.started:
+        return
+    disable_action_buttons()
+    toggle_button.configure(
+        text="Dienste werden gestoppt...", style="UpdateOrange.TButton"
+    )
+
+    def show_progress(stopped, total):
+        root.after(
+            0,
+            lambda: toggle_button.configure(
+                text=f"Dienste werden gestoppt ({stopped}/{total})..."
+            ),
+        )
+
+    def shutdown_thread():
+        shutdown_coordinator.shutdown("window", on_progress=show_progress)
+        root.after(0, root.destroy)
+
+    threading.Thread(target=shutdown_thread, daemon=True).start()
 
 
 # ============================================================================
@@ -791,29 +6196,42 @@ def create_gui():
     für die Anwendung (Tkinter) und initialisiert alle Bedienelemente.
     """
     global root, log_output, field_widgets
-    global update_button, toggle_button, save_button, reset_button
+    global update_button, toggle_button, save_button, reset_button, open_browser_button
     global frontend_port_entry, mysql_root_password_entry, mysql_api_password_entry
     global first_controller_username_entry, first_controller_password_entry, first_controller_firstname_entry, first_controller_lastname_entry
 
+    # Beim Beenden der GUI die Docker-Container stoppen
+    atexit.register(cleanup_on_exit)
+
     root = tk.Tk()
     root.title(f"Deputatsverwaltung Boot Manager - {CURRENT_VERSION}")
-    root.geometry("600x700")
+    root.geometry("600x980")
     root.resizable(False, False)
 
+    # Erster Frame: Platzhalter sofort zeichnen, bevor Theme und Konfiguration laden
+    loading_label = ttk.Label(root, text="Boot Manager wird geladen...")
+    loading_label.pack(expand=True)
+    root.update()
+    startup_profiler.mark("first_paint")
+
     # Wir halten eine Mapping: field_dict[(group_idx, field_idx)] = entry_widget
     # oder einfach in einer Liste in gleicher Reihenfolge,
     # oder noch besser: wir packen pro Feld ein kleines Objekt (dict).
     field_widgets = []  # Speichert pro Feld ein Dict: {"schema":..., "entry":...}
 
-    # sun-valley-ttk Theme auswählen (dark oder light je nach OS).
-    sv_ttk.set_theme(darkdetect.theme())
+    with startup_profiler.phase("theme_load"):
+        # sun-valley-ttk Theme auswählen (dark oder light je nach OS).
+        sv_ttk.set_theme(darkdetect.theme())
+
+        # Style-Objekt erstellen und Farb-Styles definieren
+        style = ttk.Style(root)
+        style.configure("UpdateGreen.TButton", foreground="green")
+        style.configure("UpdateOrange.TButton", foreground="orange")
+        style.configure("UpdateBlue.TButton", foreground="steel blue")
+        style.configure("IsLatest.TButton", foreground="sea green")
 
-    # Style-Objekt erstellen und Farb-Styles definieren
-    style = ttk.Style(root)
-    style.configure("UpdateGreen.TButton", foreground="green")
-    style.configure("UpdateOrange.TButton", foreground="orange")
-    style.configure("UpdateBlue.TButton", foreground="steel blue")
-    style.configure("IsLatest.TButton", foreground="sea green")
+    loading_label.destroy()
+    build_start = time.perf_counter()
 
     main_frame = ttk.Frame(root)
     main_frame.pack(padx=20, pady=(5, 20), fill="both", expand=True)
@@ -825,14 +6243,35 @@ def create_gui():
     )
     title_label.pack(pady=10)
 
+    top_buttons = ttk.Frame(main_frame)
+    top_buttons.pack(pady=5)
+
     # Update-Button
     update_button = ttk.Button(
-        main_frame,
+        top_buttons,
         text="Nach Updates suchen",
         command=check_for_updates,
         style="UpdateBlue.TButton",
     )
-    update_button.pack(pady=5)
+    update_button.pack(side=tk.LEFT, padx=(0, 5))
+
+    # Kritischer Pfad des letzten Starts
+    trace_button = ttk.Button(
+        top_buttons, text="Letzter Start", command=show_boot_trace
+    )
+    trace_button.pack(side=tk.LEFT, padx=(0, 5))
+
+    # Ressourcennutzung der Container
+    resources_button = ttk.Button(
+        top_buttons, text="Ressourcen", command=show_resource_monitor
+    )
+    resources_button.pack(side=tk.LEFT, padx=(0, 5))
+
+    # Logs aller Container
+    container_logs_button = ttk.Button(
+        top_buttons, text="Container-Logs", command=show_container_logs
+    )
+    container_logs_button.pack(side=tk.LEFT)
 
     # Dynamisch Gruppen erzeugen
     for group_def in CONFIG_SCHEMA:
@@ -849,7 +6288,16 @@ def create_gui():
             label.pack(side=tk.LEFT)
 
             entry_var = tk.StringVar()
-            entry = ttk.Entry(row_frame, textvariable=entry_var, width=30)
+            if field_def.get("choices"):
+                entry = ttk.Combobox(
+                    row_frame,
+                    textvariable=entry_var,
+                    values=field_def["choices"],
+                    state="readonly",
+                    width=28,
+                )
+            else:
+                entry = ttk.Entry(row_frame, textvariable=entry_var, width=30)
             entry.pack(side=tk.LEFT)
 
             # Wir speichern alle Informationen über dieses Feld
@@ -879,6 +6327,53 @@ def create_gui():
     )
     reset_button.pack(side=tk.LEFT, fill="x", expand=True)
 
+    # Frame für Sicherung/Wiederherstellung der Datenbank
+    backup_buttons = ttk.Frame(bottom_actions_buttons)
+    backup_buttons.pack(fill="x", expand=True, pady=(0, 5))
+
+    backup_button = ttk.Button(
+        backup_buttons, text="Datenbank sichern", command=start_backup
+    )
+    backup_button.pack(side=tk.LEFT, fill="x", expand=True, padx=(0, 5))
+
+    restore_button = ttk.Button(
+        backup_buttons, text="Datenbank wiederherstellen", command=start_restore
+    )
+    restore_button.pack(side=tk.LEFT, fill="x", expand=True)
+
+    # Frame für Massenimport, Salden-Export und Lasttest
+    data_buttons = ttk.Frame(bottom_actions_buttons)
+    data_buttons.pack(fill="x", expand=True, pady=(0, 5))
+
+    import_button = ttk.Button(
+        data_buttons, text="Daten importieren", command=start_bulk_import
+    )
+    import_button.pack(side=tk.LEFT, fill="x", expand=True, padx=(0, 5))
+
+    export_button = ttk.Button(
+        data_buttons, text="Salden exportieren", command=start_balance_export
+    )
+    export_button.pack(side=tk.LEFT, fill="x", expand=True, padx=(0, 5))
+
+    load_test_button = ttk.Button(
+        data_buttons, text="Lasttest", command=start_load_test
+    )
+    load_test_button.pack(side=tk.LEFT, fill="x", expand=True)
+
+    # Frame für Image-Bundles (Rechner ohne Registry-Zugang)
+    bundle_buttons = ttk.Frame(bottom_actions_buttons)
+    bundle_buttons.pack(fill="x", expand=True, pady=(0, 5))
+
+    bundle_export_button = ttk.Button(
+        bundle_buttons, text="Images exportieren", command=start_bundle_export
+    )
+    bundle_export_button.pack(side=tk.LEFT, fill="x", expand=True, padx=(0, 5))
+
+    bundle_import_button = ttk.Button(
+        bundle_buttons, text="Images importieren", command=start_bundle_import
+    )
+    bundle_import_button.pack(side=tk.LEFT, fill="x", expand=True)
+
     # Frame für Start/Open Browser buttons
     start_open_frame = ttk.Frame(bottom_actions_buttons)
     start_open_frame.pack(fill="x", expand=True)
@@ -897,17 +6392,33 @@ def create_gui():
         start_open_frame,
         text="Anwendung im Browser öffnen",
         command=open_frontend,
+        state=tk.DISABLED,
     )
     open_browser_button.pack(side=tk.LEFT, fill="x", expand=True)
 
-    console_frame = ttk.LabelFrame(main_frame, text="Konsolenausgabe")
+    # Fortschritt des Image-Vorladens (eine Zeile für alle Images)
+    image_status_label = ttk.Label(main_frame, text="")
+    image_status_label.pack(fill="x", pady=(5, 0))
+    image_states = {}
+
+    def show_image_progress(image, text):
+        image_states[image] = text
+        status = ", ".join(
+            f"{image.rpartition('/')[2]}: {state}"
+            for image, state in image_states.items()
+        )
+        root.after(0, lambda: image_status_label.configure(text=f"Images – {status}"))
+
+    image_puller.on_progress = show_image_progress
+
+    console_frame = ttk.LabelFrame(main_frame, text=CONSOLE_TITLE)
     console_frame.pack(fill="x")
     console_margin_frame = ttk.Frame(console_frame)
     console_margin_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
     log_text = tk.Text(
         console_margin_frame,
-        height=12,
+        height=10,
         width=70,
         relief="solid",
         padx=5,
@@ -922,28 +6433,649 @@ def create_gui():
     global log_output
     log_output = log_text
 
-    root.after(100, check_for_updates_background)
-    reload_gui_values()
+    def show_log_stats(stats):
+        # Durchsatz nur anzeigen, solange Zeilen einlaufen oder verworfen wurden
+        if stats["lines_per_second"] or stats["lines_dropped"]:
+            console_frame.configure(
+                text=f"{CONSOLE_TITLE} – {stats['lines_per_second']:.0f} Zeilen/s, "
+                f"{stats['lines_dropped']} verworfen"
+            )
+        else:
+            console_frame.configure(text=CONSOLE_TITLE)
+
+    log_sink.attach(root, log_text, on_stats=show_log_stats)
+
+    startup_profiler.add_phase("build_widgets", build_start, time.perf_counter())
+
+    # Update-Button sofort aus dem Release-Cache setzen, Revalidierung im Hintergrund
+    cached_version, cached_assets = release_cache.cached()
+    if cached_version:
+        show_release_state(cached_version, cached_assets, quiet=True)
+    threading.Thread(target=check_for_updates_background, daemon=True).start()
+    schedule_release_recheck()
+
+    # Images vorladen, während der Benutzer noch Einstellungen bearbeitet
+    threading.Thread(target=prepull_images, daemon=True).start()
+
+    with startup_profiler.phase("reload_gui_values"):
+        reload_gui_values()
+
+    # Vollständige Oberfläche zeichnen und Startprofil festhalten
+    root.update_idletasks()
+    startup_profiler.mark("ready")
+    startup_profiler.write()
 
     root.mainloop()
 
 
+# ============================================================================
+#   KOMMANDOZEILE (HEADLESS-MODUS)
+# ============================================================================
+
+
+def format_config_path(path):
+    """
+    Wandelt einen compose_path in die Schreibweise der Kommandozeile um,
+    z. B. "services.db.environment.MYSQL_ROOT_PASSWORD".
+    """
+    return ".".join(str(key) for key in path)
+
+
+def find_config_field(key):
+    """
+    Sucht das Feld aus CONFIG_SCHEMA zu einem Schlüssel der Kommandozeile.
+    """
+    for field_def in iter_config_fields():
+        if format_config_path(field_def["compose_path"]) == key:
+            return field_def
+    return None
+
+
+def get_stack_status(config):
+    """
+    Gibt den Zustand des Docker-Daemons und aller Container des Compose-Projekts zurück.
+    """
+    project = get_compose_project_name(config)
+    if not is_docker_running():
+        return {"docker": False, "project": project, "running": False, "services": {}}
+
+    containers = docker_client.containers(
+        all=True, filters={"label": [f"com.docker.compose.project={project}"]}
+    )
+    services = {}
+    for container in containers:
+        name = container["Labels"].get("com.docker.compose.service")
+        # Replikate eines Dienstes zusammenfassen
+        entry = services.setdefault(
+            name,
+            {
+                "state": container["State"],
+                "status": container["Status"],
+                "replicas": 0,
+                "running": 0,
+            },
+        )
+        entry["replicas"] += 1
+        if container["State"] == "running":
+            entry["state"], entry["status"] = "running", container["Status"]
+            entry["running"] += 1
+    return {
+        "docker": True,
+        "project": project,
+        "running": any(s["state"] == "running" for s in services.values()),
+        "services": services,
+    }
+
+
+def cli_start(args):
+    with tracer.span("boot", mode="cli") as span:
+        if not ensure_docker_running():
+            span.fail("Docker ist nicht verfügbar")
+            return 1, {"ok": False, "error": "Docker ist nicht verfügbar."}
+        ready, tracker = start_stack(timeout=args.timeout)
+        if not ready:
+            span.fail("Stack nicht bereit")
+    return (0 if ready else 1), {
+        "ok": ready,
+        "timeline": tracker.timeline() if tracker else None,
+    }
+
+
+def cli_warmup(args):
+    report = warm_up_api(load_config(), http_timeout=args.timeout)
+    return (0 if report["ok"] else 1), report
+
+
+def cli_stop(args):
+    report = stop_stack()
+    return (0 if report["ok"] else 1), report
+
+
+def cli_status(args):
+    try:
+        status = get_stack_status(load_config())
+    except DockerEngineError as e:
+        return 1, {"ok": False, "error": str(e)}
+    return 0, dict(status, ok=True)
+
+
+def cli_wait_ready(args):
+    if not is_docker_running():
+        return 1, {"ok": False, "error": "Docker läuft nicht."}
+    tracker = ReadinessTracker(load_config())
+    ready = tracker.wait(args.timeout)
+    return (0 if ready else 1), {"ok": ready, "timeline": tracker.timeline()}
+
+
+def cli_config_get(args):
+    values = {
+        format_config_path(path): value
+        for path, value in get_config_values(load_config()).items()
+    }
+    if args.key is None:
+        return 0, values
+    if args.key not in values:
+        return 2, {"ok": False, "error": f"Unbekannter Schlüssel: {args.key}"}
+    return 0, {args.key: values[args.key]}
+
+
+def cli_config_set(args):
+    field_def = find_config_field(args.key)
+    if field_def is None:
+        return 2, {"ok": False, "error": f"Unbekannter Schlüssel: {args.key}"}
+    if field_def.get("choices") and args.value not in field_def["choices"]:
+        return 2, {
+            "ok": False,
+            "error": f"Erlaubte Werte: {', '.join(field_def['choices'])}",
+        }
+
+    config = load_config()
+    if apply_config_values(config, {field_def["compose_path"]: args.value}):
+        save_config(config)
+        log("Konfiguration gespeichert.")
+    return 0, {"ok": True, args.key: args.value}
+
+
+def cli_update_check(args):
+    latest_version, _ = get_latest_release(force=True)
+    if not latest_version:
+        return 1, {"ok": False, "current": CURRENT_VERSION}
+    return 0, {
+        "ok": True,
+        "current": CURRENT_VERSION,
+        "latest": latest_version,
+        "update_available": latest_version != CURRENT_VERSION,
+    }
+
+
+def cli_update_apply(args):
+    latest_version, latest_assets = get_latest_release(force=True)
+    if not latest_version:
+        return 1, {"ok": False, "error": "Update-Prüfung fehlgeschlagen."}
+    if latest_version == CURRENT_VERSION:
+        return 0, {"ok": True, "updated": False, "current": CURRENT_VERSION}
+
+    progress_queue = queue.Queue()
+    worker = threading.Thread(
+        target=download_and_replace_files,
+        args=(latest_version, latest_assets, progress_queue),
+        daemon=True,
+    )
+    worker.start()
+
+    last_logged = 0.0
+    while True:
+        kind, payload = progress_queue.get()
+        if kind == "progress" and time.monotonic() - last_logged >= 1.0:
+            last_logged = time.monotonic()
+            log(
+                f"{format_bytes(payload['downloaded'])} von "
+                f"{format_bytes(payload['total'])} "
+                f"({format_bytes(payload['bytes_per_second'])}/s)"
+            )
+        elif kind == "status":
+            log(payload)
+        elif kind == "error":
+            return 1, {"ok": False, "error": payload}
+        elif kind == "done":
+            return 0, {
+                "ok": True,
+                "updated": True,
+                "version": latest_version,
+                "executable": payload,
+            }
+
+
+def cli_trace(args):
+    path = critical_path(read_last_trace())
+    if not path:
+        return 1, {"ok": False, "error": "Es wurde noch kein Start aufgezeichnet."}
+    return 0, {
+        "ok": True,
+        "critical_path": [
+            {
+                "depth": depth,
+                "name": describe_span(span),
+                "offset_ms": span["offset_ms"],
+                "duration_ms": span["duration_ms"],
+                "outcome": span["outcome"],
+            }
+            for depth, span in path
+        ],
+    }
+
+
+def cli_db_backup(args):
+    return 0, dict(
+        backup_database(backup_dir=args.output, pause_api=not args.no_pause), ok=True
+    )
+
+
+def cli_db_restore(args):
+    start = time.monotonic()
+    manifest = restore_database(args.path)
+    return 0, {
+        "ok": True,
+        "created": manifest["created"],
+        "bytes": sum(member["bytes"] for member in manifest["members"]),
+        "seconds": round(time.monotonic() - start, 1),
+    }
+
+
+def cli_db_import(args):
+    if args.table is not None and args.table not in importer.IMPORT_MODELS:
+        return 2, {
+            "ok": False,
+            "error": f"Unbekannte Tabelle: {args.table} "
+            f"(erlaubt: {', '.join(importer.IMPORT_MODELS)})",
+        }
+    summary = bulk_import(
+        args.paths,
+        table=args.table,
+        sql_output=args.sql_output,
+        check_keys=not args.skip_key_check,
+    )
+    return (1 if summary["rejected"] and args.strict else 0), dict(
+        summary, ok=not (summary["rejected"] and args.strict)
+    )
+
+
+def cli_db_export(args):
+    return 0, dict(
+        export_balances(
+            args.output,
+            first=args.first,
+            last=args.last,
+            period=args.period,
+            file_format=args.format,
+        ),
+        ok=True,
+    )
+
+
+def cli_db_generate(args):
+    options = {
+        name: value
+        for name, value in (("seed", args.seed), ("semesters", args.semesters))
+        if value is not None
+    }
+    return 0, dict(
+        write_dataset(
+            args.scale,
+            output=args.output,
+            file_format=args.format,
+            replace=args.replace,
+            **options,
+        ),
+        ok=True,
+    )
+
+
+def cli_loadtest(args):
+    report = run_load_test(
+        base_url=args.url,
+        users=args.users.split(",") if args.users else None,
+        password=args.password,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        scenarios=args.scenario,
+        seed=args.seed,
+        max_error_rate=args.max_error_rate,
+    )
+    return (0 if report["ok"] else 1), report
+
+
+def cli_images_export(args):
+    return 0, dict(export_image_bundle(args.output), ok=True)
+
+
+def cli_images_import(args):
+    return 0, dict(import_image_bundle(args.path), ok=True)
+
+
+def cli_mysql_profile(args):
+    memory, cpus = get_host_resources()
+    if args.memory_gb is not None:
+        memory = int(args.memory_gb * GB)
+    if args.cpus is not None:
+        cpus = args.cpus
+    profile = args.profile or get_boot_setting(load_config(), "mysql_profile")
+    if profile == "custom":
+        profile = "balanced"
+    if profile == "auto":
+        profile = choose_mysql_profile(memory)
+    return 0, {
+        "profile": profile,
+        "memory_gb": round(memory / GB, 1),
+        "cpus": cpus,
+        "settings": derive_mysql_settings(profile, memory, cpus),
+    }
+
+
+def cli_delta_create(args):
+    start = time.perf_counter()
+    delta_size = create_delta(args.old, args.new, args.delta)
+    return 0, {
+        "ok": True,
+        "delta": args.delta,
+        "delta_size": delta_size,
+        "target_size": os.path.getsize(args.new),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def cli_delta_apply(args):
+    start = time.perf_counter()
+    try:
+        size = apply_delta(args.old, args.delta, args.output, args.sha256)
+    except DeltaError as e:
+        return 1, {"ok": False, "error": str(e)}
+    return 0, {
+        "ok": True,
+        "output": args.output,
+        "size": size,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def build_cli_parser(parser):
+    """
+    Ergänzt den Argument-Parser um die Unterbefehle des Headless-Modus.
+    """
+    commands = parser.add_subparsers(dest="command", metavar="BEFEHL")
+
+    start_parser = commands.add_parser(
+        "start", help="Stack starten und auf Bereitschaft warten"
+    )
+    start_parser.add_argument("--timeout", type=float, default=READINESS_TIMEOUT)
+    start_parser.set_defaults(handler=cli_start)
+
+    commands.add_parser("stop", help="Stack stoppen").set_defaults(handler=cli_stop)
+    commands.add_parser("status", help="Zustand der Container ausgeben").set_defaults(
+        handler=cli_status
+    )
+
+    wait_parser = commands.add_parser(
+        "wait-ready", help="Warten, bis alle Dienste bereit sind"
+    )
+    wait_parser.add_argument("--timeout", type=float, default=READINESS_TIMEOUT)
+    wait_parser.set_defaults(handler=cli_wait_ready)
+
+    warmup_parser = commands.add_parser(
+        "warmup", help="API per HTTP prüfen und vorwärmen"
+    )
+    warmup_parser.add_argument("--timeout", type=float, default=WARMUP_HTTP_TIMEOUT)
+    warmup_parser.set_defaults(handler=cli_warmup)
+
+    loadtest_parser = commands.add_parser(
+        "loadtest", help="Lasttest gegen die API (Durchsatz, Latenz-Perzentile)"
+    )
+    loadtest_parser.add_argument(
+        "--url", help="Basis-URL der API (Standard: lokaler API-Port)"
+    )
+    loadtest_parser.add_argument(
+        "--users",
+        metavar="NAME,...",
+        help="Benutzernamen (Standard: Controller aus der Datenbank)",
+    )
+    loadtest_parser.add_argument(
+        "--password", help="Passwort (Standard: das des Testdatensatzes)"
+    )
+    loadtest_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=LOADTEST_CONCURRENCY,
+        help="gleichzeitige virtuelle Benutzer",
+    )
+    loadtest_parser.add_argument(
+        "--rate", type=float, help="Szenarien pro Sekunde statt Dauerlast"
+    )
+    loadtest_parser.add_argument(
+        "--duration", type=float, default=LOADTEST_DURATION, help="Sekunden"
+    )
+    loadtest_parser.add_argument(
+        "--scenario",
+        action="append",
+        metavar="SZENARIO",
+        help="nur dieses Szenario, z. B. semester_list (mehrfach möglich)",
+    )
+    loadtest_parser.add_argument(
+        "--seed", type=int, help="Zufalls-Seed (Standard: der des Testdatensatzes)"
+    )
+    loadtest_parser.add_argument(
+        "--max-error-rate", type=float, default=LOADTEST_MAX_ERROR_RATE
+    )
+    loadtest_parser.set_defaults(handler=cli_loadtest)
+
+    commands.add_parser(
+        "trace", help="Kritischen Pfad des letzten Starts ausgeben"
+    ).set_defaults(handler=cli_trace)
+
+    config_parser = commands.add_parser("config", help="Konfiguration lesen/ändern")
+    config_commands = config_parser.add_subparsers(dest="config_command", required=True)
+    get_parser = config_commands.add_parser("get", help="Wert(e) ausgeben")
+    get_parser.add_argument("key", nargs="?", help="z. B. services.web.ports.0")
+    get_parser.set_defaults(handler=cli_config_get)
+    set_parser = config_commands.add_parser("set", help="Wert setzen")
+    set_parser.add_argument("key")
+    set_parser.add_argument("value")
+    set_parser.set_defaults(handler=cli_config_set)
+
+    update_parser = commands.add_parser("update", help="Updates prüfen/installieren")
+    update_commands = update_parser.add_subparsers(dest="update_command", required=True)
+    update_commands.add_parser("check", help="Neueste Version abfragen").set_defaults(
+        handler=cli_update_check
+    )
+    update_commands.add_parser(
+        "apply", help="Neueste Version herunterladen"
+    ).set_defaults(handler=cli_update_apply)
+
+    db_parser = commands.add_parser("db", help="Datenbank sichern/wiederherstellen")
+    db_commands = db_parser.add_subparsers(dest="db_command", required=True)
+    backup_parser = db_commands.add_parser("backup", help="Datenbank 'core' sichern")
+    backup_parser.add_argument("--output", default=BACKUP_DIR, metavar="VERZEICHNIS")
+    backup_parser.add_argument(
+        "--no-pause",
+        action="store_true",
+        help="API weiterlaufen lassen (ein einziger Dump statt parallel)",
+    )
+    backup_parser.set_defaults(handler=cli_db_backup)
+    restore_parser = db_commands.add_parser("restore", help="Sicherung einspielen")
+    restore_parser.add_argument("path", metavar="VERZEICHNIS")
+    restore_parser.set_defaults(handler=cli_db_restore)
+    db_import_parser = db_commands.add_parser(
+        "import", help="CSV-/XLSX-Dateien in 'core' importieren"
+    )
+    db_import_parser.add_argument("paths", nargs="+", metavar="DATEI")
+    db_import_parser.add_argument(
+        "--table",
+        metavar="TABELLE",
+        help="Prisma-Modell statt Erkennung am Dateinamen, z. B. Teacher",
+    )
+    db_import_parser.add_argument(
+        "--sql-output", metavar="DATEI", help="SQL schreiben statt einspielen"
+    )
+    db_import_parser.add_argument(
+        "--skip-key-check",
+        action="store_true",
+        help="Referenzen und Duplikate nicht gegen die Datenbank prüfen",
+    )
+    db_import_parser.add_argument(
+        "--strict", action="store_true", help="Exit-Code 1 bei abgelehnten Zeilen"
+    )
+    db_import_parser.set_defaults(handler=cli_db_import)
+    db_export_parser = db_commands.add_parser(
+        "export", help="Salden aller Lehrpersonen exportieren (CSV/Parquet)"
+    )
+    db_export_parser.add_argument("--output", metavar="DATEI")
+    db_export_parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    db_export_parser.add_argument(
+        "--from", dest="first", type=int, help="erstes Semester (ID)"
+    )
+    db_export_parser.add_argument(
+        "--to", dest="last", type=int, help="letztes Semester (ID, sonst aktives)"
+    )
+    db_export_parser.add_argument(
+        "--period", type=int, help="Saldierungszeitraum in Semestern"
+    )
+    db_export_parser.set_defaults(handler=cli_db_export)
+    generate_parser = db_commands.add_parser(
+        "generate", help="Testdatensatz erzeugen (Last- und Kapazitätstests)"
+    )
+    generate_parser.add_argument(
+        "--scale", type=float, default=1.0, help="1 = 500 Lehrpersonen"
+    )
+    generate_parser.add_argument("--seed", type=int, help="Standard: 42")
+    generate_parser.add_argument(
+        "--semesters", type=int, help="Anzahl Semester (Standard: 20)"
+    )
+    generate_parser.add_argument(
+        "--output",
+        metavar="PFAD",
+        help="SQL-Datei bzw. CSV-Verzeichnis statt Datenbank",
+    )
+    generate_parser.add_argument("--format", choices=["sql", "csv"], default="sql")
+    generate_parser.add_argument(
+        "--replace", action="store_true", help="vorhandene Daten vorher löschen"
+    )
+    generate_parser.set_defaults(handler=cli_db_generate)
+
+    images_parser = commands.add_parser("images", help="Image-Bundles (offline)")
+    images_commands = images_parser.add_subparsers(dest="images_command", required=True)
+    export_parser = images_commands.add_parser(
+        "export", help="Images der Compose-Datei in ein Bundle exportieren"
+    )
+    export_parser.add_argument(
+        "--output", default=os.path.join(APP_FOLDER, IMAGE_BUNDLE_NAME)
+    )
+    export_parser.set_defaults(handler=cli_images_export)
+    import_parser = images_commands.add_parser("import", help="Image-Bundle laden")
+    import_parser.add_argument("path")
+    import_parser.set_defaults(handler=cli_images_import)
+
+    mysql_parser = commands.add_parser(
+        "mysql-profile", help="Abgeleitete MySQL-Einstellungen anzeigen"
+    )
+    mysql_parser.add_argument("--profile", choices=MYSQL_PROFILES[:-1])
+    mysql_parser.add_argument("--memory-gb", type=float, help="statt erkanntem RAM")
+    mysql_parser.add_argument("--cpus", type=int, help="statt erkannter CPU-Anzahl")
+    mysql_parser.set_defaults(handler=cli_mysql_profile)
+
+    delta_parser = commands.add_parser("delta", help="Delta-Updates erzeugen/anwenden")
+    delta_commands = delta_parser.add_subparsers(dest="delta_command", required=True)
+    create_parser = delta_commands.add_parser(
+        "create", help="Delta zwischen zwei EXE-Versionen erzeugen"
+    )
+    create_parser.add_argument("old")
+    create_parser.add_argument("new")
+    create_parser.add_argument("delta")
+    create_parser.set_defaults(handler=cli_delta_create)
+    apply_parser = delta_commands.add_parser(
+        "apply", help="Delta anwenden und Ergebnis prüfen"
+    )
+    apply_parser.add_argument("old")
+    apply_parser.add_argument("delta")
+    apply_parser.add_argument("output")
+    apply_parser.add_argument("--sha256", help="erwartete Prüfsumme des Ergebnisses")
+    apply_parser.set_defaults(handler=cli_delta_apply)
+
+
+def run_cli(args):
+    """
+    Führt einen Unterbefehl aus, schreibt das Ergebnis als JSON auf stdout und
+    gibt den Exit-Code zurück (0 = Erfolg, 1 = Fehler, 2 = falsche Eingabe).
+    Meldungen laufen währenddessen auf stderr.
+    """
+    if sys.stderr is not None:
+        log_sink.attach_stream(sys.stderr)
+    try:
+        exit_code, result = args.handler(args)
+    except (
+        OSError,
+        DockerEngineError,
+        backup.BackupError,
+        importer.BulkImportError,
+        balances.ExportError,
+        dataset.DatasetError,
+        loadtest.LoadTestError,
+        ImageBundleError,
+    ) as e:
+        exit_code, result = 1, {"ok": False, "error": str(e)}
+    if sys.stdout is not None:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    return exit_code
+
+
 # ============================================================================
 #   PROGRAMMAUSTIEG
 # ============================================================================
 
 
-@atexit.register
 def cleanup_on_exit():
     """
     Stellt sicher, dass beim Beenden des Programms die Docker-Container gestoppt werden.
+    Wurde bereits heruntergefahren (Fenster geschlossen), passiert nichts mehr.
     """
-    stop_docker_compose()
+    shutdown_coordinator.shutdown("exit")
 
 
 # ============================================================================
 #   PROGRAMMEINSTIEG
 # ============================================================================
 
-if __name__ == "__main__":
+
+def parse_arguments(argv=None):
+    """
+    Wertet die Kommandozeilenargumente aus.
+    """
+    parser = argparse.ArgumentParser(
+        description=f"Deputatsverwaltung Boot Manager {CURRENT_VERSION}"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const=STARTUP_PROFILE_FILE,
+        metavar="DATEI",
+        help="Import- und Phasenzeiten des Programmstarts als JSON schreiben",
+    )
+    build_cli_parser(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    startup_profiler.add_phase("module_import", _STARTUP_T0, time.perf_counter())
+    args = parse_arguments(argv)
+
+    # Mit Unterbefehl: Headless-Modus ohne Tkinter
+    if args.command:
+        sys.exit(run_cli(args))
+
+    if args.profile_startup:
+        startup_profiler.enabled = True
+        startup_profiler.output_path = args.profile_startup
     create_gui()
+
+
+if __name__ == "__main__":
+    main()
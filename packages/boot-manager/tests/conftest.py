@@ -0,0 +1,44 @@
+"""
+Gemeinsame Fixtures der Tests. Die Tests laufen wie die Benchmarks ohne Docker,
+Datenbank und Netzwerk; die Nachbildungen aus benchmarks/run_benchmarks.py
+werden mitbenutzt.
+"""
+
+import os
+import sys
+
+import pytest
+
+BOOT_MANAGER_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for folder in (BOOT_MANAGER_FOLDER, os.path.join(BOOT_MANAGER_FOLDER, "benchmarks")):
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+
+import run_benchmarks  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def bm():
+    """
+    dpt-boot-manager.py als Modul, mit abgeschaltetem Boot-Tracing.
+    """
+    return run_benchmarks.load_boot_manager()
+
+
+FAKE_MYSQL = os.path.join(os.path.dirname(__file__), "fake_mysql.py")
+
+
+@pytest.fixture(scope="session")
+def fake_mysql():
+    """
+    Liefert zu einer SQLite-Datei einen 'mysql_command' für dbtools, der statt
+    mysql im db-Container tests/fake_mysql.py aufruft.
+    """
+
+    def factory(database):
+        def mysql_command(*args, interactive=False):
+            return [sys.executable, FAKE_MYSQL, str(database), *args]
+
+        return mysql_command
+
+    return factory
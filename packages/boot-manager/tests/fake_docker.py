@@ -0,0 +1,97 @@
+"""
+Ersatz für die docker-CLI in den Tests der Image-Bundles. Jeder Aufruf wird als
+JSON-Zeile in '$FAKE_DOCKER_STATE/calls.jsonl' festgehalten, die Dateinamen
+jedes geladenen Archivs in '$FAKE_DOCKER_STATE/loads.jsonl'.
+
+    python fake_docker.py save -o DATEI IMAGE...
+    python fake_docker.py load < ARCHIV
+
+'save' schreibt ein Archiv im Format von 'docker save': je Image eine
+Konfiguration mit den diff_ids und zwei Layer-Dateien, von denen die erste
+(Basis-Layer) allen Images gemeinsam ist. 'load' liest ein solches Archiv von
+stdin; mit FAKE_DOCKER_REJECT_PARTIAL=1 lehnt es Archive ab, in denen Layer
+aus manifest.json fehlen.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import tarfile
+
+LAYER_SIZE = 64 * 1024
+
+
+def layer(name):
+    """
+    Inhalt und diff_id einer Layer-Datei.
+    """
+    data = (name.encode() * (LAYER_SIZE // len(name) + 1))[:LAYER_SIZE]
+    return data, f"sha256:{hashlib.sha256(data).hexdigest()}"
+
+
+def _record(name, entry):
+    path = os.path.join(os.environ["FAKE_DOCKER_STATE"], name)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def _add(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def save(path, images):
+    manifest = []
+    with tarfile.open(path, "w") as tar:
+        written = set()
+        for index, image in enumerate(images):
+            layers = ["base/layer.tar", f"app{index}/layer.tar"]
+            diff_ids = []
+            for name in layers:
+                data, diff_id = layer(name if name.startswith("base") else image)
+                diff_ids.append(diff_id)
+                if name not in written:
+                    _add(tar, name, data)
+                    written.add(name)
+            config = f"config{index}.json"
+            _add(tar, config, json.dumps({"rootfs": {"diff_ids": diff_ids}}).encode())
+            manifest.append({"Config": config, "RepoTags": [image], "Layers": layers})
+        _add(tar, "manifest.json", json.dumps(manifest).encode())
+
+
+def load():
+    members = {}
+    with tarfile.open(fileobj=sys.stdin.buffer, mode="r|") as tar:
+        for member in tar:
+            fileobj = tar.extractfile(member)
+            members[member.name] = fileobj.read() if fileobj else b""
+    _record("loads.jsonl", sorted(members))
+    manifest = json.loads(members.get("manifest.json", b"[]"))
+    missing = [
+        name for entry in manifest for name in entry["Layers"] if name not in members
+    ]
+    if missing and os.environ.get("FAKE_DOCKER_REJECT_PARTIAL"):
+        print(f"Error processing tar file: missing layer {missing[0]}")
+        return 1
+    for entry in manifest:
+        for tag in entry["RepoTags"]:
+            print(f"Loaded image: {tag}")
+    return 0
+
+
+def main(argv):
+    _record("calls.jsonl", argv)
+    if argv[:2] == ["save", "-o"]:
+        save(argv[2], argv[3:])
+        return 0
+    if argv == ["load"]:
+        return load()
+    print(f"unbekannter Aufruf: {argv}", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
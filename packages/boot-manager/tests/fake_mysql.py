@@ -0,0 +1,49 @@
+"""
+Ersatz für den mysql-Client in den Tests: führt Abfragen (-e) und SQL-Skripte
+(stdin) gegen eine SQLite-Datenbank aus und gibt Ergebnisse im Format von
+'mysql --batch --skip-column-names' aus.
+
+    python fake_mysql.py <datenbank.sqlite> [mysql-Optionen] [-e ABFRAGE]
+"""
+
+import re
+import sqlite3
+import sys
+
+_SCRIPT_ESCAPES = {"'": "''", "\\": "\\", "n": "\n", "r": "\r", "0": "\0", "Z": "\x1a"}
+
+
+def _batch_field(value):
+    if value is None:
+        return "NULL"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _concat_ws(match):
+    separator, arguments = match.group(1), match.group(2).split(", ")
+    return f" || {separator} || ".join(arguments)
+
+
+def main(argv):
+    database, args = argv[0], argv[1:]
+    connection = sqlite3.connect(database)
+    try:
+        if "-e" in args:
+            query = args[len(args) - 1 - args[::-1].index("-e") + 1]
+            query = re.sub(r"CONCAT_WS\(('[^']*'), ([^)]*)\)", _concat_ws, query)
+            for row in connection.execute(query):
+                print("\t".join(_batch_field(value) for value in row))
+            return 0
+        script = sys.stdin.read()
+        script = re.sub(r"^SET .*$", "", script, flags=re.M)
+        script = script.replace("START TRANSACTION", "BEGIN")
+        script = re.sub(r"\\(.)", lambda m: _SCRIPT_ESCAPES[m.group(1)], script)
+        connection.executescript(script)
+        return 0
+    except sqlite3.Error as e:
+        print(f"ERROR 1064: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,57 @@
+"""
+Ersatz für mysqldump in den Tests: gibt Schema (DROP/CREATE TABLE) und Daten
+(INSERT) einer SQLite-Datenbank als SQL aus, das tests/fake_mysql.py wieder
+einspielen kann. Jeder Aufruf wird als JSON-Zeile in '<datenbank>.calls'
+festgehalten.
+
+    python fake_mysqldump.py <datenbank.sqlite> [Optionen] DATENBANK [TABELLE...]
+
+--fail-stderr=N schreibt N Bytes auf stderr, bevor überhaupt etwas auf stdout
+kommt, und endet mit Exit-Code 2.
+"""
+
+import json
+import sqlite3
+import sys
+
+
+def main(argv):
+    database, args = argv[0], argv[1:]
+    options = [arg for arg in args if arg.startswith("--")]
+    names = [arg for arg in args if not arg.startswith("--")]
+    with open(f"{database}.calls", "a", encoding="utf-8") as f:
+        f.write(json.dumps({"options": options, "names": names}) + "\n")
+
+    for option in options:
+        if option.startswith("--fail-stderr="):
+            sys.stderr.write("x" * (int(option.partition("=")[2]) - 5) + "boom\n")
+            return 2
+
+    connection = sqlite3.connect(database)
+    tables = names[1:] or [
+        name
+        for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+        )
+    ]
+    print("SET NAMES utf8mb4;")
+    for table in tables:
+        if "--no-create-info" not in options:
+            (sql,) = connection.execute(
+                "SELECT sql FROM sqlite_master WHERE name = ?", (table,)
+            ).fetchone()
+            print(f'DROP TABLE IF EXISTS "{table}";\n{sql};')
+        if "--no-data" in options:
+            continue
+        columns = [
+            row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')
+        ]
+        values = " || ',' || ".join(f'quote("{column}")' for column in columns)
+        for (row,) in connection.execute(f'SELECT {values} FROM "{table}"'):
+            print(f'INSERT INTO "{table}" VALUES ({row});')
+    print("-- Dump completed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
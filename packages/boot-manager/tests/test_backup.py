@@ -0,0 +1,237 @@
+"""
+Sicherung und Wiederherstellung: mysqldump und mysql werden durch
+tests/fake_mysqldump.py und tests/fake_mysql.py mit SQLite-Dateien ersetzt.
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+from dbtools import backup
+
+FAKE_MYSQLDUMP = os.path.join(os.path.dirname(__file__), "fake_mysqldump.py")
+
+SCHEMA = """
+CREATE TABLE TeachingEvent (id INTEGER PRIMARY KEY, name TEXT, hours REAL);
+CREATE TABLE Teacher (id INTEGER PRIMARY KEY, userId INT);
+CREATE TABLE User (id INTEGER PRIMARY KEY, username TEXT);
+"""
+
+SIZES = {"TeachingEvent": 100 * 1024 * 1024, "Teacher": 4096, "User": 8192}
+
+
+class Progress:
+    def __init__(self):
+        self.done = 0
+        self._lock = threading.Lock()
+
+    def add(self, num_bytes):
+        with self._lock:
+            self.done += num_bytes
+
+
+def mysqldump(database, *extra):
+    def command(*args, interactive=False):
+        return [sys.executable, FAKE_MYSQLDUMP, str(database), *extra, *args]
+
+    return command
+
+
+def _calls(database):
+    with open(f"{database}.calls", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _rows(database, table):
+    connection = sqlite3.connect(database)
+    try:
+        return connection.execute(f'SELECT * FROM "{table}" ORDER BY id').fetchall()
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.db"
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.executemany(
+        "INSERT INTO TeachingEvent VALUES (?, ?, ?)",
+        [(i, f"Vorlesung {i} 'Grundlagen'", i / 4) for i in range(1, 2001)],
+    )
+    connection.executemany("INSERT INTO Teacher VALUES (?, ?)", [(1, 1), (2, 2)])
+    connection.executemany(
+        "INSERT INTO User VALUES (?, ?)", [(1, "müller"), (2, "schmidt")]
+    )
+    connection.commit()
+    connection.close()
+    return path
+
+
+def test_plan_backup_parts():
+    sizes = {"a": 10, "b": 200, "c": 300, "d": 20}
+    assert backup.plan_backup_parts(sizes, large_table_bytes=100) == [
+        ("data-c", ["c"], 300),
+        ("data-b", ["b"], 200),
+        ("data-small", ["d", "a"], 30),
+    ]
+    assert backup.plan_backup_parts({}) == []
+
+
+def test_table_sizes():
+    def mysql_command(*args, interactive=False):
+        assert "DATABASE()" in args[-1]
+        return [sys.executable, "-c", "print('Teacher\\t1024\\nUser\\tNULL')"]
+
+    assert backup.get_table_sizes(mysql_command) == {"Teacher": 1024, "User": 0}
+
+    def failing(*args, interactive=False):
+        return [sys.executable, "-c", "import sys; sys.exit('ERROR 1045')"]
+
+    with pytest.raises(backup.BackupError, match="ERROR 1045"):
+        backup.get_table_sizes(failing)
+
+
+def test_parallel_backup_and_restore(fake_mysql, source, tmp_path):
+    progress = Progress()
+    parts = []
+    summary = backup.backup_database(
+        fake_mysql(source),
+        mysqldump(source),
+        "core",
+        str(tmp_path / "backups"),
+        sizes=SIZES,
+        progress=progress,
+        on_part_done=parts.append,
+        version="1.2.3",
+    )
+    path = summary["path"]
+    assert os.path.basename(path).startswith("core-")
+    # Teile liegen direkt im Zielverzeichnis, kein Archiv und kein .part-Rest
+    assert os.listdir(tmp_path / "backups") == [os.path.basename(path)]
+    assert sorted(os.listdir(path)) == [
+        "data-TeachingEvent.sql.gz",
+        "data-small.sql.gz",
+        "manifest.json",
+        "schema.sql.gz",
+    ]
+    assert summary["parallel"] and summary["parts"] == 3
+    assert summary["bytes"] == progress.done > 2000 * 30
+    assert summary["size"] < summary["bytes"]
+    assert sorted(part["file"] for part in parts) == sorted(
+        name for name in os.listdir(path) if name.endswith(".gz")
+    )
+
+    manifest = backup.read_backup_manifest(path)
+    assert manifest["version"] == "1.2.3" and manifest["parallel"]
+    members = {member["file"]: member for member in manifest["members"]}
+    assert members["schema.sql.gz"]["schema"]
+    assert members["data-TeachingEvent.sql.gz"]["tables"] == ["TeachingEvent"]
+    assert sorted(members["data-small.sql.gz"]["tables"]) == ["Teacher", "User"]
+
+    calls = _calls(source)
+    assert all("--single-transaction" in call["options"] for call in calls)
+    assert sorted(call["names"] for call in calls) == [
+        ["core"],
+        ["core", "TeachingEvent"],
+        ["core", "User", "Teacher"],
+    ]
+
+    target = tmp_path / "target.db"
+    restored = []
+    restore_progress = Progress()
+    assert (
+        backup.restore_database(
+            os.path.join(path, "manifest.json"),
+            fake_mysql(target),
+            progress=restore_progress,
+            on_part_done=restored.append,
+        )
+        == manifest
+    )
+    # Das Schema kommt vor den Daten
+    assert restored[0]["file"] == "schema.sql.gz" and len(restored) == 3
+    assert restore_progress.done == summary["bytes"]
+    for table in ("TeachingEvent", "Teacher", "User"):
+        assert _rows(target, table) == _rows(source, table)
+
+
+def test_single_dump(fake_mysql, source, tmp_path):
+    summary = backup.backup_database(
+        fake_mysql(source),
+        mysqldump(source),
+        "core",
+        str(tmp_path),
+        sizes=SIZES,
+        parallel=1,
+    )
+    assert not summary["parallel"] and summary["parts"] == 1
+    (call,) = _calls(source)
+    # Schema und alle Daten in einem Lauf und damit einer Transaktion
+    assert call["names"] == ["core"]
+    assert "--single-transaction" in call["options"]
+    assert "--no-data" not in call["options"]
+
+    manifest = backup.read_backup_manifest(summary["path"])
+    (member,) = manifest["members"]
+    assert member["file"] == "core.sql.gz" and member["schema"]
+    assert member["tables"] == ["Teacher", "TeachingEvent", "User"]
+
+    target = tmp_path / "target.db"
+    backup.restore_database(summary["path"], fake_mysql(target))
+    assert _rows(target, "User") == [(1, "müller"), (2, "schmidt")]
+
+
+def test_failed_dump_with_large_stderr(fake_mysql, source, tmp_path):
+    # 200 KB stderr vor der ersten Zeile auf stdout: mit stderr als Pipe
+    # würden mysqldump und der Leser aufeinander warten
+    with pytest.raises(backup.BackupError, match="boom"):
+        backup.backup_database(
+            fake_mysql(source),
+            mysqldump(source, "--fail-stderr=200000"),
+            "core",
+            str(tmp_path / "backups"),
+            sizes=SIZES,
+        )
+    assert os.listdir(tmp_path / "backups") == []
+
+
+def test_restore_errors(fake_mysql, source, tmp_path):
+    with pytest.raises(backup.BackupError, match="Keine gültige Sicherung"):
+        backup.restore_database(str(tmp_path), fake_mysql(tmp_path / "x.db"))
+
+    summary = backup.backup_database(
+        fake_mysql(source),
+        mysqldump(source),
+        "core",
+        str(tmp_path),
+        sizes=SIZES,
+        parallel=1,
+    )
+    part = os.path.join(summary["path"], "core.sql.gz")
+
+    # Ein Schema, das mysql ablehnt
+    with gzip.open(part, "wb") as f:
+        f.write(b"CREATE TABLE broken (;\n")
+    with pytest.raises(backup.BackupError, match="core.sql.gz: ERROR 1064"):
+        backup.restore_database(summary["path"], fake_mysql(tmp_path / "y.db"))
+
+    # Beschädigte Datei
+    with open(part, "wb") as f:
+        f.write(b"kein gzip")
+    with pytest.raises(backup.BackupError, match="core.sql.gz"):
+        backup.restore_database(summary["path"], fake_mysql(tmp_path / "z.db"))
+
+
+def test_cli_arguments():
+    import run_benchmarks
+
+    bm = run_benchmarks.load_boot_manager()
+    args = bm.parse_arguments(["db", "backup", "--no-pause"])
+    assert args.no_pause and args.output == bm.BACKUP_DIR
+    assert bm.parse_arguments(["db", "restore", "x"]).path == "x"
+    assert bm.backup._module is None
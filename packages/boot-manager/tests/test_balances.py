@@ -0,0 +1,293 @@
+"""
+Salden-Export: die Werte aus der einen Export-Abfrage müssen mit den Einzel-
+abfragen aus packages/database/sql/select.sql übereinstimmen, ausgeführt je
+Lehrperson und Semester auf den Testdaten aus test-data.sql.
+"""
+
+import csv
+import math
+import os
+import re
+import sqlite3
+import sys
+
+import pytest
+from dbtools import balances
+from dbtools.mysql import mysql_query_rows
+
+SQL_FOLDER = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "database", "sql")
+)
+
+# Stammdaten, die test-data.sql voraussetzt (in der Datenbank von Hand gepflegt)
+LEGACY_MASTER_DATA = """
+INSERT INTO Semester (Name, IsActive) VALUES
+    ('WS2021', 0), ('SS21', 0), ('WS2122', 0), ('SS22', 0),
+    ('WS2223', 0), ('SS23', 0), ('WS2324', 0), ('SS24', 1);
+INSERT INTO TypeOfSupervision (TypeOfSupervision, CalculationFactor, ValidFrom) VALUES
+    ('Bachelorarbeit', 0.2, 1), ('Masterarbeit', 0.2, 1), ('Zweitprüfer', 0.2, 1),
+    ('Praxissemester', 0.2, 1), ('Bachelorarbeit (ab SS24)', 0.3, 8),
+    ('Masterarbeit (ab SS24)', 0.3, 8), ('Zweitprüfer (ab SS24)', 0.1, 8);
+INSERT INTO TypeOfReduction (TypeOfReduction) VALUES
+    ('Funktion/Aufgabe'), ('Forschung/Entwicklung'), ('Gesetzlich');
+"""
+
+# Schema der Web-App (Prisma), soweit der Export es liest
+CORE_SCHEMA = """
+CREATE TABLE User (id INTEGER PRIMARY KEY, username TEXT, firstName TEXT, lastName TEXT);
+CREATE TABLE TeachingGroup (id INTEGER PRIMARY KEY, groupName TEXT);
+CREATE TABLE SemesterPeriod (id INTEGER PRIMARY KEY, name TEXT, active INT);
+CREATE TABLE EvaluationSettings (id INTEGER PRIMARY KEY, key TEXT, value TEXT);
+CREATE TABLE SupervisionType (typeOfSupervisionId INTEGER PRIMARY KEY,
+    typeOfSupervision TEXT, calculationFactor REAL, validFrom INT);
+CREATE TABLE DiscountType (discountTypeId INTEGER PRIMARY KEY, discountType TEXT);
+CREATE TABLE Teacher (id INTEGER PRIMARY KEY, userId INT, teachingGroupId INT);
+CREATE TABLE TeachingDutyPerSemester (id INTEGER PRIMARY KEY, individualDuty REAL,
+    semesterPeriodId INT, teacherId INT);
+CREATE TABLE TeachingEvent (id INTEGER PRIMARY KEY, name TEXT, semesterPeriodId INT,
+    teacherId INT, ordered INT, hours REAL);
+CREATE TABLE Supervision (id INTEGER PRIMARY KEY, semesterPeriodId INT,
+    supervisionTypeId INT, teacherId INT);
+CREATE TABLE Discount (id INTEGER PRIMARY KEY, discountTypeId INT,
+    semesterPeriodId INT, teacherId INT, scope REAL);
+INSERT INTO TeachingGroup VALUES (1, 'Gruppe_1');
+INSERT INTO EvaluationSettings VALUES (1, 'saldation_period', '6');
+"""
+
+# Einzelabfragen aus select.sql (nach den drei SET-Anweisungen) -> Exportspalte
+SELECT_COLUMNS = {
+    1: "SumSupervision",
+    2: "SumLecture",
+    3: "SumReduction",
+    4: "Sum_Funktion_Forschung",
+    5: "Sum_Gesetzlich",
+    6: "Deputat",
+    7: "SumSaldo",
+    10: "SumAngeordnet",
+    11: "SumSaldoZeitraum",
+}
+COUNT_COLUMNS = ["Anz_BA", "Anz_MA", "Anz_Zwtprf", "Anz_Prxs"]
+
+
+def _read_sql(name):
+    with open(os.path.join(SQL_FOLDER, name), encoding="utf-8") as f:
+        text = f.read()
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    return re.sub(r"--[^\n]*", "", text)
+
+
+def _legacy_database(path):
+    """
+    Datenbank im Schema von create-database.sql mit den Testdaten; jede dritte
+    Lehrveranstaltung gilt als nicht angeordnet.
+    """
+    ddl = _read_sql("create-database.sql").replace(
+        "CREATE DATABASE deputationFB08;", ""
+    )
+    ddl = re.sub(r"(\w+) INT NOT NULL AUTO_INCREMENT,", r"\1 INTEGER PRIMARY KEY,", ddl)
+    ddl = re.sub(r",\s*PRIMARY KEY \(\w+ID\)", "", ddl)
+    legacy = sqlite3.connect(path)
+    legacy.executescript(ddl)
+    legacy.executescript(_read_sql("test-data.sql"))
+    legacy.executescript(LEGACY_MASTER_DATA)
+    legacy.execute("UPDATE Lecture SET IsArranged = 0 WHERE LectureID % 3 = 0")
+    legacy.commit()
+    return legacy
+
+
+def _core_database(path, legacy):
+    """
+    Überträgt die Testdaten in das Schema der Web-App.
+    """
+    core = sqlite3.connect(path)
+    core.executescript(CORE_SCHEMA)
+    users = {}
+    for number, (username, first_name, last_name) in enumerate(
+        legacy.execute("SELECT Username, FirstName, LastName FROM Teacher"), 1
+    ):
+        users[username] = number
+        core.execute(
+            "INSERT INTO User VALUES (?, ?, ?, ?)",
+            (number, username, first_name, last_name),
+        )
+        core.execute("INSERT INTO Teacher VALUES (?, ?, 1)", (number, number))
+    copies = [
+        ("SemesterPeriod", "SELECT SemesterID, Name, IsActive FROM Semester", None),
+        ("SupervisionType", "SELECT * FROM TypeOfSupervision", None),
+        ("DiscountType", "SELECT * FROM TypeOfReduction", None),
+        (
+            "TeachingDutyPerSemester (individualDuty, semesterPeriodId, teacherId)",
+            "SELECT DeputationIndividual, SemesterID, Teacher FROM DeputationPerSemester",
+            2,
+        ),
+        (
+            "TeachingEvent (name, semesterPeriodId, teacherId, ordered, hours)",
+            "SELECT LectureName, SemesterID, Teacher, IsArranged, HoursSWS FROM Lecture",
+            2,
+        ),
+        (
+            "Supervision (semesterPeriodId, supervisionTypeId, teacherId)",
+            "SELECT SemesterID, TypeOfSupervisionID, Teacher FROM Supervision",
+            2,
+        ),
+        (
+            "Discount (discountTypeId, semesterPeriodId, teacherId, scope)",
+            "SELECT TypeOfReductionID, SemesterID, Teacher, ScopeOfReduction "
+            "FROM Reduction",
+            2,
+        ),
+    ]
+    for table, query, teacher_column in copies:
+        rows = [list(row) for row in legacy.execute(query)]
+        if teacher_column is not None:
+            for row in rows:
+                row[teacher_column] = users[row[teacher_column]]
+        if rows:
+            marks = ", ".join("?" * len(rows[0]))
+            core.executemany(f"INSERT INTO {table} VALUES ({marks})", rows)
+    core.commit()
+    core.close()
+    return {number: username for username, number in users.items()}
+
+
+@pytest.fixture(scope="module")
+def databases(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("balances")
+    legacy = _legacy_database(str(folder / "legacy.sqlite"))
+    usernames = _core_database(str(folder / "core.sqlite"), legacy)
+    yield legacy, folder / "core.sqlite", usernames
+    legacy.close()
+
+
+@pytest.fixture
+def mysql_command(fake_mysql, databases):
+    return fake_mysql(databases[1])
+
+
+def _reference(legacy, username, semester, period):
+    """
+    Kennzahlen einer Lehrperson in einem Semester über die Abfragen aus select.sql.
+    """
+    statements = [s.strip() for s in _read_sql("select.sql").split(";") if s.strip()]
+    statements = statements[3:]
+
+    def run(index):
+        sql = (
+            statements[index]
+            .replace("@user", f"'{username}'")
+            .replace("@semester", str(semester))
+            .replace("@range", str(period))
+        )
+        return legacy.execute(sql).fetchall()
+
+    reference = {}
+    for index, column in SELECT_COLUMNS.items():
+        rows = run(index)
+        # Deputat: (Semester, Deputat), fehlt ganz ohne Eintrag
+        reference[column] = rows[0][-1] if rows else None
+    first_name, last_name = legacy.execute(
+        "SELECT FirstName, LastName FROM Teacher WHERE Username = ?", (username,)
+    ).fetchone()
+    counts = [row for row in run(0) if row[:2] == (first_name, last_name)]
+    reference.update(zip(COUNT_COLUMNS, counts[0][2:] if counts else [0, 0, 0, 0]))
+    return reference
+
+
+def _number(text):
+    return None if text == "" else float(text)
+
+
+def _same(actual, expected):
+    if actual is None or expected is None:
+        return actual is None and expected is None
+    return math.isclose(actual, float(expected), abs_tol=1e-9)
+
+
+def test_export_matches_select_sql(databases, mysql_command, tmp_path):
+    legacy, _, usernames = databases
+    summary = balances.export_balances(
+        mysql_command, path=str(tmp_path / "salden.csv"), first=1
+    )
+    assert (summary["first_semester"], summary["last_semester"]) == (1, 8)
+    assert summary["period"] == 6
+
+    with open(tmp_path / "salden.csv", encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert summary["rows"] == len(rows) == len(usernames) * 8
+    assert list(rows[0]) == [name for name, _ in balances.COLUMNS]
+
+    mismatches = []
+    for row in rows:
+        username = usernames[int(row["LehrpersonID"])]
+        semester = int(row["SemesterID"])
+        reference = _reference(legacy, username, semester, summary["period"])
+        for column, expected in reference.items():
+            if not _same(_number(row[column]), expected):
+                mismatches.append((username, semester, column, row[column], expected))
+    assert mismatches == []
+    # Die Testdaten decken alle Fälle ab: leere Summen und angeordnete Stunden
+    assert any(row["SumSaldo"] == "" for row in rows)
+    assert any(row["SumAngeordnet"] != "" for row in rows)
+
+
+def test_default_period_ends_at_active_semester(mysql_command, tmp_path):
+    assert balances.get_balance_period(mysql_command) == (8, 6)
+    summary = balances.export_balances(mysql_command, output_dir=str(tmp_path))
+    assert (summary["first_semester"], summary["last_semester"]) == (3, 8)
+    assert os.path.basename(summary["path"]).startswith("salden-3-8-")
+    assert summary["path"].endswith(".csv")
+
+
+def test_parquet_matches_csv(mysql_command, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    balances.export_balances(mysql_command, path=str(tmp_path / "s.csv"), first=1)
+    balances.export_balances(
+        mysql_command, path=str(tmp_path / "s.parquet"), first=1, file_format="parquet"
+    )
+    table = parquet.read_table(tmp_path / "s.parquet").to_pylist()
+    with open(tmp_path / "s.csv", encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(table) == len(rows)
+    for record, row in zip(table, rows):
+        for name, kind in balances.COLUMNS:
+            assert record[name] == balances._typed_value(kind, row[name] or None)
+
+
+def test_invalid_period(mysql_command):
+    with pytest.raises(balances.ExportError, match="Ungültiger Zeitraum"):
+        balances.export_balances(mysql_command, first=5, last=4, period=6)
+    with pytest.raises(balances.ExportError, match="Unbekanntes Format"):
+        balances.export_balances(mysql_command, file_format="xlsx")
+
+
+def test_failed_query_leaves_no_file(fake_mysql, tmp_path):
+    sqlite3.connect(tmp_path / "empty.sqlite").close()
+    target = tmp_path / "salden.csv"
+    with pytest.raises(balances.ExportError):
+        balances.export_balances(
+            fake_mysql(tmp_path / "empty.sqlite"),
+            path=str(target),
+            first=1,
+            last=8,
+            period=6,
+        )
+    assert list(tmp_path.iterdir()) == [tmp_path / "empty.sqlite"]
+
+
+def test_query_error_with_large_stderr():
+    # 200 KB Meldungen vor der ersten Zeile: mit stderr als Pipe, die erst nach
+    # stdout gelesen wird, würden mysql und der Leser aufeinander warten
+    def mysql_command(*args):
+        script = (
+            "import sys; sys.stderr.write('x' * 200000 + 'boom'); "
+            "print('1\\tNULL'); sys.exit(1)"
+        )
+        return [sys.executable, "-c", script]
+
+    rows = []
+    with pytest.raises(balances.ExportError, match="boom"):
+        for row in mysql_query_rows(
+            mysql_command, "SELECT 1", None, balances.ExportError
+        ):
+            rows.append(row)
+    assert rows == [["1", None]]
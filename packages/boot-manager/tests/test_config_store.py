@@ -0,0 +1,91 @@
+"""
+ConfigStore und Eingabewerte: Zwischenspeicher der Compose-Datei, atomares
+Schreiben und die Neuberechnung nur der betroffenen abhängigen Werte.
+"""
+
+import os
+
+import pytest
+import yaml
+
+WEB_PORT = ("services", "web", "ports", 0)
+ROOT_PASSWORD = ("services", "db", "environment", "MYSQL_ROOT_PASSWORD")
+
+
+def compose_config():
+    return {
+        "services": {
+            "web": {"ports": ["8080:3000"]},
+            "api": {
+                "environment": {
+                    "FRONTEND_URL": "http://localhost:8080",
+                    "DATABASE_URL": "mysql://system:pw@db:3306/core?connection_limit=5",
+                },
+            },
+            "prisma": {
+                "environment": {"DATABASE_URL": "mysql://root:root@db:3306/core"}
+            },
+            "db": {
+                "environment": {"MYSQL_ROOT_PASSWORD": "root", "MYSQL_PASSWORD": "pw"}
+            },
+        }
+    }
+
+
+@pytest.fixture
+def store(bm, tmp_path, monkeypatch):
+    path = tmp_path / "docker-compose.yml"
+    path.write_text(yaml.safe_dump(compose_config()), encoding="utf-8")
+    monkeypatch.setattr(bm, "DOCKER_COMPOSE_FILE", str(path))
+    return bm.ConfigStore()
+
+
+def test_load_is_cached_until_the_file_changes(store, tmp_path):
+    config = store.load()
+    assert config == compose_config()
+    # Änderungen an der Kopie erreichen den Zwischenspeicher nicht
+    config["services"].clear()
+    assert store.load() == compose_config()
+
+    # Von Hand geänderte Datei (andere Größe) wird neu gelesen
+    changed = compose_config()
+    changed["services"]["web"]["ports"] = ["18080:3000"]
+    (tmp_path / "docker-compose.yml").write_text(yaml.safe_dump(changed))
+    assert store.load()["services"]["web"]["ports"] == ["18080:3000"]
+
+
+def test_save_is_atomic_and_skips_unchanged(store, tmp_path):
+    path = tmp_path / "docker-compose.yml"
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    config = store.load()
+
+    store.save(config)
+    assert os.stat(path).st_mtime_ns == 1_000_000_000
+
+    config["services"]["web"]["ports"] = ["9090:3000"]
+    store.save(config)
+    assert os.stat(path).st_mtime_ns != 1_000_000_000
+    assert yaml.safe_load(path.read_text()) == config
+    assert os.listdir(tmp_path) == ["docker-compose.yml"]
+
+
+def test_apply_config_values_fixes_only_dependents(bm):
+    config = compose_config()
+    prisma_url = config["services"]["prisma"]["environment"]["DATABASE_URL"]
+
+    assert bm.apply_config_values(config, {WEB_PORT: "9090"}) == {WEB_PORT}
+    assert config["services"]["web"]["ports"] == ["9090:3000"]
+    assert config["services"]["api"]["environment"]["FRONTEND_URL"] == (
+        "http://localhost:9090"
+    )
+    # Die Datenbank-URLs hängen nicht am Port und bleiben unberührt
+    assert config["services"]["prisma"]["environment"]["DATABASE_URL"] == prisma_url
+    assert "volumes" not in config["services"]["db"]
+
+    # Unveränderte Werte: nichts zu speichern
+    assert bm.apply_config_values(config, {WEB_PORT: "9090"}) == set()
+
+    assert bm.apply_config_values(config, {ROOT_PASSWORD: "geheim"}) == {ROOT_PASSWORD}
+    assert config["services"]["prisma"]["environment"]["DATABASE_URL"] == (
+        "mysql://root:geheim@db:3306/core"
+    )
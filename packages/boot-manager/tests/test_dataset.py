@@ -0,0 +1,121 @@
+"""
+Testdaten-Generator: Reproduzierbarkeit, referenzielle Konsistenz und die
+Salden der Deputatsmeldungen. Eingespielt wird über tests/fake_mysql.py in
+eine SQLite-Datei mit den Tabellen aus dbtools.dataset.TABLES.
+"""
+
+import filecmp
+import os
+import sqlite3
+
+import pytest
+from dbtools import dataset
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "core.db"
+    connection = sqlite3.connect(path)
+    for table, columns in dataset.TABLES.items():
+        connection.execute(
+            f"CREATE TABLE `{table}` ({', '.join(f'`{c}`' for c in columns)})"
+        )
+    connection.commit()
+    connection.close()
+    return path
+
+
+def _query(database, sql):
+    connection = sqlite3.connect(database)
+    try:
+        return connection.execute(sql).fetchall()
+    finally:
+        connection.close()
+
+
+def test_csv_is_reproducible(tmp_path):
+    for name, seed in (("a", 7), ("b", 7), ("c", 8)):
+        dataset.write_dataset(
+            scale=0.02,
+            seed=seed,
+            semesters=4,
+            output=str(tmp_path / name),
+            file_format="csv",
+        )
+    files = sorted(os.listdir(tmp_path / "a"))
+    assert set(files) >= {f"{table}.csv" for table in ("User", "Teacher")}
+    _, mismatch, errors = filecmp.cmpfiles(tmp_path / "a", tmp_path / "b", files)
+    assert not mismatch and not errors
+    _, mismatch, _ = filecmp.cmpfiles(tmp_path / "a", tmp_path / "c", files)
+    assert "TeachingEvent.csv" in mismatch
+
+
+def test_sql_into_database(fake_mysql, database):
+    mysql_command = fake_mysql(database)
+    summary = dataset.write_dataset(mysql_command, scale=0.02, semesters=3)
+    assert summary["teachers"] == 10
+    assert summary["rows"] == sum(
+        _query(database, f"SELECT COUNT(*) FROM `{table}`")[0][0]
+        for table in dataset.TABLES
+    )
+    assert _query(database, "SELECT COUNT(*) FROM Teacher")[0][0] == 10
+    assert _query(database, "SELECT COUNT(*) FROM TeachingDutyPerSemester")[0][0] == 30
+    # Jeder Eintrag verweist auf eine vorhandene Lehrperson und ein Semester
+    assert not _query(
+        database,
+        "SELECT id FROM TeachingEvent WHERE teacherId NOT IN (SELECT id FROM Teacher)"
+        " OR semesterPeriodId NOT IN (SELECT id FROM SemesterPeriod)",
+    )
+    assert _query(database, "SELECT name FROM SemesterPeriod WHERE active = 1") == [
+        ("SS24",)
+    ]
+
+    # Saldo = Lehrveranstaltungen + Betreuungen + Ermäßigungen - Deputat
+    rows = _query(
+        database,
+        "SELECT d.sumBalance + d.individualDuty - COALESCE((SELECT SUM(hours) FROM "
+        "TeachingEvent e WHERE e.teacherId = d.teacherId AND e.semesterPeriodId = "
+        "d.semesterPeriodId), 0) - COALESCE((SELECT SUM(scope) FROM Discount x WHERE "
+        "x.teacherId = d.teacherId AND x.semesterPeriodId = d.semesterPeriodId), 0) "
+        "FROM TeachingDutyPerSemester d",
+    )
+    assert all(value >= -0.01 for (value,) in rows)
+
+
+def test_refuses_filled_database(fake_mysql, database):
+    mysql_command = fake_mysql(database)
+    dataset.write_dataset(mysql_command, scale=0.01, semesters=2)
+    with pytest.raises(dataset.DatasetError, match="bereits Daten"):
+        dataset.write_dataset(mysql_command, scale=0.01, semesters=2)
+
+    dataset.write_dataset(mysql_command, scale=0.02, semesters=2, replace=True)
+    assert _query(database, "SELECT COUNT(*) FROM Teacher")[0][0] == 10
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"file_format": "xml", "output": "x"},
+        {"scale": 0, "output": "x"},
+        {"semesters": 0, "output": "x"},
+        {"file_format": "csv"},
+    ],
+)
+def test_invalid_options(options):
+    with pytest.raises(dataset.DatasetError):
+        dataset.write_dataset(**options)
+
+
+def test_cli_defaults(tmp_path):
+    import run_benchmarks
+
+    bm = run_benchmarks.load_boot_manager()
+    args = bm.parse_arguments(
+        ["db", "generate", "--scale", "0.01", "--output", str(tmp_path / "cli.sql")]
+    )
+    assert args.seed is None and args.semesters is None
+
+    exit_code, result = args.handler(args)
+    assert exit_code == 0 and result["semesters"] == dataset.SEMESTERS
+    dataset.write_dataset(scale=0.01, output=str(tmp_path / "default.sql"))
+    assert filecmp.cmp(tmp_path / "cli.sql", tmp_path / "default.sql", shallow=False)
@@ -0,0 +1,234 @@
+"""
+Delta-Updates: create_delta/apply_delta und der Rückfall auf die vollständige
+EXE im Update-Ablauf.
+"""
+
+import hashlib
+import queue
+import random
+from http.server import ThreadingHTTPServer
+
+import pytest
+from run_benchmarks import RangeHandler, start_server
+
+KB = 1024
+
+
+def _binary(seed, size=256 * KB):
+    return random.Random(seed).randbytes(size)
+
+
+def _shuffled(data, block=4 * KB, seed=1):
+    blocks = [data[i : i + block] for i in range(0, len(data), block)]
+    random.Random(seed).shuffle(blocks)
+    return b"".join(blocks)
+
+
+def _patched(data):
+    # Einfügungen verschieben alle folgenden Blöcke gegen die Blockgrenzen
+    return (
+        data[:1000]
+        + b"neue Version"
+        + data[1000:50000]
+        + _binary(9, 3000)
+        + (data[50000:])
+    )
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def old(tmp_path):
+    data = _binary(0)
+    (tmp_path / "old.exe").write_bytes(data)
+    return data
+
+
+def _round_trip(bm, tmp_path, new):
+    (tmp_path / "new.exe").write_bytes(new)
+    paths = [str(tmp_path / name) for name in ("old.exe", "new.exe", "update.delta")]
+    size = bm.create_delta(*paths)
+    written = bm.apply_delta(
+        paths[0], paths[2], str(tmp_path / "out.exe"), _sha256(new)
+    )
+    assert written == len(new)
+    assert (tmp_path / "out.exe").read_bytes() == new
+    assert not (tmp_path / "out.exe.part").exists()
+    return size
+
+
+@pytest.mark.parametrize(
+    "change, max_ratio",
+    [
+        (lambda old: old, 0.01),
+        (lambda old: old + _binary(5, 16 * KB), 0.1),
+        (_shuffled, 0.05),
+        (_patched, 0.05),
+    ],
+    ids=["identical", "appended", "shuffled", "patched"],
+)
+def test_round_trip(bm, tmp_path, old, change, max_ratio):
+    new = change(old)
+    assert _round_trip(bm, tmp_path, new) < max_ratio * len(new)
+
+
+def test_round_trip_unrelated_and_empty(bm, tmp_path, old):
+    new = _binary(7)
+    # Ohne gemeinsame Blöcke: Delta ungefähr so groß wie die Datei selbst
+    assert _round_trip(bm, tmp_path, new) > 0.9 * len(new)
+    _round_trip(bm, tmp_path, b"")
+
+
+def _delta(bm, tmp_path, new):
+    (tmp_path / "new.exe").write_bytes(new)
+    bm.create_delta(
+        str(tmp_path / "old.exe"),
+        str(tmp_path / "new.exe"),
+        str(tmp_path / "update.delta"),
+    )
+    return (tmp_path / "update.delta").read_bytes()
+
+
+def _apply(bm, tmp_path, delta, expected_sha256=None):
+    (tmp_path / "update.delta").write_bytes(delta)
+    return bm.apply_delta(
+        str(tmp_path / "old.exe"),
+        str(tmp_path / "update.delta"),
+        str(tmp_path / "out.exe"),
+        expected_sha256,
+    )
+
+
+@pytest.mark.parametrize(
+    "corrupt, message",
+    [
+        (lambda delta: b"XXXX" + delta[4:], "Ungültiges Delta-Format"),
+        (lambda delta: delta[: len(delta) // 2], "unvollständig|beschädigt"),
+        (
+            lambda delta: delta[:-40] + bytes(b ^ 0xFF for b in delta[-40:]),
+            "beschädigt|Prüfsumme|Größe",
+        ),
+        (
+            lambda delta: delta.replace(b'"target_size": ', b'"target_size": 1', 1),
+            "Größe",
+        ),
+    ],
+    ids=["magic", "truncated", "flipped", "size"],
+)
+def test_corrupted_delta(bm, tmp_path, old, corrupt, message):
+    delta = _delta(bm, tmp_path, _patched(old))
+    with pytest.raises(bm.DeltaError, match=message):
+        _apply(bm, tmp_path, corrupt(delta))
+    assert not (tmp_path / "out.exe").exists()
+    assert not (tmp_path / "out.exe.part").exists()
+
+
+def test_expected_checksum(bm, tmp_path, old):
+    delta = _delta(bm, tmp_path, _patched(old))
+    with pytest.raises(bm.DeltaError, match="Prüfsumme"):
+        _apply(bm, tmp_path, delta, _sha256(b"andere EXE"))
+    assert not (tmp_path / "out.exe").exists()
+
+
+def test_base_hash_mismatch(bm, tmp_path, old):
+    delta = _delta(bm, tmp_path, _patched(old))
+    (tmp_path / "old.exe").write_bytes(old[:-1] + b"\0")
+    with pytest.raises(bm.DeltaError, match="installierten Version"):
+        _apply(bm, tmp_path, delta)
+    assert not (tmp_path / "out.exe").exists()
+
+
+# ============================================================================
+#   UPDATE-ABLAUF
+# ============================================================================
+
+
+class CountingRangeHandler(RangeHandler):
+    def do_GET(self):
+        self.server.hits += self.headers.get("Range") != "bytes=0-0"
+        super().do_GET()
+
+
+@pytest.fixture
+def release(bm, tmp_path, old, monkeypatch):
+    """
+    Release v9.9.9 mit EXE, Compose-Datei und Delta von der laufenden EXE
+    ('old.exe'); jedes Asset liegt auf einem eigenen lokalen Server.
+    """
+    new = _patched(old)
+    files = {
+        "BootManagerDPT.exe": new,
+        "docker-compose.yml": b"services: {}\n",
+        bm.delta_asset_name(bm.CURRENT_VERSION, "v9.9.9"): _delta(bm, tmp_path, new),
+    }
+    servers, assets, urls = {}, [], {}
+    for number, (name, payload) in enumerate(files.items()):
+        server = start_server(
+            ThreadingHTTPServer(("127.0.0.1", 0), CountingRangeHandler)
+        )
+        server.daemon_threads = True
+        server.payload, server.hits = payload, 0
+        servers[name] = server
+        urls[number] = f"http://127.0.0.1:{server.server_address[1]}/{name}"
+        assets.append(
+            {
+                "id": number,
+                "name": name,
+                "size": len(payload),
+                "digest": f"sha256:{_sha256(payload)}",
+            }
+        )
+
+    app = tmp_path / "app"
+    app.mkdir()
+    monkeypatch.setattr(bm.sys, "frozen", True, raising=False)
+    monkeypatch.setattr(bm, "EXE_PATH", str(tmp_path / "old.exe"))
+    monkeypatch.setattr(bm, "DOCKER_COMPOSE_FILE", str(app / "docker-compose.yml"))
+    monkeypatch.setattr(bm, "get_asset_download_url", urls.get)
+    yield assets, servers, new
+    for server in servers.values():
+        server.shutdown()
+        server.server_close()
+
+
+def _update(bm, assets):
+    progress = queue.Queue()
+    bm.download_and_replace_files("v9.9.9", assets, progress)
+    messages = []
+    while not progress.empty():
+        messages.append(progress.get_nowait())
+    return messages
+
+
+def test_update_applies_delta(bm, tmp_path, release):
+    assets, servers, new = release
+    messages = _update(bm, assets)
+    assert messages[-1] == ("done", str(tmp_path / "BootManagerDPT_v9.9.9.exe"))
+    assert (tmp_path / "BootManagerDPT_v9.9.9.exe").read_bytes() == new
+    assert servers["BootManagerDPT.exe"].hits == 0
+    assert not (tmp_path / "BootManagerDPT_v9.9.9.exe.delta").exists()
+
+
+def test_update_falls_back_on_base_mismatch(bm, tmp_path, release, old):
+    assets, servers, new = release
+    # Lokal veränderte EXE: das Delta passt nicht mehr
+    (tmp_path / "old.exe").write_bytes(old[::-1])
+    messages = _update(bm, assets)
+    assert messages[-1] == ("done", str(tmp_path / "BootManagerDPT_v9.9.9.exe"))
+    assert (tmp_path / "BootManagerDPT_v9.9.9.exe").read_bytes() == new
+    assert servers["BootManagerDPT.exe"].hits == 1
+    assert not (tmp_path / "BootManagerDPT_v9.9.9.exe.delta").exists()
+
+
+def test_update_falls_back_on_corrupted_delta(bm, tmp_path, release):
+    assets, servers, new = release
+    delta = servers[assets[2]["name"]]
+    delta.payload = delta.payload[:-100]
+    # Mit passender Prüfsumme veröffentlicht: erst apply_delta bemerkt den Fehler
+    assets[2]["digest"] = f"sha256:{_sha256(delta.payload)}"
+    messages = _update(bm, assets)
+    assert messages[-1][0] == "done"
+    assert (tmp_path / "BootManagerDPT_v9.9.9.exe").read_bytes() == new
+    assert servers["BootManagerDPT.exe"].hits == 1
@@ -0,0 +1,495 @@
+"""
+DockerEngineClient gegen einen nachgebildeten Daemon auf einem Unix-Socket.
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from run_benchmarks import FakeDockerDaemon, FakeDockerHandler, start_server
+
+ACTIONS = {"start": "started", "stop": "stopped"}
+
+
+class EngineHandler(FakeDockerHandler):
+    """
+    Erweitert die Benchmark-Nachbildung um Version, Filter, Images, Streams und
+    Stopps. Jede Anfrage wird in 'server.requests' festgehalten; Ereignisse für
+    /events kommen aus der Queue 'server.events' (None: Endpunkt fehlt).
+    """
+
+    def _events(self, until):
+        while True:
+            try:
+                yield self.server.events.get(timeout=max(until - time.time(), 0))
+            except queue.Empty:
+                return
+
+    def _stream(self, events):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for event in events:
+                data = json.dumps(event).encode() + b"\r\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Der Client hat den Stream vorzeitig beendet
+            self.close_connection = True
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path))
+        if self.server.drop_next:
+            # Verbindung wortlos schließen (z. B. Daemon-Neustart)
+            self.server.drop_next = False
+            self.close_connection = True
+            return
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/version":
+            return self._send({"ApiVersion": "1.45", "Version": "27.0.0"})
+        if url.path == "/containers/json" and "filters" in query:
+            labels = json.loads(query["filters"][0]).get("label", [])
+            wanted = [label.partition("=")[::2] for label in labels]
+            return self._send(
+                [
+                    container
+                    for container in self.server.containers.values()
+                    if all(container["Labels"].get(k) == v for k, v in wanted)
+                ]
+            )
+        if url.path.startswith("/images/") and url.path.endswith("/json"):
+            image = url.path[len("/images/") : -len("/json")]
+            if image in self.server.images:
+                return self._send(self.server.images[image])
+            return self._send({"message": f"No such image: {image}"}, status=404)
+        if url.path == "/events" and self.server.events is not None:
+            until = float(query.get("until", ["inf"])[0])
+            return self._stream(self._events(until))
+        super().do_GET()
+
+    def do_POST(self):
+        self.server.requests.append(("POST", self.path))
+        url = urlsplit(self.path)
+        if url.path == "/images/create":
+            return self._stream(self.server.pull_events)
+        parts = url.path.split("/")
+        if len(parts) == 4 and parts[1] == "containers" and parts[3] in ACTIONS:
+            container = self.server.containers.get(parts[2])
+            if container is None:
+                return self._send({"message": "not found"}, status=404)
+            running = parts[3] == "start"
+            getattr(self.server, ACTIONS[parts[3]]).append(parts[2])
+            changed = container["_state"]["Running"] != running
+            self.send_response(204 if changed else 304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            container["_state"]["Running"] = running
+            return
+        self._send({"message": "not found"}, status=404)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    server = start_server(
+        FakeDockerDaemon(str(tmp_path / "docker.sock"), handler=EngineHandler)
+    )
+    server.requests = []
+    server.images = {}
+    server.events = queue.Queue()
+    server.pull_events = []
+    server.stopped = []
+    server.started = []
+    server.drop_next = False
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(bm, daemon):
+    return bm.DockerEngineClient(host=f"unix://{daemon.server_address}", timeout=5)
+
+
+def _container(project, service, running=True):
+    return {
+        "Id": f"{project}-{service}",
+        "Labels": {
+            "com.docker.compose.project": project,
+            "com.docker.compose.service": service,
+        },
+        "_state": {"Running": running, "Status": "running"},
+    }
+
+
+def test_ping_and_version(client):
+    assert client.ping()
+    assert client.version()["ApiVersion"] == "1.45"
+
+
+def test_requests_share_one_connection(client, daemon):
+    client.ping()
+    connection = client._connection
+    client.version()
+    assert client._connection is connection
+
+
+def test_reconnects_after_dropped_connection(client, daemon):
+    assert client.ping()
+    daemon.drop_next = True
+    # Erster Versuch auf der alten Verbindung scheitert, der zweite klappt
+    assert client.version()["Version"] == "27.0.0"
+    assert daemon.requests[-2:] == [("GET", "/version"), ("GET", "/version")]
+
+
+def test_containers_filtered_by_label(client, daemon):
+    for container in (
+        _container("dpt", "db"),
+        _container("dpt", "api"),
+        _container("other", "db"),
+    ):
+        daemon.containers[container["Id"]] = container
+    found = client.containers(filters={"label": ["com.docker.compose.project=dpt"]})
+    assert sorted(container["Id"] for container in found) == ["dpt-api", "dpt-db"]
+    query = parse_qs(urlsplit(daemon.requests[-1][1]).query)
+    assert query["all"] == ["0"]
+    assert json.loads(query["filters"][0]) == {
+        "label": ["com.docker.compose.project=dpt"]
+    }
+    assert len(client.containers(all=True)) == 3
+
+
+def test_inspect_image(client, daemon):
+    daemon.images["mysql:9"] = {"RepoDigests": ["mysql@sha256:abc"]}
+    assert client.inspect_image("mysql:9") == {"RepoDigests": ["mysql@sha256:abc"]}
+    assert client.inspect_image("missing:1") is None
+
+
+def test_inspect_container_not_found(bm, client):
+    with pytest.raises(bm.DockerEngineError, match="HTTP 404"):
+        client.inspect_container("unknown")
+
+
+def test_events_stream(client, daemon):
+    daemon.events.put({"Type": "container", "Action": "start", "id": "a"})
+    daemon.events.put({"Type": "container", "Action": "health_status", "id": "b"})
+    events = list(client.events({"type": ["container"]}, since=100, until=0))
+    assert [event["id"] for event in events] == ["a", "b"]
+    query = parse_qs(urlsplit(daemon.requests[-1][1]).query)
+    assert query["since"] == ["100"] and query["until"] == ["0"]
+
+    # Der Stream bleibt bis 'until' offen und liefert spätere Ereignisse
+    threading.Timer(0.2, daemon.events.put, [{"id": "c"}]).start()
+    start = time.monotonic()
+    events = list(client.events(until=time.time() + 1.5))
+    assert events == [{"id": "c"}]
+    assert time.monotonic() - start >= 0.5
+
+
+READINESS_CONFIG = {
+    "name": "dpt",
+    "services": {"db": {"healthcheck": {}}, "api": {"depends_on": ["db"]}},
+}
+
+
+def _starting_stack(daemon):
+    for service in READINESS_CONFIG["services"]:
+        container = _container("dpt", service)
+        daemon.containers[container["Id"]] = container
+    daemon.containers["dpt-db"]["_state"]["Health"] = {"Status": "starting"}
+
+
+def _become_healthy(daemon, event=True):
+    time.sleep(0.3)
+    daemon.containers["dpt-db"]["_state"]["Health"]["Status"] = "healthy"
+    if event:
+        daemon.events.put({"Type": "container", "Action": "health_status: healthy"})
+
+
+def test_readiness_woken_by_events(bm, client, daemon):
+    _starting_stack(daemon)
+    threading.Thread(target=_become_healthy, args=(daemon,), daemon=True).start()
+    tracker = bm.ReadinessTracker(READINESS_CONFIG, client=client)
+    start = time.monotonic()
+    # Ohne Event käme der nächste Poll erst nach READINESS_EVENT_POLL_INTERVAL
+    assert tracker.wait(timeout=10, interval=2)
+    assert time.monotonic() - start < 1.5
+
+    path = next(path for _, path in daemon.requests if path.startswith("/events"))
+    filters = json.loads(parse_qs(urlsplit(path).query)["filters"][0])
+    assert filters["label"] == ["com.docker.compose.project=dpt"]
+    assert set(filters["event"]) == {"create", "start", "die", "health_status"}
+
+
+def test_readiness_polls_without_events(bm, client, daemon):
+    daemon.events = None
+    _starting_stack(daemon)
+    threading.Thread(target=_become_healthy, args=(daemon, False), daemon=True).start()
+    tracker = bm.ReadinessTracker(READINESS_CONFIG, client=client)
+    start = time.monotonic()
+    assert tracker.wait(timeout=10, interval=0.1)
+    assert time.monotonic() - start < 1.5
+    assert not tracker.events_live
+
+
+def test_pull_progress_and_error_event(bm, client, daemon, tmp_path):
+    puller = bm.ImagePuller(client=client, cache_path=str(tmp_path / "digests.json"))
+    reports = []
+    puller.on_progress = lambda image, text: reports.append(text)
+
+    daemon.pull_events = [
+        {"status": "Pulling from library/mysql", "id": "9"},
+        {
+            "status": "Downloading",
+            "id": "l1",
+            "progressDetail": {"current": 50, "total": 100},
+        },
+        {"status": "Pull complete", "id": "l1"},
+    ]
+    daemon.images["mysql:9"] = {"RepoDigests": ["mysql@sha256:abc"]}
+    assert puller._pull("mysql:9")
+    assert reports == ["0 %", "50 %", "100 %", "fertig"]
+    assert ("POST", "/images/create?fromImage=mysql&tag=9") in daemon.requests
+    with open(tmp_path / "digests.json", encoding="utf-8") as f:
+        assert json.load(f) == {"mysql:9": "sha256:abc"}
+
+    reports.clear()
+    daemon.pull_events = [
+        {"status": "Pulling from library/api", "id": "1"},
+        {"error": "manifest unknown", "errorDetail": {"message": "manifest unknown"}},
+    ]
+    assert not puller._pull("api:1")
+    assert reports == ["0 %", "Fehler"]
+
+
+def test_stream_error_status(bm, client):
+    with pytest.raises(bm.DockerEngineError, match="HTTP 404"):
+        list(client.stream("POST", "/unknown"))
+
+
+def test_stop_stack_in_dependency_order(bm, client, daemon):
+    config = {
+        "name": "dpt",
+        "services": {
+            "db": {},
+            "api": {"depends_on": ["db"]},
+            "web": {"depends_on": ["api"]},
+        },
+    }
+    for service in config["services"]:
+        container = _container("dpt", service)
+        daemon.containers[container["Id"]] = container
+    report = bm.stop_stack(config, client=client)
+    assert report["ok"]
+    assert daemon.stopped == ["dpt-web", "dpt-api", "dpt-db"]
+
+
+def test_paused_api(bm, client, daemon):
+    config = {"name": "dpt", "services": {"db": {}, "api": {}, "web": {}}}
+    for service in config["services"]:
+        container = _container("dpt", service)
+        daemon.containers[container["Id"]] = container
+    replica = _container("dpt", "api")
+    replica["Id"] = "dpt-api-2"
+    daemon.containers[replica["Id"]] = replica
+
+    with bm.paused_api(config, client=client) as paused:
+        assert paused
+        assert sorted(daemon.stopped) == ["dpt-api", "dpt-api-2"]
+        assert daemon.containers["dpt-db"]["_state"]["Running"]
+        assert daemon.started == []
+    assert sorted(daemon.started) == ["dpt-api", "dpt-api-2"]
+    assert daemon.containers["dpt-api"]["_state"]["Running"]
+
+    # Bereits gestoppte API wird danach nicht gestartet
+    daemon.containers["dpt-api"]["_state"]["Running"] = False
+    daemon.containers.pop("dpt-api-2")
+    daemon.started.clear()
+    with pytest.raises(RuntimeError):
+        with bm.paused_api(config, client=client) as paused:
+            raise RuntimeError
+    assert daemon.started == []
+
+
+# ============================================================================
+#   KEIN DAEMON ERREICHBAR
+# ============================================================================
+
+
+@pytest.fixture
+def missing(bm, tmp_path):
+    return bm.DockerEngineClient(host=f"unix://{tmp_path / 'missing.sock'}")
+
+
+def test_missing_socket(bm, missing):
+    assert not missing.ping()
+    with pytest.raises(bm.DockerEngineError):
+        missing.version()
+    with pytest.raises(bm.DockerEngineError):
+        list(missing.events(until=0))
+    assert not missing.wait_until_ready(timeout=0.2, initial_delay=0.05)
+
+
+def test_paused_api_without_daemon(bm, missing):
+    with bm.paused_api({"name": "dpt", "services": {"api": {}}}, missing) as paused:
+        assert not paused
+
+
+def test_stop_stack_falls_back_to_compose(bm, missing, monkeypatch):
+    calls = []
+    monkeypatch.setattr(bm, "stop_docker_compose", lambda: calls.append("stop"))
+    report = bm.stop_stack({"name": "dpt", "services": {"db": {}}}, client=missing)
+    assert calls == ["stop"]
+    assert report["ok"] and report["services"] == {}
+
+
+def test_host_resources_without_daemon(bm, missing, monkeypatch):
+    monkeypatch.setattr(bm, "docker_client", missing)
+    memory, cpus = bm.get_host_resources()
+    assert memory > 0
+    assert cpus == (os.cpu_count() or 1)
+
+
+def test_default_docker_host(bm, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", "tcp://127.0.0.1:2375")
+    assert bm.default_docker_host() == "tcp://127.0.0.1:2375"
+    monkeypatch.delenv("DOCKER_HOST")
+    monkeypatch.setattr(bm.sys, "platform", "linux")
+    monkeypatch.setattr(bm.os.path, "exists", lambda path: False)
+    assert bm.default_docker_host() == "unix:///var/run/docker.sock"
+
+
+def test_unsupported_docker_host(bm):
+    client = bm.DockerEngineClient(host="ssh://user@host")
+    assert not client.ping()
+    with pytest.raises(bm.DockerEngineError, match="Nicht unterstützter"):
+        client.version()
+
+
+# ============================================================================
+#   NAMED PIPE (WINDOWS) MIT NACHGEBILDETEM _winapi
+# ============================================================================
+
+
+class FakeOverlapped:
+    def __init__(self, data=b"", stuck=False):
+        self.event = object()
+        self.data = data
+        self.stuck = stuck
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def GetOverlappedResult(self, wait):
+        # Eine hängende Operation ohne Abbruch würde hier ewig warten
+        assert wait and (self.cancelled or not self.stuck)
+        return (0, 995) if self.cancelled else (len(self.data), 0)
+
+    def getbuffer(self):
+        return b"" if self.cancelled else self.data
+
+
+class FakeWinapi:
+    """
+    Die von _NamedPipeSocket genutzten Teile von _winapi. Lesen liefert
+    'response' stückweise; mit 'stuck' bleibt jede Leseoperation hängen.
+    """
+
+    GENERIC_READ = 0x80000000
+    GENERIC_WRITE = 0x40000000
+    NULL = 0
+    OPEN_EXISTING = 3
+    FILE_FLAG_OVERLAPPED = 0x40000000
+    ERROR_PIPE_BUSY = 231
+    ERROR_IO_PENDING = 997
+    WAIT_OBJECT_0 = 0
+    INFINITE = 0xFFFFFFFF
+
+    def __init__(self):
+        self.response = b""
+        self.written = b""
+        self.stuck = False
+        self.busy = 0
+        self.paths = []
+        self.waits = []
+        self.reads = []
+        self.closed = 0
+
+    def CreateFile(self, path, access, share, security, disposition, flags, template):
+        if self.busy:
+            self.busy -= 1
+            error = OSError("All pipe instances are busy")
+            error.winerror = self.ERROR_PIPE_BUSY
+            raise error
+        assert flags & self.FILE_FLAG_OVERLAPPED
+        self.paths.append(path)
+        return 1
+
+    def WaitNamedPipe(self, path, milliseconds):
+        self.waits.append(milliseconds)
+
+    def WriteFile(self, handle, data, overlapped=False):
+        # Höchstens 16 Bytes pro Aufruf, damit sendall weiterschreiben muss
+        chunk = bytes(data[:16])
+        self.written += chunk
+        return FakeOverlapped(chunk), self.ERROR_IO_PENDING
+
+    def ReadFile(self, handle, size, overlapped=False):
+        if self.stuck:
+            overlapped = FakeOverlapped(stuck=True)
+            self.reads.append(overlapped)
+            return overlapped, self.ERROR_IO_PENDING
+        if not self.response:
+            raise BrokenPipeError("pipe closed")
+        chunk, self.response = self.response[:size], self.response[size:]
+        return FakeOverlapped(chunk), 0
+
+    def WaitForMultipleObjects(self, handles, wait_all, milliseconds):
+        self.waits.append(milliseconds)
+        stuck = [read.event for read in self.reads]
+        return 0x102 if any(event in stuck for event in handles) else 0
+
+    def CloseHandle(self, handle):
+        self.closed += 1
+
+
+@pytest.fixture
+def winapi(monkeypatch):
+    fake = FakeWinapi()
+    monkeypatch.setitem(sys.modules, "_winapi", fake)
+    return fake
+
+
+def test_named_pipe_request(bm, winapi):
+    winapi.response = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nOK"
+    winapi.busy = 1
+    client = bm.DockerEngineClient(host="npipe:////./pipe/docker_engine", timeout=2)
+    assert client.ping()
+    assert winapi.paths == ["\\\\.\\pipe\\docker_engine"]
+    assert winapi.written.startswith(b"GET /_ping HTTP/1.1\r\n")
+    assert winapi.written.endswith(b"\r\n\r\n")
+    assert 0 < winapi.waits[0] <= 2000
+
+    client._connection.close()
+    assert winapi.closed == 1
+
+
+def test_named_pipe_timeout(bm, winapi):
+    winapi.stuck = True
+    client = bm.DockerEngineClient(host="npipe:////./pipe/docker_engine", timeout=2)
+    start = time.monotonic()
+    assert not client.ping()
+    assert time.monotonic() - start < 1
+    assert winapi.reads[0].cancelled
+    assert 1900 < winapi.waits[-1] <= 2000
+    assert winapi.closed == 1
+    # Der Verbindungs-Lock ist wieder frei
+    assert client._lock.acquire(blocking=False)
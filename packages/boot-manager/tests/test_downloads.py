@@ -0,0 +1,193 @@
+"""
+DownloadEngine gegen einen lokalen HTTP-Server: Segmente, Fortsetzen über
+'.part.json', Server ohne Range-Unterstützung, Prüfsummen und abgebrochene
+Segmente.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+from run_benchmarks import RangeHandler, start_server
+
+KB = 1024
+
+
+class AssetHandler(RangeHandler):
+    """
+    RangeHandler mit Protokoll der Range-Header, abschaltbarer Range-Unterstützung
+    und Antworten, die nach der Hälfte abbrechen ('server.truncate' Stück).
+    """
+
+    def do_GET(self):
+        byte_range = self.headers.get("Range")
+        self.server.ranges.append(byte_range)
+        with self.server.lock:
+            # Die 1-Byte-Probe wird nie abgebrochen
+            truncate = byte_range != "bytes=0-0" and self.server.truncate > 0
+            self.server.truncate -= truncate
+        if not self.server.supports_ranges:
+            del self.headers["Range"]
+            byte_range = None
+        if not truncate:
+            return super().do_GET()
+
+        payload = self.server.payload
+        start, end = 0, len(payload) - 1
+        if byte_range:
+            first, _, last = byte_range.split("=", 1)[1].partition("-")
+            start, end = int(first), int(last) if last else end
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+        else:
+            self.send_response(200)
+        body = payload[start : end + 1]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body[: len(body) // 2])
+        self.close_connection = True
+
+
+@pytest.fixture
+def server():
+    server = start_server(ThreadingHTTPServer(("127.0.0.1", 0), AssetHandler))
+    server.daemon_threads = True
+    server.payload = os.urandom(1024 * KB)
+    server.ranges = []
+    server.supports_ranges = True
+    server.truncate = 0
+    server.lock = threading.Lock()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/asset.exe"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def engine(bm):
+    def factory(**options):
+        options = dict(
+            dict(segments=4, min_segment_size=64 * KB, chunk_size=16 * KB), **options
+        )
+        return bm.DownloadEngine(**options)
+
+    return factory
+
+
+def _job(server, tmp_path, **extra):
+    return dict(url=server.url, path=str(tmp_path / "asset.exe"), **extra)
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _content(tmp_path):
+    return (tmp_path / "asset.exe").read_bytes()
+
+
+def _drain(progress):
+    items = []
+    while not progress.empty():
+        items.append(progress.get_nowait())
+    return items
+
+
+def test_segmented_download(engine, server, tmp_path):
+    progress = queue.Queue()
+    job = _job(server, tmp_path, sha256=_sha256(server.payload).upper())
+    engine(progress_queue=progress).download([job])
+    assert _content(tmp_path) == server.payload
+    assert sorted(os.listdir(tmp_path)) == ["asset.exe"]
+    # Probe plus vier Segmente
+    assert sorted(server.ranges[1:]) == [
+        "bytes=0-262143",
+        "bytes=262144-524287",
+        "bytes=524288-786431",
+        "bytes=786432-1048575",
+    ]
+    kind, last = _drain(progress)[-1]
+    assert kind == "progress"
+    assert last["downloaded"] == last["total"] == len(server.payload)
+
+
+def test_resume_from_part_state(bm, engine, server, tmp_path):
+    server.truncate = 4
+    job = _job(server, tmp_path, sha256=_sha256(server.payload))
+    with pytest.raises(bm.DownloadError):
+        engine(retries=0).download([job])
+    assert not (tmp_path / "asset.exe").exists()
+    with open(tmp_path / "asset.exe.part.json") as f:
+        state = json.load(f)
+    assert state["size"] == len(server.payload)
+    assert any(segment["done"] for segment in state["segments"])
+
+    # Nach dem ersten Fehler werden übrige Segmente nicht mehr angefragt und
+    # verbrauchen ihren Abbruch nicht
+    server.truncate = 0
+    server.ranges.clear()
+    engine().download([job])
+    assert _content(tmp_path) == server.payload
+    # Nur die fehlenden Teile werden erneut angefragt
+    expected = sorted(
+        f"bytes={segment['start'] + segment['done']}-{segment['end']}"
+        for segment in state["segments"]
+        if segment["start"] + segment["done"] <= segment["end"]
+    )
+    assert sorted(server.ranges[1:]) == expected
+
+
+def test_stale_part_state_starts_over(engine, server, tmp_path):
+    (tmp_path / "asset.exe.part").write_bytes(b"\0" * len(server.payload))
+    state = {
+        "size": len(server.payload),
+        "sha256": "0" * 64,  # anderer Stand der Datei
+        "segments": [{"start": 0, "end": len(server.payload) - 1, "done": 1000}],
+    }
+    (tmp_path / "asset.exe.part.json").write_text(json.dumps(state))
+    engine().download([_job(server, tmp_path, sha256=_sha256(server.payload))])
+    assert _content(tmp_path) == server.payload
+    assert "bytes=0-262143" in server.ranges
+
+
+def test_server_without_range_support(engine, server, tmp_path):
+    server.supports_ranges = False
+    server.truncate = 1
+    engine().download([_job(server, tmp_path, sha256=_sha256(server.payload))])
+    assert _content(tmp_path) == server.payload
+    # Ein einzelnes Segment; nach dem Abbruch wird von vorn geladen
+    assert server.ranges[1:] == [None, None]
+
+
+def test_sha256_mismatch(bm, engine, server, tmp_path):
+    job = _job(server, tmp_path, sha256=_sha256(b"something else"))
+    with pytest.raises(bm.DownloadError, match="SHA-256"):
+        engine().download([job])
+    # Beschädigte Teildatei verworfen, der nächste Versuch beginnt neu
+    assert os.listdir(tmp_path) == []
+
+
+def test_short_segment_is_resumed(engine, server, tmp_path):
+    server.payload = os.urandom(64 * KB)
+    server.truncate = 1
+    engine().download([_job(server, tmp_path, sha256=_sha256(server.payload))])
+    assert _content(tmp_path) == server.payload
+    # Zweiter Versuch setzt hinter den angekommenen 32 KB fort
+    assert server.ranges[1:] == ["bytes=0-65535", "bytes=32768-65535"]
+
+
+def test_short_segment_gives_up(bm, engine, server, tmp_path):
+    server.truncate = 100
+    with pytest.raises(bm.DownloadError, match="asset.exe"):
+        engine(retries=0).download([_job(server, tmp_path)])
+    assert not (tmp_path / "asset.exe").exists()
+
+
+def test_unreachable_server(bm, engine, tmp_path):
+    job = {"url": "http://127.0.0.1:9/asset.exe", "path": str(tmp_path / "a.exe")}
+    with pytest.raises(bm.DownloadError, match="nicht erreichbar"):
+        engine().download([job])
@@ -0,0 +1,197 @@
+"""
+Image-Bundles: Export über 'docker save', Import mit ausgelassenen Layern und
+die Entscheidung des ImagePullers zwischen Bundle und Registry. Die docker-CLI
+ersetzt tests/fake_docker.py, den Daemon ein einfaches Objekt mit
+inspect_image() und images().
+"""
+
+import hashlib
+import json
+import os
+import stat
+import sys
+
+import fake_docker
+import pytest
+
+FAKE_DOCKER = os.path.join(os.path.dirname(__file__), "fake_docker.py")
+
+IMAGES = ["fabianjg/dpt:api-latest", "fabianjg/dpt:web-latest"]
+DIGEST = "sha256:" + "a" * 64
+
+
+class Daemon:
+    """
+    Lokale Images: {Referenz: Liste der diff_ids}.
+    """
+
+    def __init__(self, images):
+        self.local = images
+
+    def images(self):
+        return [{"Id": image} for image in self.local]
+
+    def inspect_image(self, image):
+        if image not in self.local:
+            return None
+        return {
+            "Id": f"sha256:{image}",
+            "RepoDigests": [f"{image.partition(':')[0]}@{DIGEST}"],
+            "Size": 1024,
+            "RootFS": {"Layers": self.local[image]},
+        }
+
+
+def _read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def docker_cli(tmp_path, monkeypatch):
+    """
+    Legt ein 'docker'-Skript vor den PATH und gibt das Zustandsverzeichnis zurück.
+    """
+    folder = tmp_path / "bin"
+    folder.mkdir()
+    script = folder / "docker"
+    script.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_DOCKER}" "$@"\n')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    state = tmp_path / "docker-state"
+    state.mkdir()
+    monkeypatch.setenv("PATH", f"{folder}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_DOCKER_STATE", str(state))
+    return state
+
+
+@pytest.fixture
+def bundle(bm, docker_cli, tmp_path):
+    config = {"services": {"api": {"image": IMAGES[0]}, "web": {"image": IMAGES[1]}}}
+    path = str(tmp_path / bm.IMAGE_BUNDLE_NAME)
+    report = bm.export_image_bundle(
+        path, config=config, client=Daemon(dict.fromkeys(IMAGES, []))
+    )
+    assert report["images"] == IMAGES and report["path"] == path
+    return report
+
+
+def test_layer_chain_ids(bm):
+    first, second = "sha256:" + "1" * 64, "sha256:" + "2" * 64
+    chained = "sha256:" + hashlib.sha256(f"{first} {second}".encode()).hexdigest()
+    assert bm._layer_chain_ids([first, second]) == [first, chained]
+    assert bm._layer_chain_ids([]) == []
+
+
+def test_export_manifest(bm, bundle, tmp_path):
+    assert 0 < bundle["size"] < bundle["uncompressed"]
+    assert not os.path.exists(f"{bundle['path']}.part")
+    manifest = bm.read_image_bundle_manifest(bundle["path"])
+    assert manifest["images"][IMAGES[0]]["digests"] == [DIGEST]
+    _, base = fake_docker.layer("base/layer.tar")
+    _, api = fake_docker.layer(IMAGES[0])
+    assert manifest["layers"]["base/layer.tar"] == base
+    assert manifest["layers"]["app0/layer.tar"] == bm._layer_chain_ids([base, api])[1]
+
+    assert bm.find_image_bundle(str(tmp_path))[1] == manifest
+    assert bm.bundle_contains_image(IMAGES[1], folder=str(tmp_path))
+    assert not bm.bundle_contains_image("mysql:8", folder=str(tmp_path))
+    assert bm.find_image_bundle(str(tmp_path / "bin")) is None
+
+
+def test_import_skips_present_layers(bm, bundle, docker_cli):
+    _, base = fake_docker.layer("base/layer.tar")
+    report = bm.import_image_bundle(bundle["path"], client=Daemon({"mysql:8": [base]}))
+    (loaded,) = _read_jsonl(docker_cli / "loads.jsonl")
+    assert "base/layer.tar" not in loaded and "app0/layer.tar" in loaded
+    assert bm.IMAGE_BUNDLE_MANIFEST not in loaded
+    assert report["skipped"] == fake_docker.LAYER_SIZE
+    assert report["loaded"] + report["skipped"] == bundle["uncompressed"]
+
+
+def test_import_falls_back_to_full_load(bm, bundle, docker_cli, monkeypatch):
+    monkeypatch.setenv("FAKE_DOCKER_REJECT_PARTIAL", "1")
+    _, base = fake_docker.layer("base/layer.tar")
+    report = bm.import_image_bundle(bundle["path"], client=Daemon({"mysql:8": [base]}))
+    partial, full = _read_jsonl(docker_cli / "loads.jsonl")
+    assert "base/layer.tar" not in partial and "base/layer.tar" in full
+    assert report["skipped"] == 0
+
+    # Ohne ausgelassene Layer gibt es keinen zweiten Versuch
+    with open(bundle["path"], "r+b") as f:
+        f.seek(-64, os.SEEK_END)
+        f.write(b"\0" * 64)
+    with pytest.raises(bm.ImageBundleError):
+        bm.import_image_bundle(bundle["path"], client=Daemon({}))
+
+
+@pytest.mark.parametrize(
+    "policy, local, remote, reachable, expected",
+    [
+        # Bundle passt zur Registry: laden statt ziehen, unter jeder Strategie
+        ("always", [], DIGEST, True, ["bundle"]),
+        ("missing", None, DIGEST, True, ["bundle"]),
+        # Veraltetes Bundle: ziehen, das Bundle bleibt unberührt
+        ("always", [], "sha256:" + "b" * 64, True, ["pull"]),
+        ("missing", None, "sha256:" + "b" * 64, True, ["pull"]),
+        # Registry nicht erreichbar: Bundle ohne Digest-Vergleich
+        ("always", [], None, False, ["bundle"]),
+    ],
+)
+def test_puller_uses_bundle_only_when_current(
+    bm, monkeypatch, tmp_path, policy, local, remote, reachable, expected
+):
+    manifest = {"images": {IMAGES[0]: {"digests": [DIGEST]}}, "layers": {}}
+    monkeypatch.setattr(
+        bm, "find_image_bundle", lambda folder=None: ("bundle.tar.zst", manifest)
+    )
+    calls = []
+
+    def import_image_bundle(path, client=None):
+        calls.append("bundle")
+        daemon.local[IMAGES[0]] = []
+
+    def get_remote_digest(image):
+        if not reachable:
+            raise bm.requests.exceptions.ConnectionError("offline")
+        return remote
+
+    monkeypatch.setattr(bm, "import_image_bundle", import_image_bundle)
+    monkeypatch.setattr(bm, "get_remote_digest", get_remote_digest)
+    daemon = Daemon({} if local is None else {IMAGES[0]: local})
+    puller = bm.ImagePuller(client=daemon, cache_path=str(tmp_path / "digests.json"))
+
+    def pull(image):
+        calls.append("pull")
+        return True
+
+    monkeypatch.setattr(puller, "_pull", pull)
+
+    assert puller.ensure_images([IMAGES[0]], policy)
+    assert calls == expected
+
+
+def test_puller_falls_back_to_stale_bundle(bm, monkeypatch, tmp_path):
+    manifest = {"images": {IMAGES[0]: {"digests": [DIGEST]}}, "layers": {}}
+    monkeypatch.setattr(
+        bm, "find_image_bundle", lambda folder=None: ("bundle.tar.zst", manifest)
+    )
+    monkeypatch.setattr(bm, "get_remote_digest", lambda image: "sha256:" + "b" * 64)
+    daemon = Daemon({})
+    calls = []
+
+    def import_image_bundle(path, client=None):
+        calls.append("bundle")
+        daemon.local[IMAGES[0]] = []
+
+    monkeypatch.setattr(bm, "import_image_bundle", import_image_bundle)
+    puller = bm.ImagePuller(client=daemon, cache_path=str(tmp_path / "digests.json"))
+
+    def pull(image):
+        calls.append("pull")
+        return False
+
+    monkeypatch.setattr(puller, "_pull", pull)
+
+    # Pull scheitert und es gibt kein lokales Image: dann doch das Bundle
+    assert puller.ensure_images([IMAGES[0]], "always")
+    assert calls == ["pull", "bundle"]
@@ -0,0 +1,407 @@
+"""
+Massenimport: CSV und XLSX lesen, Spalten zuordnen, Zeilen prüfen und das SQL
+über 'sql_output' in eine Datei schreiben (ohne Datenbank). Für die Prüfung
+der Schlüssel steht tests/fake_mysql.py mit einer SQLite-Datei bereit.
+"""
+
+import csv
+import datetime
+import gzip
+import sqlite3
+import sys
+
+import pytest
+from dbtools import importer
+from dbtools.mysql import mysql_script_stream
+
+SCHEMA = """
+CREATE TABLE User (id INTEGER PRIMARY KEY);
+CREATE TABLE TeachingGroup (id INTEGER PRIMARY KEY);
+CREATE TABLE SemesterPeriod (id INTEGER PRIMARY KEY);
+CREATE TABLE Comment (commentId INTEGER PRIMARY KEY);
+CREATE TABLE Program (id INTEGER PRIMARY KEY);
+CREATE TABLE Teacher (id INTEGER PRIMARY KEY, userId INT UNIQUE, retirementDate TEXT,
+    totalTeachingDuty REAL, teachingGroupId INT);
+CREATE TABLE TeachingDutyPerSemester (id INTEGER PRIMARY KEY, individualDuty REAL,
+    sumBalance REAL, sumOrderedBalance REAL, semesterPeriodId INT, teacherId INT,
+    UNIQUE (semesterPeriodId, teacherId));
+CREATE TABLE TeachingEvent (id INTEGER PRIMARY KEY, name TEXT, semesterPeriodId INT,
+    teacherId INT, ordered INT, hours REAL, commentId INT, programId INT);
+INSERT INTO User VALUES (1), (2), (3);
+INSERT INTO TeachingGroup VALUES (1);
+INSERT INTO SemesterPeriod VALUES (1), (2);
+INSERT INTO Teacher VALUES (1, 1, '2040-01-01', 18, 1);
+"""
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def _read_rejects(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f, delimiter=";"))
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "core.sqlite"
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.close()
+    return path
+
+
+# ============================================================================
+#   DATEIEN LESEN
+# ============================================================================
+
+
+@pytest.mark.parametrize("delimiter", [";", ",", "\t"])
+def test_csv_delimiter_and_bom(tmp_path, delimiter):
+    path = tmp_path / "TeachingEvent.csv"
+    rows = [["name", "hours"], ["Mathe; Teil 1", "4,5"], ["Physik", "2"]]
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        csv.writer(f, delimiter=delimiter).writerows(rows)
+    assert list(importer.iter_import_rows(str(path))) == rows
+
+
+def test_xlsx_rows(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["name", "semesterPeriodId", "teacherId", "ordered", "hours"])
+    sheet.append(["Mathe 1", 1, 1, True, 4.5])
+    sheet.append(["Physik", 2.0, 1, "nein", None])
+    workbook.save(tmp_path / "Vorlesungen.xlsx")
+    rows = list(importer.iter_import_rows(str(tmp_path / "Vorlesungen.xlsx")))
+    assert rows[1] == ["Mathe 1", 1, 1, True, 4.5]
+    assert rows[2] == ["Physik", 2, 1, "nein", ""]
+
+
+def test_xlsx_import(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(
+        ["discountTypeId", "semesterPeriodId", "teacherId", "ordered"]
+        + ["approvalDate", "supervisor", "description", "scope"]
+    )
+    sheet.append([1, 2.0, 1, False, datetime.datetime(2024, 3, 1, 12, 30)])
+    sheet["F2"], sheet["G2"], sheet["H2"] = "Dekan", "Forschung", 2
+    sheet.append([1, 1, 1, "ja", "31.12.2023", "Dekan", "Gremium", "x"])
+    workbook.save(tmp_path / "Discount.xlsx")
+
+    summary = importer.bulk_import(
+        [str(tmp_path / "Discount.xlsx")],
+        None,
+        sql_output=str(tmp_path / "import.sql"),
+        check_keys=False,
+    )
+    assert (summary["rows"], summary["rejected"]) == (1, 1)
+    sql = (tmp_path / "import.sql").read_text(encoding="utf-8")
+    assert "(1, 2, 1, 0, '2024-03-01 12:30:00.000', 'Dekan', 'Forschung', 2.0)" in sql
+    rejects = _read_rejects(tmp_path / "Discount.rejects.csv")
+    assert rejects[1][:2] == ["3", "scope: Zahl erwartet"]
+
+
+# ============================================================================
+#   TABELLEN UND SPALTEN
+# ============================================================================
+
+
+def test_detect_table(tmp_path):
+    assert importer.detect_import_table("exports/teaching_event-2024.csv", []) == (
+        "TeachingEvent"
+    )
+    header = ["userId", "retirementDate", "totalTeachingDuty", "teachingGroupId"]
+    assert importer.detect_import_table("daten.csv", header) == "Teacher"
+    with pytest.raises(importer.BulkImportError, match="nicht erkennbar"):
+        importer.detect_import_table("daten.csv", ["id"])
+
+
+def test_map_columns():
+    header = ["NAME", "", "semesterperiodid", "TeacherId", "ordered", " hours "]
+    assert importer.map_import_columns("TeachingEvent", header) == [
+        (0, "name"),
+        (2, "semesterPeriodId"),
+        (3, "teacherId"),
+        (4, "ordered"),
+        (5, "hours"),
+    ]
+    with pytest.raises(importer.BulkImportError, match="unbekannte Spalte 'raum'"):
+        importer.map_import_columns("TeachingEvent", header + ["raum"])
+    with pytest.raises(importer.BulkImportError, match="Spalten fehlen: hours"):
+        importer.map_import_columns("TeachingEvent", header[:-1])
+
+
+@pytest.mark.parametrize(
+    "kind, raw, value",
+    [
+        ("int", "12", 12),
+        ("int", 3.0, 3),
+        ("float", "4,5", 4.5),
+        ("bool", "Ja", True),
+        ("bool", "falsch", False),
+        ("date", "24.08.2035", datetime.date(2035, 8, 24)),
+        ("date", "2035-08-24", datetime.date(2035, 8, 24)),
+        ("datetime", "01.03.2024 12:30", datetime.datetime(2024, 3, 1, 12, 30)),
+        (
+            "datetime",
+            "2024-03-01T12:30:00+01:00",
+            datetime.datetime(2024, 3, 1, 11, 30),
+        ),
+        ("str", "  Mathe  ", "Mathe"),
+    ],
+)
+def test_parsers(kind, raw, value):
+    assert importer.IMPORT_PARSERS[kind][0](raw) == value
+
+
+@pytest.mark.parametrize(
+    "kind, raw",
+    [
+        ("int", "1.5"),
+        ("int", True),
+        ("float", "nan"),
+        ("bool", "vielleicht"),
+        ("date", "31.02.2024"),
+        ("str", "x" * 192),
+    ],
+)
+def test_parsers_reject(kind, raw):
+    with pytest.raises(ValueError):
+        importer.IMPORT_PARSERS[kind][0](raw)
+
+
+# ============================================================================
+#   IMPORT
+# ============================================================================
+
+
+def test_import_to_sql_file(tmp_path):
+    path = _write(
+        tmp_path / "TeachingEvent.csv",
+        "name;semesterPeriodId;teacherId;ordered;hours\n"
+        "Mathe 1;1;1;ja;4,5\n"
+        "O'Brien \\ Co;2;1;0;2\n",
+    )
+    summary = importer.bulk_import(
+        [path], None, sql_output=str(tmp_path / "import.sql"), check_keys=False
+    )
+    assert summary["rows"] == 2 and summary["rejected"] == 0
+    assert summary["files"][0]["rejects_file"] is None
+    assert (tmp_path / "import.sql").read_text(encoding="utf-8") == (
+        "SET NAMES utf8mb4;\nSET autocommit = 0;\nSTART TRANSACTION;\n"
+        "INSERT INTO `TeachingEvent` "
+        "(`name`, `semesterPeriodId`, `teacherId`, `ordered`, `hours`) VALUES\n"
+        "('Mathe 1', 1, 1, 1, 4.5),\n"
+        "('O\\'Brien \\\\ Co', 2, 1, 0, 2.0);\n"
+        "COMMIT;\n"
+    )
+
+
+def test_rejects_file(tmp_path):
+    path = _write(
+        tmp_path / "TeachingEvent.csv",
+        "name;semesterPeriodId;teacherId;ordered;hours\n"
+        "Mathe 1;1;1;ja;4,5\n"
+        ";1;1;ja;zwei\n"
+        "\n"
+        "Physik;x;1;vielleicht;2\n"
+        "Chemie;1;1;nein;3\n",
+    )
+    summary = importer.bulk_import(
+        [path], None, sql_output=str(tmp_path / "import.sql"), check_keys=False
+    )
+    assert (summary["rows"], summary["rejected"]) == (2, 2)
+    assert summary["files"][0]["rejects_file"] == str(
+        tmp_path / "TeachingEvent.rejects.csv"
+    )
+    # Zeilennummern wie in Excel (Kopfzeile = 1), Leerzeilen zählen mit
+    assert _read_rejects(tmp_path / "TeachingEvent.rejects.csv") == [
+        [
+            "zeile",
+            "fehler",
+            "name",
+            "semesterPeriodId",
+            "teacherId",
+            "ordered",
+            "hours",
+        ],
+        ["3", "name: fehlt; hours: Zahl erwartet", "", "1", "1", "ja", "zwei"],
+        [
+            "5",
+            "semesterPeriodId: ganze Zahl erwartet; "
+            "ordered: Wahrheitswert (ja/nein) erwartet",
+            "Physik",
+            "x",
+            "1",
+            "vielleicht",
+            "2",
+        ],
+    ]
+
+
+def test_foreign_and_unique_keys(fake_mysql, database, tmp_path):
+    teachers = _write(
+        tmp_path / "Teacher.csv",
+        "id;userId;retirementDate;totalTeachingDuty;teachingGroupId\n"
+        "2;2;2040-01-01;18;1\n"
+        "3;1;2040-01-01;18;1\n"  # userId 1 gehört schon Lehrperson 1
+        "4;3;2040-01-01;18;9\n",  # TeachingGroup 9 fehlt
+    )
+    duties = _write(
+        tmp_path / "TeachingDutyPerSemester.csv",
+        "individualDuty;sumBalance;sumOrderedBalance;semesterPeriodId;teacherId\n"
+        "18;0;0;1;2\n"  # Lehrperson 2 aus derselben Importdatei
+        "18;0;0;1;2\n"  # doppelt
+        "18;0;0;1;4\n"  # Lehrperson 4 wurde abgelehnt
+        "18;0;0;7;1\n",  # Semester 7 fehlt
+    )
+    # Reihenfolge der Modelle statt der Reihenfolge der Argumente
+    summary = importer.bulk_import(
+        [duties, teachers],
+        fake_mysql(database),
+        sql_output=str(tmp_path / "import.sql"),
+    )
+    assert [result["table"] for result in summary["files"]] == [
+        "Teacher",
+        "TeachingDutyPerSemester",
+    ]
+    assert (summary["rows"], summary["rejected"]) == (2, 5)
+    errors = {
+        name: [row[:2] for row in _read_rejects(tmp_path / f"{name}.rejects.csv")[1:]]
+        for name in ("Teacher", "TeachingDutyPerSemester")
+    }
+    assert errors == {
+        "Teacher": [
+            ["3", "userId 1 existiert bereits"],
+            ["4", "teachingGroupId: TeachingGroup 9 fehlt"],
+        ],
+        "TeachingDutyPerSemester": [
+            ["3", "semesterPeriodId/teacherId 1,2 existiert bereits"],
+            ["4", "teacherId: Teacher 4 fehlt"],
+            ["5", "semesterPeriodId: SemesterPeriod 7 fehlt"],
+        ],
+    }
+
+
+def test_import_into_database(fake_mysql, database, tmp_path):
+    path = _write(
+        tmp_path / "TeachingEvent.csv",
+        "name;semesterPeriodId;teacherId;ordered;hours;programId\n"
+        "Mathe 1;1;1;ja;4,5;\n"
+        "Physik;2;1;nein;2;5\n",  # Program 5 fehlt
+    )
+    summary = importer.bulk_import([path], fake_mysql(database))
+    assert (summary["rows"], summary["rejected"]) == (1, 1)
+    connection = sqlite3.connect(database)
+    assert connection.execute(
+        "SELECT name, semesterPeriodId, teacherId, ordered, hours, programId "
+        "FROM TeachingEvent"
+    ).fetchall() == [("Mathe 1", 1, 1, 1, 4.5, None)]
+    connection.close()
+
+
+def test_database_error(fake_mysql, database, tmp_path):
+    path = _write(
+        tmp_path / "Supervision.csv",
+        "studentId;semesterPeriodId;supervisionTypeId;teacherId\n1;1;1;1\n",
+    )
+    # Die Tabellen Supervision und SupervisionType fehlen in der Datenbank
+    with pytest.raises(importer.BulkImportError, match="Supervision"):
+        importer.bulk_import([path], fake_mysql(database))
+    with pytest.raises(importer.BulkImportError, match="abgelehnt"):
+        importer.bulk_import([path], fake_mysql(database), check_keys=False)
+
+
+def test_database_error_with_large_stderr():
+    # mysql schreibt 200 KB Meldungen, bevor es stdin liest; mit stderr als
+    # Pipe würden beide Seiten beim Schreiben aufeinander warten
+    def mysql_command(*args, interactive=False):
+        script = "import sys; sys.stderr.write('x' * 200000 + 'boom'); sys.exit(1)"
+        return [sys.executable, "-c", script]
+
+    with pytest.raises(importer.BulkImportError, match="boom"):
+        with mysql_script_stream(mysql_command, None, importer.BulkImportError) as f:
+            for _ in range(64):
+                f.write("INSERT INTO t VALUES (1);\n" * 1000)
+
+
+@pytest.mark.parametrize("output", ["import.sql", "import.sql.gz"])
+def test_bad_file_leaves_no_sql(tmp_path, output):
+    good = _write(
+        tmp_path / "TeachingEvent.csv",
+        "name;semesterPeriodId;teacherId;ordered;hours\nMathe 1;1;1;ja;4,5\n",
+    )
+    bad = _write(tmp_path / "Discount.csv", "discountTypeId;raum\n1;A 101\n")
+    with pytest.raises(importer.BulkImportError, match="unbekannte Spalte 'raum'"):
+        importer.bulk_import(
+            [good, bad], None, sql_output=str(tmp_path / output), check_keys=False
+        )
+    assert not (tmp_path / output).exists()
+
+    importer.bulk_import(
+        [good], None, sql_output=str(tmp_path / output), check_keys=False
+    )
+    opener = gzip.open if output.endswith(".gz") else open
+    with opener(tmp_path / output, "rt", encoding="utf-8") as f:
+        assert f.read().endswith("('Mathe 1', 1, 1, 1, 4.5);\nCOMMIT;\n")
+
+
+def test_empty_and_undecodable_files(tmp_path):
+    empty = _write(tmp_path / "TeachingEvent.csv", "")
+    with pytest.raises(importer.BulkImportError, match="Datei ist leer"):
+        importer.bulk_import(
+            [empty], None, sql_output=str(tmp_path / "a.sql"), check_keys=False
+        )
+    latin1 = tmp_path / "Teacher.csv"
+    latin1.write_bytes(
+        "userId;retirementDate;totalTeachingDuty;teachingGroupId\n"
+        "1;01.01.2040;18;1\nGrün;x;y;z\n".encode("latin-1")
+    )
+    with pytest.raises(importer.BulkImportError, match="Teacher.csv"):
+        importer.bulk_import(
+            [str(latin1)], None, sql_output=str(tmp_path / "b.sql"), check_keys=False
+        )
+    assert not (tmp_path / "a.sql").exists() and not (tmp_path / "b.sql").exists()
+
+
+def test_progress_counts_bytes(tmp_path):
+    class Progress:
+        done = 0
+
+        def add(self, num_bytes):
+            self.done += num_bytes
+
+    path = _write(
+        tmp_path / "TeachingEvent.csv",
+        "name;semesterPeriodId;teacherId;ordered;hours\nMathe 1;1;1;ja;4,5\n",
+    )
+    progress, statuses, results = Progress(), [], []
+    importer.bulk_import(
+        [path],
+        None,
+        sql_output=str(tmp_path / "import.sql"),
+        check_keys=False,
+        progress=progress,
+        on_status=statuses.append,
+        on_file_done=results.append,
+    )
+    assert progress.done == (tmp_path / "TeachingEvent.csv").stat().st_size
+    assert statuses == ["Importiere TeachingEvent.csv..."]
+    assert results[0]["rows"] == 1
+
+
+def test_cli_checks_table_without_loading_importer_at_startup():
+    import run_benchmarks
+
+    bm = run_benchmarks.load_boot_manager()
+    args = bm.parse_arguments(["db", "import", "--table", "Lecture", "x.csv"])
+    assert bm.importer._module is None
+
+    exit_code, result = args.handler(args)
+    assert exit_code == 2
+    assert "Unbekannte Tabelle: Lecture" in result["error"]
@@ -0,0 +1,331 @@
+"""
+Lasttest gegen eine nachgebildete API: Anmeldung, HTTP-Client, Fehlerquote,
+Perzentile und das offene Lastmodell.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from dbtools import loadtest
+
+PASSWORD = "secret"
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """
+    Beantwortet die Endpunkte der Szenarien. Über Attribute des Servers lassen
+    sich Verzögerung, Fehler und Verbindungsabbrüche einstellen.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _send(self, status, body, chunked=False, close=False, silent_close=False):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if close:
+            self.send_header("Connection", "close")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(data), 7):
+                part = data[i : i + 7]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        # silent_close: Verbindung ohne Ankündigung schließen (Idle-Timeout)
+        self.close_connection = close or silent_close
+
+    def _body(self):
+        return json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+    def _authorized(self):
+        if self.headers.get("Authorization", "").startswith("Bearer tok-"):
+            return True
+        self._send(401, {"message": "Unauthorized"})
+        return False
+
+    def do_POST(self):
+        body = self._body()
+        self.server.hits.append(("POST", self.path, body))
+        if self.path == "/auth/login":
+            if body["password"] == PASSWORD and body["username"] != "bad":
+                return self._send(201, {"access_token": f"tok-{body['username']}"})
+            return self._send(401, {"message": "Invalid credentials"})
+        self._send(404, {})
+
+    def do_PUT(self):
+        body = self._body()
+        self.server.hits.append(("PUT", self.path, body))
+        if self._authorized():
+            self._send(200, body)
+
+    def do_GET(self):
+        self.server.hits.append(("GET", self.path, None))
+        if not self._authorized():
+            return
+        time.sleep(self.server.delay)
+        if self.path == "/semester":
+            return self._send(200, [{"id": 1, "name": "SS24"}])
+        if self.path == "/auth/profile":
+            return self._send(200, {"id": 1})
+        if self.path == "/teacher":
+            return self._send(200, [{"id": i} for i in range(20)], chunked=True)
+        if self.path == "/teachingDuty":
+            if self.server.fail_duties:
+                return self._send(500, {"message": "Internal server error"})
+            return self._send(200, [{"id": 1, "individualDuty": 18}])
+        if self.path == "/close":
+            return self._send(200, {"closed": True}, close=True)
+        if self.path == "/idle":
+            return self._send(200, {"idle": True}, silent_close=True)
+        self._send(404, {})
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ApiHandler)
+    server.daemon_threads = True
+    server.hits = []
+    server.connections = 0
+    server.delay = 0.0
+    server.fail_duties = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _requests(base_url, paths):
+    """
+    Führt die GET-Anfragen nacheinander über eine Verbindung aus.
+    """
+
+    async def run():
+        connection = loadtest.AsyncHttpConnection(base_url)
+        headers = {"Authorization": "Bearer tok-test"}
+        try:
+            return [await connection.request("GET", path, headers) for path in paths]
+        finally:
+            connection.close()
+
+    return asyncio.run(run())
+
+
+# ============================================================================
+#   HTTP-CLIENT
+# ============================================================================
+
+
+def test_content_length_and_chunked_bodies(api):
+    (status, data), (chunked_status, chunked) = _requests(
+        api.url, ["/semester", "/teacher"]
+    )
+    assert (status, json.loads(data)) == (200, [{"id": 1, "name": "SS24"}])
+    assert chunked_status == 200
+    assert json.loads(chunked) == [{"id": i} for i in range(20)]
+    assert api.connections == 1
+
+
+def test_keep_alive_and_reconnect(api):
+    responses = _requests(
+        api.url, ["/semester", "/semester", "/close", "/semester", "/idle", "/semester"]
+    )
+    assert [status for status, _ in responses] == [200] * 6
+    # Neue Verbindung nach "Connection: close" und nach dem stillen Schließen
+    assert api.connections == 3
+
+
+def test_invalid_url():
+    with pytest.raises(loadtest.LoadTestError, match="Ungültige URL"):
+        loadtest.AsyncHttpConnection("ftp://example.org")
+
+
+# ============================================================================
+#   MESSWERTE
+# ============================================================================
+
+
+def test_latency_percentile():
+    values = list(range(1, 11))
+    assert loadtest.latency_percentile([], 50) == 0.0
+    assert loadtest.latency_percentile([7], 99) == 7
+    assert loadtest.latency_percentile(values, 0) == 1
+    assert loadtest.latency_percentile(values, 50) == 5
+    assert loadtest.latency_percentile(values, 95) == 10
+    assert loadtest.latency_percentile(values, 100) == 10
+    assert loadtest.latency_percentile(list(range(1, 101)), 99) == 99
+
+
+def test_error_accounting():
+    stats = loadtest.LoadTestStats()
+    stats.record("GET /a", 10, 200, 100)
+    stats.record("GET /a", 20, 500)
+    stats.record("GET /a", 30, 404)
+    stats.record("GET /a", 40, error="timeout")
+    stats.record("GET /b", 5, 201)
+    assert (stats.requests, stats.errors) == (5, 3)
+    report = stats.report(1.0)
+    assert report["GET /a"]["errors"] == 3
+    assert report["GET /a"]["error_rate"] == 0.75
+    assert report["GET /a"]["statuses"] == {"200": 1, "500": 1, "404": 1}
+    assert report["GET /a"]["error_messages"] == {
+        "HTTP 500": 1,
+        "HTTP 404": 1,
+        "timeout": 1,
+    }
+    assert report["GET /a"]["p50_ms"] == 20
+    assert report["GET /b"]["error_rate"] == 0
+
+
+# ============================================================================
+#   LASTTEST
+# ============================================================================
+
+
+def test_login_and_closed_loop(api):
+    report = loadtest.run_load_test(
+        api.url, ["alice", "bad"], PASSWORD, concurrency=2, duration=0.3, seed=1
+    )
+    assert (report["users"], report["logged_in"]) == (2, 1)
+    assert report["login"]["statuses"] == {"201": 1, "401": 1}
+    assert report["mode"] == "closed" and report["dropped_iterations"] == 0
+    assert report["requests"] > 0 and report["errors"] == 0 and report["ok"]
+    assert set(report["endpoints"]) <= {
+        "GET /semester",
+        "GET /auth/profile",
+        "GET /teacher",
+        "GET /teachingDuty",
+        "PUT /teachingDuty",
+    }
+    # Alle Anfragen mit dem Token des angemeldeten Benutzers
+    assert not any(
+        status == "401"
+        for endpoint in report["endpoints"].values()
+        for status in endpoint["statuses"]
+    )
+    # Die Deputatsmeldung schreibt den gelesenen Wert unverändert zurück
+    puts = [body for method, _, body in api.hits if method == "PUT"]
+    assert all(body == {"id": 1, "individualDuty": 18} for body in puts)
+
+
+def test_all_logins_failed(api):
+    with pytest.raises(loadtest.LoadTestError, match="Keiner der 2 Benutzer"):
+        loadtest.run_load_test(api.url, ["alice", "bob"], "wrong", 1, 0.1)
+
+
+def test_error_rate(api):
+    api.fail_duties = True
+    options = dict(concurrency=2, duration=0.3, scenarios=["teacher_dashboard"])
+    report = loadtest.run_load_test(api.url, ["alice"], PASSWORD, **options)
+    duties = report["endpoints"]["GET /teachingDuty"]
+    assert duties["errors"] == duties["requests"] == duties["statuses"]["500"]
+    assert report["errors"] == duties["errors"]
+    # Je Durchlauf drei Anfragen, davon eine fehlerhaft
+    assert report["error_rate"] == pytest.approx(1 / 3, abs=0.01)
+    assert not report["ok"]
+
+    report = loadtest.run_load_test(
+        api.url, ["alice"], PASSWORD, max_error_rate=0.5, **options
+    )
+    assert report["ok"]
+
+
+def test_open_loop_drops_and_counts_queueing(api):
+    api.delay = 0.05
+    report = loadtest.run_load_test(
+        api.url,
+        ["alice"],
+        PASSWORD,
+        concurrency=1,
+        duration=0.5,
+        rate=100,
+        scenarios=["semester_list"],
+    )
+    assert report["mode"] == "open"
+    completed = report["iterations"]["semester_list"]
+    # Alle 50 geplanten Durchläufe sind entweder gelaufen oder verworfen
+    assert completed + report["dropped_iterations"] == 50
+    assert report["dropped_iterations"] > 0
+    assert report["requests"] == completed
+    # Die Wartezeit auf den einzigen Benutzer zählt zur Latenz: spätere
+    # Durchläufe warten mehrere Antwortzeiten
+    semester = report["endpoints"]["GET /semester"]
+    assert semester["max_ms"] > 3 * 50
+
+
+def test_invalid_options(api):
+    with pytest.raises(loadtest.LoadTestError, match="Unbekannte Szenarien: x"):
+        loadtest.run_load_test(api.url, ["alice"], PASSWORD, 1, 1, scenarios=["x"])
+    with pytest.raises(loadtest.LoadTestError, match="positiv"):
+        loadtest.run_load_test(api.url, ["alice"], PASSWORD, 1, 1, rate=0)
+
+
+def test_access_token_keys():
+    assert loadtest.get_access_token({"access_token": "a"}) == "a"
+    assert loadtest.get_access_token({"accessToken": "b"}) == "b"
+    assert loadtest.get_access_token({"token": "c"}) == "c"
+    assert loadtest.get_access_token({"token": 1}) is None
+    assert loadtest.get_access_token([]) is None
+
+
+def test_load_test_users(fake_mysql, tmp_path):
+    database = tmp_path / "core.sqlite"
+    mysql_command = fake_mysql(database)
+    with pytest.raises(loadtest.LoadTestError, match="nicht gelesen"):
+        loadtest.get_load_test_users(mysql_command, 2)
+
+    connection = sqlite3.connect(database)
+    connection.execute("CREATE TABLE User (id INTEGER PRIMARY KEY, username, role)")
+    connection.commit()
+    with pytest.raises(loadtest.LoadTestError, match="Keine Controller"):
+        loadtest.get_load_test_users(mysql_command, 2)
+
+    connection.executemany(
+        "INSERT INTO User VALUES (?, ?, ?)",
+        [
+            (1, "teacher001", "TEACHER"),
+            (2, "controller001", "CONTROLLER"),
+            (3, "controller002", "CONTROLLER"),
+            (4, "controller003", "CONTROLLER"),
+        ],
+    )
+    connection.commit()
+    connection.close()
+    assert loadtest.get_load_test_users(mysql_command, 2) == [
+        "controller001",
+        "controller002",
+    ]
+
+
+def test_cli_defaults_without_loading_dbtools_at_startup(api, monkeypatch):
+    import run_benchmarks
+
+    bm = run_benchmarks.load_boot_manager()
+    argv = ["loadtest", "--url", api.url, "--users", "alice", "--duration", "0.2"]
+    args = bm.parse_arguments(argv)
+    assert args.password is None and args.seed is None
+    assert bm.loadtest._module is None and bm.dataset._module is None
+
+    results = []
+    monkeypatch.setattr(bm, "write_load_test_results", results.append)
+    args = bm.parse_arguments(argv + ["--password", PASSWORD])
+    exit_code, report = args.handler(args)
+    assert exit_code == 0 and report["requests"] > 0
+    assert results == [report]
@@ -0,0 +1,147 @@
+"""
+MySQL-Profile: abgeleitete Einstellungen je Host-Größe und der daraus folgende
+Verbindungspool der API-Replikate.
+"""
+
+import pytest
+
+MB = 1024 * 1024
+GB = 1024 * MB
+
+
+@pytest.mark.parametrize(
+    "memory, profile",
+    [
+        (2 * GB, "small"),
+        (6 * GB - 1, "small"),
+        (8 * GB, "balanced"),
+        (64 * GB, "server"),
+    ],
+)
+def test_auto_profile_by_memory(bm, memory, profile):
+    assert bm.choose_mysql_profile(memory) == profile
+    assert bm.derive_mysql_settings("auto", memory, 4) == bm.derive_mysql_settings(
+        profile, memory, 4
+    )
+
+
+def test_small_host(bm):
+    settings = bm.derive_mysql_settings("small", 4 * GB, 2)
+    assert settings == {
+        "innodb_buffer_pool_size": "384M",
+        "innodb_buffer_pool_instances": 1,
+        "innodb_redo_log_capacity": "256M",
+        "innodb_flush_log_at_trx_commit": 2,
+        "sync_binlog": 0,
+        "innodb_read_io_threads": 2,
+        "innodb_write_io_threads": 2,
+        "max_connections": 50,
+        "tmp_table_size": "16M",
+        "max_heap_table_size": "16M",
+    }
+
+
+def test_mid_host(bm):
+    settings = bm.derive_mysql_settings("balanced", 16 * GB, 8)
+    assert settings == {
+        "innodb_buffer_pool_size": "4096M",
+        "innodb_buffer_pool_instances": 4,
+        "innodb_redo_log_capacity": "512M",
+        "innodb_flush_log_at_trx_commit": 1,
+        "sync_binlog": 1,
+        "innodb_read_io_threads": 4,
+        "innodb_write_io_threads": 4,
+        "max_connections": 100,
+        "tmp_table_size": "32M",
+        "max_heap_table_size": "32M",
+    }
+
+
+def test_large_host(bm):
+    settings = bm.derive_mysql_settings("server", 128 * GB, 64)
+    assert settings == {
+        "innodb_buffer_pool_size": "32768M",
+        "innodb_buffer_pool_instances": 8,
+        "innodb_redo_log_capacity": "2048M",
+        "innodb_flush_log_at_trx_commit": 1,
+        "sync_binlog": 1,
+        "innodb_read_io_threads": 16,
+        "innodb_write_io_threads": 16,
+        "max_connections": 300,
+        "tmp_table_size": "64M",
+        "max_heap_table_size": "64M",
+    }
+
+
+@pytest.mark.parametrize("profile", ["small", "balanced", "server"])
+@pytest.mark.parametrize("memory", [1 * GB, 3 * GB, 12 * GB, 48 * GB])
+def test_buffer_pool_bounds(bm, profile, memory):
+    settings = bm.derive_mysql_settings(profile, memory, 4)
+    buffer_pool = int(settings["innodb_buffer_pool_size"].rstrip("M")) * MB
+    # Ganze 128-MB-Chunks, nie mehr als drei Viertel des Speichers
+    assert buffer_pool % (128 * MB) == 0
+    assert 128 * MB <= buffer_pool <= memory * 3 // 4
+
+
+def test_unknown_profile(bm):
+    with pytest.raises(ValueError):
+        bm.derive_mysql_settings("huge", 8 * GB, 4)
+
+
+@pytest.mark.parametrize(
+    "profile, memory, cpus",
+    [("small", 4 * GB, 2), ("balanced", 16 * GB, 8), ("server", 128 * GB, 64)],
+)
+@pytest.mark.parametrize("replicas", [1, 2, 4, 8])
+def test_api_pools_fit_max_connections(bm, profile, memory, cpus, replicas):
+    max_connections = bm.derive_mysql_settings(profile, memory, cpus)["max_connections"]
+    limit = bm.api_connection_limit(max_connections, replicas)
+    assert 2 <= limit <= bm.API_DB_POOL_MAX
+    assert (
+        limit * replicas <= max_connections - bm.MYSQL_RESERVED_CONNECTIONS
+    ), "alle Replikate zusammen müssen unter max_connections bleiben"
+
+
+@pytest.mark.parametrize(
+    "max_connections, replicas, limit",
+    [(50, 1, 20), (50, 4, 10), (50, 8, 5), (50, 30, 2), (151, 1, 20), (300, 8, 20)],
+)
+def test_api_connection_limit(bm, max_connections, replicas, limit):
+    assert bm.api_connection_limit(max_connections, replicas) == limit
+
+
+def test_connection_limit_in_database_url(bm):
+    config = {
+        "services": {
+            "api": {
+                "environment": {
+                    "DATABASE_URL": "mysql://user:pw@db:3306/dpt?connect_timeout=10"
+                }
+            }
+        }
+    }
+    limit = bm.api_connection_limit(
+        bm.derive_mysql_settings("small", 4 * GB, 2)["max_connections"], 4
+    )
+    assert bm.set_api_connection_limit(config, limit)
+    assert config["services"]["api"]["environment"]["DATABASE_URL"] == (
+        "mysql://user:pw@db:3306/dpt?connect_timeout=10&connection_limit=10"
+    )
+    # Unveränderter Wert: keine Änderung, die Compose-Datei bleibt unangetastet
+    assert not bm.set_api_connection_limit(config, limit)
+
+
+def test_write_mysql_config(bm, tmp_path, monkeypatch):
+    monkeypatch.setattr(bm, "DOCKER_COMPOSE_FILE", str(tmp_path / "compose.yml"))
+    config = {bm.BOOT_SETTINGS_KEY: {"mysql_profile": "auto"}}
+    profile, max_connections = bm.write_mysql_config(config, resources=(16 * GB, 8))
+    assert (profile, max_connections) == ("balanced", 100)
+    text = (tmp_path / bm.MYSQL_CONFIG_NAME).read_text(encoding="utf-8")
+    assert "innodb_buffer_pool_size = 4096M" in text
+    assert "max_connections = 100" in text
+
+    # Eigene Konfiguration: max_connections wird aus der Datei gelesen
+    (tmp_path / bm.MYSQL_CONFIG_NAME).write_text("[mysqld]\nmax-connections = 80\n")
+    config[bm.BOOT_SETTINGS_KEY]["mysql_profile"] = "custom"
+    assert bm.write_mysql_config(config) == ("custom", 80)
+    assert bm.api_connection_limit(80, 4) == 17
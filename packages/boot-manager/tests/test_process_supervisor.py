@@ -0,0 +1,145 @@
+"""
+ProcessSupervisor mit echten Kindprozessen (der laufende Python-Interpreter)
+und die Erkennung des Compose-Aufrufs.
+"""
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+@pytest.fixture
+def supervisor(bm):
+    return bm.ProcessSupervisor(terminate_grace=1)
+
+
+def test_output_exit_code_and_history(bm, supervisor):
+    lines = []
+    finished = []
+    process = supervisor.start(
+        python(
+            "import sys\n"
+            "print('eins')\n"
+            "print('zwei', file=sys.stderr)\n"
+            "sys.stdout.write('x' * 3000000)\n"
+            "sys.exit(3)"
+        ),
+        name="test",
+        on_line=lines.append,
+        on_exit=finished.append,
+    )
+    assert process.wait(timeout=30) == 3
+    assert "eins" in lines and "zwei" in lines
+    # Überlange Zeilen kommen in Stücken von höchstens PROCESS_LINE_LIMIT Zeichen
+    long_parts = [line for line in lines if line.startswith("x")]
+    assert "".join(long_parts) == "x" * 3000000
+    assert max(map(len, long_parts)) <= bm.PROCESS_LINE_LIMIT + bm.PROCESS_READ_SIZE
+    assert process.result()["exit_code"] == 3 and not process.running
+    assert supervisor.running() == [] and list(supervisor.history) == [process]
+    # on_exit läuft nach dem Ende; wait() kann vorher zurückkehren
+    deadline = time.monotonic() + 5
+    while not finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert finished == [process]
+
+
+def test_timeout_terminates(supervisor):
+    start = time.monotonic()
+    process = supervisor.start(
+        python("import time; time.sleep(30)"), timeout=0.5, on_line=lambda line: None
+    )
+    process.wait(timeout=10)
+    assert process.timed_out and not process.running
+    assert process.returncode != 0
+    assert time.monotonic() - start < 5
+
+
+def test_exclusive_runs_one_after_another(supervisor):
+    stamps = {}
+
+    def collect(key):
+        return lambda line: stamps.setdefault(key, []).append(float(line))
+
+    code = "import time; print(time.time()); time.sleep(0.3); print(time.time())"
+    first = supervisor.start(python(code), exclusive="compose", on_line=collect(1))
+    second = supervisor.start(python(code), exclusive="compose", on_line=collect(2))
+    assert first.wait(timeout=30) == 0 and second.wait(timeout=30) == 0
+    assert stamps[2][0] >= stamps[1][1]
+
+
+def test_cancel_waiting_and_running(supervisor):
+    running = supervisor.start(
+        python("import time; time.sleep(30)"),
+        exclusive="compose",
+        on_line=lambda line: None,
+    )
+    waiting = supervisor.start(python("print('nie')"), exclusive="compose")
+    time.sleep(0.2)
+    supervisor.cancel_all("compose")
+    assert running.wait(timeout=10) != 0 and running.cancelled
+    # Der wartende Prozess wird gar nicht erst gestartet
+    assert waiting.wait(timeout=10) is None
+    assert waiting.cancelled and waiting.pid is None
+
+
+def test_not_startable(supervisor, tmp_path):
+    process = supervisor.start([str(tmp_path / "fehlt")])
+    assert process.wait(timeout=10) is None
+    assert process.error and not process.running
+
+
+@pytest.mark.parametrize(
+    "outputs, command, replicas",
+    [
+        ({"docker": b"Docker Compose version v2.27.0\n"}, ["docker", "compose"], True),
+        (
+            {"docker-compose": b"docker-compose version 1.29.2, build 5becea4c\n"},
+            ["docker-compose"],
+            False,
+        ),
+        (
+            {"docker-compose": b"Docker Compose version 2.20.3\n"},
+            ["docker-compose"],
+            True,
+        ),
+    ],
+)
+def test_compose_command(bm, monkeypatch, outputs, command, replicas):
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args)
+        if args[0] not in outputs:
+            raise FileNotFoundError(args[0])
+        return subprocess.CompletedProcess(args, 0, outputs[args[0]], b"")
+
+    monkeypatch.setattr(bm.subprocess, "run", run)
+    monkeypatch.setattr(bm, "_compose_command", None)
+    monkeypatch.setattr(bm, "_compose_major_version", None)
+    assert bm.get_compose_command() == command
+    detected = len(calls)
+    assert bm.compose_supports_replicas() is replicas
+    assert bm.compose_args("up", "-d") == command + [
+        "-f",
+        bm.DOCKER_COMPOSE_FILE,
+        "up",
+        "-d",
+    ]
+    # Das Ergebnis wird zwischengespeichert
+    assert len(calls) == detected
+
+
+def test_compose_command_not_cached_without_docker(bm, monkeypatch):
+    def run(args, **kwargs):
+        raise FileNotFoundError(args[0])
+
+    monkeypatch.setattr(bm.subprocess, "run", run)
+    monkeypatch.setattr(bm, "_compose_command", None)
+    assert bm.get_compose_command() == ["docker", "compose"]
+    assert bm._compose_command is None